@@ -0,0 +1,73 @@
+"""add_analytics_daily_rollups
+
+Revision ID: b3d51c7e9f20
+Revises: a40bfa0084a1
+Create Date: 2026-10-16 10:00:00.000000
+
+Daily rollups behind the underwriting/quotation analytics dashboards,
+maintained incrementally by DailyRollupService.refresh()
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d51c7e9f20'
+down_revision: Union[str, None] = 'a40bfa0084a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create analytics_daily_rollups and analytics_rollup_state."""
+    measure = lambda name: sa.Column(name, sa.Numeric(18, 4), nullable=False, server_default='0')
+    counter = lambda name: sa.Column(name, sa.Integer(), nullable=False, server_default='0')
+
+    op.create_table(
+        'analytics_daily_rollups',
+        sa.Column('source', sa.String(50), nullable=False,
+                  comment='Rolled-up table (underwriting_applications, quotations, ...)'),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_type', sa.String(50), nullable=False,
+                  comment="Product/insurance type ('' when unset)"),
+        sa.Column('dimension', sa.String(30), nullable=False),
+        sa.Column('dimension_value', sa.String(50), nullable=False,
+                  comment="Value of the dimension ('' when unset)"),
+        counter('row_count'),
+        measure('processing_hours_sum'),
+        counter('processing_count'),
+        counter('sla_total'),
+        counter('sla_compliant'),
+        sa.Column('score_sum', sa.Numeric(18, 4), nullable=False, server_default='0',
+                  comment='Quality score (applications) or risk score (profiles)'),
+        counter('score_count'),
+        measure('loading_sum'),
+        counter('loading_count'),
+        measure('discount_sum'),
+        counter('discount_count'),
+        sa.PrimaryKeyConstraint('source', 'day', 'product_type', 'dimension', 'dimension_value'),
+    )
+    op.create_index(
+        'ix_analytics_daily_rollups_source_dimension_day',
+        'analytics_daily_rollups',
+        ['source', 'dimension', 'day']
+    )
+
+    op.create_table(
+        'analytics_rollup_state',
+        sa.Column('source', sa.String(50), primary_key=True, nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False,
+                  comment='Start of the last refresh; rows changed after it are re-rolled'),
+        sa.Column('rolled_through', sa.Date(), nullable=False,
+                  comment='Last closed day stored in analytics_daily_rollups'),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop the rollup tables."""
+    op.drop_table('analytics_rollup_state')
+    op.drop_index('ix_analytics_daily_rollups_source_dimension_day', table_name='analytics_daily_rollups')
+    op.drop_table('analytics_daily_rollups')
@@ -0,0 +1,35 @@
+"""add_business_number_sequences
+
+Revision ID: b7c2e4a91d3f
+Revises: b3d51c7e9f20
+Create Date: 2026-10-16 11:00:00.000000
+
+Sequences behind app.core.number_allocator. INCREMENT BY is the block
+size each process reserves per nextval() call.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2e4a91d3f'
+down_revision: Union[str, None] = 'b3d51c7e9f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BLOCK_SIZE = 100
+
+SEQUENCES = ('quote_number_seq', 'underwriting_application_number_seq')
+
+
+def upgrade() -> None:
+    """Create one block-allocating sequence per numbered entity."""
+    for name in SEQUENCES:
+        op.execute(f"CREATE SEQUENCE IF NOT EXISTS {name} START WITH 1 INCREMENT BY {BLOCK_SIZE} MINVALUE 1")
+
+
+def downgrade() -> None:
+    """Drop the number sequences."""
+    for name in SEQUENCES:
+        op.execute(f"DROP SEQUENCE IF EXISTS {name}")
@@ -1,11 +1,20 @@
 # app/core/base_repository.py
 
-from typing import TypeVar, Generic, Optional, List, Dict, Any, Type, Union
+from enum import Enum
+from typing import TypeVar, Generic, Optional, List, Dict, Any, Type, Union, Iterable
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, and_, or_, literal_column
 from sqlalchemy.exc import NoResultFound
 from app.core.database import Base
+from app.utils.pagination import (
+    CountMode,
+    count_rows,
+    estimate_count,
+    keyset_page,
+    keyset_statement,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +23,90 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
+
+# ==================== GROUPED AGGREGATION ====================
+
+class GroupedAggregates:
+    """
+    Result of grouped_aggregates().
+    
+    Attributes:
+        totals: Aggregate label -> value over all matching rows
+        groups: Dimension name -> {dimension value: {aggregate label: value}}
+            (enum values are stored by their ``.value``)
+    """
+    
+    def __init__(self, totals: Dict[str, Any], groups: Dict[str, Dict[Any, Dict[str, Any]]]):
+        self.totals = totals
+        self.groups = groups
+    
+    def total(self, label: str = "count") -> Any:
+        """Aggregate over all rows (0 when NULL)."""
+        return self.totals.get(label) or 0
+    
+    def counts(self, dimension: str, label: str = "count", skip_empty: bool = False) -> Dict[Any, Any]:
+        """Aggregate ``label`` per value of ``dimension``."""
+        return {
+            value: aggregates[label]
+            for value, aggregates in self.groups.get(dimension, {}).items()
+            if not (skip_empty and not aggregates[label])
+        }
+
+
+def grouped_aggregates(
+    db: Session,
+    source: Any,
+    dimensions: Dict[str, Any],
+    aggregates: Optional[Dict[str, Any]] = None,
+    where: Iterable[Any] = ()
+) -> GroupedAggregates:
+    """
+    Totals plus per-value breakdowns for several dimensions in one query.
+    
+    Runs ``GROUP BY GROUPING SETS ((), (dim1), (dim2), ...)``, so a stats
+    endpoint needs one round trip instead of a COUNT per enum value.
+    Conditional counts are expressed as aggregates with a FILTER clause,
+    e.g. ``{"active": func.count().filter(Model.is_active.is_(True))}``.
+    
+    Args:
+        db: Database session
+        source: Model (or selectable) to aggregate
+        dimensions: Name -> column to break down by
+        aggregates: Label -> aggregate expression (default: row count as "count")
+        where: Filter clauses applied to all rows
+        
+    Returns:
+        GroupedAggregates with the overall totals and per-dimension groups
+    """
+    aggregates = aggregates or {"count": func.count()}
+    names = list(dimensions)
+    columns = list(dimensions.values())
+    labels = list(aggregates)
+    
+    query = select(
+        *(func.grouping(column) for column in columns),
+        *columns,
+        *aggregates.values()
+    ).select_from(source).where(*where)
+    if columns:
+        query = query.group_by(func.grouping_sets(literal_column("()"), *columns))
+    
+    totals: Dict[str, Any] = dict.fromkeys(labels)
+    groups: Dict[str, Dict[Any, Dict[str, Any]]] = {name: {} for name in names}
+    width = len(columns)
+    for row in db.execute(query):
+        values = dict(zip(labels, row[2 * width:]))
+        # grouping(col) is 0 only in the grouping set that contains col
+        grouped = [i for i, flag in enumerate(row[:width]) if not flag]
+        if not grouped:
+            totals = values
+        else:
+            key = row[width + grouped[0]]
+            groups[names[grouped[0]]][key.value if isinstance(key, Enum) else key] = values
+    
+    return GroupedAggregates(totals, groups)
+
+
 class BaseRepository:
     """
     Base repository class for common database operations.
@@ -231,6 +324,37 @@ class BaseRepository:
         
         return self.db.scalar(query) or 0
 
+    def grouped_aggregates(
+        self,
+        dimensions: Dict[str, Any],
+        aggregates: Optional[Dict[str, Any]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        where: Iterable[Any] = ()
+    ) -> GroupedAggregates:
+        """
+        Totals and per-dimension breakdowns of this model in one query.
+        
+        Args:
+            dimensions: Name -> column (or field name) to break down by
+            aggregates: Label -> aggregate expression (default: row count as "count")
+            filters: Dictionary of field:value filters
+            where: Additional filter clauses
+            
+        Returns:
+            GroupedAggregates (see grouped_aggregates)
+        """
+        clauses = list(where)
+        if filters:
+            for field_name, field_value in filters.items():
+                if hasattr(self.model, field_name):
+                    clauses.append(getattr(self.model, field_name) == field_value)
+        
+        dimensions = {
+            name: getattr(self.model, column) if isinstance(column, str) else column
+            for name, column in dimensions.items()
+        }
+        return grouped_aggregates(self.db, self.model, dimensions, aggregates, clauses)
+
     # ==================== UPDATE OPERATIONS ====================
     
     def update(self, id: Union[UUID, int], obj_in: Union[Dict[str, Any], Any]) -> Optional[Any]:
@@ -501,23 +625,36 @@ class BaseRepository:
         query = query.offset(skip).limit(limit)
         return list(self.db.scalars(query))
 
+    def _filtered_select(self, filters: Optional[Dict[str, Any]] = None):
+        query = select(self.model)
+        if filters:
+            for field_name, field_value in filters.items():
+                if hasattr(self.model, field_name):
+                    query = query.where(getattr(self.model, field_name) == field_value)
+        return query
+
     def get_paginated(
         self,
         page: int = 1,
         page_size: int = 20,
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[str] = None,
-        order_desc: bool = False
+        order_desc: bool = False,
+        estimate_total: bool = False
     ) -> Dict[str, Any]:
         """
         Get paginated results with metadata.
         
+        Deep pages still scan every skipped row; prefer get_keyset_page
+        for large tables.
+        
         Args:
             page: Page number (1-based)
             page_size: Items per page
             filters: Dictionary of field:value filters
             order_by: Field name to order by
             order_desc: Whether to order in descending order
+            estimate_total: Use the planner's row estimate instead of COUNT(*)
             
         Returns:
             Dictionary with items and pagination metadata
@@ -534,7 +671,10 @@ class BaseRepository:
         )
         
         # Get total count
-        total_items = self.count(filters=filters)
+        if estimate_total:
+            total_items = estimate_count(self.db, self._filtered_select(filters))
+        else:
+            total_items = self.count(filters=filters)
         total_pages = (total_items + page_size - 1) // page_size
         
         return {
@@ -549,6 +689,57 @@ class BaseRepository:
             }
         }
 
+    def get_keyset_page(
+        self,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        count_mode: CountMode = CountMode.NONE
+    ) -> Dict[str, Any]:
+        """
+        Get a page by keyset (cursor) instead of offset.
+        
+        Rows are ordered by (order_by, id); the cost of a page does not grow
+        with its depth. ``order_by`` should be an indexed, non-null column.
+        
+        Args:
+            size: Items per page
+            cursor: ``next_cursor`` of the previous page (None for the first page)
+            filters: Dictionary of field:value filters
+            order_by: Sort field name
+            order_desc: Whether to order in descending order
+            count_mode: Whether to add an exact, estimated or no total
+            
+        Returns:
+            Dictionary with items and cursor pagination metadata
+            
+        Raises:
+            ValueError: If the cursor is malformed or order_by is unknown
+        """
+        if not hasattr(self.model, order_by):
+            raise ValueError(f"{self.model.__name__} has no field {order_by}")
+        sort_column, id_column = getattr(self.model, order_by), self.model.id
+        
+        query = self._filtered_select(filters)
+        total = count_rows(self.db, query, count_mode)
+        rows = list(self.db.scalars(
+            keyset_statement(query, sort_column, id_column, size, cursor, order_desc)
+        ))
+        items, next_cursor = keyset_page(rows, sort_column, id_column, size)
+        
+        return {
+            "items": items,
+            "pagination": {
+                "size": size,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+                "total": total,
+                "total_is_estimate": CountMode(count_mode) == CountMode.ESTIMATE
+            }
+        }
+
 
 # Type-safe repository class for those who want explicit typing
 class TypedRepository(BaseRepository, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
@@ -564,4 +755,292 @@ class TypedRepository(BaseRepository, Generic[ModelType, CreateSchemaType, Updat
         return super().create(obj_in)
     
     def update(self, id: Union[UUID, int], obj_in: Union[Dict[str, Any], UpdateSchemaType]) -> Optional[ModelType]:
-        return super().update(id, obj_in)
\ No newline at end of file
+        return super().update(id, obj_in)
+
+
+class AsyncBaseRepository:
+    """
+    Async counterpart of BaseRepository for use with AsyncSession.
+    Mirrors the CRUD/query surface of BaseRepository so hot async paths
+    (auth, pricing, underwriting) can await queries instead of blocking
+    the event loop on a synchronous session.
+    """
+
+    def __init__(self, model: Type[Any], db: AsyncSession):
+        """
+        Initialize the repository with a model class and async session.
+
+        Args:
+            model: The SQLAlchemy model class
+            db: Async database session
+        """
+        self.model = model
+        self.db = db
+
+    @staticmethod
+    def _to_dict(obj_in: Union[Dict[str, Any], Any], **dump_kwargs: Any) -> Dict[str, Any]:
+        """Normalize a Pydantic schema (v1/v2) or dict to a plain dict."""
+        if hasattr(obj_in, 'model_dump'):
+            return obj_in.model_dump(**dump_kwargs)
+        if hasattr(obj_in, 'dict'):
+            return obj_in.dict(**dump_kwargs)
+        return obj_in
+
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        if filters:
+            for field_name, field_value in filters.items():
+                if hasattr(self.model, field_name):
+                    query = query.where(getattr(self.model, field_name) == field_value)
+        return query
+
+    # ==================== CREATE OPERATIONS ====================
+
+    async def create(self, obj_in: Union[Dict[str, Any], Any]) -> Any:
+        """
+        Create a new record from a dictionary or Pydantic schema.
+
+        Args:
+            obj_in: Dictionary of field values or Pydantic schema instance
+
+        Returns:
+            Created model instance
+        """
+        db_obj = self.model(**self._to_dict(obj_in, exclude_unset=True))
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        logger.info(f"Created {self.model.__name__} with ID: {db_obj.id}")
+        return db_obj
+
+    async def create_batch(self, objects_in: List[Union[Dict[str, Any], Any]]) -> List[Any]:
+        """
+        Create multiple records in a single flush/commit.
+
+        Args:
+            objects_in: List of dictionaries or Pydantic schemas
+
+        Returns:
+            List of created model instances
+        """
+        db_objects = [self.model(**self._to_dict(o, exclude_unset=True)) for o in objects_in]
+        self.db.add_all(db_objects)
+        await self.db.commit()
+        logger.info(f"Created batch of {len(db_objects)} {self.model.__name__} records")
+        return db_objects
+
+    # ==================== READ OPERATIONS ====================
+
+    async def get(self, id: Union[UUID, int]) -> Optional[Any]:
+        """Get a single record by ID."""
+        return await self.db.get(self.model, id)
+
+    async def get_by_field(self, field_name: str, field_value: Any) -> Optional[Any]:
+        """Get a single record by a specific field."""
+        return await self.db.scalar(
+            select(self.model).where(getattr(self.model, field_name) == field_value).limit(1)
+        )
+
+    async def get_multi(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        order_desc: bool = False
+    ) -> List[Any]:
+        """
+        Get multiple records with optional filtering and pagination.
+
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            filters: Dictionary of field:value filters
+            order_by: Field name to order by
+            order_desc: Whether to order in descending order
+
+        Returns:
+            List of model instances
+        """
+        query = self._apply_filters(select(self.model), filters)
+
+        if order_by and hasattr(self.model, order_by):
+            order_column = getattr(self.model, order_by)
+            query = query.order_by(order_column.desc() if order_desc else order_column)
+
+        query = query.offset(skip).limit(limit)
+        return list(await self.db.scalars(query))
+
+    async def get_all(self) -> List[Any]:
+        """Get all records."""
+        return list(await self.db.scalars(select(self.model)))
+
+    async def exists(self, id: Union[UUID, int]) -> bool:
+        """Check if a record exists by ID."""
+        return await self.db.get(self.model, id) is not None
+
+    async def exists_by_field(self, field_name: str, field_value: Any) -> bool:
+        """Check if a record exists by a specific field."""
+        found = await self.db.scalar(
+            select(self.model.id)
+            .where(getattr(self.model, field_name) == field_value)
+            .limit(1)
+        )
+        return found is not None
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count records with optional filtering."""
+        query = self._apply_filters(select(func.count(self.model.id)), filters)
+        return await self.db.scalar(query) or 0
+
+    # ==================== UPDATE OPERATIONS ====================
+
+    async def update(self, id: Union[UUID, int], obj_in: Union[Dict[str, Any], Any]) -> Optional[Any]:
+        """
+        Update a record by ID from a dictionary or Pydantic schema.
+
+        Args:
+            id: Record ID
+            obj_in: Dictionary of field values or Pydantic schema instance
+
+        Returns:
+            Updated model instance or None if not found
+        """
+        db_obj = await self.get(id)
+        if not db_obj:
+            return None
+
+        obj_data = self._to_dict(obj_in, exclude_unset=True, exclude_none=True)
+        for field, value in obj_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        logger.info(f"Updated {self.model.__name__} with ID: {id}")
+        return db_obj
+
+    async def update_multi(self, filters: Dict[str, Any], obj_in: Dict[str, Any]) -> int:
+        """Update multiple records matching filters; returns rows updated."""
+        query = self._apply_filters(update(self.model), filters).values(**obj_in)
+        result = await self.db.execute(query)
+        await self.db.commit()
+
+        rows_updated = result.rowcount
+        logger.info(f"Updated {rows_updated} {self.model.__name__} records")
+        return rows_updated
+
+    # ==================== DELETE OPERATIONS ====================
+
+    async def delete(self, id: Union[UUID, int]) -> bool:
+        """Delete a record by ID; returns False if not found."""
+        db_obj = await self.get(id)
+        if not db_obj:
+            return False
+
+        await self.db.delete(db_obj)
+        await self.db.commit()
+        logger.info(f"Deleted {self.model.__name__} with ID: {id}")
+        return True
+
+    async def delete_multi(self, filters: Dict[str, Any]) -> int:
+        """Delete multiple records matching filters; returns rows deleted."""
+        result = await self.db.execute(self._apply_filters(delete(self.model), filters))
+        await self.db.commit()
+
+        rows_deleted = result.rowcount
+        logger.info(f"Deleted {rows_deleted} {self.model.__name__} records")
+        return rows_deleted
+
+    # ==================== UTILITY METHODS ====================
+
+    async def refresh(self, db_obj: Any) -> Any:
+        """Refresh a model instance from the database."""
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def flush(self) -> None:
+        """Flush the current transaction."""
+        await self.db.flush()
+
+    async def commit(self) -> None:
+        """Commit the current transaction."""
+        await self.db.commit()
+
+    async def rollback(self) -> None:
+        """Rollback the current transaction."""
+        await self.db.rollback()
+
+    # ==================== SEARCH METHODS ====================
+
+    async def get_paginated(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        order_desc: bool = False,
+        estimate_total: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get paginated results with metadata (same shape as BaseRepository.get_paginated).
+        """
+        skip = (page - 1) * page_size
+        items = await self.get_multi(
+            skip=skip,
+            limit=page_size,
+            filters=filters,
+            order_by=order_by,
+            order_desc=order_desc
+        )
+        if estimate_total:
+            query = self._apply_filters(select(self.model), filters)
+            total_items = await self.db.run_sync(estimate_count, query)
+        else:
+            total_items = await self.count(filters=filters)
+        total_pages = (total_items + page_size - 1) // page_size
+
+        return {
+            "items": items,
+            "pagination": {
+                "page": page,
+                "page_size": page_size,
+                "total_items": total_items,
+                "total_pages": total_pages,
+                "has_next": page < total_pages,
+                "has_prev": page > 1
+            }
+        }
+
+    async def get_keyset_page(
+        self,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        count_mode: CountMode = CountMode.NONE
+    ) -> Dict[str, Any]:
+        """
+        Keyset page (same shape as BaseRepository.get_keyset_page).
+        """
+        if not hasattr(self.model, order_by):
+            raise ValueError(f"{self.model.__name__} has no field {order_by}")
+        sort_column, id_column = getattr(self.model, order_by), self.model.id
+
+        query = self._apply_filters(select(self.model), filters)
+        total = await self.db.run_sync(count_rows, query, count_mode)
+        rows = list((await self.db.scalars(
+            keyset_statement(query, sort_column, id_column, size, cursor, order_desc)
+        )).all())
+        items, next_cursor = keyset_page(rows, sort_column, id_column, size)
+
+        return {
+            "items": items,
+            "pagination": {
+                "size": size,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+                "total": total,
+                "total_is_estimate": CountMode(count_mode) == CountMode.ESTIMATE
+            }
+        }
@@ -0,0 +1,432 @@
+# app/core/bulk_import.py
+
+"""
+COPY-based bulk import pipeline.
+
+Large imports (reference code sets, actuarial tables) go through a
+temporary staging table instead of ORM objects:
+
+1. rows are streamed into the staging table with PostgreSQL ``COPY``
+   (all columns as text, so malformed values never abort the load);
+2. validation runs as set-based UPDATEs that mark rejected rows with a
+   reason (required, length, number/range, allowed values, duplicates);
+3. the valid rows are cast and upserted into the target table with one
+   ``INSERT ... SELECT ... ON CONFLICT`` statement.
+
+The staging table lives in the caller's transaction (``ON COMMIT DROP``),
+so nothing is visible until the caller commits and a rollback discards
+everything. Progress is reported through an optional callback.
+
+COPY needs the psycopg 3 driver (the one DATABASE_URL is normalized to).
+"""
+
+import csv
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+    case,
+    cast,
+    func,
+    null,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, literal_column
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_PATTERN = r"^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?$"
+INTEGER_PATTERN = r"^[+-]?[0-9]+$"
+
+DEFAULT_PROGRESS_EVERY = 10000
+DEFAULT_MAX_ERRORS = 100
+
+
+@dataclass
+class ImportProgress:
+    """Snapshot passed to progress callbacks."""
+    phase: str  # copy, validate, upsert, done
+    rows_copied: int = 0
+    rejected: int = 0
+    inserted: int = 0
+    updated: int = 0
+    elapsed_seconds: float = 0.0
+
+
+ProgressCallback = Callable[[ImportProgress], None]
+
+
+@dataclass
+class BulkImportResult:
+    """Outcome of a bulk import."""
+    total_rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)  # first rejected rows
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_rows": self.total_rows,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+def iter_csv_records(stream: IO[bytes], encoding: str = "utf-8-sig") -> Iterator[Dict[str, str]]:
+    """
+    Stream dict records from a binary CSV file.
+
+    Header names are stripped and lowercased; the file is decoded
+    incrementally, never read whole.
+    """
+    reader = csv.reader(io.TextIOWrapper(stream, encoding=encoding, newline=""))
+    header = next(reader, None)
+    if header is None:
+        return
+    names = [name.strip().lower() for name in header]
+    for values in reader:
+        if values:
+            yield dict(zip(names, values))
+
+
+class StagingImport:
+    """
+    A temporary text staging table for one import.
+
+    Usage:
+        staging = StagingImport(db, "icd10", ["code", "description_en"])
+        staging.copy(records)
+        staging.require("code", "description_en")
+        staging.reject_duplicates("code")
+        inserted, updated = staging.upsert(ICD10Code.__table__, ["code"])
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        name: str,
+        columns: Sequence[str],
+        progress: Optional[ProgressCallback] = None,
+        progress_every: int = DEFAULT_PROGRESS_EVERY
+    ):
+        self.db = db
+        self.columns = list(columns)
+        self.progress = progress
+        self.progress_every = progress_every
+        self.rows_copied = 0
+        self.started = time.monotonic()
+
+        self.table = Table(
+            f"import_{name}_{uuid4().hex[:8]}",
+            MetaData(),
+            Column("line_no", BigInteger, primary_key=True),
+            *[Column(column, Text) for column in self.columns],
+            Column("error", Text),
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DROP",
+        )
+        self.table.create(db.connection())
+        self.c = self.table.c
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+
+    def report(self, phase: str, **counts: int) -> None:
+        if self.progress is not None:
+            self.progress(ImportProgress(
+                phase=phase,
+                rows_copied=self.rows_copied,
+                elapsed_seconds=time.monotonic() - self.started,
+                **counts
+            ))
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+
+    def copy(self, records: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Stream ``records`` into the staging table with COPY.
+
+        Keys not in ``columns`` are ignored, missing keys load as NULL and
+        blank strings as NULL. Rows are numbered from 1 in input order.
+
+        Returns:
+            Number of rows copied
+        """
+        connection = self.db.connection()
+        preparer = connection.dialect.identifier_preparer
+        column_list = ", ".join(preparer.quote(name) for name in ["line_no", *self.columns])
+        statement = f"COPY {preparer.format_table(self.table)} ({column_list}) FROM STDIN"
+
+        with connection.connection.cursor() as cursor:
+            if not hasattr(cursor, "copy"):
+                raise RuntimeError("Bulk import requires the psycopg 3 driver")
+            with cursor.copy(statement) as copy:
+                for record in records:
+                    self.rows_copied += 1
+                    copy.write_row(
+                        [self.rows_copied, *(self._text(record.get(name)) for name in self.columns)]
+                    )
+                    if self.rows_copied % self.progress_every == 0:
+                        self.report("copy")
+
+        self.report("copy")
+        return self.rows_copied
+
+    # ------------------------------------------------------------------
+    # Set-based validation
+    # ------------------------------------------------------------------
+
+    def reject(self, reason: str, condition: ColumnElement) -> int:
+        """Mark not-yet-rejected rows matching ``condition`` with ``reason``."""
+        result = self.db.execute(
+            update(self.table)
+            .where(self.c.error.is_(None), condition)
+            .values(error=reason)
+        )
+        return result.rowcount
+
+    def as_numeric(self, name: str) -> ColumnElement:
+        """The column as numeric, NULL where it is not a number (safe to compare)."""
+        column = self.c[name]
+        return case((column.regexp_match(NUMERIC_PATTERN), cast(column, Numeric)), else_=null())
+
+    def require(self, *names: str) -> None:
+        for name in names:
+            self.reject(f"{name} is required", self.c[name].is_(None))
+
+    def max_length(self, name: str, length: int) -> None:
+        self.reject(f"{name} exceeds {length} characters", func.char_length(self.c[name]) > length)
+
+    def number(
+        self,
+        name: str,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        integer: bool = False,
+        decimal_places: Optional[int] = None
+    ) -> None:
+        """
+        Reject non-numeric values (or non-integers), values outside
+        [minimum, maximum] and values with more than ``decimal_places``
+        significant decimals (trailing zeros do not count, as in pydantic).
+        """
+        column = self.c[name]
+        pattern = INTEGER_PATTERN if integer else NUMERIC_PATTERN
+        kind = "an integer" if integer else "a number"
+        self.reject(f"{name} must be {kind}", column.isnot(None) & ~column.regexp_match(pattern))
+        if minimum is not None:
+            self.reject(f"{name} must be >= {minimum}", self.as_numeric(name) < minimum)
+        if maximum is not None:
+            self.reject(f"{name} must be <= {maximum}", self.as_numeric(name) > maximum)
+        if decimal_places is not None:
+            self.reject(
+                f"{name} must have at most {decimal_places} decimal places",
+                func.scale(func.trim_scale(self.as_numeric(name))) > decimal_places
+            )
+
+    def one_of(self, name: str, allowed: Iterable[str]) -> None:
+        allowed = list(allowed)
+        self.reject(
+            f"{name} must be one of: {', '.join(allowed)}",
+            self.c[name].isnot(None) & self.c[name].notin_(allowed)
+        )
+
+    def reject_duplicates(
+        self,
+        *names: str,
+        normalize: Optional[Mapping[str, Callable[[ColumnElement], ColumnElement]]] = None
+    ) -> int:
+        """
+        Reject repeated keys among valid rows; the first occurrence is kept.
+
+        Keys are compared as staged text unless ``normalize`` maps a column
+        to an expression builder (e.g. ``{"age": lambda c: cast(c, Integer)}``
+        so "30" and "030" collide). Call it after the checks that make those
+        expressions safe, since only valid rows are compared.
+        """
+        normalize = normalize or {}
+        keys = [normalize[name](self.c[name]) if name in normalize else self.c[name] for name in names]
+        ranked = (
+            select(
+                self.c.line_no,
+                func.row_number().over(
+                    partition_by=keys, order_by=self.c.line_no
+                ).label("occurrence"),
+            )
+            .where(self.c.error.is_(None))
+            .subquery()
+        )
+        return self.reject(
+            f"duplicate {', '.join(names)}",
+            self.c.line_no.in_(select(ranked.c.line_no).where(ranked.c.occurrence > 1))
+        )
+
+    def validate_against(self, target: Table) -> None:
+        """Required/length/number checks derived from the target table's columns."""
+        for name in self.columns:
+            if name not in target.c:
+                continue
+            column = target.c[name]
+            if not column.nullable and column.default is None and column.server_default is None:
+                self.require(name)
+            if isinstance(column.type, String) and column.type.length:
+                self.max_length(name, column.type.length)
+            elif isinstance(column.type, Integer):
+                self.number(name, integer=True)
+            elif isinstance(column.type, Numeric):
+                self.number(name)
+
+    def counts(self) -> Tuple[int, int]:
+        """(valid, rejected) row counts."""
+        valid, rejected = self.db.execute(
+            select(
+                func.count().filter(self.c.error.is_(None)),
+                func.count().filter(self.c.error.isnot(None)),
+            )
+        ).one()
+        return valid, rejected
+
+    def errors(self, limit: int = DEFAULT_MAX_ERRORS) -> List[Dict[str, Any]]:
+        """The first ``limit`` rejected rows with their reasons."""
+        rows = self.db.execute(
+            select(self.c.line_no, self.c.error)
+            .where(self.c.error.isnot(None))
+            .order_by(self.c.line_no)
+            .limit(limit)
+        ).all()
+        return [{"row": row.line_no, "error": row.error} for row in rows]
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+
+    def typed(self, name: str, target: Table) -> ColumnElement:
+        """Staging column cast to the target column type."""
+        return cast(self.c[name], target.c[name].type)
+
+    def upsert(self, target: Table, key_columns: Sequence[str], update_existing: bool = True) -> Tuple[int, int]:
+        """
+        Insert valid rows into ``target``, updating rows whose key exists.
+
+        Rows identical to the stored ones are left untouched. A UUID
+        primary key missing from the staged columns is generated with
+        gen_random_uuid().
+
+        Returns:
+            (inserted, updated)
+        """
+        names = [name for name in self.columns if name in target.c]
+        values = [self.typed(name, target).label(name) for name in names]
+        for column in target.primary_key.columns:
+            if column.name not in names and isinstance(column.type, PG_UUID):
+                names.append(column.name)
+                values.append(func.gen_random_uuid().label(column.name))
+
+        stmt = pg_insert(target).from_select(
+            names, select(*values).where(self.c.error.is_(None)).order_by(self.c.line_no)
+        )
+        updatable = [name for name in self.columns if name in target.c and name not in key_columns]
+        if update_existing and updatable:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={name: stmt.excluded[name] for name in updatable},
+                where=or_(*(target.c[name].is_distinct_from(stmt.excluded[name]) for name in updatable)),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(key_columns))
+
+        # xmax is 0 only for freshly inserted row versions
+        upserted = stmt.returning(literal_column("(xmax = 0)", Boolean).label("inserted")).cte("upserted")
+        inserted, updated = self.db.execute(
+            select(
+                func.count().filter(upserted.c.inserted),
+                func.count().filter(~upserted.c.inserted),
+            )
+        ).one()
+        self.report("upsert", inserted=inserted, updated=updated)
+        return inserted, updated
+
+
+def bulk_upsert(
+    db: Session,
+    target: Table,
+    records: Iterable[Mapping[str, Any]],
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+    progress: Optional[ProgressCallback] = None,
+    max_errors: int = DEFAULT_MAX_ERRORS
+) -> BulkImportResult:
+    """
+    Load flat records into ``target`` through a staging table.
+
+    Rows failing the checks derived from ``target`` (or repeating a key)
+    are rejected and reported; all other rows are upserted on
+    ``key_columns``. Does not commit.
+
+    Args:
+        db: Database session
+        target: Target table (e.g. ICD10Code.__table__)
+        records: Dict records, e.g. from iter_csv_records
+        columns: Columns to load
+        key_columns: Natural key with a unique constraint
+        progress: Optional progress callback
+        max_errors: Rejected rows listed in the result
+
+    Returns:
+        BulkImportResult
+    """
+    staging = StagingImport(db, target.name, columns, progress=progress)
+    staging.copy(records)
+
+    staging.validate_against(target)
+    staging.reject_duplicates(*key_columns)
+    valid, rejected = staging.counts()
+    staging.report("validate", rejected=rejected)
+
+    inserted, updated = staging.upsert(target, key_columns)
+
+    result = BulkImportResult(
+        total_rows=staging.rows_copied,
+        inserted=inserted,
+        updated=updated,
+        unchanged=valid - inserted - updated,
+        rejected=rejected,
+        errors=staging.errors(max_errors) if rejected else [],
+        elapsed_seconds=time.monotonic() - staging.started,
+    )
+    staging.report("done", rejected=rejected, inserted=inserted, updated=updated)
+    logger.info(
+        f"Bulk import into {target.name}: {result.total_rows} rows, {inserted} inserted, "
+        f"{updated} updated, {rejected} rejected in {result.elapsed_seconds:.1f}s"
+    )
+    return result
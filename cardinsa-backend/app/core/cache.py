@@ -2,158 +2,484 @@
 
 """
 Cache module for the application.
-Provides a simple in-memory cache implementation and an interface for Redis if needed.
+Provides a bounded in-memory LRU/TTL cache and a Redis-backed cache.
 """
 
 import json
+import sys
 import time
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
+import heapq
+import enum
+import fnmatch
+import hashlib
+import inspect
+import logging
+import functools
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional, Dict, List, Tuple
+from uuid import UUID
 import asyncio
-from threading import Lock
+from threading import Event, Lock
 
 from app.core.settings import settings
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; RedisCache falls back to memory
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    """Single cache slot; expires_at is on the time.monotonic() clock."""
+    
+    __slots__ = ('value', 'expires_at', 'size')
+    
+    def __init__(self, value: Any, expires_at: Optional[float], size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
 
 class InMemoryCache:
     """
-    Simple in-memory cache implementation with TTL support.
-    For production, consider using Redis instead.
+    Bounded in-memory LRU cache with TTL support.
+    
+    - Entries live in an OrderedDict in recency order, so hits and LRU
+      evictions are O(1); the cache is capped by ``max_entries`` and an
+      approximate ``max_bytes`` budget.
+    - TTLs use the monotonic clock (immune to wall-clock jumps).
+    - Expiry deadlines are kept in a min-heap; every write sweeps the
+      entries whose deadline has passed, so expired data is reclaimed
+      without scanning the whole cache.
+    
+    The lock only guards O(1) critical sections (no awaits inside), so it
+    never stalls the event loop; it exists for callers on worker threads.
+    For cross-process sharing, use RedisCache instead.
     """
     
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    # Bound on expired entries reclaimed per write so a burst of expiries
+    # cannot turn a single set() into a long pause.
+    _SWEEP_BATCH = 256
+    
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else getattr(settings, 'CACHE_MAX_ENTRIES', 10000)
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(settings, 'CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._expiry_heap: List[tuple] = []
+        self._heap_seq = 0
+        self._bytes = 0
+        self._tag_index: Dict[str, set] = {}
+        self._key_tags: Dict[str, tuple] = {}
         self._lock = Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+    
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        return sys.getsizeof(value)
+    
+    def _remove(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            self._untag(key)
+        return entry
+    
+    def _untag(self, key: str) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            members = self._tag_index.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tag_index[tag]
+    
+    def _sweep_expired(self, now: float, limit: Optional[int] = None) -> int:
+        """Pop due deadlines off the heap; stale heap items (overwritten or deleted keys) are skipped."""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            _, _, key, entry = heapq.heappop(heap)
+            if self._cache.get(key) is entry:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                removed += 1
+        
+        # Overwrites leave dead heap items behind; rebuild when they dominate
+        if len(heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [item for item in heap if self._cache.get(item[2]) is item[3]]
+            heapq.heapify(self._expiry_heap)
+        return removed
+    
+    def _evict_over_budget(self) -> None:
+        while self._cache and (len(self._cache) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self._untag(key)
+            self._stats['evictions'] += 1
+    
+    def _get_nowait(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            
+            if entry.expires_at is not None and time.monotonic() >= entry.expires_at:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry.value
+    
+    def _set_nowait(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> None:
+        now = time.monotonic()
+        entry = _CacheEntry(value, now + ttl if ttl else None, self._sizeof(value))
+        
+        with self._lock:
+            self._sweep_expired(now, self._SWEEP_BATCH)
+            self._remove(key)
+            self._cache[key] = entry
+            self._bytes += entry.size
+            if entry.expires_at is not None:
+                self._heap_seq += 1
+                heapq.heappush(self._expiry_heap, (entry.expires_at, self._heap_seq, key, entry))
+            if tags:
+                self._tag_nowait(key, tags)
+            self._evict_over_budget()
+    
+    def _tag_nowait(self, key: str, tags: List[str]) -> None:
+        """Attach tags to a key (caller holds the lock)."""
+        if key not in self._cache:
+            return
+        merged = tuple(dict.fromkeys(self._key_tags.get(key, ()) + tuple(tags)))
+        self._key_tags[key] = merged
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+    
+    def _invalidate_tags_nowait(self, tags: List[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tag_index.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
     
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache."""
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                
-                # Check if expired
-                if entry['expires_at'] and datetime.now() > entry['expires_at']:
-                    del self._cache[key]
-                    return None
-                
-                return entry['value']
-            
-            return None
+        return self._get_nowait(key)
     
     async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
         """Set value in cache with optional TTL."""
-        expires_at = None
-        if ttl:
-            expires_at = datetime.now() + timedelta(seconds=ttl)
-        
-        with self._lock:
-            self._cache[key] = {
-                'value': value,
-                'created_at': datetime.now(),
-                'expires_at': expires_at
-            }
+        self._set_nowait(key, value, ttl)
     
     async def setex(self, key: str, ttl: int, value: str) -> None:
         """Set value with expiration time."""
-        await self.set(key, value, ttl)
+        self._set_nowait(key, value, ttl)
     
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+            return self._remove(key) is not None
     
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
-        result = await self.get(key)
-        return result is not None
+        with self._lock:
+            entry = self._cache.get(key)
+            return entry is not None and (entry.expires_at is None or time.monotonic() < entry.expires_at)
     
-    async def clear(self) -> None:
-        """Clear all cache entries."""
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get many values; missing keys come back as None."""
+        return [self._get_nowait(key) for key in keys]
+    
+    async def mset(self, mapping: Dict[str, str], ttl: Optional[int] = None) -> None:
+        """Set many values with the same TTL."""
+        for key, value in mapping.items():
+            self._set_nowait(key, value, ttl)
+    
+    async def tag_keys(self, key: str, tags: List[str], ttl: Optional[int] = None) -> None:
+        """Attach invalidation tags to an existing key."""
+        with self._lock:
+            self._tag_nowait(key, tags)
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key carrying any of the given tags."""
+        return self._invalidate_tags_nowait(tags)
+    
+    def _delete_pattern_nowait(self, pattern: str) -> int:
+        with self._lock:
+            matched = [key for key in self._cache if fnmatch.fnmatchcase(key, pattern)]
+            for key in matched:
+                self._remove(key)
+            return len(matched)
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a glob pattern."""
+        return self._delete_pattern_nowait(pattern)
+    
+    def _clear_nowait(self) -> None:
         with self._lock:
             self._cache.clear()
+            self._expiry_heap.clear()
+            self._tag_index.clear()
+            self._key_tags.clear()
+            self._bytes = 0
     
-    def cleanup_expired(self) -> None:
-        """Remove expired entries."""
-        now = datetime.now()
-        expired_keys = []
-        
+    async def clear(self) -> None:
+        """Clear all cache entries."""
+        self._clear_nowait()
+    
+    def cleanup_expired(self) -> int:
+        """Remove all expired entries; returns how many were reclaimed."""
         with self._lock:
-            for key, entry in self._cache.items():
-                if entry['expires_at'] and now > entry['expires_at']:
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self._cache[key]
+            return self._sweep_expired(time.monotonic())
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self._lock:
+            now = time.monotonic()
             total_entries = len(self._cache)
-            expired_count = 0
-            now = datetime.now()
-            
-            for entry in self._cache.values():
-                if entry['expires_at'] and now > entry['expires_at']:
-                    expired_count += 1
+            expired_count = sum(
+                1 for _, _, key, entry in self._expiry_heap
+                if entry.expires_at <= now and self._cache.get(key) is entry
+            )
+            lookups = self._stats['hits'] + self._stats['misses']
             
             return {
                 'total_entries': total_entries,
                 'expired_entries': expired_count,
                 'active_entries': total_entries - expired_count,
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'evictions': self._stats['evictions'],
+                'expirations': self._stats['expirations'],
+                'bytes': self._bytes,
+                'tags': len(self._tag_index),
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
                 'cache_type': 'in_memory'
             }
 
 
 class RedisCache:
     """
-    Redis cache implementation (placeholder for future Redis integration).
-    This would require redis-py dependency.
+    Redis cache implementation backed by redis.asyncio.
+
+    All instances pointing at the same URL share one connection pool per
+    process, so every worker hits the same cache. Keys are namespaced with
+    ``key_prefix`` so ``clear()`` and pattern deletes never touch data owned
+    by other Redis users (rate limiter, Celery).
+
+    A ``fakeredis://`` URL (or an injected ``client``) runs against an
+    in-process fake server, which keeps tests free of a real Redis.
     """
-    
-    def __init__(self, redis_url: str = None):
-        # For now, fall back to in-memory cache
-        # In production, you would initialize Redis client here:
-        # import redis
-        # self.redis = redis.from_url(redis_url)
-        self._fallback_cache = InMemoryCache()
-        print("Warning: Redis not configured, using in-memory cache fallback")
-    
+
+    _pools: Dict[str, Any] = {}
+
+    def __init__(
+        self,
+        redis_url: str = None,
+        client: Any = None,
+        key_prefix: Optional[str] = None,
+        max_connections: Optional[int] = None,
+    ):
+        self.redis_url = redis_url or getattr(settings, 'REDIS_URL', None) or "redis://localhost:6379/0"
+        self.key_prefix = key_prefix if key_prefix is not None else getattr(settings, 'CACHE_KEY_PREFIX', 'cardinsa:cache:')
+        self._fallback_cache = None
+        self._pooled = False
+
+        if client is not None:
+            self.redis = client
+        elif self.redis_url.startswith("fakeredis://"):
+            import fakeredis.aioredis
+            self.redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        elif aioredis is None:
+            # redis-py not installed: keep the app running on a local cache
+            logger.warning("redis package not installed, using in-memory cache fallback")
+            self._fallback_cache = InMemoryCache()
+            self.redis = None
+        else:
+            self.redis = aioredis.Redis(connection_pool=self._get_pool(self.redis_url, max_connections))
+            self._pooled = True
+
+    @classmethod
+    def _get_pool(cls, redis_url: str, max_connections: Optional[int] = None):
+        """Get (or lazily create) the process-wide connection pool for a URL."""
+        pool = cls._pools.get(redis_url)
+        if pool is None:
+            pool = aioredis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=max_connections or getattr(settings, 'REDIS_MAX_CONNECTIONS', 50),
+                socket_timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 5),
+                socket_connect_timeout=getattr(settings, 'REDIS_SOCKET_CONNECT_TIMEOUT', 5),
+                decode_responses=True,
+            )
+            cls._pools[redis_url] = pool
+        return pool
+
+    def loop_local_copy(self) -> "RedisCache":
+        """
+        Get a copy of this cache on its own connection, for a short-lived event loop.
+        
+        Pooled connections belong to the loop that opened them (the
+        application's), so code running under ``asyncio.run`` elsewhere
+        must not use them. Unpooled instances are returned as is.
+        """
+        if not self._pooled:
+            return self
+        client = aioredis.Redis.from_url(
+            self.redis_url,
+            socket_timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 5),
+            socket_connect_timeout=getattr(settings, 'REDIS_SOCKET_CONNECT_TIMEOUT', 5),
+            decode_responses=True,
+        )
+        return RedisCache(self.redis_url, client=client, key_prefix=self.key_prefix)
+
+    def _k(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
     async def get(self, key: str) -> Optional[str]:
         """Get value from Redis cache."""
-        # return await self.redis.get(key)
-        return await self._fallback_cache.get(key)
-    
+        if self._fallback_cache:
+            return await self._fallback_cache.get(key)
+        return await self.redis.get(self._k(key))
+
     async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
         """Set value in Redis cache."""
-        # if ttl:
-        #     await self.redis.setex(key, ttl, value)
-        # else:
-        #     await self.redis.set(key, value)
-        await self._fallback_cache.set(key, value, ttl)
-    
+        if self._fallback_cache:
+            return await self._fallback_cache.set(key, value, ttl)
+        if ttl:
+            await self.redis.set(self._k(key), value, ex=ttl)
+        else:
+            await self.redis.set(self._k(key), value)
+
     async def setex(self, key: str, ttl: int, value: str) -> None:
         """Set value with expiration time."""
-        # await self.redis.setex(key, ttl, value)
-        await self._fallback_cache.setex(key, ttl, value)
-    
+        await self.set(key, value, ttl)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Fetch many keys in one round trip; missing keys come back as None."""
+        if self._fallback_cache:
+            return await self._fallback_cache.mget(keys)
+        if not keys:
+            return []
+        return await self.redis.mget([self._k(k) for k in keys])
+
+    async def mset(self, mapping: Dict[str, str], ttl: Optional[int] = None) -> None:
+        """Store many keys in one pipelined round trip, each with the same TTL."""
+        if self._fallback_cache:
+            return await self._fallback_cache.mset(mapping, ttl)
+        if not mapping:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self._k(key), value, ex=ttl)
+            await pipe.execute()
+
     async def delete(self, key: str) -> bool:
         """Delete key from Redis cache."""
-        # result = await self.redis.delete(key)
-        # return result > 0
-        return await self._fallback_cache.delete(key)
+        if self._fallback_cache:
+            return await self._fallback_cache.delete(key)
+        return await self.redis.delete(self._k(key)) > 0
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """
+        Delete all keys matching a glob pattern (e.g. ``profile_123_*``).
+        Uses SCAN + UNLINK in batches so large keyspaces never block Redis.
+        """
+        if self._fallback_cache:
+            return await self._fallback_cache.delete_pattern(pattern)
+
+        deleted = 0
+        batch: List[str] = []
+        async for key in self.redis.scan_iter(match=self._k(pattern), count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += await self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.redis.unlink(*batch)
+        return deleted
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}tag:{tag}"
+    
+    async def tag_keys(self, key: str, tags: List[str], ttl: Optional[int] = None) -> None:
+        """
+        Record key membership in one Redis SET per tag. Tag sets expire no
+        earlier than their longest-lived member (EXPIRE NX/GT, Redis >= 7).
+        """
+        if self._fallback_cache:
+            return await self._fallback_cache.tag_keys(key, tags, ttl)
+        if not tags:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), self._k(key))
+                if ttl:
+                    pipe.expire(self._tag_key(tag), ttl, gt=True)
+                    pipe.expire(self._tag_key(tag), ttl, nx=True)
+            await pipe.execute()
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key carrying any of the given tags, plus the tag sets."""
+        if self._fallback_cache:
+            return await self._fallback_cache.invalidate_tags(tags)
+        if not tags:
+            return 0
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        members = await self.redis.sunion(tag_keys)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if members:
+                pipe.unlink(*members)
+            pipe.unlink(*tag_keys)
+            results = await pipe.execute()
+        return results[0] if members else 0
     
     async def exists(self, key: str) -> bool:
         """Check if key exists in Redis cache."""
-        # return await self.redis.exists(key)
-        return await self._fallback_cache.exists(key)
-    
+        if self._fallback_cache:
+            return await self._fallback_cache.exists(key)
+        return await self.redis.exists(self._k(key)) > 0
+
     async def clear(self) -> None:
-        """Clear Redis cache."""
-        # await self.redis.flushdb()
-        await self._fallback_cache.clear()
+        """Clear this cache's namespace (not the whole Redis database)."""
+        if self._fallback_cache:
+            return await self._fallback_cache.clear()
+        await self.delete_pattern("*")
+
+    async def ping(self) -> bool:
+        """Check connectivity to Redis."""
+        if self._fallback_cache:
+            return True
+        return await self.redis.ping()
+
+    async def close(self) -> None:
+        """Release the shared connection pool (call on shutdown)."""
+        pool = self._pools.pop(self.redis_url, None)
+        if pool is not None:
+            await pool.disconnect()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        if self._fallback_cache:
+            return self._fallback_cache.get_stats()
+        pool = self._pools.get(self.redis_url)
+        return {
+            'cache_type': 'redis',
+            'key_prefix': self.key_prefix,
+            'max_connections': getattr(pool, 'max_connections', None),
+        }
 
 
 class NoOpCache:
@@ -182,6 +508,26 @@ class NoOpCache:
         """Always returns False."""
         return False
     
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Always returns all misses."""
+        return [None] * len(keys)
+    
+    async def mset(self, mapping: Dict[str, str], ttl: Optional[int] = None) -> None:
+        """Does nothing."""
+        pass
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        """Always returns 0."""
+        return 0
+    
+    async def tag_keys(self, key: str, tags: List[str], ttl: Optional[int] = None) -> None:
+        """Does nothing."""
+        pass
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Always returns 0."""
+        return 0
+    
     async def clear(self) -> None:
         """Does nothing."""
         pass
@@ -227,11 +573,13 @@ def clear_cache():
 
 
 # Convenience functions for common cache operations
-async def cache_set(key: str, value: Any, ttl: int = 3600) -> None:
-    """Set a value in cache with JSON serialization."""
+async def cache_set(key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> None:
+    """Set a value in cache with JSON serialization, optionally tagged for invalidation."""
     cache = get_cache_client()
     json_value = json.dumps(value, default=str)
     await cache.setex(key, ttl, json_value)
+    if tags:
+        await cache.tag_keys(key, tags, ttl)
 
 
 async def cache_get(key: str, default: Any = None) -> Any:
@@ -254,6 +602,96 @@ async def cache_delete(key: str) -> bool:
     return await cache.delete(key)
 
 
+async def cache_get_many(keys: List[str]) -> Dict[str, Any]:
+    """Get many JSON values in one round trip; only hits are returned."""
+    cache = get_cache_client()
+    values = await cache.mget(keys)
+    found: Dict[str, Any] = {}
+    for key, raw in zip(keys, values):
+        if raw is None:
+            continue
+        try:
+            found[key] = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            continue
+    return found
+
+
+async def cache_set_many(mapping: Dict[str, Any], ttl: int = 3600) -> None:
+    """Set many values with JSON serialization in one round trip."""
+    cache = get_cache_client()
+    await cache.mset({k: json.dumps(v, default=str) for k, v in mapping.items()}, ttl)
+
+
+async def close_cache_client() -> None:
+    """Release cache connections (call on application shutdown)."""
+    global _cache_instance
+    if _cache_instance is not None and hasattr(_cache_instance, 'close'):
+        await _cache_instance.close()
+    _cache_instance = None
+
+
+# =====================================================================
+# DECORATOR SUPPORT
+# =====================================================================
+
+def _stable_default(value: Any) -> Any:
+    """json.dumps fallback that renders common domain types deterministically."""
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    # Last resort; objects without a stable repr should not be cache arguments
+    return repr(value)
+
+
+def make_cache_key(func: Callable, args: tuple, kwargs: dict, key_prefix: str = "") -> str:
+    """
+    Build a deterministic cache key for a call.
+    
+    Arguments are bound to the function signature (so ``f(1)`` and ``f(x=1)``
+    share a key, and defaults are applied), ``self``/``cls`` is dropped, and the
+    result is serialized as sorted JSON. Unlike ``str(args)`` the key is stable
+    across processes and independent of kwarg order or object addresses.
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        call_args = dict(bound.arguments)
+    except (TypeError, ValueError):
+        call_args = {'args': list(args), 'kwargs': kwargs}
+    
+    for receiver in ('self', 'cls'):
+        call_args.pop(receiver, None)
+    
+    payload = json.dumps(call_args, sort_keys=True, default=_stable_default, separators=(',', ':'))
+    digest = hashlib.sha1(f"{func.__module__}.{func.__qualname__}:{payload}".encode()).hexdigest()
+    return f"{key_prefix}:{digest}" if key_prefix else digest
+
+
+class _FlightAbandoned(Exception):
+    """The caller loading a value was cancelled; callers waiting on it retry."""
+
+
+class _Flight:
+    """A call in progress that concurrent callers for the same key wait on."""
+    
+    __slots__ = ('event', 'result', 'error')
+    
+    def __init__(self):
+        self.event = Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
 # Cache decorators for functions
 def cache_result(ttl: int = 3600, key_prefix: str = ""):
     """
@@ -263,39 +701,73 @@ def cache_result(ttl: int = 3600, key_prefix: str = ""):
         ttl: Time to live in seconds
         key_prefix: Prefix for cache key
     """
-    def decorator(func):
-        async def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            import hashlib
-            
-            key_data = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
-            cache_key = f"{key_prefix}:{hashlib.md5(key_data.encode()).hexdigest()}"
-            
-            # Try to get from cache
-            cached_result = await cache_get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Call function and cache result
-            if asyncio.iscoroutinefunction(func):
-                result = await func(*args, **kwargs)
-            else:
-                result = func(*args, **kwargs)
-            
-            await cache_set(cache_key, result, ttl)
-            return result
-        
-        return wrapper
-    return decorator
+    return cache_manager.cached(ttl=ttl, key_prefix=key_prefix)
+
+class CacheRegion:
+    """
+    Named, process-local cache region with a synchronous API.
+    
+    Sync services and repositories (which cannot await the shared client)
+    cache through a region. Regions are bounded InMemoryCache instances and
+    support the same tag and pattern invalidation as the shared backends.
+    """
+    
+    def __init__(self, namespace: str, max_entries: Optional[int] = None):
+        self.namespace = namespace
+        self._store = InMemoryCache(max_entries=max_entries)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._store._get_nowait(key)
+        return default if value is None else value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> None:
+        self._store._set_nowait(key, value, ttl, tags)
+    
+    def delete(self, key: str) -> bool:
+        with self._store._lock:
+            return self._store._remove(key) is not None
+    
+    def delete_pattern(self, pattern: str) -> int:
+        return self._store._delete_pattern_nowait(pattern)
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        return self._store._invalidate_tags_nowait(list(tags))
+    
+    def clear(self) -> None:
+        self._store._clear_nowait()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._store.get_stats(), 'namespace': self.namespace, 'cache_type': 'region'}
+
 
 class CacheManager:
     """
     Cache manager class providing a unified interface for caching operations.
     This provides the cache_manager that your underwriting repository expects.
+    
+    Invalidation is scoped: entries can be tagged (e.g. ``profile:<id>``,
+    ``product_type:<type>``) and dropped with invalidate_tags(), or matched
+    by key pattern with clear_pattern(); clear() remains the big hammer.
     """
     
     def __init__(self):
         self._cache_client = None
+        self._regions: Dict[str, CacheRegion] = {}
+        # Single-flight bookkeeping for the cached() decorator
+        self._async_flights: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._sync_flights: Dict[str, _Flight] = {}
+        self._flight_lock = Lock()
+        # Application event loop, for backend calls made from sync worker threads
+        self._main_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def bind_loop(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Remember the application's event loop (call on startup).
+        
+        Sync code running in worker threads then schedules shared-backend
+        invalidations on that loop, where the Redis pool lives.
+        """
+        self._main_loop = loop or asyncio.get_running_loop()
     
     @property
     def cache(self):
@@ -308,64 +780,222 @@ class CacheManager:
         """Get value from cache with optional default"""
         return await cache_get(key, default)
     
-    async def set(self, key: str, value: Any, ttl: int = 3600):
-        """Set value in cache with TTL"""
-        return await cache_set(key, value, ttl)
+    async def set(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None):
+        """Set value in cache with TTL and optional invalidation tags"""
+        return await cache_set(key, value, ttl, tags)
     
     async def delete(self, key: str):
         """Delete key from cache"""
         return await cache_delete(key)
     
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get many values at once (single MGET on Redis)"""
+        return await cache_get_many(keys)
+    
+    async def set_many(self, mapping: Dict[str, Any], ttl: int = 3600):
+        """Set many values at once (single pipeline on Redis)"""
+        return await cache_set_many(mapping, ttl)
+    
     async def exists(self, key: str):
         """Check if key exists in cache"""
         return await self.cache.exists(key)
     
     async def clear(self):
-        """Clear all cache entries"""
+        """Clear all cache entries (shared backend and local regions)"""
+        for region in self._regions.values():
+            region.clear()
         return await self.cache.clear()
     
-    def invalidate(self, pattern: str = None):
-        """Invalidate cache entries (alias for clear for now)"""
-        return self.clear()
+    def get_cache(self, namespace: str) -> CacheRegion:
+        """Get (or create) the synchronous local cache region for a namespace"""
+        region = self._regions.get(namespace)
+        if region is None:
+            region = self._regions[namespace] = CacheRegion(namespace)
+        return region
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of the tags, in the shared backend and all regions"""
+        removed = sum(region.invalidate_tags(*tags) for region in self._regions.values())
+        return removed + await self.cache.invalidate_tags(list(tags))
+    
+    def clear_pattern(self, pattern: str) -> int:
+        """
+        Drop entries whose key matches a glob pattern.
+        
+        Safe to call from sync code: local regions are purged immediately and
+        the shared backend delete is scheduled on the application's event loop.
+        Returns the number of local entries removed.
+        """
+        removed = sum(region.delete_pattern(pattern) for region in self._regions.values())
+        self._schedule(lambda cache: cache.delete_pattern(pattern))
+        return removed
+    
+    def invalidate_tags_nowait(self, *tags: str) -> int:
+        """Sync-callable variant of invalidate_tags (shared backend delete is scheduled)."""
+        removed = sum(region.invalidate_tags(*tags) for region in self._regions.values())
+        self._schedule(lambda cache: cache.invalidate_tags(list(tags)))
+        return removed
     
-    def cached(self, ttl: int = 3600, key_prefix: str = ""):
+    def _schedule(self, operation: Callable[[Any], Awaitable[Any]]) -> None:
+        """
+        Run ``operation(cache)`` against the shared backend from sync code.
+        
+        On the event loop it becomes a task. Worker threads hand it to the
+        application loop bound with bind_loop() and wait for it, since the
+        Redis pool cannot be used from another loop. Without one (scripts),
+        it runs under asyncio.run on a dedicated connection.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            task = loop.create_task(operation(self.cache))
+            task.add_done_callback(
+                lambda t: t.cancelled() or t.exception() is None
+                or logger.warning(f"Scheduled cache invalidation failed: {t.exception()}")
+            )
+            return
+        
+        main_loop = self._main_loop
+        if main_loop is not None and main_loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(operation(self.cache), main_loop)
+            try:
+                future.result(timeout=getattr(settings, 'REDIS_SOCKET_TIMEOUT', 5))
+            except Exception as e:
+                future.cancel()
+                logger.warning(f"Cache invalidation failed: {e}")
+            return
+        
+        try:
+            asyncio.run(self._run_loop_local(operation))
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed: {e}")
+    
+    async def _run_loop_local(self, operation: Callable[[Any], Awaitable[Any]]) -> Any:
+        cache = self.cache
+        local = cache.loop_local_copy() if isinstance(cache, RedisCache) else cache
+        try:
+            return await operation(local)
+        finally:
+            if local is not cache:
+                await local.redis.aclose()
+    
+    async def invalidate(self, pattern: str = None, tags: Optional[List[str]] = None):
+        """Invalidate by tags and/or key pattern; with neither, clear everything"""
+        if tags:
+            await self.invalidate_tags(*tags)
+        if pattern:
+            for region in self._regions.values():
+                region.delete_pattern(pattern)
+            await self.cache.delete_pattern(pattern)
+        if not tags and not pattern:
+            await self.clear()
+    
+    def cached(self, ttl: int = 3600, key_prefix: str = "", tags: Optional[Callable[..., List[str]]] = None):
         """
         Decorator for caching method results
         
+        Works on both sync and async callables. Async results go to the shared
+        backend (JSON-serialized); sync results are kept in the process-local
+        ``cached`` region, since sync code cannot await the shared client.
+        Either way the result is shared across requests and threads, so cache
+        plain data (IDs, dicts) rather than ORM instances bound to a session.
+        In both cases concurrent misses for the same key are coalesced: one
+        caller loads, the others wait for and share its result (or its
+        exception). If an async loader is cancelled, its waiters retry.
+        
         Args:
             ttl: Time to live in seconds
             key_prefix: Prefix for cache key
+            tags: Optional callable receiving the call's arguments and returning
+                invalidation tags for the cached entry
         
         Usage:
             @cache_manager.cached(ttl=300, key_prefix="active_rules")
-            async def get_active_rules(self):
-                return await self.db.query(...).all()
+            def get_active_rule_ids(self, product_type):
+                return tuple(rule_id for rule_id, in self.db.query(Rule.id)...)
         """
         def decorator(func):
-            async def wrapper(*args, **kwargs):
-                # Generate cache key from function name and arguments
-                import hashlib
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    cache_key = make_cache_key(func, args, kwargs, key_prefix)
+                    
+                    cached_result = await self.get(cache_key)
+                    if cached_result is not None:
+                        return cached_result
+                    
+                    flight_key = (id(asyncio.get_running_loop()), cache_key)
+                    pending = self._async_flights.get(flight_key)
+                    while pending is not None:
+                        try:
+                            return await asyncio.shield(pending)
+                        except _FlightAbandoned:
+                            # The loader was cancelled; join a newer flight or load ourselves
+                            pending = self._async_flights.get(flight_key)
+                    
+                    future = asyncio.get_running_loop().create_future()
+                    self._async_flights[flight_key] = future
+                    try:
+                        result = await func(*args, **kwargs)
+                        if result is not None:
+                            await self.set(cache_key, result, ttl, tags=tags(*args, **kwargs) if tags else None)
+                        future.set_result(result)
+                        return result
+                    except asyncio.CancelledError:
+                        # Cancellation belongs to the leader's caller, not its waiters
+                        future.set_exception(_FlightAbandoned())
+                        future.exception()
+                        raise
+                    except BaseException as e:
+                        future.set_exception(e)
+                        # Mark retrieved so a flight without waiters does not log
+                        future.exception()
+                        raise
+                    finally:
+                        self._async_flights.pop(flight_key, None)
                 
-                # Skip 'self' argument for methods
-                cache_args = args[1:] if args and hasattr(args[0], '__dict__') else args
-                key_data = f"{func.__name__}:{str(cache_args)}:{str(sorted(kwargs.items()))}"
-                cache_key = f"{key_prefix}:{hashlib.md5(key_data.encode()).hexdigest()}" if key_prefix else hashlib.md5(key_data.encode()).hexdigest()
+                return async_wrapper
+            
+            region = self.get_cache("cached")
+            
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                cache_key = make_cache_key(func, args, kwargs, key_prefix)
                 
-                # Try to get from cache
-                cached_result = await self.get(cache_key)
+                cached_result = region.get(cache_key)
                 if cached_result is not None:
                     return cached_result
                 
-                # Call function and cache result
-                if asyncio.iscoroutinefunction(func):
-                    result = await func(*args, **kwargs)
-                else:
-                    result = func(*args, **kwargs)
+                with self._flight_lock:
+                    flight = self._sync_flights.get(cache_key)
+                    leader = flight is None
+                    if leader:
+                        flight = self._sync_flights[cache_key] = _Flight()
                 
-                await self.set(cache_key, result, ttl)
-                return result
+                if not leader:
+                    flight.event.wait()
+                    if flight.error is not None:
+                        raise flight.error
+                    return flight.result
+                
+                try:
+                    result = func(*args, **kwargs)
+                    if result is not None:
+                        region.set(cache_key, result, ttl, tags=tags(*args, **kwargs) if tags else None)
+                    flight.result = result
+                    return result
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._flight_lock:
+                        self._sync_flights.pop(cache_key, None)
+                    flight.event.set()
             
-            return wrapper
+            return sync_wrapper
         return decorator
 
 
@@ -379,8 +1009,14 @@ __all__ = [
     'cache_set',
     'cache_get', 
     'cache_delete',
+    'cache_get_many',
+    'cache_set_many',
+    'close_cache_client',
     'cache_manager',
     'cache_result',
+    'make_cache_key',
+    'CacheManager',
+    'CacheRegion',
     'InMemoryCache',
     'RedisCache',
     'NoOpCache'
@@ -1,12 +1,19 @@
 # app/core/database.py
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import uuid
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Generator, TypeVar
 
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -16,7 +23,9 @@ from sqlalchemy.orm import (
 )
 
 from app.core.settings import settings
+from app.core.executors import run_in_worker_pool
 
+T = TypeVar("T")
 
 # -------------------------------------------------------------------
 # Engine
@@ -67,6 +76,50 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# -------------------------------------------------------------------
+# Async engine + session factory (use get_async_db in async routes)
+# -------------------------------------------------------------------
+def _async_database_url(url: str) -> str:
+    """
+    Derive an async-capable URL from DATABASE_URL.
+    psycopg 3 ships both sync and async drivers under the same dialect name,
+    so plain ``postgresql://`` / ``postgresql+psycopg2://`` URLs are mapped
+    to ``postgresql+psycopg://``; URLs that already name an async driver
+    (psycopg, asyncpg) are used as-is.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql" and parsed.get_driver_name() not in ("psycopg", "asyncpg"):
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed.render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    _get("ASYNC_DATABASE_URL", None) or _async_database_url(settings.DATABASE_URL),
+    echo=_get("DB_ECHO", False),
+    pool_pre_ping=_get("DB_POOL_PRE_PING", True),
+    pool_size=_get("DB_ASYNC_POOL_SIZE", 20),
+    max_overflow=_get("DB_ASYNC_MAX_OVERFLOW", 20),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,   # async sessions cannot lazy-refresh expired attributes
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for a scoped AsyncSession.
+    Queries are awaited on the event loop instead of blocking a worker thread.
+    Usage:
+        async def route(db: AsyncSession = Depends(get_async_db)): ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # -------------------------------------------------------------------
 # Declarative Base with Alembic-friendly naming conventions
 # -------------------------------------------------------------------
@@ -118,13 +171,42 @@ def init_engine() -> None:
         pass
 
 
+async def run_in_session(db: Session, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run blocking work on a sync Session from async code, off the event loop.
+
+    ``func(*args, **kwargs)`` (which must only touch ``db``) runs on the
+    shared worker pool. Calls for the same session are serialized, so
+    coroutines gathered over one request's session never use it from two
+    threads at once.
+    Usage:
+        profile = await run_in_session(db, repository.get_profile, profile_id)
+    """
+    lock = db.info.get("_run_in_session_lock")
+    if lock is None:
+        lock = db.info["_run_in_session_lock"] = asyncio.Lock()
+    async with lock:
+        return await run_in_worker_pool(func, *args, **kwargs)
+
+
+async def dispose_engines() -> None:
+    """Release pooled connections of both engines (call on shutdown)."""
+    await async_engine.dispose()
+    engine.dispose()
+
+
 __all__ = [
     "engine",
     "SessionLocal",
     "get_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
     "Base",
     "UUIDPrimaryKeyMixin",
     "TimestampMixin",
     "SoftDeleteMixin",
     "init_engine",
+    "run_in_session",
+    "dispose_engines",
 ]
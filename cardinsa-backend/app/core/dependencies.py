@@ -4,18 +4,16 @@ from uuid import UUID
 
 from fastapi import Depends, HTTPException, status, Header, Query, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select, or_, and_, literal
-from sqlalchemy.orm import Session
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.settings import settings
-from app.core.database import get_db
-from app.core.security import decode_token, is_token_blacklisted
+from app.core.database import get_async_db
+from app.core.security import decode_token, is_token_blacklisted_async
+from app.core.permission_cache import get_user_permissions, scope_chain
 
 from app.modules.auth.models.user_model import User
 from app.modules.auth.models.role_model import Role
-from app.modules.auth.models.user_role_model import UserRole
-from app.modules.auth.models.permission_model import Permission
-from app.modules.auth.models.role_permission_model import RolePermission
 
 # OAuth2 password flow (token URL must match your auth route)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -56,7 +54,7 @@ class CurrentUser:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     x_device_fingerprint: Optional[str] = Header(None, alias="X-Device-Fingerprint"),
 ) -> CurrentUser:
     """
@@ -66,7 +64,7 @@ async def get_current_user(
 
     Args:
         token: JWT access token from Authorization header
-        db: Database session
+        db: Async database session
         x_device_fingerprint: Device fingerprint from request header
 
     Returns:
@@ -94,7 +92,7 @@ async def get_current_user(
 
     # SECURITY: Check if access token is blacklisted (logout/revocation)
     jti = (payload or {}).get("jti")
-    if jti and is_token_blacklisted(jti, db):
+    if jti and await is_token_blacklisted_async(jti, db):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
@@ -114,9 +112,9 @@ async def get_current_user(
     # Prefer by UUID; fallback to username/email
     user: Optional[User] = None
     try:
-        user = db.get(User, UUID(str(sub)))
+        user = await db.get(User, UUID(str(sub)))
     except Exception:
-        user = db.scalar(
+        user = await db.scalar(
             select(User).where(
                 or_(User.username == str(sub).lower(), User.email == str(sub).lower())
             ).limit(1)
@@ -133,7 +131,7 @@ async def get_current_user(
 
 async def get_optional_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Optional[CurrentUser]:
     """
     Optional dependency to get current user if token provided.
@@ -194,7 +192,7 @@ async def user_has_permission(
     current: CurrentUser,
     resource: str,
     action: str,
-    db: Session
+    db: AsyncSession
 ) -> bool:
     """
     Check if user has permission without raising exception.
@@ -215,24 +213,9 @@ async def user_has_permission(
     if current.has_any(["superadmin"]):
         return True
 
-    role_ids = [r.id for r in current.roles]
-    if not role_ids:
-        return False
-
-    stmt = (
-        select(Permission.id)
-        .join(RolePermission, RolePermission.permission_id == Permission.id)
-        .join(Role, Role.id == RolePermission.role_id)
-        .where(
-            Role.id.in_(role_ids),
-            Role.is_active.is_(True),
-            Permission.is_active.is_(True),
-            or_(Permission.resource == resource, Permission.resource == literal("*")),
-            or_(Permission.action == action, Permission.action == literal("*")),
-        )
-        .limit(1)
-    )
-    return db.scalar(stmt) is not None
+    # In-memory check against the user's cached, resolved grants (wildcards included)
+    permissions = await get_user_permissions(db, current.id)
+    return permissions.allows(resource, action)
 
 
 def require_permission(resource: str, action: str):
@@ -254,34 +237,9 @@ def require_permission(resource: str, action: str):
 
     async def _dep(
         current: CurrentUser = Depends(get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
     ) -> None:
-        # Superrole bypass (e.g., superadmin)
-        if current.has_any(["superadmin"]):
-            return
-
-        role_ids = [r.id for r in current.roles]
-        if not role_ids:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permission"
-            )
-
-        stmt = (
-            select(Permission.id)
-            .join(RolePermission, RolePermission.permission_id == Permission.id)
-            .join(Role, Role.id == RolePermission.role_id)
-            .where(
-                Role.id.in_(role_ids),
-                Role.is_active.is_(True),
-                Permission.is_active.is_(True),
-                # wildcard-friendly checks
-                or_(Permission.resource == resource, Permission.resource == literal("*")),
-                or_(Permission.action == action, Permission.action == literal("*")),
-            )
-            .limit(1)
-        )
-        if db.scalar(stmt) is None:
+        if not await user_has_permission(current, resource, action, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permission"
@@ -337,7 +295,7 @@ async def user_has_permission_scoped(
     resource: str,
     action: str,
     scope: ScopeContext,
-    db: Session
+    db: AsyncSession
 ) -> bool:
     """
     Check if user has scoped permission without raising exception.
@@ -359,63 +317,10 @@ async def user_has_permission_scoped(
     if current.has_any(["superadmin"]):
         return True
     
-    # Build scope conditions
-    scope_conditions = []
-    
-    if scope.unit_id:
-        scope_conditions.append(
-            and_(
-                UserRole.company_id == scope.company_id,
-                UserRole.department_id == scope.department_id,
-                UserRole.unit_id == scope.unit_id
-            )
-        )
-    
-    if scope.department_id:
-        scope_conditions.append(
-            and_(
-                UserRole.company_id == scope.company_id,
-                UserRole.department_id == scope.department_id,
-                UserRole.unit_id.is_(None)
-            )
-        )
-    
-    if scope.company_id:
-        scope_conditions.append(
-            and_(
-                UserRole.company_id == scope.company_id,
-                UserRole.department_id.is_(None),
-                UserRole.unit_id.is_(None)
-            )
-        )
-    
-    # Global permission
-    scope_conditions.append(
-        and_(
-            UserRole.company_id.is_(None),
-            UserRole.department_id.is_(None),
-            UserRole.unit_id.is_(None)
-        )
-    )
-    
-    # Query for permission
-    stmt = (
-        select(Permission.id)
-        .join(RolePermission, RolePermission.permission_id == Permission.id)
-        .join(Role, Role.id == RolePermission.role_id)
-        .join(UserRole, UserRole.role_id == Role.id)
-        .where(
-            UserRole.user_id == current.id,
-            Role.is_active.is_(True),
-            Permission.is_active.is_(True),
-            or_(Permission.resource == resource, Permission.resource == literal("*")),
-            or_(Permission.action == action, Permission.action == literal("*")),
-            or_(*scope_conditions) if scope_conditions else literal(False)
-        )
-        .limit(1)
-    )
-    
-    return db.scalar(stmt) is not None
+    # Assignment scopes that cover the request: unit → department → company → global
+    scopes = scope_chain(scope.company_id, scope.department_id, scope.unit_id)
+    permissions = await get_user_permissions(db, current.id)
+    return permissions.allows_in_scopes(resource, action, scopes)
 
 
 def require_permission_scoped(resource: str, action: str):
@@ -441,84 +346,9 @@ def require_permission_scoped(resource: str, action: str):
     async def _dep(
         scope: ScopeContext = Depends(resolve_scope),
         current: CurrentUser = Depends(get_current_user),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
     ) -> None:
-        # 🔹 superrole bypass (platform owners)
-        if current.has_any(["superadmin"]):
-            return
-
-        # Roles for this user
-        role_ids_subq = (
-            select(Role.id)
-            .join(UserRole, UserRole.role_id == Role.id)
-            .where(UserRole.user_id == current.id, Role.is_active.is_(True))
-        )
-
-        # Build scope predicates: exact → broader → global
-        # 1. Exact match at unit level
-        # 2. Broader match at department level
-        # 3. Broader match at company level
-        # 4. Global permission (no scope restrictions)
-        
-        scope_conditions = []
-        
-        if scope.unit_id:
-            # Unit level permission
-            scope_conditions.append(
-                and_(
-                    UserRole.company_id == scope.company_id,
-                    UserRole.department_id == scope.department_id,
-                    UserRole.unit_id == scope.unit_id
-                )
-            )
-        
-        if scope.department_id:
-            # Department level permission (covers all units in dept)
-            scope_conditions.append(
-                and_(
-                    UserRole.company_id == scope.company_id,
-                    UserRole.department_id == scope.department_id,
-                    UserRole.unit_id.is_(None)
-                )
-            )
-        
-        if scope.company_id:
-            # Company level permission (covers all depts/units in company)
-            scope_conditions.append(
-                and_(
-                    UserRole.company_id == scope.company_id,
-                    UserRole.department_id.is_(None),
-                    UserRole.unit_id.is_(None)
-                )
-            )
-        
-        # Global permission (no scope, applies everywhere)
-        scope_conditions.append(
-            and_(
-                UserRole.company_id.is_(None),
-                UserRole.department_id.is_(None),
-                UserRole.unit_id.is_(None)
-            )
-        )
-
-        # Query for permission with scope
-        stmt = (
-            select(Permission.id)
-            .join(RolePermission, RolePermission.permission_id == Permission.id)
-            .join(Role, Role.id == RolePermission.role_id)
-            .join(UserRole, UserRole.role_id == Role.id)
-            .where(
-                UserRole.user_id == current.id,
-                Role.is_active.is_(True),
-                Permission.is_active.is_(True),
-                or_(Permission.resource == resource, Permission.resource == literal("*")),
-                or_(Permission.action == action, Permission.action == literal("*")),
-                or_(*scope_conditions) if scope_conditions else literal(False)
-            )
-            .limit(1)
-        )
-        
-        if db.scalar(stmt) is None:
+        if not await user_has_permission_scoped(current, resource, action, scope, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permission for this scope"
@@ -0,0 +1,141 @@
+# app/core/executors.py
+
+"""
+Process-wide worker pool.
+
+Services that need to push blocking or CPU-bound work off the event loop
+share one bounded ThreadPoolExecutor instead of creating their own per
+instance, so thread counts do not grow with request traffic.
+
+Password hashing (bcrypt) gets its own, smaller pool: a login storm then
+queues behind PASSWORD_HASH_MAX_WORKERS threads instead of occupying the
+shared pool or blocking the event loop. bcrypt releases the GIL while
+hashing, so threads give real parallelism here.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_worker_pool: Optional[ThreadPoolExecutor] = None
+_worker_pool_lock = Lock()
+
+_password_pool: Optional[ThreadPoolExecutor] = None
+_password_pool_lock = Lock()
+
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """
+    Get the shared worker pool, creating it on first use.
+    
+    Returns:
+        The process-wide ThreadPoolExecutor
+    """
+    global _worker_pool
+    
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                max_workers = getattr(settings, 'WORKER_POOL_MAX_WORKERS', 8)
+                _worker_pool = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="cardinsa-worker"
+                )
+                logger.info(f"Started shared worker pool with {max_workers} workers")
+    
+    return _worker_pool
+
+
+async def run_in_worker_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable on the shared worker pool and await its result.
+    
+    Args:
+        func: Callable to run
+        *args, **kwargs: Arguments passed to the callable
+        
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_worker_pool(), functools.partial(func, *args, **kwargs))
+
+
+def get_password_pool() -> ThreadPoolExecutor:
+    """
+    Get the dedicated password hashing pool, creating it on first use.
+    
+    Returns:
+        The process-wide ThreadPoolExecutor for bcrypt work
+    """
+    global _password_pool
+    
+    if _password_pool is None:
+        with _password_pool_lock:
+            if _password_pool is None:
+                max_workers = getattr(settings, 'PASSWORD_HASH_MAX_WORKERS', 4)
+                _password_pool = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="cardinsa-password"
+                )
+                logger.info(f"Started password hashing pool with {max_workers} workers")
+    
+    return _password_pool
+
+
+async def run_in_password_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a password hash/verify callable on the password pool and await its result.
+    
+    Args:
+        func: Callable to run
+        *args, **kwargs: Arguments passed to the callable
+        
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_pool(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_worker_pool(wait: bool = True) -> None:
+    """Shut the shared worker pool down (call on application shutdown)."""
+    global _worker_pool
+    
+    with _worker_pool_lock:
+        pool, _worker_pool = _worker_pool, None
+    
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Shared worker pool shut down")
+
+
+def shutdown_password_pool(wait: bool = True) -> None:
+    """Shut the password hashing pool down (call on application shutdown)."""
+    global _password_pool
+    
+    with _password_pool_lock:
+        pool, _password_pool = _password_pool, None
+    
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Password hashing pool shut down")
+
+
+__all__ = [
+    'get_worker_pool',
+    'run_in_worker_pool',
+    'shutdown_worker_pool',
+    'get_password_pool',
+    'run_in_password_pool',
+    'shutdown_password_pool',
+]
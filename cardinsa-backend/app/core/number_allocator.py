@@ -0,0 +1,106 @@
+# app/core/number_allocator.py
+
+"""
+Business number allocator.
+
+Quote, application, ... numbers come from one PostgreSQL sequence per
+entity. Each sequence is created with ``INCREMENT BY <block size>``, so a
+single ``nextval`` reserves a whole block of numbers for this process;
+the block is then handed out from memory. Numbers are unique across
+processes without any lookup query, at the cost of gaps (unused parts
+of a block are lost when a process exits) and of numbers not being
+strictly ordered across processes.
+
+Formatting is per entity: a ``str.format`` template that receives
+``seq`` (the allocated integer), ``date`` (current UTC datetime) and any
+fields passed by the caller (e.g. ``product``).
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import column, func, select, table
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_pg_sequences = table("pg_sequences", column("sequencename"), column("increment_by"))
+
+
+@dataclass(frozen=True)
+class NumberFormat:
+    """Sequence and template of one entity's numbers."""
+    sequence: str
+    template: str
+
+
+# Sequences are created by migration b7c2e4a91d3f (INCREMENT BY 100)
+NUMBER_FORMATS: Dict[str, NumberFormat] = {
+    "quotation": NumberFormat("quote_number_seq", "QTE-{date:%Y%m%d}-{seq:08d}"),
+    "underwriting_application": NumberFormat(
+        "underwriting_application_number_seq", "{date:%Y%m%d}-{product}-{seq:06d}"
+    ),
+}
+
+
+class NumberAllocator:
+    """Hands out sequence numbers from per-process reserved blocks."""
+
+    def __init__(self, formats: Optional[Dict[str, NumberFormat]] = None):
+        self.formats = dict(NUMBER_FORMATS if formats is None else formats)
+        self._blocks: Dict[str, Tuple[int, int]] = {}  # sequence -> (next, end exclusive)
+        self._increments: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def next_value(self, db: Session, sequence: str) -> int:
+        """
+        Next integer of ``sequence``, reserving a new block when the current one is used up.
+
+        Args:
+            db: Session used only when a new block must be reserved
+            sequence: PostgreSQL sequence name
+        """
+        with self._lock:
+            next_value, end = self._blocks.get(sequence, (0, 0))
+            if next_value >= end:
+                increment = self._increments.get(sequence)
+                if increment is None:
+                    increment = db.scalar(
+                        select(func.coalesce(func.max(_pg_sequences.c.increment_by), 1)).where(
+                            _pg_sequences.c.sequencename == sequence
+                        )
+                    )
+                    self._increments[sequence] = increment
+                next_value = db.scalar(select(func.nextval(sequence)))
+                end = next_value + increment
+                logger.debug(f"Reserved {sequence} block {next_value}..{end - 1}")
+            self._blocks[sequence] = (next_value + 1, end)
+            return next_value
+
+    def next_number(self, db: Session, entity: str, **fields: Any) -> str:
+        """
+        Allocate and format the next number of ``entity``.
+
+        Args:
+            db: Database session
+            entity: Key in NUMBER_FORMATS
+            **fields: Extra template fields
+
+        Returns:
+            The formatted number
+        """
+        number_format = self.formats[entity]
+        seq = self.next_value(db, number_format.sequence)
+        return number_format.template.format(seq=seq, date=datetime.now(timezone.utc), **fields)
+
+    def reset(self) -> None:
+        """Drop reserved blocks (the rest of each block is skipped)."""
+        with self._lock:
+            self._blocks.clear()
+            self._increments.clear()
+
+
+number_allocator = NumberAllocator()
@@ -0,0 +1,206 @@
+# app/core/permission_cache.py
+
+"""
+Per-user permission cache.
+
+A user's grants are resolved in one query: every (resource, action) pair
+reachable through active roles and active permissions, grouped by the
+scope (company, department, unit) of the role assignment. The result is
+cached per user for PERMISSION_CACHE_TTL_SECONDS, so permission guards
+become set lookups instead of a Permission/RolePermission/Role/UserRole
+join on every request.
+
+Entries live in a process-local cache region. Role assignment changes
+drop the user's entry, role changes drop the entries of the role's users
+and permission changes drop everything; other processes pick changes up
+when the TTL expires.
+"""
+
+import logging
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Iterable, List, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.core.cache import cache_manager
+
+from app.modules.auth.models.role_model import Role
+from app.modules.auth.models.user_role_model import UserRole
+from app.modules.auth.models.permission_model import Permission
+from app.modules.auth.models.role_permission_model import RolePermission
+
+logger = logging.getLogger(__name__)
+
+ScopeKey = Tuple[Any, Any, Any]  # (company_id, department_id, unit_id); None = unscoped
+Grant = Tuple[str, str]  # (resource, action)
+
+GLOBAL_SCOPE: ScopeKey = (None, None, None)
+
+_ALL_TAG = "permissions:all"
+
+# Bumped by every invalidation; a load that raced one is not cached
+_generation = 0
+_generation_lock = Lock()
+
+
+def _cache():
+    return cache_manager.get_cache("permissions")
+
+
+def _user_key(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+def _role_tag(role_id: UUID) -> str:
+    return f"role:{role_id}"
+
+
+class ResolvedPermissions:
+    """Grants of one user, per assignment scope, with wildcard matching."""
+
+    __slots__ = ("scoped", "grants", "role_ids")
+
+    def __init__(self, scoped: Dict[ScopeKey, FrozenSet[Grant]], role_ids: Iterable[UUID] = ()):
+        self.scoped = scoped
+        self.grants: FrozenSet[Grant] = frozenset().union(*scoped.values())
+        self.role_ids: FrozenSet[UUID] = frozenset(role_ids)
+
+    @staticmethod
+    def _matches(grants: FrozenSet[Grant], resource: str, action: str) -> bool:
+        return (
+            (resource, action) in grants
+            or (resource, "*") in grants
+            or ("*", action) in grants
+            or ("*", "*") in grants
+        )
+
+    def allows(self, resource: str, action: str) -> bool:
+        """Whether any of the user's roles grants the permission (any scope)."""
+        return self._matches(self.grants, resource, action)
+
+    def allows_in_scopes(self, resource: str, action: str, scopes: Iterable[ScopeKey]) -> bool:
+        """Whether a role assigned at one of ``scopes`` grants the permission."""
+        for scope in scopes:
+            grants = self.scoped.get(scope)
+            if grants and self._matches(grants, resource, action):
+                return True
+        return False
+
+
+def _as_uuid(value: Any) -> Any:
+    """Normalize scope ids (path params arrive as strings); invalid ids never match."""
+    if value is None or isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return str(value)
+
+
+def scope_chain(company_id: Any, department_id: Any, unit_id: Any) -> List[ScopeKey]:
+    """
+    Assignment scopes that grant access at the requested scope.
+
+    Exact unit → department (all its units) → company (all its
+    departments) → global assignments.
+    """
+    company_id, department_id, unit_id = _as_uuid(company_id), _as_uuid(department_id), _as_uuid(unit_id)
+    scopes: List[ScopeKey] = []
+    if unit_id:
+        scopes.append((company_id, department_id, unit_id))
+    if department_id:
+        scopes.append((company_id, department_id, None))
+    if company_id:
+        scopes.append((company_id, None, None))
+    scopes.append(GLOBAL_SCOPE)
+    return scopes
+
+
+async def _load_user_permissions(db: AsyncSession, user_id: UUID) -> ResolvedPermissions:
+    stmt = (
+        select(
+            UserRole.role_id,
+            UserRole.company_id,
+            UserRole.department_id,
+            UserRole.unit_id,
+            Role.is_active,
+            Permission.resource,
+            Permission.action,
+        )
+        .join(Role, Role.id == UserRole.role_id)
+        .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+        .outerjoin(
+            Permission,
+            and_(Permission.id == RolePermission.permission_id, Permission.is_active.is_(True)),
+        )
+        .where(UserRole.user_id == user_id)
+    )
+
+    scoped: Dict[ScopeKey, Set[Grant]] = {}
+    role_ids: Set[UUID] = set()
+    for role_id, company_id, department_id, unit_id, role_active, resource, action in (await db.execute(stmt)).all():
+        # Inactive roles grant nothing but stay tagged, so reactivating them invalidates
+        role_ids.add(role_id)
+        if role_active and resource is not None and action is not None:
+            scoped.setdefault((company_id, department_id, unit_id), set()).add((resource, action))
+
+    return ResolvedPermissions(
+        {scope: frozenset(grants) for scope, grants in scoped.items()}, role_ids
+    )
+
+
+async def get_user_permissions(db: AsyncSession, user_id: UUID) -> ResolvedPermissions:
+    """
+    Resolved permissions of a user, from the cache or one query.
+
+    Args:
+        db: Async database session
+        user_id: User whose grants are resolved
+
+    Returns:
+        The user's ResolvedPermissions
+    """
+    ttl = getattr(settings, 'PERMISSION_CACHE_TTL_SECONDS', 60)
+    key = _user_key(user_id)
+    if ttl > 0:
+        cached = _cache().get(key)
+        if cached is not None:
+            return cached
+
+    generation = _generation
+    permissions = await _load_user_permissions(db, user_id)
+
+    if ttl > 0:
+        with _generation_lock:
+            if generation == _generation:
+                tags = [_ALL_TAG, key] + [_role_tag(role_id) for role_id in permissions.role_ids]
+                _cache().set(key, permissions, ttl=ttl, tags=tags)
+    return permissions
+
+
+def _bump_generation() -> None:
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+def invalidate_user_permissions(user_id: UUID) -> None:
+    """Drop a user's cached permissions (role assigned or revoked)."""
+    _bump_generation()
+    _cache().delete(_user_key(user_id))
+
+
+def invalidate_role_permissions(role_id: UUID) -> None:
+    """Drop the cached permissions of every user holding a role (role or its grants changed)."""
+    _bump_generation()
+    removed = _cache().invalidate_tags(_role_tag(role_id))
+    logger.debug(f"Invalidated cached permissions of {removed} user(s) for role {role_id}")
+
+
+def invalidate_all_permissions() -> None:
+    """Drop every cached permission set (a permission itself changed)."""
+    _bump_generation()
+    _cache().invalidate_tags(_ALL_TAG)
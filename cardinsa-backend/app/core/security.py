@@ -4,9 +4,12 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.settings import settings
+from app.core.executors import run_in_password_pool
+from app.core.token_blacklist import token_blacklist_cache
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -53,6 +56,36 @@ def hash_password(password: str) -> str:
     return get_password_hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password hashing pool.
+
+    Use from ``async def`` code: bcrypt takes hundreds of milliseconds and
+    would otherwise stall every request on the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await run_in_password_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the password hashing pool (see verify_password_async).
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+    """
+    return await run_in_password_pool(pwd_context.hash, password)
+
+
 def create_token(
     data: Dict[str, Any], 
     secret: str, 
@@ -250,6 +283,9 @@ def is_token_blacklisted(jti: str, db: Session) -> bool:
 
     SECURITY: Prevents reuse of revoked tokens
 
+    Answered from the in-memory blacklist mirror; ``db`` is only used to
+    refresh the mirror when the background sync is not keeping it fresh.
+
     Args:
         jti: JWT ID (jti claim) from token
         db: Database session
@@ -257,14 +293,25 @@ def is_token_blacklisted(jti: str, db: Session) -> bool:
     Returns:
         True if token is blacklisted, False otherwise
     """
-    # Import here to avoid circular dependency
-    from app.modules.auth.models.token_blacklist_model import TokenBlacklist
+    if not token_blacklist_cache.is_fresh():
+        token_blacklist_cache.sync(db)
+    return token_blacklist_cache.contains(jti)
 
-    blacklisted = db.query(TokenBlacklist).filter(
-        TokenBlacklist.token_jti == jti
-    ).first()
 
-    return blacklisted is not None
+async def is_token_blacklisted_async(jti: str, db: AsyncSession) -> bool:
+    """
+    Async variant of is_token_blacklisted for AsyncSession callers.
+
+    Args:
+        jti: JWT ID (jti claim) from token
+        db: Async database session
+
+    Returns:
+        True if token is blacklisted, False otherwise
+    """
+    if not token_blacklist_cache.is_fresh():
+        await token_blacklist_cache.sync_async(db)
+    return token_blacklist_cache.contains(jti)
 
 
 def blacklist_token(
@@ -305,6 +352,9 @@ def blacklist_token(
     db.add(blacklist_entry)
     db.commit()
 
+    # Reject the token in this process right away (others pick it up on sync)
+    token_blacklist_cache.add(jti, expires_at)
+
 
 def cleanup_expired_blacklist_tokens(db: Session) -> int:
     """
@@ -329,4 +379,7 @@ def cleanup_expired_blacklist_tokens(db: Session) -> int:
 
     db.commit()
 
+    # Expired JTIs can no longer be presented; drop them from memory too
+    token_blacklist_cache.prune()
+
     return deleted_count
\ No newline at end of file
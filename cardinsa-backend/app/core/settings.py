@@ -29,6 +29,9 @@ class Settings(BaseSettings):
     jwt_public_key_path: str  = Field("./keys/ed25519-public.pem", validation_alias=AliasChoices("jwt_public_key_path", "JWT_PUBLIC_KEY_PATH"))
 
     PASSWORD_RESET_TOKEN_TTL_MINUTES: int = 30
+    PERMISSION_CACHE_TTL_SECONDS: int = 60  # per-process cache of each user's resolved permissions (0 = off)
+    TOKEN_BLACKLIST_SYNC_SECONDS: float = 5.0  # how often each process refreshes its in-memory token blacklist
+    TOKEN_BLACKLIST_PRUNE_SECONDS: float = 300.0  # how often each process drops expired JTIs from that mirror
 
     # --- Database ---
     # DATABASE_URL must be set in .env file - no default for security
@@ -37,6 +40,27 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 10
     DB_MAX_OVERFLOW: int = 20
     DB_POOL_PRE_PING: bool = True
+    # Async engine (defaults to DATABASE_URL rewritten for the psycopg async driver)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_ASYNC_POOL_SIZE: int = 20
+    DB_ASYNC_MAX_OVERFLOW: int = 20
+
+    # --- Cache / Redis ---
+    CACHE_ENABLED: bool = True
+    CACHE_KEY_PREFIX: str = "cardinsa:cache:"
+    CACHE_MAX_ENTRIES: int = 10000  # per-process InMemoryCache bound (LRU eviction)
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    REDIS_URL: Optional[str] = None  # "redis://localhost:6379/0"; "fakeredis://" for an in-process fake
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5
+
+    # --- Worker pool ---
+    WORKER_POOL_MAX_WORKERS: int = 8  # shared thread pool for blocking/CPU-bound service work
+    PASSWORD_HASH_MAX_WORKERS: int = 4  # concurrent bcrypt hash/verify calls per process
+
+    # --- Analytics ---
+    ANALYTICS_ROLLUP_REFRESH_SECONDS: float = 300  # daily rollup refresh interval (0 = no background refresh)
 
     # --- CORS ---
     CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -0,0 +1,246 @@
+# app/core/token_blacklist.py
+
+"""
+In-memory token blacklist.
+
+Each process mirrors the unexpired rows of the ``token_blacklist`` table:
+a bloom filter answers "definitely not revoked" for almost every token,
+and an exact JTI -> expiry map confirms the rare positives. Revocation
+checks therefore never touch the database.
+
+The mirror is filled by a full load on first use and then refreshed
+incrementally (rows blacklisted since the last sync) by a background
+task every TOKEN_BLACKLIST_SYNC_SECONDS, which also drops expired JTIs
+every TOKEN_BLACKLIST_PRUNE_SECONDS. blacklist_token() updates the
+local mirror immediately, so tokens revoked by this process are rejected
+at once; revocations from other processes are seen after the next sync.
+If the background task is not running (scripts, tests), a stale mirror
+is synced inline by the next check.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows are stamped with the inserting transaction's start time, so commits can
+# land slightly "in the past"; each incremental sync re-reads this window.
+_SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over strings.
+
+    Positions come from double hashing on Python's (per-process salted)
+    string hash, which str objects cache, so a lookup costs no digest.
+    The filter is never shared between processes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1024)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _hashes(self, item: str) -> Tuple[int, int]:
+        h1 = hash(item) & 0xFFFFFFFFFFFFFFFF
+        h2 = (h1 >> 32 | h1 << 32) & 0xFFFFFFFFFFFFFFFF | 1
+        return h1, h2
+
+    def add(self, item: str) -> None:
+        h1, h2 = self._hashes(item)
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % self.size
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = self._hashes(item)
+        bits, size = self._bits, self.size
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+def _epoch(value: datetime) -> float:
+    """Expiry as a POSIX timestamp (naive values are local time, as fromtimestamp() makes them)."""
+    return value.timestamp()
+
+
+class TokenBlacklistCache:
+    """Process-local mirror of the unexpired token blacklist."""
+
+    def __init__(
+        self,
+        sync_interval: Optional[float] = None,
+        capacity: int = 10000,
+        prune_interval: Optional[float] = None
+    ):
+        self.sync_interval = (
+            sync_interval if sync_interval is not None
+            else getattr(settings, 'TOKEN_BLACKLIST_SYNC_SECONDS', 5.0)
+        )
+        self.prune_interval = (
+            prune_interval if prune_interval is not None
+            else getattr(settings, 'TOKEN_BLACKLIST_PRUNE_SECONDS', 300.0)
+        )
+        self._initial_capacity = capacity
+        self._expiries: Dict[str, float] = {}
+        self._bloom = BloomFilter(capacity)
+        self._watermark: Optional[datetime] = None  # newest blacklisted_at seen
+        self._synced_at: Optional[float] = None  # time.monotonic() of the last sync
+        self._pruned_at: Optional[float] = None  # time.monotonic() of the last background prune
+        self._lock = Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lookups and local updates
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def is_fresh(self) -> bool:
+        return self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval
+
+    def contains(self, jti: str) -> bool:
+        """Whether ``jti`` is revoked, per the mirror (no database access)."""
+        if jti not in self._bloom:
+            return False
+        return jti in self._expiries
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Record a revocation locally (called right after it is committed)."""
+        with self._lock:
+            self._add_nolock(jti, _epoch(expires_at))
+
+    def _add_nolock(self, jti: str, expires: float) -> None:
+        if jti in self._expiries:
+            return
+        self._expiries[jti] = expires
+        if len(self._expiries) > self._bloom.capacity:
+            self._rebuild_nolock()
+        else:
+            self._bloom.add(jti)
+
+    def _rebuild_nolock(self) -> None:
+        bloom = BloomFilter(max(self._initial_capacity, 2 * len(self._expiries)))
+        for jti in self._expiries:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop expired JTIs and rebuild the bloom filter; returns the number removed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [jti for jti, expires in self._expiries.items() if expires < now]
+            for jti in expired:
+                del self._expiries[jti]
+            if expired:
+                self._rebuild_nolock()
+        return len(expired)
+
+    def reset(self) -> None:
+        """Forget everything; the next check performs a full load."""
+        with self._lock:
+            self._expiries.clear()
+            self._bloom = BloomFilter(self._initial_capacity)
+            self._watermark = None
+            self._synced_at = None
+
+    # ------------------------------------------------------------------
+    # Database sync
+    # ------------------------------------------------------------------
+
+    def _sync_statement(self):
+        from app.modules.auth.models.token_blacklist_model import TokenBlacklist
+
+        stmt = select(
+            TokenBlacklist.token_jti, TokenBlacklist.expires_at, TokenBlacklist.blacklisted_at
+        )
+        if self._watermark is None:
+            # Full load: everything that can still be presented
+            return stmt.where(TokenBlacklist.expires_at >= datetime.now(timezone.utc))
+        return stmt.where(TokenBlacklist.blacklisted_at >= self._watermark - _SYNC_OVERLAP)
+
+    def _apply(self, rows: Iterable[Tuple[str, datetime, Optional[datetime]]]) -> int:
+        added = 0
+        with self._lock:
+            for jti, expires_at, blacklisted_at in rows:
+                if jti not in self._expiries:
+                    self._add_nolock(jti, _epoch(expires_at))
+                    added += 1
+                if blacklisted_at is not None and (self._watermark is None or blacklisted_at > self._watermark):
+                    self._watermark = blacklisted_at
+            if self._watermark is None:
+                self._watermark = datetime.now(timezone.utc)
+            self._synced_at = time.monotonic()
+        return added
+
+    def sync(self, db: Session) -> int:
+        """Pull rows blacklisted since the last sync (all unexpired rows the first time)."""
+        return self._apply(db.execute(self._sync_statement()).all())
+
+    async def sync_async(self, db: AsyncSession) -> int:
+        """Async variant of sync()."""
+        return self._apply((await db.execute(self._sync_statement())).all())
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    async def _sync_forever(self) -> None:
+        from app.core.database import AsyncSessionLocal
+
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.sync_async(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token blacklist sync failed: {e}")
+            self._prune_if_due()
+            await asyncio.sleep(self.sync_interval)
+
+    def _prune_if_due(self) -> int:
+        """Prune every prune_interval; the first call only starts the clock."""
+        now = time.monotonic()
+        if self._pruned_at is None:
+            self._pruned_at = now
+            return 0
+        if now - self._pruned_at < self.prune_interval:
+            return 0
+        self._pruned_at = now
+        return self.prune()
+
+    def start_background_sync(self) -> None:
+        """Start the periodic refresh on the running event loop (idempotent)."""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync_forever())
+
+    async def stop_background_sync(self) -> None:
+        task, self._sync_task = self._sync_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+token_blacklist_cache = TokenBlacklistCache()
@@ -14,6 +14,12 @@ from app.core.middleware import (
 from app.core.exceptions import install_exception_handlers
 from app.api.v1.router import api_router
 from app.core.error_handlers import add_error_handlers
+from app.core.database import dispose_engines
+from app.core.cache import cache_manager, close_cache_client
+from app.core.executors import shutdown_worker_pool, shutdown_password_pool
+from app.modules.analytics.services.daily_rollup_service import daily_rollup_refresher
+from app.core.token_blacklist import token_blacklist_cache
+from app.modules.pricing.calculations.services.pricing_engine_registry import pricing_engine_registry
 
 # Configure logging first
 configure_logging()
@@ -109,11 +115,22 @@ async def startup_event():
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"API URL: {settings.API_V1_STR}")
     logger.info(f"CORS origins: {cors_origins}")
+    cache_manager.bind_loop()
+    pricing_engine_registry.startup()
+    token_blacklist_cache.start_background_sync()
+    daily_rollup_refresher.start()
 
 # Add shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.APP_NAME}")
+    pricing_engine_registry.shutdown()
+    await token_blacklist_cache.stop_background_sync()
+    await daily_rollup_refresher.stop()
+    shutdown_worker_pool(wait=False)
+    shutdown_password_pool(wait=False)
+    await close_cache_client()
+    await dispose_engines()
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
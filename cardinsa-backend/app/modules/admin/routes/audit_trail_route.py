@@ -7,7 +7,7 @@ SECURITY: Uses SQLAlchemy ORM to prevent SQL injection
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select
 from typing import Optional, List
 import uuid as uuid_lib
 from datetime import datetime, timedelta
@@ -15,14 +15,60 @@ from datetime import datetime, timedelta
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, CurrentUser
 from app.modules.admin.models import AuditLog
+from app.utils.pagination import CountMode, count_rows, keyset_paginate
+from app.utils.streaming_export import ExportFormat, stream_query, streaming_export_response
 
 router = APIRouter(prefix="/audit-trail", tags=["Admin - Audit Trail"])
 
+AUDIT_LOG_EXPORT_COLUMNS = [
+    "id", "entity_type", "entity_id", "action", "performed_by", "changes_made",
+    "ip_address", "user_agent", "request_id", "session_id", "created_at"
+]
+
+
+def _audit_log_query(
+    entity_type: Optional[str],
+    action: Optional[str],
+    user_id: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+):
+    """Audit log select filtered like the /logs parameters."""
+    # Build query using ORM (safe from SQL injection)
+    query = select(AuditLog)
+
+    # Apply filters
+    if entity_type:
+        query = query.where(AuditLog.entity_type == entity_type)
+
+    if action:
+        query = query.where(AuditLog.action == action)
+
+    if user_id:
+        try:
+            user_uuid = uuid_lib.UUID(user_id)
+            query = query.where(AuditLog.performed_by == user_uuid)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid user_id format"
+            )
+
+    if start_date:
+        query = query.where(AuditLog.created_at >= start_date)
+
+    if end_date:
+        query = query.where(AuditLog.created_at <= end_date)
+
+    return query
+
 
 @router.get("/logs", summary="Get Audit Logs")
 async def get_audit_logs(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    estimate_total: bool = False,
     entity_type: Optional[str] = None,
     action: Optional[str] = None,
     user_id: Optional[str] = None,
@@ -40,52 +86,56 @@ async def get_audit_logs(
     - user_id: User who performed the action
     - start_date/end_date: Date range filter
 
+    Results are newest first. Pass the returned next_cursor to get the
+    following page by keyset; ``skip`` (offset paging) still works and is
+    ignored when a cursor is given. ``total`` is an exact count unless
+    estimate_total is set, which uses the planner's estimate instead.
+
     SECURITY: Uses ORM query builder to prevent SQL injection
     """
     try:
-        # Build query using ORM (safe from SQL injection)
-        query = db.query(AuditLog)
-
-        # Apply filters
-        if entity_type:
-            query = query.filter(AuditLog.entity_type == entity_type)
-
-        if action:
-            query = query.filter(AuditLog.action == action)
-
-        if user_id:
-            try:
-                user_uuid = uuid_lib.UUID(user_id)
-                query = query.filter(AuditLog.performed_by == user_uuid)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid user_id format"
-                )
-
-        if start_date:
-            query = query.filter(AuditLog.created_at >= start_date)
-
-        if end_date:
-            query = query.filter(AuditLog.created_at <= end_date)
-
-        # Get total count before pagination
-        total = query.count()
-
-        # Apply ordering and pagination
-        logs = (
-            query
-            .order_by(desc(AuditLog.created_at))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = _audit_log_query(entity_type, action, user_id, start_date, end_date)
+
+        count_mode = CountMode.ESTIMATE if estimate_total else CountMode.EXACT
+
+        if skip and not cursor:
+            # Legacy offset paging
+            total = count_rows(db, query, count_mode)
+            logs = db.scalars(
+                query
+                .order_by(desc(AuditLog.created_at), desc(AuditLog.id))
+                .offset(skip)
+                .limit(limit)
+            ).all()
+            return {
+                "logs": [log.to_dict() for log in logs],
+                "total": total,
+                "total_is_estimate": estimate_total,
+                "skip": skip,
+                "limit": limit,
+                "next_cursor": None,
+                "has_next": skip + len(logs) < total
+            }
+
+        try:
+            logs, meta = keyset_paginate(
+                db, query, AuditLog.created_at, AuditLog.id,
+                size=limit, cursor=cursor, descending=True, count_mode=count_mode
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
 
         return {
             "logs": [log.to_dict() for log in logs],
-            "total": total,
-            "skip": skip,
-            "limit": limit
+            "total": meta.total,
+            "total_is_estimate": meta.total_is_estimate,
+            "skip": 0,
+            "limit": limit,
+            "next_cursor": meta.next_cursor,
+            "has_next": meta.has_next
         }
 
     except HTTPException:
@@ -97,6 +147,32 @@ async def get_audit_logs(
         )
 
 
+@router.get("/logs/export", summary="Export Audit Logs")
+async def export_audit_logs(
+    format: ExportFormat = ExportFormat.CSV,
+    entity_type: Optional[str] = None,
+    action: Optional[str] = None,
+    user_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Stream audit logs matching the /logs filters as CSV or NDJSON,
+    oldest first. Rows are streamed from a server-side cursor, so the
+    export size is not limited by memory.
+    """
+    query = _audit_log_query(entity_type, action, user_id, start_date, end_date)
+    query = query.order_by(AuditLog.created_at, AuditLog.id)
+
+    return streaming_export_response(
+        stream_query(query, lambda log: log.to_dict()),
+        export_format=format,
+        filename="audit_logs",
+        columns=AUDIT_LOG_EXPORT_COLUMNS
+    )
+
+
 @router.get("/entity/{entity_type}/{entity_id}", summary="Get Entity Audit History")
 async def get_entity_audit_history(
     entity_type: str,
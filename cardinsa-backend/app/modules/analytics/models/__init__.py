@@ -0,0 +1,7 @@
+"""
+Analytics Module Models
+"""
+
+from app.modules.analytics.models.daily_rollup_model import DailyRollup, RollupState
+
+__all__ = ["DailyRollup", "RollupState"]
@@ -0,0 +1,82 @@
+"""
+Daily Rollup Models
+Pre-aggregated daily counts and sums behind the analytics dashboards
+"""
+
+from __future__ import annotations
+import datetime as dt
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import String, Date, DateTime, Integer, Numeric, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class DailyRollup(Base):
+    """
+    One aggregate row per source × day × product type × dimension value
+
+    Each source writes an 'all' dimension (value '') carrying its measures
+    plus count-only rows per breakdown dimension (status, channel,
+    risk_level, ...). Unused measures stay 0. Only closed days are stored;
+    today is always aggregated live.
+    """
+    __tablename__ = "analytics_daily_rollups"
+
+    source: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        comment="Rolled-up table (underwriting_applications, quotations, ...)"
+    )
+    day: Mapped[dt.date] = mapped_column(Date, primary_key=True)
+    product_type: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        comment="Product/insurance type ('' when unset)"
+    )
+    dimension: Mapped[str] = mapped_column(String(30), primary_key=True)
+    dimension_value: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        comment="Value of the dimension ('' when unset)"
+    )
+
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Measures (sum/count pairs so averages can be recombined across days)
+    processing_hours_sum: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False, default=0)
+    processing_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sla_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sla_compliant: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    score_sum: Mapped[Decimal] = mapped_column(
+        Numeric(18, 4), nullable=False, default=0,
+        comment="Quality score (applications) or risk score (profiles)"
+    )
+    score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    loading_sum: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False, default=0)
+    loading_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    discount_sum: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False, default=0)
+    discount_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_analytics_daily_rollups_source_dimension_day', 'source', 'dimension', 'day'),
+    )
+
+
+class RollupState(Base):
+    """Refresh progress per rollup source"""
+    __tablename__ = "analytics_rollup_state"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    watermark: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Start of the last refresh; rows changed after it are re-rolled"
+    )
+    rolled_through: Mapped[dt.date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="Last closed day stored in analytics_daily_rollups"
+    )
+    refreshed_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
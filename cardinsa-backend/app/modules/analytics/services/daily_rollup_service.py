@@ -0,0 +1,482 @@
+# app/modules/analytics/services/daily_rollup_service.py
+
+"""
+Daily Rollup Service
+
+Maintains analytics_daily_rollups: per source, closed day, product type
+and dimension value, the row count plus sum/count measure pairs. A
+refresh only re-aggregates days that contain rows changed since the last
+refresh (``coalesce(updated_at, created_at)`` past the watermark) and the
+days that closed since then; every other day is left alone.
+
+Readers combine stored rollups for closed days with a live aggregate of
+the same shape for the days not rolled up yet (today, or a lagging
+refresh), so results stay current. Until a source has been refreshed
+once, ``read`` returns None and callers aggregate live.
+
+Hard deletes and edits that move a row to another day are not seen by
+the incremental refresh; ``refresh(rebuild=True)`` recomputes everything.
+"""
+
+import asyncio
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, literal_column, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.settings import settings
+from app.modules.analytics.models.daily_rollup_model import DailyRollup, RollupState
+from app.modules.underwriting.models.underwriting_application_model import UnderwritingApplication
+from app.modules.underwriting.models.underwriting_profile_model import UnderwritingProfile
+from app.modules.pricing.quotations.models.quotation_model import Quotation
+from app.modules.pricing.profiles.models.quotation_pricing_profile_model import QuotationPricingProfile
+
+logger = get_logger(__name__)
+
+# Rollup sources
+UNDERWRITING_APPLICATIONS = "underwriting_applications"
+UNDERWRITING_PROFILES = "underwriting_profiles"
+QUOTATIONS = "quotations"
+PRICING_PROFILES = "pricing_profiles"
+
+# Dimension carrying each source's measures (value '')
+ALL = "all"
+
+# Rows committed shortly before a refresh may carry an older timestamp
+_CHANGE_OVERLAP = timedelta(minutes=5)
+
+# Serializes refreshes across processes (pg_try_advisory_xact_lock key)
+_REFRESH_LOCK_KEY = 0x726F6C6C7570
+
+DayFilter = Callable[[Any], Any]
+RollupKey = Tuple[str, str, str]  # (product_type, dimension, dimension_value)
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+@dataclass
+class RollupTotals:
+    """Summed rollup measures."""
+    row_count: int = 0
+    processing_hours_sum: float = 0
+    processing_count: int = 0
+    sla_total: int = 0
+    sla_compliant: int = 0
+    score_sum: float = 0
+    score_count: int = 0
+    loading_sum: float = 0
+    loading_count: int = 0
+    discount_sum: float = 0
+    discount_count: int = 0
+
+    def add(self, values: Iterable[Any]) -> "RollupTotals":
+        """Add a row of measure values given in field order."""
+        for f, value in zip(fields(self), values):
+            if value:
+                setattr(self, f.name, getattr(self, f.name) + (float(value) if isinstance(value, Decimal) else value))
+        return self
+
+    def merge(self, other: "RollupTotals") -> "RollupTotals":
+        return self.add(getattr(other, f.name) for f in fields(other))
+
+
+MEASURES = [f.name for f in fields(RollupTotals)]
+
+
+class RollupResult:
+    """Rollup totals of one source over a day range, by product type and dimension value."""
+
+    def __init__(self, rows: Dict[RollupKey, RollupTotals]):
+        self.rows = rows
+
+    def totals(self, dimension: str = ALL, values: Optional[Iterable[str]] = None) -> RollupTotals:
+        """Totals over every product type (and the given dimension values, if any)."""
+        wanted = set(values) if values is not None else None
+        result = RollupTotals()
+        for (_, row_dimension, value), totals in self.rows.items():
+            if row_dimension == dimension and (wanted is None or value in wanted):
+                result.merge(totals)
+        return result
+
+    def counts(self, dimension: str, skip_blank: bool = True) -> Dict[str, int]:
+        """Row counts per dimension value (blank values skipped)."""
+        counts: Dict[str, int] = {}
+        for (_, row_dimension, value), totals in self.rows.items():
+            if row_dimension == dimension and (value or not skip_blank) and totals.row_count:
+                counts[value] = counts.get(value, 0) + totals.row_count
+        return counts
+
+    def counts_by_product(self, dimension: str = ALL) -> Dict[str, int]:
+        """Row counts per product type."""
+        counts: Dict[str, int] = {}
+        for (product_type, row_dimension, _), totals in self.rows.items():
+            if row_dimension == dimension and totals.row_count:
+                counts[product_type] = counts.get(product_type, 0) + totals.row_count
+        return counts
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def _measures(**values: Any) -> List[Any]:
+    """Labelled measure columns in table order; measures not given are 0."""
+    return [values.get(name, literal_column("0")).label(name) for name in MEASURES[1:]]
+
+
+def _dimension_select(day, product, dimension: str, value, *where):
+    """Count-only rows for one breakdown dimension."""
+    value = func.coalesce(value, '')
+    return select(
+        day.label('day'),
+        product.label('product_type'),
+        literal_column(f"'{dimension}'").label('dimension'),
+        value.label('dimension_value'),
+        func.count().label('row_count'),
+        *_measures()
+    ).where(*where).group_by(day, product, value)
+
+
+def _changed_since(model, since: datetime):
+    return func.coalesce(model.updated_at, model.created_at) >= since
+
+
+def _application_facts(day_filter: DayFilter):
+    app = UnderwritingApplication
+    day = func.date(app.submitted_at)
+    product = app.product_type
+    where = [app.archived_at.is_(None), day_filter(day)]
+
+    # NULL unless both timestamps are set; aggregates skip NULLs
+    hours = func.extract('epoch', app.actual_completion_date - app.processing_started_at) / 3600
+    with_sla = and_(hours.isnot(None), app.sla_due_date.isnot(None))
+    quality = func.nullif(app.quality_score, 0)  # zero scores count as unscored
+
+    overall = select(
+        day.label('day'),
+        product.label('product_type'),
+        literal_column(f"'{ALL}'").label('dimension'),
+        literal_column("''").label('dimension_value'),
+        func.count().label('row_count'),
+        *_measures(
+            processing_hours_sum=func.coalesce(func.sum(hours), 0),
+            processing_count=func.count(hours),
+            sla_total=func.count().filter(with_sla),
+            sla_compliant=func.count().filter(
+                and_(with_sla, app.actual_completion_date <= app.sla_due_date)
+            ),
+            score_sum=func.coalesce(func.sum(quality), 0),
+            score_count=func.count(quality),
+        )
+    ).where(*where).group_by(day, product)
+
+    return union_all(
+        overall,
+        _dimension_select(day, product, 'status', app.status, *where),
+        _dimension_select(day, product, 'channel', app.submission_channel, *where),
+    )
+
+
+def _application_changed_days(since: datetime):
+    app = UnderwritingApplication
+    return select(func.date(app.submitted_at)).where(_changed_since(app, since)).distinct()
+
+
+def _profile_facts(day_filter: DayFilter):
+    profile, app = UnderwritingProfile, UnderwritingApplication
+    day = func.date(app.submitted_at)
+    # Zero scores/loadings/discounts count as not set
+    score = func.nullif(profile.risk_score, 0)
+    loading = func.nullif(profile.premium_loading, 0)
+    discount = func.nullif(profile.premium_discount, 0)
+    risk_level = func.coalesce(profile.risk_level, '')
+
+    return select(
+        day.label('day'),
+        app.product_type.label('product_type'),
+        literal_column("'risk_level'").label('dimension'),
+        risk_level.label('dimension_value'),
+        func.count().label('row_count'),
+        *_measures(
+            score_sum=func.coalesce(func.sum(score), 0),
+            score_count=func.count(score),
+            loading_sum=func.coalesce(func.sum(loading), 0),
+            loading_count=func.count(loading),
+            discount_sum=func.coalesce(func.sum(discount), 0),
+            discount_count=func.count(discount),
+        )
+    ).select_from(profile).join(
+        app, profile.application_id == app.id
+    ).where(
+        profile.archived_at.is_(None), day_filter(day)
+    ).group_by(day, app.product_type, risk_level)
+
+
+def _profile_changed_days(since: datetime):
+    profile, app = UnderwritingProfile, UnderwritingApplication
+    return select(func.date(app.submitted_at)).select_from(profile).join(
+        app, profile.application_id == app.id
+    ).where(
+        or_(_changed_since(profile, since), _changed_since(app, since))
+    ).distinct()
+
+
+def _quotation_facts(day_filter: DayFilter):
+    day = func.date(Quotation.created_at)
+    product = func.coalesce(Quotation.product_code, '')
+    locked = case((Quotation.is_locked.is_(True), 'true'), (Quotation.is_locked.is_(False), 'false'))
+    where = [day_filter(day)]
+    return union_all(
+        _dimension_select(day, product, 'status', Quotation.status, *where),
+        _dimension_select(day, product, 'locked', locked, *where),
+    )
+
+
+def _quotation_changed_days(since: datetime):
+    return select(func.date(Quotation.created_at)).where(_changed_since(Quotation, since)).distinct()
+
+
+def _pricing_profile_facts(day_filter: DayFilter):
+    profile = QuotationPricingProfile
+    day = func.date(profile.created_at)
+    return _dimension_select(
+        day, profile.insurance_type, 'status', profile.status,
+        profile.is_deleted.is_(False), day_filter(day)
+    )
+
+
+def _pricing_profile_changed_days(since: datetime):
+    profile = QuotationPricingProfile
+    return select(func.date(profile.created_at)).where(_changed_since(profile, since)).distinct()
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    name: str
+    facts: Callable[[DayFilter], Any]
+    changed_days: Callable[[datetime], Any]
+
+
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    source.name: source for source in (
+        RollupSource(UNDERWRITING_APPLICATIONS, _application_facts, _application_changed_days),
+        RollupSource(UNDERWRITING_PROFILES, _profile_facts, _profile_changed_days),
+        RollupSource(QUOTATIONS, _quotation_facts, _quotation_changed_days),
+        RollupSource(PRICING_PROFILES, _pricing_profile_facts, _pricing_profile_changed_days),
+    )
+}
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class DailyRollupService:
+    """Refreshes and reads analytics_daily_rollups."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---- Refresh ----
+
+    def refresh(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Bring every source's rollups up to yesterday and commit.
+
+        Args:
+            rebuild: Recompute all days instead of only changed ones
+
+        Returns:
+            Number of days re-aggregated per source (empty if another
+            process holds the refresh lock)
+        """
+        if not self.db.scalar(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY))):
+            logger.info("Daily rollup refresh already running elsewhere, skipping")
+            self.db.rollback()
+            return {}
+
+        try:
+            now, today = self.db.execute(select(func.now(), func.current_date())).one()
+            refreshed = {
+                name: self._refresh_source(source, now, today, rebuild)
+                for name, source in ROLLUP_SOURCES.items()
+            }
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        logger.info(f"Refreshed daily rollups: {refreshed}")
+        return refreshed
+
+    def _refresh_source(self, source: RollupSource, now: datetime, today: date, rebuild: bool) -> int:
+        yesterday = today - timedelta(days=1)
+        state = self.db.get(RollupState, source.name)
+
+        if rebuild or state is None:
+            self.db.execute(delete(DailyRollup).where(DailyRollup.source == source.name))
+            self._insert_facts(source, lambda day: day < today)
+            days = self.db.scalar(
+                select(func.count(DailyRollup.day.distinct())).where(DailyRollup.source == source.name)
+            )
+        else:
+            changed = [
+                day for day in self.db.scalars(source.changed_days(state.watermark - _CHANGE_OVERLAP))
+                if day is not None and day <= state.rolled_through
+            ]
+            # Days that closed since the last refresh are rolled up whole
+            first_new_day = state.rolled_through + timedelta(days=1)
+            if not changed and first_new_day > yesterday:
+                days = 0
+            else:
+                def day_filter(day):
+                    return or_(day.in_(changed), day.between(first_new_day, yesterday))
+
+                self.db.execute(
+                    delete(DailyRollup).where(
+                        DailyRollup.source == source.name,
+                        day_filter(DailyRollup.day)
+                    )
+                )
+                self._insert_facts(source, day_filter)
+                days = len(changed) + max(0, (yesterday - first_new_day).days + 1)
+
+        if state is None:
+            state = RollupState(source=source.name)
+            self.db.add(state)
+        state.watermark = now
+        state.rolled_through = yesterday
+        state.refreshed_at = now
+        self.db.flush()
+        return days
+
+    def _insert_facts(self, source: RollupSource, day_filter: DayFilter) -> None:
+        columns = ['day', 'product_type', 'dimension', 'dimension_value'] + MEASURES
+        facts = source.facts(day_filter).subquery()
+        self.db.execute(
+            insert(DailyRollup).from_select(
+                ['source'] + columns,
+                select(literal_column(f"'{source.name}'"), *(facts.c[name] for name in columns))
+            )
+        )
+
+    # ---- Read ----
+
+    def read(
+        self,
+        source: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        product_type: Optional[str] = None
+    ) -> Optional[RollupResult]:
+        """
+        Totals of ``source`` for days in [start_date, end_date] (open ends allowed).
+
+        Returns:
+            RollupResult, or None if the source has never been refreshed
+        """
+        state = self.db.get(RollupState, source)
+        if state is None:
+            return None
+
+        today = self.db.scalar(select(func.current_date()))
+        end_date = today if end_date is None else min(end_date, today)
+        rows: Dict[RollupKey, RollupTotals] = {}
+
+        # Closed days from the rollup table
+        rolled_end = min(end_date, state.rolled_through)
+        if start_date is None or start_date <= rolled_end:
+            query = select(
+                DailyRollup.product_type,
+                DailyRollup.dimension,
+                DailyRollup.dimension_value,
+                *(func.sum(getattr(DailyRollup, measure)) for measure in MEASURES)
+            ).where(
+                DailyRollup.source == source,
+                DailyRollup.day <= rolled_end
+            ).group_by(DailyRollup.product_type, DailyRollup.dimension, DailyRollup.dimension_value)
+            if start_date is not None:
+                query = query.where(DailyRollup.day >= start_date)
+            if product_type:
+                query = query.where(DailyRollup.product_type == product_type)
+            self._collect(rows, self.db.execute(query))
+
+        # Days not rolled up yet (today, or a lagging refresh) live
+        live_start = state.rolled_through + timedelta(days=1)
+        if start_date is not None:
+            live_start = max(live_start, start_date)
+        if live_start <= end_date:
+            facts = ROLLUP_SOURCES[source].facts(lambda day: day.between(live_start, end_date)).subquery()
+            query = select(
+                facts.c.product_type, facts.c.dimension, facts.c.dimension_value,
+                *(facts.c[measure] for measure in MEASURES)
+            )
+            if product_type:
+                query = query.where(facts.c.product_type == product_type)
+            self._collect(rows, self.db.execute(query))
+
+        return RollupResult(rows)
+
+    @staticmethod
+    def _collect(rows: Dict[RollupKey, RollupTotals], result) -> None:
+        for product_type, dimension, value, *measures in result:
+            key = (product_type or '', dimension, value or '')
+            rows.setdefault(key, RollupTotals()).add(measures)
+
+
+# ============================================================================
+# BACKGROUND REFRESH
+# ============================================================================
+
+def refresh_daily_rollups(rebuild: bool = False) -> Dict[str, int]:
+    """Refresh all rollups in a fresh session (for jobs and scripts)."""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return DailyRollupService(db).refresh(rebuild=rebuild)
+    finally:
+        db.close()
+
+
+class DailyRollupRefresher:
+    """Runs refresh_daily_rollups on the worker pool every ANALYTICS_ROLLUP_REFRESH_SECONDS."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def _refresh_forever(self, interval: float) -> None:
+        from app.core.executors import run_in_worker_pool
+
+        while True:
+            try:
+                await run_in_worker_pool(refresh_daily_rollups)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Daily rollup refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start the periodic refresh on the running event loop (no-op when disabled)."""
+        interval = getattr(settings, 'ANALYTICS_ROLLUP_REFRESH_SECONDS', 300)
+        if interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._refresh_forever(interval))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+daily_rollup_refresher = DailyRollupRefresher()
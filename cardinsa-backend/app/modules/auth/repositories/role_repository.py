@@ -3,6 +3,7 @@ from typing import Optional, Sequence
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.modules.auth.models.role_model import Role
+from app.core.permission_cache import invalidate_role_permissions
 
 def get_by_slug(db: Session, slug: str) -> Optional[Role]:
     return db.scalar(select(Role).where(Role.slug == slug.strip().lower()).limit(1))
@@ -14,4 +15,7 @@ def list_roles(db: Session, *, limit: int = 100, offset: int = 0) -> Sequence[Ro
     return list(db.scalars(select(Role).order_by(Role.name).limit(limit).offset(offset)))
 
 def save(db: Session, role: Role) -> Role:
-    db.add(role); db.commit(); db.refresh(role); return role
+    db.add(role); db.commit(); db.refresh(role)
+    # (De)activation must not keep authorizing from cached grants
+    invalidate_role_permissions(role.id)
+    return role
@@ -12,21 +12,24 @@ from typing import Optional
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Body, Header
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import jwt
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.settings import settings
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    verify_password,
+    verify_password_async,
     is_token_blacklisted,
     blacklist_token,
     decode_token
 )
 from app.modules.auth.schemas.auth_schema import TokenResponse, UserInfoResponse
 from app.modules.auth.repositories.user_repository import UserRepository
+from app.modules.auth.models.user_model import User
 from app.core.dependencies import get_current_user, CurrentUser
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -35,7 +38,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/login", response_model=TokenResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     x_device_fingerprint: Optional[str] = Header(None, alias="X-Device-Fingerprint"),
 ):
     """
@@ -66,9 +69,11 @@ async def login(
             detail="Password cannot be empty"
         )
 
-    # Get user from database
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_username_or_email(form_data.username)
+    # Get user from database (async session keeps the event loop free)
+    login_name = form_data.username.strip().lower()
+    user = await db.scalar(
+        select(User).where(or_(User.username == login_name, User.email == login_name)).limit(1)
+    )
 
     if not user:
         raise HTTPException(
@@ -77,10 +82,10 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verify password
-    if not verify_password(form_data.password, user.password_hash):
+    # Verify password (bcrypt runs on the password pool, not the event loop)
+    if not await verify_password_async(form_data.password, user.password_hash):
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
-        db.commit()
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -105,7 +110,7 @@ async def login(
     user.failed_login_attempts = 0
     user.last_login = datetime.utcnow()
     user.account_locked_until = None
-    db.commit()
+    await db.commit()
 
     # SECURITY: Create tokens with JTI for blacklist tracking and device fingerprint binding
     extra_data = {}
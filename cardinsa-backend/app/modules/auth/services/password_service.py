@@ -5,7 +5,12 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.core.security import hash_password, verify_password as _verify
+from app.core.security import (
+    hash_password,
+    verify_password as _verify,
+    get_password_hash_async,
+    verify_password_async,
+)
 from app.modules.auth.models.user_model import User
 
 
@@ -18,6 +23,15 @@ def verify(plain: str, hashed: str) -> bool:
     return _verify(plain, hashed)
 
 
+# Async variants run bcrypt on the password pool; use them from async routes
+async def hash_async(plain: str) -> str:
+    return await get_password_hash_async(plain)
+
+
+async def verify_async(plain: str, hashed: str) -> bool:
+    return await verify_password_async(plain, hashed)
+
+
 # ---- Missing function used by users_route.py ----
 def change_password_for_user(db: Session, user: User, new_password: str) -> None:
     """
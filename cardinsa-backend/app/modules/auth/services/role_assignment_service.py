@@ -9,6 +9,7 @@ from app.modules.org.models.department_model import Department
 from app.modules.org.models.unit_model import Unit
 
 from app.modules.auth.repositories import user_role_repository as repo
+from app.core.permission_cache import invalidate_user_permissions
 
 def _validate_user_and_role(db: Session, user_id: UUID, role_id: UUID | None, role_name: str | None) -> tuple[User, Role]:
     user = db.get(User, user_id)
@@ -61,7 +62,9 @@ def assign_role_scoped(
 ):
     _validate_scope(db, company_id, department_id, unit_id)
     _, role = _validate_user_and_role(db, user_id, role_id, role_name)
-    return repo.assign(db, user_id, role.id, company_id=company_id, department_id=department_id, unit_id=unit_id)
+    assignment = repo.assign(db, user_id, role.id, company_id=company_id, department_id=department_id, unit_id=unit_id)
+    invalidate_user_permissions(user_id)
+    return assignment
 
 def revoke_role_scoped(
     db: Session, *, user_id: UUID, role_id: UUID | None, role_name: str | None,
@@ -69,4 +72,7 @@ def revoke_role_scoped(
 ) -> bool:
     _validate_scope(db, company_id, department_id, unit_id)
     _, role = _validate_user_and_role(db, user_id, role_id, role_name)
-    return repo.revoke(db, user_id, role.id, company_id=company_id, department_id=department_id, unit_id=unit_id)
+    revoked = repo.revoke(db, user_id, role.id, company_id=company_id, department_id=department_id, unit_id=unit_id)
+    if revoked:
+        invalidate_user_permissions(user_id)
+    return revoked
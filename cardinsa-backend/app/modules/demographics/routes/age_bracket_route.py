@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.dependencies import require_permission_scoped
 from app.modules.demographics.schemas.age_bracket_schema import (
     AgeBracketCreate, AgeBracketUpdate, AgeBracketOut
@@ -12,7 +12,7 @@ router = APIRouter()
 
 @router.get("/", response_model=list[AgeBracketOut])
 async def list_age_brackets(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_permission_scoped("demographics", "view"))
 ):
     return await age_bracket_service.get_all_age_brackets(db)
@@ -20,7 +20,7 @@ async def list_age_brackets(
 @router.post("/", response_model=AgeBracketOut)
 async def create_age_bracket(
     data: AgeBracketCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_permission_scoped("demographics", "create"))
 ):
     return await age_bracket_service.create_age_bracket(db, data)
@@ -29,7 +29,7 @@ async def create_age_bracket(
 async def update_age_bracket(
     id: UUID,
     data: AgeBracketUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_permission_scoped("demographics", "update"))
 ):
     db_obj = await age_bracket_service.get_age_bracket(db, id)
@@ -38,7 +38,7 @@ async def update_age_bracket(
 @router.delete("/{id}")
 async def delete_age_bracket(
     id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_permission_scoped("demographics", "delete"))
 ):
     db_obj = await age_bracket_service.get_age_bracket(db, id)
@@ -13,11 +13,9 @@ from app.modules.pricing.benefits.models.benefit_calculation_rule_model import B
 from app.core.exceptions import ValidationError, NotFoundError, BusinessLogicError
 from app.core.base_service import BaseService
 from app.core.logging import get_logger
+from app.modules.pricing.profiles.services.formula_compiler import compile_formula
 from datetime import datetime, date
 import re
-import ast
-import operator
-import math
 
 logger = get_logger(__name__)
 
@@ -28,27 +26,6 @@ class BenefitCalculationRuleService(BaseService):
     def __init__(self, db: Session):
         self.db = db
         self.repository = BenefitCalculationRuleRepository(db)
-        
-        # Safe operators for formula evaluation
-        self.safe_operators = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.Mod: operator.mod,
-            ast.Pow: operator.pow,
-            ast.USub: operator.neg,
-        }
-        
-        # Safe functions for formula evaluation
-        self.safe_functions = {
-            'min': min,
-            'max': max,
-            'abs': abs,
-            'round': round,
-            'floor': math.floor,
-            'ceil': math.ceil,
-        }
     
     async def create_calculation_rule(self, rule_data: Dict[str, Any]) -> BenefitCalculationRule:
         """Create calculation rule with validation"""
@@ -365,11 +342,8 @@ class BenefitCalculationRuleService(BaseService):
     async def _validate_formula(self, formula: str) -> None:
         """Validate calculation formula for safety and syntax"""
         try:
-            # Parse the formula to check syntax
-            tree = ast.parse(formula, mode='eval')
-            
-            # Check for unsafe operations
-            await self._check_formula_safety(tree)
+            # Check syntax and safety (the compiled formula is cached)
+            compile_formula(formula)
             
             # Test with dummy values
             test_context = {
@@ -380,30 +354,9 @@ class BenefitCalculationRuleService(BaseService):
             
             await self._evaluate_formula_safe(formula, test_context)
             
-        except SyntaxError:
-            raise ValidationError("Formula contains syntax errors")
         except Exception as e:
             raise ValidationError(f"Formula validation failed: {str(e)}")
     
-    async def _check_formula_safety(self, node) -> None:
-        """Check if formula contains only safe operations"""
-        if isinstance(node, ast.Expression):
-            await self._check_formula_safety(node.body)
-        elif isinstance(node, ast.BinOp):
-            if type(node.op) not in self.safe_operators:
-                raise ValidationError(f"Unsafe operator: {type(node.op).__name__}")
-            await self._check_formula_safety(node.left)
-            await self._check_formula_safety(node.right)
-        elif isinstance(node, ast.Call):
-            if node.func.id not in self.safe_functions:
-                raise ValidationError(f"Unsafe function: {node.func.id}")
-            for arg in node.args:
-                await self._check_formula_safety(arg)
-        elif isinstance(node, (ast.Name, ast.Num, ast.Constant)):
-            pass  # Safe
-        else:
-            raise ValidationError(f"Unsafe AST node: {type(node).__name__}")
-    
     async def _set_rule_defaults(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Set default values for calculation rule"""
         defaults = {
@@ -470,47 +423,20 @@ class BenefitCalculationRuleService(BaseService):
     async def _evaluate_formula_safe(self, formula: str, context: Dict[str, Any]) -> Union[int, float, Decimal]:
         """Safely evaluate formula with given context"""
         try:
-            # Replace variables in formula with actual values
-            safe_formula = formula
-            for key, value in context.items():
-                safe_formula = safe_formula.replace(key, str(value))
+            compiled = compile_formula(formula)
             
-            # Parse and evaluate safely
-            tree = ast.parse(safe_formula, mode='eval')
-            result = await self._eval_ast_node(tree.body, context)
+            # Unknown variables count as 0; Decimals are evaluated as floats
+            variables = {}
+            for name in compiled.variables:
+                value = context.get(name, 0)
+                variables[name] = float(value) if isinstance(value, Decimal) else value
             
-            return result
+            return compiled(variables)
             
         except Exception as e:
             logger.error(f"Formula evaluation error: {str(e)}")
             raise ValidationError(f"Formula evaluation failed: {str(e)}")
     
-    async def _eval_ast_node(self, node, context: Dict[str, Any]) -> Union[int, float, Decimal]:
-        """Recursively evaluate AST node"""
-        if isinstance(node, ast.Constant):
-            return node.value
-        elif isinstance(node, ast.Num):  # Python < 3.8 compatibility
-            return node.n
-        elif isinstance(node, ast.Name):
-            return context.get(node.id, 0)
-        elif isinstance(node, ast.BinOp):
-            left = await self._eval_ast_node(node.left, context)
-            right = await self._eval_ast_node(node.right, context)
-            op = self.safe_operators[type(node.op)]
-            return op(left, right)
-        elif isinstance(node, ast.UnaryOp):
-            operand = await self._eval_ast_node(node.operand, context)
-            op = self.safe_operators[type(node.op)]
-            return op(operand)
-        elif isinstance(node, ast.Call):
-            func = self.safe_functions[node.func.id]
-            args = []
-            for arg in node.args:
-                args.append(await self._eval_ast_node(arg, context))
-            return func(*args)
-        else:
-            raise ValueError(f"Unsupported AST node: {type(node)}")
-    
     async def _execute_parameter_calculation(self, rule: BenefitCalculationRule,
                                            context: Dict[str, Any]) -> Decimal:
         """Execute parameter-based calculation"""
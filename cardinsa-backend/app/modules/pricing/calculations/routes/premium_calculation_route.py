@@ -23,6 +23,7 @@ from app.modules.pricing.calculations.services.premium_calculation_engine import
     CalculationStatus,
     ComponentType
 )
+from app.modules.pricing.calculations.services.pricing_engine_registry import pricing_engine_registry
 from app.modules.pricing.calculations.services.override_management_service import (
     OverrideManagementService,
     OverrideType,
@@ -115,8 +116,8 @@ class BatchCalculationRequest(BaseModel):
 # =============================================================================
 
 def get_calculation_engine(db: Session = Depends(get_db)) -> PremiumCalculationEngine:
-    """Dependency to get calculation engine."""
-    return PremiumCalculationEngine(db)
+    """Dependency to get calculation engine (a per-request view of the shared engine)."""
+    return pricing_engine_registry.calculation_engine(db)
 
 def get_override_service(db: Session = Depends(get_db)) -> OverrideManagementService:
     """Dependency to get override management service."""
@@ -10,12 +10,14 @@ from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from dataclasses import dataclass, field
+import copy
 import json
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, run_in_session
+from app.core.executors import get_worker_pool
 from app.core.exceptions import ValidationError, BusinessLogicError
 from app.core.logging import get_logger
 
@@ -28,7 +30,6 @@ from app.modules.pricing.profiles.services.rule_orchestration_engine import (
     ConflictResolutionStrategy
 )
 from app.modules.pricing.profiles.services.age_bracket_integration import (
-    AdvancedAgeBracketIntegration,
     DemographicProfile,
     Gender
 )
@@ -36,6 +37,11 @@ from app.modules.pricing.profiles.services.age_bracket_integration import (
 logger = get_logger(__name__)
 
 
+def _to_decimal(value: Any) -> Decimal:
+    """Convert a float/NumPy scalar to Decimal via its shortest repr."""
+    return Decimal(repr(float(value)))
+
+
 class CalculationStatus(str, Enum):
     """Status of premium calculation."""
     PENDING = "PENDING"
@@ -125,15 +131,26 @@ class PremiumCalculationEngine:
     Integrates Steps 4-6 into a unified calculation pipeline.
     """
     
+    # Batches at least this large use the columnar (NumPy) mode by default
+    COLUMNAR_BATCH_THRESHOLD = 64
+    
+    # Pricing component stages, in pipeline order
+    _COMPONENT_STAGES = (
+        ("deductibles", ComponentType.DEDUCTIBLE, "Deductibles"),
+        ("copays", ComponentType.COPAY, "Copays"),
+        ("discounts", ComponentType.DISCOUNT, "Discounts"),
+        ("commission", ComponentType.COMMISSION, "Commission"),
+    )
+    
     def __init__(self, db: Session = None):
         self.db = db or next(get_db())
         
-        # Initialize integrated components
+        # Initialize integrated components (one age bracket configuration for both)
         self.rule_orchestrator = RuleOrchestrationEngine(self.db)
-        self.age_bracket_system = AdvancedAgeBracketIntegration(self.db)
+        self.age_bracket_system = self.rule_orchestrator.age_bracket_system
         
         # Configuration
-        self.thread_pool = ThreadPoolExecutor(max_workers=4)
+        self.thread_pool = get_worker_pool()
         
         # Performance tracking
         self.performance_stats = {
@@ -144,6 +161,19 @@ class PremiumCalculationEngine:
             "component_performance": {}
         }
     
+    def with_session(self, db: Session) -> "PremiumCalculationEngine":
+        """
+        Get a per-request view of this engine bound to another session.
+        
+        The view shares the rule orchestrator's components, the age bracket
+        configuration, the worker pool and performance statistics with this
+        instance, so per-request setup is a couple of shallow copies.
+        """
+        view = copy.copy(self)
+        view.db = db
+        view.rule_orchestrator = self.rule_orchestrator.with_session(db)
+        return view
+    
     # ============================================================================
     # MAIN CALCULATION METHODS
     # ============================================================================
@@ -266,13 +296,29 @@ class PremiumCalculationEngine:
     
     async def batch_calculate(
         self,
-        requests: List[CalculationRequest]
+        requests: List[CalculationRequest],
+        columnar: Optional[bool] = None
     ) -> List[CalculationResult]:
         """
         Process multiple calculation requests in parallel.
         
         Optimizes performance for bulk calculations while maintaining accuracy.
+        
+        Args:
+            requests: Calculation requests
+            columnar: Force (True) or disable (False) the columnar NumPy mode;
+                by default it is used for batches of COLUMNAR_BATCH_THRESHOLD
+                requests or more
+            
+        Returns:
+            One CalculationResult per request, in request order
         """
+        if columnar is None:
+            columnar = len(requests) >= self.COLUMNAR_BATCH_THRESHOLD
+        
+        if columnar and requests:
+            return await self._batch_calculate_columnar(requests)
+        
         try:
             logger.info(f"Starting batch calculation for {len(requests)} requests")
             
@@ -310,6 +356,245 @@ class PremiumCalculationEngine:
             logger.error(f"Batch calculation failed: {str(e)}")
             raise
     
+    # ============================================================================
+    # COLUMNAR BATCH MODE
+    # ============================================================================
+    
+    async def _batch_calculate_columnar(
+        self,
+        requests: List[CalculationRequest]
+    ) -> List[CalculationResult]:
+        """
+        Columnar batch calculation for portfolio repricing.
+        
+        Every pipeline stage is a multiplicative factor, so the batch is priced
+        as a factor matrix (rows x stages) over float64 arrays: profile
+        configuration is loaded once per distinct profile, demographic factors
+        once per distinct demographic profile, and the premium after each stage
+        is a cumulative product. Rules-engine rows still go through the
+        orchestrator individually. Results have the same shape as
+        calculate_premium, with factor-only demographic adjustment details;
+        a failing stage only affects the rows it failed for, exactly as in
+        the per-request pipeline.
+        """
+        start_time = datetime.utcnow()
+        size = len(requests)
+        logger.info(f"Starting columnar batch calculation for {size} requests")
+        
+        results = [
+            CalculationResult(
+                calculation_id=uuid4(),
+                request=request,
+                status=CalculationStatus.IN_PROGRESS,
+                base_premium=request.base_premium,
+                final_premium=request.base_premium,
+                total_factor=Decimal('1.0'),
+                components=[],
+                total_execution_time=0.0,
+                calculation_timestamp=start_time,
+                metadata={"batch_mode": "columnar", "batch_size": size}
+            )
+            for request in requests
+        ]
+        
+        base = np.fromiter((float(r.base_premium) for r in requests), dtype=np.float64, count=size)
+        
+        # Stage columns: profile base, demographic, then the pricing components
+        stage_count = 2 + len(self._COMPONENT_STAGES)
+        factors = np.ones((size, stage_count), dtype=np.float64)
+        applied = np.zeros((size, stage_count), dtype=bool)
+        
+        # Step 1: Profile base, one configuration load per distinct profile
+        profile_configs: Dict[UUID, Dict[str, Any]] = {}
+        profile_factor_by_id: Dict[UUID, float] = {}
+        profile_errors: Dict[UUID, Exception] = {}
+        for profile_id in {r.profile_id for r in requests if r.profile_id}:
+            try:
+                config = await self._load_profile_configuration(profile_id)
+                profile_factor_by_id[profile_id] = float(
+                    Decimal(str(config.get("base_factor", 1.0)))
+                    * Decimal(str(config.get("currency_factor", 1.0)))
+                    * Decimal(str(config.get("risk_factor", 1.0)))
+                )
+                profile_configs[profile_id] = config
+            except Exception as e:
+                logger.error(f"Error applying profile base: {str(e)}")
+                profile_errors[profile_id] = e
+        
+        for i, request in enumerate(requests):
+            if not request.profile_id:
+                continue
+            if request.profile_id in profile_errors:
+                results[i].errors.append(f"Profile base error: {str(profile_errors[request.profile_id])}")
+                continue
+            factors[i, 0] = profile_factor_by_id[request.profile_id]
+            applied[i, 0] = True
+        
+        # Step 2: Demographic pricing, priced once per distinct demographic key
+        demographic_pricing: Dict[Tuple, Any] = {}
+        for i, request in enumerate(requests):
+            profile = request.demographic_profile
+            if not profile:
+                continue
+            key = (
+                profile.age, profile.gender, profile.territory, profile.occupation,
+                tuple(profile.risk_factors or ()), request.benefit_type
+            )
+            if key not in demographic_pricing:
+                try:
+                    demographic_pricing[key] = self.age_bracket_system.calculate_demographic_pricing(
+                        base_premium=Decimal('1'),
+                        demographic_profile=profile,
+                        benefit_type=request.benefit_type,
+                        include_actuarial=True
+                    )
+                except Exception as e:
+                    demographic_pricing[key] = e
+            
+            pricing = demographic_pricing[key]
+            if isinstance(pricing, Exception):
+                results[i].errors.append(f"Demographic pricing error: {str(pricing)}")
+                continue
+            factors[i, 1] = float(pricing["total_factor"])
+            applied[i, 1] = True
+        
+        # Step 3: Pricing components; a bad component stops the rest of its row
+        for i, request in enumerate(requests):
+            try:
+                for column, (config_key, _, _) in enumerate(self._COMPONENT_STAGES, start=2):
+                    if config_key in request.pricing_components:
+                        config = request.pricing_components[config_key]
+                        factors[i, column] = float(Decimal(str(config.get("factor", 1.0))))
+                        applied[i, column] = True
+            except Exception as e:
+                logger.error(f"Error applying pricing components: {str(e)}")
+                results[i].errors.append(f"Pricing components error: {str(e)}")
+        
+        outputs = base[:, None] * np.cumprod(factors, axis=1)
+        inputs = np.concatenate((base[:, None], outputs[:, :-1]), axis=1)
+        
+        failed = set()
+        for i, result in enumerate(results):
+            try:
+                self._add_columnar_components(
+                    result, requests[i], inputs[i], outputs[i], factors[i], applied[i],
+                    profile_configs, demographic_pricing
+                )
+                result.final_premium = _to_decimal(outputs[i, -1])
+            except Exception as e:
+                self._fail_columnar_row(result, e)
+                failed.add(i)
+        
+        # Step 4: Advanced rules engine (per request; rules see the running premium)
+        rule_rows = [i for i, r in enumerate(requests) if r.rule_ids and i not in failed]
+        if rule_rows:
+            await asyncio.gather(*(self._apply_rules_engine(results[i]) for i in rule_rows))
+        
+        # Step 5: Finalize
+        final = np.fromiter((float(r.final_premium) for r in results), dtype=np.float64, count=size)
+        safe_base = np.where(base > 0, base, 1.0)
+        total_factor = np.where(base > 0, final / safe_base, 1.0)
+        negative = final < 0
+        high_factor = total_factor > 10
+        
+        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        per_row_time = execution_time / size
+        
+        for i, result in enumerate(results):
+            result.total_execution_time = per_row_time
+            if i in failed:
+                continue
+            if requests[i].base_premium > 0:
+                result.total_factor = result.final_premium / requests[i].base_premium
+            result.final_premium = result.final_premium.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            if negative[i]:
+                result.warnings.append("Final premium is negative - review calculation logic")
+            if high_factor[i]:
+                result.warnings.append("Total adjustment factor is very high - review for accuracy")
+            
+            self._add_audit_entry(result, "CALCULATION_FINALIZED", {
+                "final_premium": float(result.final_premium),
+                "total_factor": float(total_factor[i]),
+                "components_count": len(result.components),
+                "batch_mode": "columnar"
+            })
+            result.status = CalculationStatus.COMPLETED
+            self._update_performance_stats(result)
+        
+        logger.info(
+            f"Columnar batch calculation completed: {size - len(failed)}/{size} successful "
+            f"in {execution_time:.3f}s"
+        )
+        return results
+    
+    def _fail_columnar_row(self, result: CalculationResult, error: Exception):
+        """Mark one columnar row failed the way calculate_premium does."""
+        logger.error(f"Premium calculation {result.calculation_id} failed: {str(error)}")
+        result.status = CalculationStatus.FAILED
+        result.errors.append(str(error))
+        self._add_audit_entry(result, "CALCULATION_FAILED", {
+            "error": str(error),
+            "batch_mode": "columnar"
+        })
+    
+    def _add_columnar_components(
+        self,
+        result: CalculationResult,
+        request: CalculationRequest,
+        inputs: Any,
+        outputs: Any,
+        factors: Any,
+        applied: Any,
+        profile_configs: Dict[UUID, Dict[str, Any]],
+        demographic_pricing: Dict[Tuple, Any]
+    ):
+        """Materialize the CalculationComponent records for one columnar row."""
+        def add(column: int, component_type: ComponentType, name: str, details: Dict[str, Any]):
+            result.components.append(CalculationComponent(
+                component_type=component_type,
+                component_name=name,
+                input_value=_to_decimal(inputs[column]),
+                output_value=_to_decimal(outputs[column]),
+                factor=_to_decimal(factors[column]),
+                execution_order=len(result.components) + 1,
+                execution_time=0.0,
+                details=details
+            ))
+        
+        if applied[0]:
+            config = profile_configs[request.profile_id]
+            add(0, ComponentType.PROFILE_BASE, f"Profile: {config.get('name', 'Unknown')}", {
+                "profile_id": str(request.profile_id),
+                "base_factor": float(config.get("base_factor", 1.0)),
+                "currency_factor": float(config.get("currency_factor", 1.0)),
+                "risk_factor": float(config.get("risk_factor", 1.0))
+            })
+        elif not request.profile_id:
+            add(0, ComponentType.PROFILE_BASE, "Base Premium", {"source": "direct_input"})
+        
+        if applied[1]:
+            profile = request.demographic_profile
+            pricing = demographic_pricing[(
+                profile.age, profile.gender, profile.territory, profile.occupation,
+                tuple(profile.risk_factors or ()), request.benefit_type
+            )]
+            add(1, ComponentType.DEMOGRAPHIC, "Demographic Pricing", {
+                "demographic_profile": {
+                    "age": profile.age,
+                    "gender": profile.gender.value,
+                    "territory": profile.territory
+                },
+                "adjustments": [
+                    {key: adj[key] for key in ("type", "factor", "description", "source")}
+                    for adj in pricing.get("adjustments", [])
+                ],
+                "age_bracket": pricing.get("age_bracket", {})
+            })
+        
+        for column, (config_key, component_type, name) in enumerate(self._COMPONENT_STAGES, start=2):
+            if applied[column]:
+                add(column, component_type, name, request.pricing_components[config_key])
+    
     # ============================================================================
     # COMPONENT APPLICATION METHODS
     # ============================================================================
@@ -479,7 +764,8 @@ class PremiumCalculationEngine:
                 input_data=rules_input_data,
                 demographic_profile=result.request.demographic_profile,
                 base_premium=result.final_premium,
-                benefit_type=result.request.benefit_type
+                benefit_type=result.request.benefit_type,
+                profile_id=result.request.profile_id
             )
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
@@ -702,12 +988,10 @@ class PremiumCalculationEngine:
         }
     
     async def _get_profile_rule_ids(self, profile_id: UUID) -> List[UUID]:
-        """Get rule IDs associated with a pricing profile."""
-        # Placeholder implementation - would query database
-        return [
-            UUID('12345678-1234-5678-9abc-123456789012'),
-            UUID('87654321-4321-8765-cba9-210987654321')
-        ]
+        """Get rule IDs associated with a pricing profile, in execution order."""
+        return await run_in_session(
+            self.db, self.rule_orchestrator.rule_loader.get_profile_rule_ids, self.db, profile_id
+        )
     
     def get_performance_statistics(self) -> Dict[str, Any]:
         """Get current performance statistics."""
@@ -715,13 +999,15 @@ class PremiumCalculationEngine:
     
     def clear_performance_statistics(self):
         """Clear performance statistics."""
-        self.performance_stats = {
+        # In place: per-request views share this dict
+        self.performance_stats.clear()
+        self.performance_stats.update({
             "total_calculations": 0,
             "successful_calculations": 0,
             "failed_calculations": 0,
             "average_execution_time": 0.0,
             "component_performance": {}
-        }
+        })
 
 
 # ============================================================================
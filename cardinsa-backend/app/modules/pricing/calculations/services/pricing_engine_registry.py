@@ -0,0 +1,75 @@
+# app/modules/pricing/calculations/services/pricing_engine_registry.py
+"""
+Pricing Engine Registry
+Process-wide, lifecycle-managed instances of the pricing engines
+"""
+
+from typing import Optional
+from threading import Lock
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.modules.pricing.calculations.services.premium_calculation_engine import PremiumCalculationEngine
+from app.modules.pricing.profiles.services.rule_orchestration_engine import RuleOrchestrationEngine
+
+logger = get_logger(__name__)
+
+
+class PricingEngineRegistry:
+    """
+    Holds one PremiumCalculationEngine per process.
+
+    Building an engine wires up the rule orchestrator, logic engine,
+    dependency manager and age bracket configuration; doing that per request
+    made setup cost scale with traffic. The registry builds them once at
+    startup and hands out cheap per-request views bound to the request's
+    session (see ``with_session``). The shared instances hold no session of
+    their own: the one used to build them is closed straight away. Blocking
+    work runs on the shared worker pool from ``app.core.executors``.
+    """
+
+    def __init__(self):
+        self._engine: Optional[PremiumCalculationEngine] = None
+        self._lock = Lock()
+
+    @property
+    def is_started(self) -> bool:
+        return self._engine is not None
+
+    def startup(self) -> None:
+        """Build the shared engines (idempotent)."""
+        with self._lock:
+            if self._engine is not None:
+                return
+            # Construction needs a session; request views bind their own
+            with SessionLocal() as db:
+                self._engine = PremiumCalculationEngine(db)
+            logger.info("Pricing engine registry started")
+
+    def shutdown(self) -> None:
+        """Release the shared engines."""
+        with self._lock:
+            engine, self._engine = self._engine, None
+
+        if engine is not None:
+            logger.info("Pricing engine registry shut down")
+
+    def _shared_engine(self) -> PremiumCalculationEngine:
+        if self._engine is None:
+            # Scripts and tests may skip the application startup hook
+            self.startup()
+        return self._engine
+
+    def calculation_engine(self, db: Session) -> PremiumCalculationEngine:
+        """Per-request PremiumCalculationEngine bound to ``db``."""
+        return self._shared_engine().with_session(db)
+
+    def orchestration_engine(self, db: Session) -> RuleOrchestrationEngine:
+        """Per-request RuleOrchestrationEngine bound to ``db``."""
+        return self._shared_engine().rule_orchestrator.with_session(db)
+
+
+# Global registry instance
+pricing_engine_registry = PricingEngineRegistry()
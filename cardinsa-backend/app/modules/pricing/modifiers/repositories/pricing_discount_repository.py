@@ -462,51 +462,41 @@ class PricingDiscountRepository(BaseRepository):
     def get_discount_statistics(self) -> Dict[str, Any]:
         """Get comprehensive statistics about discounts."""
         try:
-            # Total counts
-            total_count = self.count()
-            active_count = self.count({'is_active': True})
-            promotional_count = self.count({'is_promotional': True, 'is_active': True})
-            
-            # Count by discount type
-            type_query = select(
-                PricingDiscount.discount_type,
-                func.count(PricingDiscount.id).label('count')
-            ).where(
-                PricingDiscount.is_active == True
-            ).group_by(PricingDiscount.discount_type)
-            
-            type_counts = {}
-            for row in self.db.execute(type_query):
-                type_counts[row.discount_type.value if row.discount_type else 'unknown'] = row.count
-            
-            # Count by discount scope
-            scope_query = select(
-                PricingDiscount.discount_scope,
-                func.count(PricingDiscount.id).label('count')
-            ).where(
-                PricingDiscount.is_active == True
-            ).group_by(PricingDiscount.discount_scope)
-            
-            scope_counts = {}
-            for row in self.db.execute(scope_query):
-                scope_counts[row.discount_scope.value if row.discount_scope else 'unknown'] = row.count
-            
-            # Usage statistics
-            usage_query = select(
-                func.sum(PricingDiscount.current_use_count).label('total_uses'),
-                func.avg(PricingDiscount.current_use_count).label('avg_uses'),
-                func.max(PricingDiscount.current_use_count).label('max_uses')
-            ).where(
-                and_(
-                    PricingDiscount.is_active == True,
-                    PricingDiscount.current_use_count.is_not(None)
-                )
+            active = PricingDiscount.is_active == True
+            used = and_(active, PricingDiscount.current_use_count.is_not(None))
+            
+            # Totals, type/scope breakdowns and usage in one query
+            stats = self.grouped_aggregates(
+                dimensions={'type': PricingDiscount.discount_type, 'scope': PricingDiscount.discount_scope},
+                aggregates={
+                    'count': func.count(),
+                    'active': func.count().filter(active),
+                    'promotional': func.count().filter(and_(active, PricingDiscount.is_promotional == True)),
+                    'stackable': func.count().filter(and_(active, PricingDiscount.is_stackable == True)),
+                    'total_uses': func.sum(PricingDiscount.current_use_count).filter(used),
+                    'avg_uses': func.avg(PricingDiscount.current_use_count).filter(used),
+                    'max_uses': func.max(PricingDiscount.current_use_count).filter(used),
+                }
             )
             
-            usage_stats = self.db.execute(usage_query).first()
+            total_count = stats.total('count')
+            active_count = stats.total('active')
+            promotional_count = stats.total('promotional')
+            
+            # Breakdowns count active discounts only
+            type_counts = {
+                discount_type or 'unknown': count
+                for discount_type, count in stats.counts('type', 'active', skip_empty=True).items()
+            }
+            scope_counts = {
+                scope or 'unknown': count
+                for scope, count in stats.counts('scope', 'active', skip_empty=True).items()
+            }
+            
+            usage_stats = stats.totals
             
             # Stackability analysis
-            stackable_count = self.count({'is_stackable': True, 'is_active': True})
+            stackable_count = stats.total('stackable')
             non_stackable_count = active_count - stackable_count
             
             return {
@@ -517,9 +507,9 @@ class PricingDiscountRepository(BaseRepository):
                 'by_discount_type': type_counts,
                 'by_discount_scope': scope_counts,
                 'usage_statistics': {
-                    'total_uses': int(usage_stats.total_uses) if usage_stats.total_uses else 0,
-                    'average_uses': float(usage_stats.avg_uses) if usage_stats.avg_uses else 0,
-                    'max_uses': int(usage_stats.max_uses) if usage_stats.max_uses else 0
+                    'total_uses': int(usage_stats['total_uses']) if usage_stats['total_uses'] else 0,
+                    'average_uses': float(usage_stats['avg_uses']) if usage_stats['avg_uses'] else 0,
+                    'max_uses': int(usage_stats['max_uses']) if usage_stats['max_uses'] else 0
                 },
                 'stackability': {
                     'stackable_discounts': stackable_count,
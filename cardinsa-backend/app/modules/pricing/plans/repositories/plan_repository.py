@@ -21,7 +21,9 @@ from app.modules.pricing.plans.models.plan_territory_model import PlanTerritory
 from app.modules.pricing.plans.models.plan_coverage_link_model import PlanCoverageLink
 from app.modules.pricing.plans.models.plan_exclusion_model import PlanExclusion
 from app.modules.pricing.plans.models.plan_eligibility_rule_model import PlanEligibilityRule
+from app.modules.pricing.benefits.models.plan_benefit_schedule_model import PlanBenefitSchedule
 
+from app.core.base_repository import grouped_aggregates
 from app.core.exceptions import DatabaseOperationError, EntityNotFoundError
 import logging
 
@@ -692,48 +694,39 @@ class PlanRepository:
             Statistics dictionary
         """
         try:
-            query = self.db.query(Plan).filter(Plan.archived_at.is_(None))
+            where = [Plan.archived_at.is_(None)]
             
             if company_id:
-                query = query.filter(Plan.company_id == company_id)
+                where.append(Plan.company_id == company_id)
             
             if product_id:
-                query = query.filter(Plan.product_id == product_id)
-            
-            # Total plans
-            total = query.count()
-            
-            # Active plans
-            active = query.filter(Plan.is_active == True).count()
-            
-            # By status
-            status_counts = {}
-            for status in PlanStatus:
-                count = query.filter(Plan.status == status.value).count()
-                status_counts[status.value] = count
-            
-            # By type
-            type_counts = {}
-            for plan_type in PlanType:
-                count = query.filter(Plan.plan_type == plan_type.value).count()
-                type_counts[plan_type.value] = count
-            
-            # Premium statistics
-            premium_stats = self.db.query(
-                func.min(Plan.premium_amount).label('min'),
-                func.max(Plan.premium_amount).label('max'),
-                func.avg(Plan.premium_amount).label('avg')
-            ).filter(
-                Plan.archived_at.is_(None)
+                where.append(Plan.product_id == product_id)
+            
+            # Totals, status/type breakdowns and premium range in one query
+            stats = grouped_aggregates(
+                self.db,
+                Plan,
+                dimensions={'status': Plan.status, 'type': Plan.plan_type},
+                aggregates={
+                    'count': func.count(),
+                    'active': func.count().filter(Plan.is_active == True),
+                    'min_premium': func.min(Plan.premium_amount),
+                    'max_premium': func.max(Plan.premium_amount),
+                    'avg_premium': func.avg(Plan.premium_amount),
+                },
+                where=where
             )
             
-            if company_id:
-                premium_stats = premium_stats.filter(Plan.company_id == company_id)
+            total = stats.total('count')
+            active = stats.total('active')
             
-            if product_id:
-                premium_stats = premium_stats.filter(Plan.product_id == product_id)
+            by_status = stats.counts('status')
+            status_counts = {status.value: by_status.get(status.value, 0) for status in PlanStatus}
             
-            premium_result = premium_stats.first()
+            by_type = stats.counts('type')
+            type_counts = {plan_type.value: by_type.get(plan_type.value, 0) for plan_type in PlanType}
+            
+            premium_result = stats.totals
             
             return {
                 'total_plans': total,
@@ -742,9 +735,9 @@ class PlanRepository:
                 'by_status': status_counts,
                 'by_type': type_counts,
                 'premium_statistics': {
-                    'minimum': float(premium_result.min) if premium_result.min else 0,
-                    'maximum': float(premium_result.max) if premium_result.max else 0,
-                    'average': float(premium_result.avg) if premium_result.avg else 0
+                    'minimum': float(premium_result['min_premium']) if premium_result['min_premium'] else 0,
+                    'maximum': float(premium_result['max_premium']) if premium_result['max_premium'] else 0,
+                    'average': float(premium_result['avg_premium']) if premium_result['avg_premium'] else 0
                 }
             }
             
@@ -762,30 +755,41 @@ class PlanRepository:
         Returns:
             List of plan comparison data
         """
-        plans = self.db.query(Plan).filter(
-            Plan.id.in_(plan_ids),
-            Plan.archived_at.is_(None)
-        ).options(
-            selectinload(Plan.coverage_links),
-            selectinload(Plan.benefit_schedules),
-            selectinload(Plan.exclusions)
+        def related_count(model):
+            return (
+                select(func.count())
+                .select_from(model)
+                .where(model.plan_id == Plan.id)
+                .correlate(Plan)
+                .scalar_subquery()
+            )
+        
+        # Counts come from subqueries; the related rows are never loaded
+        rows = self.db.execute(
+            select(
+                Plan.id,
+                Plan.name,
+                Plan.plan_type,
+                Plan.plan_tier,
+                Plan.premium_amount,
+                Plan.coverage_period_months,
+                related_count(PlanCoverageLink).label('coverage_count'),
+                related_count(PlanBenefitSchedule).label('benefit_count'),
+                related_count(PlanExclusion).label('exclusion_count'),
+                Plan.waiting_periods,
+                Plan.minimum_age,
+                Plan.maximum_issue_age
+            ).where(
+                Plan.id.in_(plan_ids),
+                Plan.archived_at.is_(None)
+            )
         ).all()
         
         comparison = []
-        for plan in plans:
-            comparison.append({
-                'id': str(plan.id),
-                'name': plan.name,
-                'plan_type': plan.plan_type,
-                'plan_tier': plan.plan_tier,
-                'premium_amount': float(plan.premium_amount),
-                'coverage_period_months': plan.coverage_period_months,
-                'coverage_count': len(plan.coverage_links),
-                'benefit_count': len(plan.benefit_schedules),
-                'exclusion_count': len(plan.exclusions),
-                'waiting_periods': plan.waiting_periods,
-                'minimum_age': plan.minimum_age,
-                'maximum_issue_age': plan.maximum_issue_age
-            })
+        for row in rows:
+            plan_data = dict(row._mapping)
+            plan_data['id'] = str(row.id)
+            plan_data['premium_amount'] = float(row.premium_amount)
+            comparison.append(plan_data)
         
         return comparison
\ No newline at end of file
@@ -7,20 +7,23 @@ Data access layer for Actuarial Table entities.
 Handles all database operations for actuarial data management.
 """
 
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterable, Mapping, Tuple
 from uuid import UUID
 from datetime import datetime, date
 from decimal import Decimal
 import json
 import csv
 import io
+import time
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, select
+from sqlalchemy import and_, or_, func, select, true, cast, literal, Integer, Numeric
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, array
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.modules.pricing.product.models.actuarial_table_model import ActuarialTable
 from app.modules.pricing.product.schemas.actuarial_table_schema import (
     ActuarialTableCreate,
+    ActuarialTableImportMetadata,
     ActuarialTableUpdate,
     ActuarialTableFilter,
     ActuarialCalculationRequest,
@@ -31,7 +34,18 @@ from app.modules.pricing.product.schemas.actuarial_table_schema import (
     Gender,
     SmokingStatus
 )
+from app.modules.pricing.product.services.actuarial_rate_index import (
+    ActuarialRateIndex,
+    index_for_table,
+    rate_column_key
+)
 from app.core.database import get_db
+from app.core.bulk_import import (
+    BulkImportResult,
+    ProgressCallback,
+    StagingImport,
+    iter_csv_records
+)
 from fastapi import HTTPException, status
 import logging
 
@@ -558,9 +572,32 @@ def calculate_actuarial_value(
             f"Actuarial table with ID {calculation_request.table_id} not found"
         )
     
-    # Find the appropriate rate from table data
+    return calculate_actuarial_value_for_table(table, calculation_request)
+
+
+def calculate_actuarial_value_for_table(
+    table: ActuarialTable,
+    calculation_request: ActuarialCalculationRequest
+) -> Dict[str, Any]:
+    """
+    Perform actuarial calculations against an already loaded table
+    
+    Lets batch callers load each table once and price many requests on it.
+    
+    Args:
+        table: Actuarial table model
+        calculation_request: Calculation parameters
+        
+    Returns:
+        Dictionary containing calculation results
+        
+    Raises:
+        NotFoundException: If age not in table
+    """
+    # Find the appropriate rate from the (cached, per-version) table index
+    rate_index = index_for_table(table)
     base_rate = _get_rate_from_table(
-        table.table_data,
+        rate_index,
         calculation_request.age,
         calculation_request.gender,
         calculation_request.smoking_status
@@ -578,7 +615,7 @@ def calculate_actuarial_value(
     # Apply improvement factor if available
     if calculation_request.apply_improvement:
         improvement_factor = _get_improvement_factor(
-            table.table_data,
+            rate_index,
             calculation_request.age
         )
         if improvement_factor:
@@ -588,7 +625,7 @@ def calculate_actuarial_value(
     # Apply selection factor if requested
     if calculation_request.apply_selection:
         selection_factor = _get_selection_factor(
-            table.table_data,
+            rate_index,
             calculation_request.age
         )
         if selection_factor:
@@ -654,7 +691,7 @@ def calculate_actuarial_value(
 
 
 def _get_rate_from_table(
-    table_data: List[Dict],
+    rate_index: ActuarialRateIndex,
     age: int,
     gender: Optional[Gender],
     smoking_status: Optional[SmokingStatus]
@@ -663,7 +700,7 @@ def _get_rate_from_table(
     Extract rate from table data based on parameters
     
     Args:
-        table_data: Table data as list of dictionaries
+        rate_index: Age index over the table data
         age: Age
         gender: Optional gender
         smoking_status: Optional smoking status
@@ -671,59 +708,25 @@ def _get_rate_from_table(
     Returns:
         Rate value or None if not found
     """
-    for row in table_data:
-        if row.get('age') != age:
-            continue
-        
-        # Check gender match if specified
-        if gender and row.get('gender'):
-            if row['gender'] != gender.value:
-                continue
-        
-        # Check smoking status match if specified
-        if smoking_status and row.get('smoking_status'):
-            if row['smoking_status'] != smoking_status.value:
-                continue
-        
-        # Return the appropriate rate
-        if gender and smoking_status:
-            # Look for specific rate first
-            if gender == Gender.MALE and row.get('rate_male'):
-                return row['rate_male']
-            elif gender == Gender.FEMALE and row.get('rate_female'):
-                return row['rate_female']
-            
-            if smoking_status == SmokingStatus.SMOKER and row.get('rate_smoker'):
-                return row['rate_smoker']
-            elif smoking_status == SmokingStatus.NON_SMOKER and row.get('rate_non_smoker'):
-                return row['rate_non_smoker']
-        
-        # Return general rate
-        return row.get('rate')
-    
-    return None
+    return rate_index.get(age, rate_column_key(gender, smoking_status))
 
 
 def _get_improvement_factor(
-    table_data: List[Dict],
+    rate_index: ActuarialRateIndex,
     age: int
 ) -> Optional[Decimal]:
     """Get improvement factor from table data"""
-    for row in table_data:
-        if row.get('age') == age and row.get('improvement_factor'):
-            return Decimal(str(row['improvement_factor']))
-    return None
+    factor = rate_index.get(age, "improvement_factor")
+    return Decimal(str(factor)) if factor else None
 
 
 def _get_selection_factor(
-    table_data: List[Dict],
+    rate_index: ActuarialRateIndex,
     age: int
 ) -> Optional[Decimal]:
     """Get selection factor from table data"""
-    for row in table_data:
-        if row.get('age') == age and row.get('selection_factor'):
-            return Decimal(str(row['selection_factor']))
-    return None
+    factor = rate_index.get(age, "selection_factor")
+    return Decimal(str(factor)) if factor else None
 
 
 # ================================================================
@@ -754,9 +757,14 @@ def import_actuarial_table(
         BadRequestException: If import fails
     """
     try:
-        # Parse file based on format
+        # CSV goes through the COPY pipeline; the table is created there
         if file_format == 'csv':
-            table_data = _parse_csv_data(file_data)
+            if isinstance(file_data, str):
+                file_data = file_data.encode('utf-8')
+            table, _ = bulk_import_actuarial_table(
+                db, iter_csv_records(io.BytesIO(file_data)), table_info, created_by
+            )
+            return table
         elif file_format == 'json':
             table_data = _parse_json_data(file_data)
         else:
@@ -776,28 +784,151 @@ def import_actuarial_table(
         raise BadRequestException(f"Import failed: {str(e)}")
 
 
-def _parse_csv_data(csv_data: Union[str, bytes]) -> List[ActuarialDataRow]:
-    """Parse CSV data into actuarial data rows"""
-    if isinstance(csv_data, bytes):
-        csv_data = csv_data.decode('utf-8')
+ACTUARIAL_IMPORT_COLUMNS = [
+    "age", "gender", "smoking_status", "rate", "rate_male", "rate_female",
+    "rate_smoker", "rate_non_smoker", "improvement_factor", "selection_factor"
+]
+_RATE_COLUMNS = ["rate", "rate_male", "rate_female", "rate_smoker", "rate_non_smoker"]
+_FACTOR_COLUMNS = ["improvement_factor", "selection_factor"]
+
+
+def bulk_import_actuarial_table(
+    db: Session,
+    records: Iterable[Mapping[str, Any]],
+    table_info: Dict[str, Any],
+    created_by: Optional[UUID] = None,
+    validate_only: bool = False,
+    progress: Optional[ProgressCallback] = None
+) -> Tuple[Optional[ActuarialTable], BulkImportResult]:
+    """
+    Import an actuarial table through a COPY staging table
     
-    reader = csv.DictReader(io.StringIO(csv_data))
-    rows = []
+    Rows are copied into a staging table and validated with set-based
+    checks equivalent to ActuarialDataRow and _validate_table_data. The
+    table_data document is then built by the database (jsonb_agg), so
+    rows are never turned into Python objects. A table with any invalid
+    row is rejected as a whole; a validate_only run returns the rejected
+    rows in the result instead of raising.
     
-    for row in reader:
-        data_row = ActuarialDataRow(
-            age=int(row['age']),
-            rate=Decimal(row['rate']),
-            gender=Gender(row['gender']) if row.get('gender') else None,
-            smoking_status=SmokingStatus(row['smoking_status']) if row.get('smoking_status') else None,
-            rate_male=Decimal(row['rate_male']) if row.get('rate_male') else None,
-            rate_female=Decimal(row['rate_female']) if row.get('rate_female') else None,
-            rate_smoker=Decimal(row['rate_smoker']) if row.get('rate_smoker') else None,
-            rate_non_smoker=Decimal(row['rate_non_smoker']) if row.get('rate_non_smoker') else None
+    Args:
+        db: Database session
+        records: Row dicts (age, rate, gender, ...), e.g. from iter_csv_records
+        table_info: Table metadata
+        created_by: ID of the user importing
+        validate_only: Validate without creating the table
+        progress: Optional progress callback
+        
+    Returns:
+        Tuple of (created table or None when validate_only, import result)
+        
+    Raises:
+        ConflictException: If table code already exists
+        BadRequestException: If there are no rows, or (unless validate_only)
+            any row is invalid
+    """
+    metadata = ActuarialTableImportMetadata(**table_info)
+    
+    existing = db.scalar(
+        select(ActuarialTable.id).where(
+            ActuarialTable.table_code == metadata.table_code,
+            ActuarialTable.is_deleted == False
+        )
+    )
+    if existing:
+        raise ConflictException(
+            f"Actuarial table with code '{metadata.table_code}' already exists"
         )
-        rows.append(data_row)
     
-    return rows
+    try:
+        staging = StagingImport(db, "actuarial", ACTUARIAL_IMPORT_COLUMNS, progress=progress)
+        staging.copy(records)
+        
+        staging.require("age", "rate")
+        staging.number("age", minimum=0, maximum=150, integer=True)
+        for column in _RATE_COLUMNS:
+            staging.number(column, minimum=0, maximum=1, decimal_places=6)
+        for column in _FACTOR_COLUMNS:
+            staging.number(column, minimum=0, decimal_places=6)
+        staging.one_of("gender", [gender.value for gender in Gender])
+        staging.one_of("smoking_status", [smoking.value for smoking in SmokingStatus])
+        # Compare values, not spellings: "30" and "+030" are the same age
+        staging.reject_duplicates(
+            "age", "gender", "smoking_status",
+            normalize={
+                "age": lambda column: cast(column, Integer),
+                "gender": func.lower,
+                "smoking_status": func.lower,
+            }
+        )
+        
+        valid, rejected = staging.counts()
+        result = BulkImportResult(
+            total_rows=staging.rows_copied,
+            rejected=rejected,
+            errors=staging.errors() if rejected else []
+        )
+        staging.report("validate", rejected=rejected)
+        
+        if not staging.rows_copied:
+            raise BadRequestException("Table data cannot be empty")
+        
+        if validate_only:
+            db.rollback()
+            result.elapsed_seconds = time.monotonic() - staging.started
+            return None, result
+        
+        if rejected:
+            details = "; ".join(f"row {error['row']}: {error['error']}" for error in result.errors[:10])
+            raise BadRequestException(f"{rejected} invalid row(s): {details}")
+        
+        c = staging.c
+        fields = []
+        for column in ACTUARIAL_IMPORT_COLUMNS:
+            if column == "age":
+                value = cast(c.age, Integer)
+            elif column in ("gender", "smoking_status"):
+                value = c[column]
+            else:
+                value = cast(c[column], Numeric)
+            fields.extend([literal(column), value])
+        fields.extend([literal("additional_data"), cast(literal("{}"), JSONB)])
+        
+        table = ActuarialTable(
+            **metadata.model_dump(exclude={'tags', 'table_data'}),
+            # Built in the database from the staged rows, in file order
+            table_data=select(
+                func.jsonb_agg(aggregate_order_by(func.jsonb_build_object(*fields), c.line_no))
+            ).scalar_subquery(),
+            created_by=created_by,
+            created_at=datetime.utcnow(),
+            status=TableStatus.ACTIVE
+        )
+        if metadata.tags:
+            table.tags = metadata.tags
+        
+        db.add(table)
+        db.commit()
+        db.refresh(table)
+        
+        result.inserted = valid
+        result.elapsed_seconds = time.monotonic() - staging.started
+        staging.report("done", inserted=valid)
+        logger.info(
+            f"Imported actuarial table {table.id}: {valid} rows in {result.elapsed_seconds:.1f}s"
+        )
+        return table, result
+        
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Database integrity error: {str(e)}")
+        raise ConflictException("Table creation failed due to data conflict")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error importing actuarial table: {str(e)}")
+        raise BadRequestException(f"Import failed: {str(e)}")
 
 
 def _parse_json_data(json_data: Union[str, bytes]) -> List[ActuarialDataRow]:
@@ -852,6 +983,98 @@ def export_actuarial_table(
         raise BadRequestException(f"Export failed: {str(e)}")
 
 
+def actuarial_table_rows_statement(table_ids: List[UUID]):
+    """
+    Select the elements of ``table_data`` one row at a time
+    
+    Expands the JSONB array in the database so exports can stream rows
+    instead of loading whole tables. Columns: table_id, table_code,
+    value (one data row), in table order.
+    
+    Args:
+        table_ids: Table UUIDs
+        
+    Returns:
+        Select statement
+    """
+    elements = (
+        func.jsonb_array_elements(ActuarialTable.table_data)
+        .table_valued("value", with_ordinality="ordinal")
+        .render_derived()
+        .lateral("element")
+    )
+    return (
+        select(
+            ActuarialTable.id.label("table_id"),
+            ActuarialTable.table_code,
+            elements.c.value
+        )
+        .join(elements, true())
+        .where(
+            ActuarialTable.id.in_(table_ids),
+            ActuarialTable.is_deleted == False
+        )
+        .order_by(ActuarialTable.table_code, ActuarialTable.id, elements.c.ordinal)
+    )
+
+
+def actuarial_table_row_keys_statement(table_ids: List[UUID]):
+    """
+    Select the distinct keys of the ``table_data`` rows of the given tables
+    
+    Tables may mix row schemas (e.g. only some rows carry ``loading``), so
+    CSV exports need the union of keys rather than the first row's. Keys
+    are ordered by first appearance.
+    
+    Args:
+        table_ids: Table UUIDs
+        
+    Returns:
+        Select statement with one ``key`` column
+    """
+    elements = (
+        func.jsonb_array_elements(ActuarialTable.table_data)
+        .table_valued("value", with_ordinality="ordinal")
+        .render_derived()
+        .lateral("element")
+    )
+    keys = (
+        func.jsonb_object_keys(elements.c.value)
+        .table_valued("key", with_ordinality="key_ordinal")
+        .render_derived()
+        .lateral("row_key")
+    )
+    first_seen = func.min(array([elements.c.ordinal, keys.c.key_ordinal]))
+    return (
+        select(keys.c.key)
+        .select_from(ActuarialTable)
+        .join(elements, true())
+        .join(keys, true())
+        .where(
+            ActuarialTable.id.in_(table_ids),
+            ActuarialTable.is_deleted == False
+        )
+        .group_by(keys.c.key)
+        .order_by(first_seen, keys.c.key)
+    )
+
+
+def get_actuarial_table_row_keys(db: Session, table_ids: List[UUID]) -> List[str]:
+    """Union of the row keys of the given tables, in first-seen order"""
+    return list(db.execute(actuarial_table_row_keys_statement(table_ids)).scalars())
+
+
+def get_actuarial_table_codes(db: Session, table_ids: List[UUID]) -> Dict[UUID, str]:
+    """Codes of the existing (not deleted) tables among ``table_ids``, without loading their data"""
+    rows = db.execute(
+        select(ActuarialTable.id, ActuarialTable.table_code).where(
+            ActuarialTable.id.in_(table_ids),
+            ActuarialTable.is_deleted == False
+        )
+    ).all()
+    return {row.id: row.table_code for row in rows}
+
+
 def _export_to_csv(table_data: List[Dict]) -> str:
     """Export table data to CSV format"""
     if not table_data:
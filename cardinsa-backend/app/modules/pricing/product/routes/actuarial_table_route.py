@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.utils.streaming_export import ExportFormat, streaming_export_response
 from app.modules.pricing.product.services import actuarial_table_service as service
 from app.modules.pricing.product.schemas.actuarial_table_schema import (
     ActuarialTableCreate,
@@ -140,6 +141,56 @@ async def import_table(
         )
 
 
+@router.post(
+    "/import/bulk",
+    response_model=dict,
+    summary="Bulk import actuarial table"
+)
+def bulk_import_table(
+    file: UploadFile = File(..., description="CSV file"),
+    table_code: str = Body(..., description="Unique table code"),
+    table_name: str = Body(..., description="Table name"),
+    table_type: TableType = Body(..., description="Table type"),
+    table_source: TableSource = Body(..., description="Table source"),
+    base_year: int = Body(..., description="Base year"),
+    version: str = Body(..., description="Table version"),
+    min_age: int = Body(0, description="Minimum age"),
+    max_age: int = Body(120, description="Maximum age"),
+    validate_only: bool = Body(False, description="Only validate without saving"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Import a large actuarial table from CSV.
+    
+    The upload is streamed into a staging table with COPY and validated
+    in the database. With validate_only the response lists the first
+    rejected rows; otherwise any rejected row fails the import with 400
+    naming the first ten. Columns:
+    age and rate (required), gender, smoking_status, rate_male,
+    rate_female, rate_smoker, rate_non_smoker, improvement_factor,
+    selection_factor.
+    """
+    table_metadata = {
+        "table_code": table_code,
+        "table_name": table_name,
+        "table_type": table_type,
+        "table_source": table_source,
+        "base_year": base_year,
+        "version": version,
+        "min_age": min_age,
+        "max_age": max_age
+    }
+    
+    return service.bulk_import_actuarial_table(
+        db,
+        file.file,
+        table_metadata,
+        created_by=current_user.get("user_id"),
+        validate_only=validate_only
+    )
+
+
 # ================================================================
 # READ ENDPOINTS
 # ================================================================
@@ -264,6 +315,31 @@ async def calculate_actuarial_value(
         )
 
 
+@router.post(
+    "/calculate/batch",
+    response_model=List[ActuarialCalculationResponse],
+    summary="Perform actuarial calculations in batch"
+)
+async def calculate_actuarial_values_batch(
+    calculation_requests: List[ActuarialCalculationRequest] = Body(..., description="Calculation requests"),
+    db: Session = Depends(get_db)
+):
+    """
+    Perform actuarial calculations for many ages/terms in one call.
+
+    Each table is loaded once and life expectancies, present values and
+    reserves are computed for the whole batch together. Results are
+    returned in request order.
+    """
+    try:
+        return service.perform_actuarial_calculations(db, calculation_requests)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.post(
     "/calculate-premium",
     response_model=dict,
@@ -539,35 +615,57 @@ async def export_tables(
         )
 
 
+@router.post(
+    "/export/stream",
+    summary="Stream actuarial table rows"
+)
+async def export_tables_stream(
+    export_request: ActuarialTableExport,
+    format: ExportFormat = Query(ExportFormat.CSV, description="Export format"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the data rows of the requested tables as CSV or NDJSON.
+    
+    Each row is prefixed with table_id and table_code. Unlike /export,
+    rows are streamed from the database, so large tables do not have to
+    fit in memory. CSV columns are the union of every row's keys, so
+    tables with different row schemas lose no data (missing values are
+    left empty). ``export_request.format`` is ignored.
+    """
+    rows = service.stream_actuarial_table_rows(db, export_request.table_ids)
+    columns = None
+    if format == ExportFormat.CSV:
+        columns = service.actuarial_table_row_columns(db, export_request.table_ids)
+    return streaming_export_response(rows, export_format=format, filename="actuarial_tables", columns=columns)
+
+
 @router.get(
     "/{table_id}/export",
     summary="Export single table"
 )
 async def export_single_table(
     table_id: UUID,
-    format: str = Query("json", pattern="^(csv|json)$", description="Export format"),
+    format: str = Query("json", pattern="^(csv|json|ndjson)$", description="Export format"),
     db: Session = Depends(get_db)
 ):
     """
     Export a single actuarial table.
+    
+    csv and ndjson are streamed row by row; json returns the whole table.
     """
     from app.modules.pricing.product.repositories import actuarial_table_repository as repo
     
+    if format in (ExportFormat.CSV.value, ExportFormat.NDJSON.value):
+        rows = service.stream_actuarial_table_rows(db, [table_id], include_table_columns=False)
+        columns = None
+        if format == ExportFormat.CSV.value:
+            columns = service.actuarial_table_row_columns(db, [table_id], include_table_columns=False)
+        return streaming_export_response(rows, export_format=format, filename=f"table_{table_id}", columns=columns)
+    
     try:
         data = repo.export_actuarial_table(db, table_id, format)
-        
-        # Return appropriate response based on format
-        if format == "csv":
-            from fastapi.responses import Response
-            return Response(
-                content=data,
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=table_{table_id}.csv"
-                }
-            )
-        else:
-            return {"format": format, "data": data}
+        return {"format": format, "data": data}
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -243,6 +243,15 @@ class ActuarialTableCreate(ActuarialTableBase):
         return v
 
 
+class ActuarialTableImportMetadata(ActuarialTableCreate):
+    """Metadata of a table whose rows come from a bulk import file"""
+    
+    table_data: Optional[List[ActuarialDataRow]] = Field(
+        None,
+        description="Not used: rows are loaded from the import file"
+    )
+
+
 # ================================================================
 # UPDATE SCHEMA
 # ================================================================
@@ -0,0 +1,139 @@
+# app/modules/pricing/product/services/actuarial_kernels.py
+
+"""
+Vectorized Actuarial Kernels
+
+NumPy implementations of the projections used by the actuarial table
+service. Every kernel works on whole batches (one row per age / policy)
+so callers price many ages and terms in a single pass instead of looping
+year by year.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Survival projection limits (same as the original per-age loop)
+LIFE_EXPECTANCY_HORIZON = 50
+LIFE_EXPECTANCY_MAX_AGE = 120
+LIFE_EXPECTANCY_MIN_SURVIVAL = 0.01
+
+
+def life_expectancies(
+    mortality_by_age: np.ndarray,
+    start_ages: np.ndarray,
+    horizon: int = LIFE_EXPECTANCY_HORIZON,
+    max_age: int = LIFE_EXPECTANCY_MAX_AGE,
+    min_survival: float = LIFE_EXPECTANCY_MIN_SURVIVAL
+) -> np.ndarray:
+    """
+    Curtate life expectancy for many starting ages at once.
+
+    For each start age x the projection runs over ages x .. min(x+horizon,
+    max_age)-1, accumulating the cumulative survival probability. It stops
+    at the first age without a rate, and after the first year whose
+    survival falls below ``min_survival``.
+
+    Args:
+        mortality_by_age: Dense float array of q_x indexed by age (NaN = missing)
+        start_ages: Integer array of starting ages
+        horizon: Maximum projection length in years
+        max_age: Projection never reaches this age
+        min_survival: Survival level after which projection stops
+
+    Returns:
+        Float array of life expectancies, aligned with ``start_ages``
+    """
+    start_ages = np.asarray(start_ages, dtype=np.int64)
+    ages = start_ages[:, None] + np.arange(horizon, dtype=np.int64)[None, :]
+
+    in_table = (ages >= 0) & (ages < min(max_age, len(mortality_by_age)))
+    q = np.full(ages.shape, np.nan, dtype=np.float64)
+    q[in_table] = mortality_by_age[ages[in_table]]
+
+    # Truncate each row at its first missing rate
+    alive = np.cumprod(~np.isnan(q), axis=1, dtype=np.int8).astype(bool)
+    survival = np.cumprod(np.where(alive, 1.0 - q, 1.0), axis=1)
+
+    # Keep years up to and including the first one below min_survival
+    below = np.cumsum(alive & (survival < min_survival), axis=1)
+    before_stop = np.concatenate(
+        (np.ones((len(start_ages), 1), dtype=bool), below[:, :-1] == 0), axis=1
+    )
+    included = np.where(alive & before_stop, survival, 0.0)
+
+    # Sequential (cumsum) accumulation matches the year-by-year sum exactly
+    if included.shape[1] == 0:
+        return np.zeros(len(start_ages), dtype=np.float64)
+    return np.cumsum(included, axis=1)[:, -1]
+
+
+def present_values(
+    rates: np.ndarray,
+    term_years: np.ndarray,
+    interest_rates: np.ndarray,
+    sums_insured: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Present value of a level annuity and of a term insurance benefit.
+
+    With a constant rate q, interest i and term n:
+        annuity   = sum_{t=1..n} v^t (1-q)^t
+        insurance = S * sum_{t=1..n} v^t q (1-q)^(t-1),   v = 1/(1+i)
+
+    Args:
+        rates: Mortality/morbidity rate per row
+        term_years: Term per row
+        interest_rates: Discount rate per row
+        sums_insured: Sum insured per row (NaN = none)
+
+    Returns:
+        Dict with ``annuity_present_value`` and, when sums insured are
+        given, ``insurance_present_value`` arrays (NaN where no sum insured)
+    """
+    q = np.asarray(rates, dtype=np.float64)[:, None]
+    i = np.asarray(interest_rates, dtype=np.float64)[:, None]
+    terms = np.asarray(term_years, dtype=np.int64)
+
+    years = np.arange(1, int(terms.max(initial=0)) + 1, dtype=np.float64)[None, :]
+    in_term = years <= terms[:, None]
+
+    discount = (1.0 + i) ** -years
+    survival = (1.0 - q) ** years
+
+    values = {
+        "annuity_present_value": np.where(in_term, discount * survival, 0.0).sum(axis=1)
+    }
+
+    if sums_insured is not None:
+        death = q * (1.0 - q) ** (years - 1.0)
+        benefit = np.where(in_term, discount * death, 0.0).sum(axis=1)
+        values["insurance_present_value"] = benefit * np.asarray(sums_insured, dtype=np.float64)
+
+    return values
+
+
+def annuity_certain_factors(term_years: np.ndarray, interest_rates: np.ndarray) -> np.ndarray:
+    """
+    Annuity-certain factor (1 - (1+i)^-n) / i per row (n where i == 0).
+    """
+    n = np.asarray(term_years, dtype=np.float64)
+    i = np.asarray(interest_rates, dtype=np.float64)
+    safe_i = np.where(i == 0, 1.0, i)
+    return np.where(i == 0, n, (1.0 - (1.0 + i) ** -n) / safe_i)
+
+
+def reserves(
+    annual_premiums: np.ndarray,
+    term_years: np.ndarray,
+    interest_rates: np.ndarray,
+    reserve_ratio: float = 0.3
+) -> np.ndarray:
+    """
+    Simplified policy reserve: a share of total premiums, discounted.
+
+    reserve = P * n * reserve_ratio * a_n  (a_n = annuity-certain factor)
+    """
+    premiums = np.asarray(annual_premiums, dtype=np.float64)
+    terms = np.asarray(term_years, dtype=np.float64)
+    return premiums * terms * reserve_ratio * annuity_certain_factors(terms, interest_rates)
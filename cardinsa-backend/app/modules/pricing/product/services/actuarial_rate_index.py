@@ -0,0 +1,347 @@
+# app/modules/pricing/product/services/actuarial_rate_index.py
+
+"""
+Actuarial Rate Index
+
+Age-indexed, column-oriented view of an actuarial table. Rows are grouped
+by age once; each lookup dimension (gender/smoking combination, factor
+column) is resolved into a column aligned with the sorted ages the first
+time it is used. Exact lookups are a dict hit plus a list index,
+interpolation is a bisect over the sorted ages, and ``array()`` exposes a
+column as a NumPy float64 array for vectorized consumers.
+
+Indexes are immutable and cached per table version (see get_rate_index).
+"""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from decimal import Decimal
+from enum import Enum
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; array() is then unavailable
+    np = None
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Gender / smoking values used by rate columns (plain strings, see _plain)
+MALE, FEMALE, UNISEX = "male", "female", "unisex"
+SMOKER, NON_SMOKER = "smoker", "non_smoker"
+
+_INDEX_CACHE_SIZE = 256
+_index_cache: "OrderedDict[Hashable, ActuarialRateIndex]" = OrderedDict()
+_index_cache_lock = Lock()
+
+
+def _plain(value: Any) -> Any:
+    """Enum members -> their value, so rows and queries compare as plain strings."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def _field(row: Any, name: str) -> Any:
+    """Read a row field from a dict (JSONB) or an object (ActuarialDataRow)."""
+    if isinstance(row, dict):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+class ActuarialRateIndex:
+    """
+    Immutable age-indexed lookup structure over actuarial rows.
+
+    Columns are keyed by any hashable and resolved lazily by the resolver
+    passed at construction: ``resolver(rows_at_age, key)`` returns the value
+    for one age. Ages with no resolvable value hold ``None``.
+    """
+
+    def __init__(
+        self,
+        rows_by_age: Dict[int, List[Any]],
+        resolver: Callable[[List[Any], Hashable], Any]
+    ):
+        self.ages: Tuple[int, ...] = tuple(sorted(rows_by_age))
+        self._rows = tuple(rows_by_age[age] for age in self.ages)
+        self._position = {age: i for i, age in enumerate(self.ages)}
+        self._resolver = resolver
+        self._columns: Dict[Hashable, List[Any]] = {}
+        self._arrays: Dict[Hashable, Any] = {}
+        self._lock = Lock()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_table_rows(cls, table_data: Iterable[Any]) -> "ActuarialRateIndex":
+        """
+        Index ``ActuarialTable.table_data`` rows (dicts or ActuarialDataRow).
+
+        Column keys are ``("rate", gender, smoking_status)`` (plain string
+        values or None), ``("mortality", gender, smoking_status)`` for
+        projections that take the first row of each age, and the factor
+        names ``"improvement_factor"`` and ``"selection_factor"``. Row order
+        within an age is preserved, so the first matching row wins exactly
+        as in a linear scan.
+        """
+        rows_by_age: Dict[int, List[Any]] = {}
+        for row in table_data or []:
+            age = _field(row, 'age')
+            if age is not None:
+                rows_by_age.setdefault(int(age), []).append(row)
+        return cls(rows_by_age, _resolve_table_row_column)
+
+    @classmethod
+    def from_rate_mapping(cls, rates: Dict[Any, Dict[Any, Any]]) -> "ActuarialRateIndex":
+        """
+        Index an ``{age: {gender: rate}}`` mapping (age keys may be strings).
+
+        Column keys are gender values; each resolves to the gender's rate,
+        then the UNISEX rate, then the mean of the age's available rates.
+        """
+        rows_by_age = {
+            int(age): [{_plain(gender): rate for gender, rate in gender_rates.items()}]
+            for age, gender_rates in (rates or {}).items()
+        }
+        return cls(rows_by_age, _resolve_gender_mapping_column)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def has_age(self, age: int) -> bool:
+        return age in self._position
+
+    def column(self, key: Hashable) -> List[Any]:
+        """Resolved values for ``key``, aligned with ``ages``."""
+        values = self._columns.get(key)
+        if values is None:
+            with self._lock:
+                values = self._columns.get(key)
+                if values is None:
+                    values = [self._resolver(rows, key) for rows in self._rows]
+                    self._columns[key] = values
+        return values
+
+    def get(self, age: int, key: Hashable) -> Any:
+        """Exact-age lookup; None if the age is absent or has no value."""
+        position = self._position.get(age)
+        if position is None:
+            return None
+        return self.column(key)[position]
+
+    def bounds(self, age: int) -> Tuple[Optional[int], Optional[int]]:
+        """Nearest indexed ages at or below and at or above ``age``."""
+        i = bisect_left(self.ages, age)
+        upper = self.ages[i] if i < len(self.ages) else None
+        if upper == age:
+            return age, age
+        lower = self.ages[i - 1] if i > 0 else None
+        return lower, upper
+
+    def nearest_age(self, age: int) -> Optional[int]:
+        """Closest indexed age (ties go to the lower age)."""
+        lower, upper = self.bounds(age)
+        if lower is None or upper is None:
+            return upper if lower is None else lower
+        return lower if age - lower <= upper - age else upper
+
+    def interpolate(self, age: int, key: Hashable) -> Optional[Decimal]:
+        """
+        Rate at ``age``, linearly interpolated between the bounding ages.
+
+        Outside the table range the nearest age's rate is returned.
+        """
+        if not self.ages:
+            return None
+
+        lower, upper = self.bounds(age)
+        if lower == age:
+            return self.get(age, key)
+        if lower is None or upper is None:
+            return self.get(self.nearest_age(age), key)
+
+        lower_rate = self.get(lower, key)
+        upper_rate = self.get(upper, key)
+        if lower_rate is None or upper_rate is None:
+            return None
+
+        lower_rate, upper_rate = Decimal(str(lower_rate)), Decimal(str(upper_rate))
+        weight = (age - lower) / (upper - lower)
+        return lower_rate + (upper_rate - lower_rate) * Decimal(str(weight))
+
+    def array(self, key: Hashable) -> Any:
+        """
+        Column as a NumPy float64 array aligned with ``ages`` (NaN = missing).
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for vectorized actuarial lookups")
+        values = self._arrays.get(key)
+        if values is None:
+            values = np.array(
+                [np.nan if v is None else float(v) for v in self.column(key)],
+                dtype=np.float64
+            )
+            values.setflags(write=False)
+            self._arrays[key] = values
+        return values
+
+    def dense_array(self, key: Hashable, stop: Optional[int] = None) -> Any:
+        """
+        Column as a float64 array indexed directly by age (0 .. stop-1).
+
+        Ages missing from the table (or without a value) are NaN, so
+        ``dense_array(key)[age]`` needs no position lookup.
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for vectorized actuarial lookups")
+        if stop is None:
+            stop = (self.ages[-1] + 1) if self.ages else 0
+        dense = np.full(max(stop, 0), np.nan, dtype=np.float64)
+        if self.ages:
+            ages = self.ages_array()
+            in_range = (ages >= 0) & (ages < stop)
+            dense[ages[in_range]] = self.array(key)[in_range]
+        return dense
+
+    def ages_array(self) -> Any:
+        """Indexed ages as a NumPy int array."""
+        if np is None:
+            raise RuntimeError("NumPy is required for vectorized actuarial lookups")
+        return np.asarray(self.ages, dtype=np.int64)
+
+
+# ------------------------------------------------------------------
+# Column resolvers
+# ------------------------------------------------------------------
+
+def _resolve_table_row_column(rows: Sequence[Any], key: Hashable) -> Any:
+    """Resolve one age of a table_data column (mirrors the original row scan)."""
+    if key in ("improvement_factor", "selection_factor"):
+        for row in rows:
+            value = _field(row, key)
+            if value:
+                return value
+        return None
+
+    kind, gender, smoking_status = key
+    if kind == "mortality":
+        return _resolve_mortality_rate(rows[0], gender, smoking_status) if rows else None
+
+    for row in rows:
+        row_gender = _plain(_field(row, 'gender'))
+        if gender and row_gender and row_gender != gender:
+            continue
+
+        row_smoking = _plain(_field(row, 'smoking_status'))
+        if smoking_status and row_smoking and row_smoking != smoking_status:
+            continue
+
+        if gender and smoking_status:
+            # Specific rates first
+            if gender == MALE and _field(row, 'rate_male'):
+                return _field(row, 'rate_male')
+            elif gender == FEMALE and _field(row, 'rate_female'):
+                return _field(row, 'rate_female')
+
+            if smoking_status == SMOKER and _field(row, 'rate_smoker'):
+                return _field(row, 'rate_smoker')
+            elif smoking_status == NON_SMOKER and _field(row, 'rate_non_smoker'):
+                return _field(row, 'rate_non_smoker')
+
+        return _field(row, 'rate')
+
+    return None
+
+
+def _resolve_mortality_rate(row: Any, gender: Any, smoking_status: Any) -> Any:
+    """Rate used by survival projections: gender, then smoking, then general rate."""
+    if gender == MALE and _field(row, 'rate_male'):
+        return _field(row, 'rate_male')
+    elif gender == FEMALE and _field(row, 'rate_female'):
+        return _field(row, 'rate_female')
+    elif smoking_status == SMOKER and _field(row, 'rate_smoker'):
+        return _field(row, 'rate_smoker')
+    elif smoking_status == NON_SMOKER and _field(row, 'rate_non_smoker'):
+        return _field(row, 'rate_non_smoker')
+    return _field(row, 'rate')
+
+
+def _resolve_gender_mapping_column(rows: Sequence[Dict[str, Any]], gender: Hashable) -> Any:
+    """Resolve one age of an {age: {gender: rate}} column with its fallbacks."""
+    gender_rates = rows[0]
+    if gender in gender_rates:
+        return gender_rates[gender]
+    if "UNISEX" in gender_rates:
+        return gender_rates["UNISEX"]
+    if gender_rates:
+        rates = list(gender_rates.values())
+        return sum(rates) / len(rates)
+    return None
+
+
+def rate_column_key(gender: Any = None, smoking_status: Any = None) -> Tuple[str, Any, Any]:
+    """Column key for a table_data rate lookup."""
+    return ("rate", _plain(gender) or None, _plain(smoking_status) or None)
+
+
+def mortality_column_key(gender: Any = None, smoking_status: Any = None) -> Tuple[str, Any, Any]:
+    """Column key for the per-age rate used in survival projections."""
+    return ("mortality", _plain(gender) or None, _plain(smoking_status) or None)
+
+
+# ------------------------------------------------------------------
+# Per-version cache
+# ------------------------------------------------------------------
+
+def get_rate_index(version_key: Hashable, build: Callable[[], ActuarialRateIndex]) -> ActuarialRateIndex:
+    """
+    Get the index cached for a table version, building it on first use.
+
+    Args:
+        version_key: Identifies one immutable table version, e.g.
+            ``(table.id, table.version, table.updated_at)``
+        build: Builds the index when it is not cached
+
+    Returns:
+        The shared index for that version
+    """
+    with _index_cache_lock:
+        index = _index_cache.get(version_key)
+        if index is not None:
+            _index_cache.move_to_end(version_key)
+            return index
+
+    index = build()
+    with _index_cache_lock:
+        _index_cache[version_key] = index
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def index_for_table(table: Any) -> ActuarialRateIndex:
+    """Cached index over an ActuarialTable model's ``table_data``."""
+    version_key = (
+        "table_data",
+        getattr(table, 'id', None) or id(table),
+        getattr(table, 'version', None),
+        getattr(table, 'updated_at', None),
+    )
+    return get_rate_index(version_key, lambda: ActuarialRateIndex.from_table_rows(table.table_data))
+
+
+def clear_rate_index_cache() -> None:
+    """Drop every cached index (e.g. after bulk table imports)."""
+    with _index_cache_lock:
+        _index_cache.clear()
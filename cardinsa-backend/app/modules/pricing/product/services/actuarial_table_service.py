@@ -7,15 +7,21 @@ Business logic layer for Actuarial Table management.
 Handles actuarial calculations, table management, and risk assessment.
 """
 
-from typing import Optional, List, Dict, Any, Union, Tuple
+from typing import IO, Optional, List, Dict, Any, Union, Tuple, Iterator
 from uuid import UUID
 from datetime import datetime, date
 from decimal import Decimal
 import json
 import math
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.modules.pricing.product.repositories import actuarial_table_repository as repo
+from app.modules.pricing.product.services import actuarial_kernels as kernels
+from app.modules.pricing.product.services.actuarial_rate_index import (
+    index_for_table,
+    mortality_column_key
+)
 from app.modules.pricing.product.schemas.actuarial_table_schema import (
     ActuarialTableCreate,
     ActuarialTableUpdate,
@@ -34,6 +40,8 @@ from app.modules.pricing.product.schemas.actuarial_table_schema import (
     SmokingStatus
 )
 from app.core.database import get_db
+from app.utils.streaming_export import stream_query
+from app.core.bulk_import import iter_csv_records
 from fastapi import HTTPException, status
 import logging
 
@@ -437,72 +445,160 @@ def perform_actuarial_calculation(
     Returns:
         Detailed calculation results
     """
-    # Get base calculation from repository
-    base_calc = repo.calculate_actuarial_value(db, calculation_request)
+    return perform_actuarial_calculations(db, [calculation_request])[0]
+
+
+def perform_actuarial_calculations(
+    db: Session,
+    calculation_requests: List[ActuarialCalculationRequest]
+) -> List[ActuarialCalculationResponse]:
+    """
+    Perform actuarial calculations for many ages/terms in one call
     
-    # Enhance with additional calculations
-    table = repo.get_actuarial_table_by_id(db, calculation_request.table_id)
+    Each referenced table is loaded once; life expectancies, present values
+    and reserves are computed with the vectorized kernels over the whole
+    batch rather than per request.
     
-    if not table:
-        raise NotFoundException(
-            f"Table {calculation_request.table_id} not found"
-        )
+    Args:
+        db: Database session
+        calculation_requests: Calculation parameters, one per result
+        
+    Returns:
+        Detailed calculation results, in request order
+    """
+    tables = {}
+    for request in calculation_requests:
+        if request.table_id not in tables:
+            table = repo.get_actuarial_table_by_id(db, request.table_id)
+            if not table:
+                raise NotFoundException(f"Table {request.table_id} not found")
+            tables[request.table_id] = table
+    
+    # Base rates and premiums per request
+    base_calcs = [
+        repo.calculate_actuarial_value_for_table(tables[request.table_id], request)
+        for request in calculation_requests
+    ]
     
-    # Calculate life expectancy if mortality table
-    life_expectancy = None
-    if table.table_type == TableType.MORTALITY:
-        life_expectancy = _calculate_life_expectancy(
-            table.table_data,
-            calculation_request.age,
-            calculation_request.gender,
-            calculation_request.smoking_status
-        )
+    life_expectancies = _batch_life_expectancies(tables, calculation_requests)
+    present_values = _batch_present_values(calculation_requests, base_calcs)
+    reserve_amounts = _batch_reserves(calculation_requests, base_calcs)
+    
+    results = []
+    for i, (request, base_calc) in enumerate(zip(calculation_requests, base_calcs)):
+        table = tables[request.table_id]
+        results.append(ActuarialCalculationResponse(
+            table_id=request.table_id,
+            base_rate=Decimal(str(base_calc["base_rate"])),
+            adjusted_rate=Decimal(str(base_calc["adjusted_rate"])),
+            annual_premium=Decimal(str(base_calc["annual_premium"])) if base_calc.get("annual_premium") else None,
+            monthly_premium=Decimal(str(base_calc["monthly_premium"])) if base_calc.get("monthly_premium") else None,
+            net_premium=Decimal(str(base_calc["net_premium"])) if base_calc.get("net_premium") else None,
+            gross_premium=Decimal(str(base_calc["gross_premium"])) if base_calc.get("gross_premium") else None,
+            present_value=Decimal(str(base_calc["present_value"])) if base_calc.get("present_value") else None,
+            reserve_amount=reserve_amounts[i],
+            calculation_details={
+                **base_calc["calculation_details"],
+                "life_expectancy": life_expectancies[i],
+                "present_values": present_values[i],
+                "table_type": table.table_type,
+                "table_version": table.version
+            },
+            factors_applied=base_calc["factors_applied"]
+        ))
     
-    # Calculate present values if term and interest provided
-    present_values = {}
-    if calculation_request.term_years and calculation_request.interest_rate:
-        present_values = _calculate_present_values(
-            base_calc["adjusted_rate"],
-            calculation_request.term_years,
-            calculation_request.interest_rate,
-            calculation_request.sum_insured
-        )
+    return results
+
+
+def _batch_life_expectancies(
+    tables: Dict[UUID, Any],
+    calculation_requests: List[ActuarialCalculationRequest]
+) -> List[Optional[float]]:
+    """
+    Life expectancy per request (None for non-mortality tables)
     
-    # Calculate reserves if applicable
-    reserve_amount = None
-    if base_calc.get("annual_premium") and calculation_request.term_years:
-        reserve_amount = _calculate_reserve(
-            Decimal(str(base_calc["annual_premium"])),
-            calculation_request.term_years,
-            calculation_request.interest_rate or Decimal('0.03')
+    Requests are grouped by table and gender/smoking column so each group
+    is a single kernel call over its ages.
+    """
+    groups: Dict[Tuple, List[int]] = {}
+    for i, request in enumerate(calculation_requests):
+        if tables[request.table_id].table_type == TableType.MORTALITY:
+            key = (request.table_id, mortality_column_key(request.gender, request.smoking_status))
+            groups.setdefault(key, []).append(i)
+    
+    results: List[Optional[float]] = [None] * len(calculation_requests)
+    for (table_id, column_key), positions in groups.items():
+        mortality = index_for_table(tables[table_id]).dense_array(
+            column_key, stop=kernels.LIFE_EXPECTANCY_MAX_AGE
         )
+        ages = np.array([calculation_requests[i].age for i in positions], dtype=np.int64)
+        for i, value in zip(positions, kernels.life_expectancies(mortality, ages)):
+            results[i] = float(value)
     
-    # Create enhanced response
-    enhanced_calc = ActuarialCalculationResponse(
-        table_id=calculation_request.table_id,
-        base_rate=Decimal(str(base_calc["base_rate"])),
-        adjusted_rate=Decimal(str(base_calc["adjusted_rate"])),
-        annual_premium=Decimal(str(base_calc["annual_premium"])) if base_calc.get("annual_premium") else None,
-        monthly_premium=Decimal(str(base_calc["monthly_premium"])) if base_calc.get("monthly_premium") else None,
-        net_premium=Decimal(str(base_calc["net_premium"])) if base_calc.get("net_premium") else None,
-        gross_premium=Decimal(str(base_calc["gross_premium"])) if base_calc.get("gross_premium") else None,
-        present_value=Decimal(str(base_calc["present_value"])) if base_calc.get("present_value") else None,
-        reserve_amount=reserve_amount,
-        calculation_details={
-            **base_calc["calculation_details"],
-            "life_expectancy": life_expectancy,
-            "present_values": present_values,
-            "table_type": table.table_type,
-            "table_version": table.version
-        },
-        factors_applied=base_calc["factors_applied"]
+    return results
+
+
+def _batch_present_values(
+    calculation_requests: List[ActuarialCalculationRequest],
+    base_calcs: List[Dict[str, Any]]
+) -> List[Dict[str, float]]:
+    """Present values for every request with a term and interest rate."""
+    results: List[Dict[str, float]] = [{} for _ in calculation_requests]
+    positions = [
+        i for i, request in enumerate(calculation_requests)
+        if request.term_years and request.interest_rate
+    ]
+    if not positions:
+        return results
+    
+    requests = [calculation_requests[i] for i in positions]
+    values = kernels.present_values(
+        np.array([base_calcs[i]["adjusted_rate"] for i in positions], dtype=np.float64),
+        np.array([r.term_years for r in requests], dtype=np.int64),
+        np.array([float(r.interest_rate) for r in requests], dtype=np.float64),
+        np.array([float(r.sum_insured) if r.sum_insured else np.nan for r in requests], dtype=np.float64)
     )
     
-    return enhanced_calc
+    for row, (i, request) in enumerate(zip(positions, requests)):
+        pv_calculations = {"annuity_present_value": float(values["annuity_present_value"][row])}
+        if request.sum_insured:
+            insurance_pv = float(values["insurance_present_value"][row])
+            pv_calculations["insurance_present_value"] = insurance_pv
+            pv_calculations["net_single_premium"] = insurance_pv
+        results[i] = pv_calculations
+    
+    return results
+
+
+def _batch_reserves(
+    calculation_requests: List[ActuarialCalculationRequest],
+    base_calcs: List[Dict[str, Any]]
+) -> List[Optional[Decimal]]:
+    """Policy reserve for every request with a premium and term."""
+    results: List[Optional[Decimal]] = [None] * len(calculation_requests)
+    positions = [
+        i for i, request in enumerate(calculation_requests)
+        if base_calcs[i].get("annual_premium") and request.term_years
+    ]
+    if not positions:
+        return results
+    
+    amounts = kernels.reserves(
+        np.array([base_calcs[i]["annual_premium"] for i in positions], dtype=np.float64),
+        np.array([calculation_requests[i].term_years for i in positions], dtype=np.int64),
+        np.array(
+            [float(calculation_requests[i].interest_rate or Decimal('0.03')) for i in positions],
+            dtype=np.float64
+        )
+    )
+    for i, amount in zip(positions, amounts):
+        results[i] = Decimal(repr(float(amount)))
+    
+    return results
 
 
 def _calculate_life_expectancy(
-    table_data: List[Dict],
+    table: Any,
     current_age: int,
     gender: Optional[Gender],
     smoking_status: Optional[SmokingStatus]
@@ -511,7 +607,7 @@ def _calculate_life_expectancy(
     Calculate life expectancy from mortality table
     
     Args:
-        table_data: Mortality table data
+        table: Mortality table
         current_age: Current age
         gender: Gender
         smoking_status: Smoking status
@@ -519,110 +615,11 @@ def _calculate_life_expectancy(
     Returns:
         Life expectancy in years
     """
-    survival_prob = 1.0
-    expected_years = 0.0
-    
-    for age in range(current_age, min(current_age + 50, 120)):
-        # Get mortality rate for this age
-        rate = None
-        for row in table_data:
-            if row.get('age') == age:
-                # Use specific rate based on gender/smoking
-                if gender and gender == Gender.MALE and row.get('rate_male'):
-                    rate = row['rate_male']
-                elif gender and gender == Gender.FEMALE and row.get('rate_female'):
-                    rate = row['rate_female']
-                elif smoking_status and smoking_status == SmokingStatus.SMOKER and row.get('rate_smoker'):
-                    rate = row['rate_smoker']
-                elif smoking_status and smoking_status == SmokingStatus.NON_SMOKER and row.get('rate_non_smoker'):
-                    rate = row['rate_non_smoker']
-                else:
-                    rate = row.get('rate')
-                break
-        
-        if rate is None:
-            break
-        
-        # Update survival probability
-        survival_prob *= (1 - rate)
-        expected_years += survival_prob
-        
-        if survival_prob < 0.01:  # Stop when survival probability is very low
-            break
-    
-    return expected_years
-
-
-def _calculate_present_values(
-    rate: Decimal,
-    term_years: int,
-    interest_rate: Decimal,
-    sum_insured: Optional[Decimal]
-) -> Dict[str, float]:
-    """
-    Calculate various present values
-    
-    Args:
-        rate: Mortality/morbidity rate
-        term_years: Term in years
-        interest_rate: Discount rate
-        sum_insured: Sum insured amount
-        
-    Returns:
-        Present value calculations
-    """
-    pv_calculations = {}
-    
-    # Present value of $1 annuity
-    annuity_pv = Decimal('0')
-    for year in range(1, term_years + 1):
-        discount = (Decimal('1') + interest_rate) ** -year
-        survival = (Decimal('1') - rate) ** year
-        annuity_pv += discount * survival
-    
-    pv_calculations["annuity_present_value"] = float(annuity_pv)
-    
-    # Present value of insurance benefit
-    if sum_insured:
-        insurance_pv = Decimal('0')
-        for year in range(1, term_years + 1):
-            discount = (Decimal('1') + interest_rate) ** -year
-            death_prob = rate * ((Decimal('1') - rate) ** (year - 1))
-            insurance_pv += discount * death_prob * sum_insured
-        
-        pv_calculations["insurance_present_value"] = float(insurance_pv)
-        pv_calculations["net_single_premium"] = float(insurance_pv)
-    
-    return pv_calculations
-
-
-def _calculate_reserve(
-    annual_premium: Decimal,
-    term_years: int,
-    interest_rate: Decimal
-) -> Decimal:
-    """
-    Calculate policy reserve
-    
-    Args:
-        annual_premium: Annual premium
-        term_years: Policy term
-        interest_rate: Interest rate
-        
-    Returns:
-        Reserve amount
-    """
-    # Simplified reserve calculation
-    # In practice, would use more sophisticated methods
-    reserve = annual_premium * term_years * Decimal('0.3')  # 30% of total premiums
-    
-    # Adjust for interest
-    discount_factor = (
-        (Decimal('1') - (Decimal('1') + interest_rate) ** -term_years) /
-        interest_rate
+    mortality = index_for_table(table).dense_array(
+        mortality_column_key(gender, smoking_status),
+        stop=kernels.LIFE_EXPECTANCY_MAX_AGE
     )
-    
-    return reserve * discount_factor
+    return float(kernels.life_expectancies(mortality, np.array([current_age]))[0])
 
 
 def calculate_risk_premium(
@@ -733,6 +730,45 @@ def import_actuarial_table(
         raise BadRequestException(f"Import failed: {str(e)}")
 
 
+def bulk_import_actuarial_table(
+    db: Session,
+    stream: IO[bytes],
+    table_metadata: Dict[str, Any],
+    created_by: Optional[UUID] = None,
+    validate_only: bool = False
+) -> Dict[str, Any]:
+    """
+    Import an actuarial table from a CSV stream through the COPY pipeline
+    
+    Args:
+        db: Database session
+        stream: Binary CSV stream (header with age, rate, ...)
+        table_metadata: Table metadata
+        created_by: User performing import
+        validate_only: Validate rows without creating the table
+        
+    Returns:
+        Created table summary (None when validate_only) and import statistics
+    """
+    table, result = repo.bulk_import_actuarial_table(
+        db,
+        iter_csv_records(stream),
+        table_metadata,
+        created_by,
+        validate_only=validate_only
+    )
+    
+    return {
+        "table": {
+            "id": str(table.id),
+            "table_code": table.table_code,
+            "table_name": table.table_name,
+            "version": table.version
+        } if table else None,
+        "import": result.to_dict()
+    }
+
+
 def export_actuarial_tables(
     db: Session,
     export_request: ActuarialTableExport
@@ -790,6 +826,58 @@ def export_actuarial_tables(
     }
 
 
+def stream_actuarial_table_rows(
+    db: Session,
+    table_ids: List[UUID],
+    include_table_columns: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the data rows of actuarial tables for CSV/NDJSON export
+    
+    Rows are expanded in the database and read through a server-side
+    cursor, so memory does not grow with table size.
+    
+    Args:
+        db: Database session (used only to check the tables exist)
+        table_ids: Table UUIDs
+        include_table_columns: Prefix each row with table_id/table_code
+        
+    Returns:
+        Iterator of row dicts
+        
+    Raises:
+        NotFoundException: If a table does not exist
+    """
+    codes = repo.get_actuarial_table_codes(db, table_ids)
+    missing = [str(table_id) for table_id in table_ids if table_id not in codes]
+    if missing:
+        raise NotFoundException(f"Actuarial table(s) not found: {', '.join(missing)}")
+    
+    if include_table_columns:
+        def to_dict(row) -> Dict[str, Any]:
+            return {"table_id": str(row.table_id), "table_code": row.table_code, **row.value}
+    else:
+        def to_dict(row) -> Dict[str, Any]:
+            return row.value
+    
+    return stream_query(repo.actuarial_table_rows_statement(table_ids), to_dict, scalars=False)
+
+
+def actuarial_table_row_columns(
+    db: Session,
+    table_ids: List[UUID],
+    include_table_columns: bool = True
+) -> List[str]:
+    """
+    CSV columns for stream_actuarial_table_rows: the union of the tables'
+    row keys (first-seen order), so mixed row schemas keep every column
+    """
+    keys = repo.get_actuarial_table_row_keys(db, table_ids)
+    if include_table_columns:
+        return ["table_id", "table_code"] + [key for key in keys if key not in ("table_id", "table_code")]
+    return keys
+
+
 # ================================================================
 # TABLE COMPARISON & ANALYSIS
 # ================================================================
@@ -989,12 +1077,8 @@ def analyze_mortality_improvement(
     # Calculate life expectancy change at key ages
     for test_age in [0, 20, 40, 60, 80]:
         if test_age >= min_age and test_age <= max_age:
-            old_le = _calculate_life_expectancy(
-                old_table.table_data, test_age, None, None
-            )
-            new_le = _calculate_life_expectancy(
-                new_table.table_data, test_age, None, None
-            )
+            old_le = _calculate_life_expectancy(old_table, test_age, None, None)
+            new_le = _calculate_life_expectancy(new_table, test_age, None, None)
             
             analysis["life_expectancy_change"][f"age_{test_age}"] = {
                 "old": old_le,
@@ -35,6 +35,7 @@ from app.modules.pricing.profiles.models.quotation_pricing_profile_model import
 )
 from app.modules.pricing.profiles.models.quotation_pricing_rule_model import QuotationPricingRule
 from app.modules.pricing.profiles.models.quotation_pricing_profile_rule_model import QuotationPricingProfileRule
+from app.modules.analytics.services.daily_rollup_service import DailyRollupService, PRICING_PROFILES
 from app.core.exceptions import (
     NotFoundError as EntityNotFoundError, 
     BusinessLogicError, 
@@ -656,25 +657,33 @@ class QuotationPricingProfileRepository:
             # Basic counts
             analytics = {}
             
-            # Profile counts by status
-            status_counts = self.db.query(
-                QuotationPricingProfile.status,
-                func.count(QuotationPricingProfile.id).label('count')
-            ).filter(
-                QuotationPricingProfile.is_deleted == False
-            ).group_by(QuotationPricingProfile.status).all()
-            
-            analytics['status_distribution'] = {status.status: status.count for status in status_counts}
-            
-            # Profile counts by insurance type
-            insurance_counts = self.db.query(
-                QuotationPricingProfile.insurance_type,
-                func.count(QuotationPricingProfile.id).label('count')
-            ).filter(
-                QuotationPricingProfile.is_deleted == False
-            ).group_by(QuotationPricingProfile.insurance_type).all()
-            
-            analytics['insurance_type_distribution'] = {ins.insurance_type: ins.count for ins in insurance_counts}
+            # Status/insurance type counts come from the daily rollups once refreshed
+            rollups = DailyRollupService(self.db).read(PRICING_PROFILES)
+            if rollups is not None:
+                analytics['status_distribution'] = {
+                    status or None: count for status, count in rollups.counts('status', skip_blank=False).items()
+                }
+                analytics['insurance_type_distribution'] = rollups.counts_by_product('status')
+            else:
+                # Profile counts by status
+                status_counts = self.db.query(
+                    QuotationPricingProfile.status,
+                    func.count(QuotationPricingProfile.id).label('count')
+                ).filter(
+                    QuotationPricingProfile.is_deleted == False
+                ).group_by(QuotationPricingProfile.status).all()
+                
+                analytics['status_distribution'] = {status.status: status.count for status in status_counts}
+                
+                # Profile counts by insurance type
+                insurance_counts = self.db.query(
+                    QuotationPricingProfile.insurance_type,
+                    func.count(QuotationPricingProfile.id).label('count')
+                ).filter(
+                    QuotationPricingProfile.is_deleted == False
+                ).group_by(QuotationPricingProfile.insurance_type).all()
+                
+                analytics['insurance_type_distribution'] = {ins.insurance_type: ins.count for ins in insurance_counts}
             
             # Premium statistics
             premium_stats = self.db.query(
@@ -695,13 +704,17 @@ class QuotationPricingProfileRepository:
                 'total_usage_count': premium_stats.total_usage or 0
             }
             
-            # Recent activity
-            recent_created = self.db.query(func.count(QuotationPricingProfile.id)).filter(
-                and_(
-                    QuotationPricingProfile.created_at >= cutoff_date,
-                    QuotationPricingProfile.is_deleted == False
-                )
-            ).scalar()
+            # Recent activity (creations per whole day from the rollups once refreshed)
+            recent = DailyRollupService(self.db).read(PRICING_PROFILES, start_date=cutoff_date.date())
+            if recent is not None:
+                recent_created = recent.totals('status').row_count
+            else:
+                recent_created = self.db.query(func.count(QuotationPricingProfile.id)).filter(
+                    and_(
+                        QuotationPricingProfile.created_at >= cutoff_date,
+                        QuotationPricingProfile.is_deleted == False
+                    )
+                ).scalar()
             
             recent_updated = self.db.query(func.count(QuotationPricingProfile.id)).filter(
                 and_(
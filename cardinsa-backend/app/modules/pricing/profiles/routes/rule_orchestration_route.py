@@ -23,6 +23,7 @@ from app.modules.pricing.profiles.services.rule_orchestration_engine import (
     CacheStrategy,
     ConflictResolutionStrategy
 )
+from app.modules.pricing.calculations.services.pricing_engine_registry import pricing_engine_registry
 from app.modules.pricing.profiles.services.age_bracket_integration import (
     DemographicProfile,
     Gender
@@ -117,8 +118,8 @@ class HealthCheckResponse(BaseModel):
 # =============================================================================
 
 def get_orchestration_engine(db: Session = Depends(get_db)) -> RuleOrchestrationEngine:
-    """Dependency to get rule orchestration engine."""
-    return RuleOrchestrationEngine(db)
+    """Dependency to get rule orchestration engine (a per-request view of the shared engine)."""
+    return pricing_engine_registry.orchestration_engine(db)
 
 # =============================================================================
 # MAIN ORCHESTRATION ENDPOINTS
@@ -261,13 +262,81 @@ async def orchestrate_profile_rules(
     try:
         logger.info(f"Starting profile orchestration for profile {profile_id}, user {current_user.id}")
         
-        # Get rules for the profile (would need to implement this query)
-        # For now, we'll return an error indicating this needs implementation
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="Profile rule retrieval not yet implemented. Use /execute endpoint with explicit rule IDs."
+        if config:
+            engine.update_configuration(OrchestrationConfig(
+                execution_strategy=ExecutionStrategy(config.execution_strategy),
+                cache_strategy=CacheStrategy(config.cache_strategy),
+                conflict_resolution=ConflictResolutionStrategy(config.conflict_resolution),
+                max_execution_time=config.max_execution_time,
+                enable_parallel_evaluation=config.enable_parallel_evaluation,
+                max_parallel_rules=config.max_parallel_rules,
+                enable_performance_monitoring=config.enable_performance_monitoring,
+                cache_ttl=config.cache_ttl
+            ))
+        
+        # Active rules of the profile, in execution order (one cached query)
+        rule_ids = engine.rule_loader.get_profile_rule_ids(db, profile_id)
+        if not rule_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No active rules found for profile {profile_id}"
+            )
+        
+        profile = None
+        if demographic_profile:
+            profile = DemographicProfile(
+                age=demographic_profile.age,
+                gender=Gender(demographic_profile.gender),
+                territory=demographic_profile.territory,
+                occupation=demographic_profile.occupation,
+                risk_factors=demographic_profile.risk_factors
+            )
+        
+        result = await engine.orchestrate_pricing_rules(
+            rule_ids=rule_ids,
+            input_data=input_data,
+            demographic_profile=profile,
+            base_premium=base_premium,
+            benefit_type=benefit_type,
+            profile_id=profile_id
         )
         
+        rule_results = [
+            RuleExecutionResultSchema(
+                rule_id=r.rule_id,
+                rule_name=r.rule_name,
+                execution_time=r.execution_time,
+                success=r.success,
+                condition_met=r.condition_met,
+                impact_applied=r.impact_applied,
+                result_value=r.result_value,
+                error_message=r.error_message,
+                cache_hit=r.cache_hit,
+                execution_details=r.execution_details
+            )
+            for r in result.rule_results
+        ]
+        
+        logger.info(f"Profile orchestration completed: {result.rules_applied}/{result.rules_evaluated} rules applied in {result.total_execution_time:.3f}s")
+        
+        return OrchestrationResponse(
+            total_execution_time=result.total_execution_time,
+            rules_evaluated=result.rules_evaluated,
+            rules_applied=result.rules_applied,
+            conflicts_detected=result.conflicts_detected,
+            conflicts_resolved=result.conflicts_resolved,
+            final_premium=result.final_premium,
+            base_premium=result.base_premium,
+            total_adjustment_factor=result.total_adjustment_factor,
+            rule_results=rule_results,
+            demographic_calculation=result.demographic_calculation,
+            performance_metrics=result.performance_metrics,
+            cache_statistics=result.cache_statistics
+        )
+        
+    except HTTPException:
+        raise
+    
     except Exception as e:
         logger.error(f"Error in profile orchestration: {str(e)}")
         raise HTTPException(
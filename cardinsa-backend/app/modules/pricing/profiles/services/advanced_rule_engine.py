@@ -4,11 +4,15 @@ Advanced Multi-Condition Logic Engine for Step 6 Completion
 Handles complex rule evaluation with AND/OR/NOT operators and nested conditions
 """
 
-from typing import List, Optional, Dict, Any, Union, Tuple
+from typing import List, Optional, Dict, Any, Union, Tuple, Callable
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
+from collections import OrderedDict
+from threading import Lock
 import json
+import operator
+import weakref
 from enum import Enum
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
@@ -19,6 +23,8 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+Predicate = Callable[[Dict[str, Any]], bool]
+
 
 class LogicalOperator(str, Enum):
     """Supported logical operators for complex conditions."""
@@ -81,6 +87,8 @@ class AdvancedRule:
     is_active: bool = True
     created_at: datetime = None
     updated_at: datetime = None
+    # Identity of this parsed variant (e.g. rule + profile overrides); see rule_version()
+    version: Any = None
     
     def __post_init__(self):
         if self.dependencies is None:
@@ -89,25 +97,59 @@ class AdvancedRule:
             self.conflicts_with = []
 
 
+def rule_version(rule: AdvancedRule) -> Any:
+    """
+    Cache version of a rule: its explicit ``version`` when set (loaders set
+    it to cover profile overrides), else updated_at or created_at.
+    """
+    if rule.version is not None:
+        return rule.version
+    return rule.updated_at or rule.created_at
+
+
+# Compiled predicates are shared by every engine instance in the process.
+# Rules are keyed by (rule_id, rule_version); bare condition trees by node identity.
+_COMPILED_RULE_CACHE_SIZE = 2048
+_compiled_rules: "OrderedDict[Tuple[UUID, Any], Predicate]" = OrderedDict()
+_compiled_nodes: Dict[int, Tuple[weakref.ref, Predicate]] = {}
+_compile_lock = Lock()
+
+
+def _always_false(data: Dict[str, Any]) -> bool:
+    return False
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
 class MultiConditionLogicEngine:
     """
     Advanced logic engine for evaluating complex multi-condition rules.
     Supports nested AND/OR/NOT operations and various comparison operators.
+    
+    Condition trees are compiled once into nested closures: field paths are
+    pre-split into accessors, operator dispatch and constant conversions
+    happen at compile time, and AND/OR children are ordered cheapest-first
+    so short-circuiting skips the expensive branches.
     """
     
     def __init__(self, db: Session = None):
         self.db = db or next(get_db())
-        self.comparison_operators = {
-            ComparisonOperator.EQUALS: self._equals,
-            ComparisonOperator.GREATER_THAN: self._greater_than,
-            ComparisonOperator.GREATER_EQUAL: self._greater_equal,
-            ComparisonOperator.LESS_THAN: self._less_than,
-            ComparisonOperator.LESS_EQUAL: self._less_equal,
-            ComparisonOperator.IN: self._in_operator,
-            ComparisonOperator.BETWEEN: self._between,
-            ComparisonOperator.CONTAINS: self._contains,
-            ComparisonOperator.STARTS_WITH: self._starts_with,
-            ComparisonOperator.ENDS_WITH: self._ends_with,
+        self.leaf_compilers = {
+            ComparisonOperator.EQUALS: self._compile_equals,
+            ComparisonOperator.GREATER_THAN: self._compile_ordering(operator.gt),
+            ComparisonOperator.GREATER_EQUAL: self._compile_ordering(operator.ge),
+            ComparisonOperator.LESS_THAN: self._compile_ordering(operator.lt),
+            ComparisonOperator.LESS_EQUAL: self._compile_ordering(operator.le),
+            ComparisonOperator.IN: self._compile_in,
+            ComparisonOperator.BETWEEN: self._compile_between,
+            ComparisonOperator.CONTAINS: self._compile_string_test(lambda field, value: value in field),
+            ComparisonOperator.STARTS_WITH: self._compile_string_test(str.startswith),
+            ComparisonOperator.ENDS_WITH: self._compile_string_test(str.endswith),
         }
     
     # ============================================================================
@@ -130,164 +172,246 @@ class MultiConditionLogicEngine:
             Boolean result of condition evaluation
         """
         try:
-            if conditions.is_comparison():
-                return self._evaluate_comparison(conditions, input_data)
-            elif conditions.is_logical():
-                return self._evaluate_logical(conditions, input_data)
-            else:
-                logger.warning(f"Unknown condition type: {conditions}")
-                return False
-                
+            return self.compile_conditions(conditions)(input_data)
         except Exception as e:
             logger.error(f"Error evaluating conditions: {str(e)}")
             return False
     
-    def _evaluate_comparison(
-        self,
-        condition: ConditionNode,
-        input_data: Dict[str, Any]
-    ) -> bool:
-        """Evaluate a single comparison condition."""
-        if not condition.field:
-            logger.warning("Comparison condition missing field name")
+    def evaluate_rule(self, rule: AdvancedRule, input_data: Dict[str, Any]) -> bool:
+        """
+        Evaluate a rule's conditions using the predicate cached for its version.
+        
+        Args:
+            rule: Rule whose conditions are evaluated
+            input_data: Input data for evaluation
+            
+        Returns:
+            Boolean result of condition evaluation
+        """
+        try:
+            return self.compile_rule(rule)(input_data)
+        except Exception as e:
+            logger.error(f"Error evaluating rule {rule.rule_id}: {str(e)}")
             return False
+    
+    # ============================================================================
+    # COMPILATION
+    # ============================================================================
+    
+    def compile_rule(self, rule: AdvancedRule) -> Predicate:
+        """
+        Get the compiled predicate for a rule, compiling it on first use.
         
-        field_value = self._get_nested_field_value(input_data, condition.field)
+        The cache key is (rule_id, rule_version(rule)), so editing a rule, or
+        loading it with different profile overrides, compiles it afresh.
+        """
+        key = (rule.rule_id, rule_version(rule))
+        with _compile_lock:
+            predicate = _compiled_rules.get(key)
+            if predicate is not None:
+                _compiled_rules.move_to_end(key)
+                return predicate
         
-        if field_value is None:
-            logger.debug(f"Field {condition.field} not found in input data")
-            return False
+        predicate = self._compile_node(rule.conditions)
+        with _compile_lock:
+            _compiled_rules[key] = predicate
+            while len(_compiled_rules) > _COMPILED_RULE_CACHE_SIZE:
+                _compiled_rules.popitem(last=False)
+        return predicate
+    
+    def compile_conditions(self, conditions: ConditionNode) -> Predicate:
+        """
+        Get the compiled predicate for a condition tree.
+        
+        Predicates are cached for the lifetime of the ConditionNode object;
+        trees must not be mutated after their first evaluation.
+        """
+        node_id = id(conditions)
+        cached = _compiled_nodes.get(node_id)
+        if cached is not None and cached[0]() is conditions:
+            return cached[1]
+        
+        predicate = self._compile_node(conditions)
+        ref = weakref.ref(conditions, lambda _ref, node_id=node_id: _compiled_nodes.pop(node_id, None))
+        with _compile_lock:
+            _compiled_nodes[node_id] = (ref, predicate)
+        return predicate
+    
+    def _compile_node(self, condition: ConditionNode) -> Predicate:
+        """Compile one node (and its subtree) into a predicate."""
+        if condition.is_comparison():
+            return self._compile_comparison(condition)
+        elif condition.is_logical():
+            return self._compile_logical(condition)
+        
+        logger.warning(f"Unknown condition type: {condition}")
+        return _always_false
+    
+    def _compile_comparison(self, condition: ConditionNode) -> Predicate:
+        """Compile a single comparison condition."""
+        if not condition.field:
+            logger.warning("Comparison condition missing field name")
+            return _always_false
         
-        operator_func = self.comparison_operators.get(condition.operator)
-        if not operator_func:
+        compile_leaf = self.leaf_compilers.get(condition.operator)
+        if not compile_leaf:
             logger.warning(f"Unsupported comparison operator: {condition.operator}")
-            return False
+            return _always_false
+        
+        get_field = self._compile_field_accessor(condition.field)
+        test = compile_leaf(condition.value)
+        
+        def comparison(data: Dict[str, Any]) -> bool:
+            field_value = get_field(data)
+            if field_value is None:
+                return False
+            try:
+                return test(field_value)
+            except Exception:
+                return False
         
-        return operator_func(field_value, condition.value)
+        return comparison
     
-    def _evaluate_logical(
-        self,
-        condition: ConditionNode,
-        input_data: Dict[str, Any]
-    ) -> bool:
-        """Evaluate logical operators (AND/OR/NOT)."""
+    def _compile_logical(self, condition: ConditionNode) -> Predicate:
+        """Compile logical operators (AND/OR/NOT)."""
         if not condition.conditions:
             logger.warning("Logical condition missing sub-conditions")
-            return False
-        
-        if condition.operator == LogicalOperator.AND:
-            return all(
-                self.evaluate_conditions(sub_condition, input_data)
-                for sub_condition in condition.conditions
-            )
-        
-        elif condition.operator == LogicalOperator.OR:
-            return any(
-                self.evaluate_conditions(sub_condition, input_data)
-                for sub_condition in condition.conditions
-            )
+            return _always_false
         
-        elif condition.operator == LogicalOperator.NOT:
+        if condition.operator == LogicalOperator.NOT:
             if len(condition.conditions) != 1:
                 logger.warning("NOT operator requires exactly one sub-condition")
-                return False
-            return not self.evaluate_conditions(condition.conditions[0], input_data)
+                return _always_false
+            inner = self._compile_node(condition.conditions[0])
+            return lambda data: not inner(data)
         
-        else:
+        if condition.operator not in (LogicalOperator.AND, LogicalOperator.OR):
             logger.warning(f"Unsupported logical operator: {condition.operator}")
+            return _always_false
+        
+        # Evaluation is side-effect free, so children can run cheapest-first
+        children = sorted(condition.conditions, key=self._estimate_cost)
+        predicates = tuple(self._compile_node(child) for child in children)
+        
+        if condition.operator == LogicalOperator.AND:
+            def all_of(data: Dict[str, Any]) -> bool:
+                for predicate in predicates:
+                    if not predicate(data):
+                        return False
+                return True
+            return all_of
+        
+        def any_of(data: Dict[str, Any]) -> bool:
+            for predicate in predicates:
+                if predicate(data):
+                    return True
             return False
+        return any_of
+    
+    def _estimate_cost(self, condition: ConditionNode) -> int:
+        """Rough relative cost of evaluating a node, used for short-circuit ordering."""
+        if condition.is_logical():
+            return 1 + sum(self._estimate_cost(child) for child in condition.conditions or [])
+        if condition.operator in (
+            ComparisonOperator.CONTAINS, ComparisonOperator.STARTS_WITH, ComparisonOperator.ENDS_WITH
+        ):
+            return 3
+        return 1 + (condition.field or '').count('.')
     
     # ============================================================================
-    # COMPARISON OPERATOR IMPLEMENTATIONS
+    # COMPARISON OPERATOR COMPILERS
     # ============================================================================
     
-    def _equals(self, field_value: Any, condition_value: Any) -> bool:
+    def _compile_equals(self, condition_value: Any) -> Callable[[Any], bool]:
         """Equality comparison."""
-        return field_value == condition_value
-    
-    def _greater_than(self, field_value: Any, condition_value: Any) -> bool:
-        """Greater than comparison."""
-        try:
-            return float(field_value) > float(condition_value)
-        except (ValueError, TypeError):
-            return str(field_value) > str(condition_value)
-    
-    def _greater_equal(self, field_value: Any, condition_value: Any) -> bool:
-        """Greater than or equal comparison."""
-        try:
-            return float(field_value) >= float(condition_value)
-        except (ValueError, TypeError):
-            return str(field_value) >= str(condition_value)
-    
-    def _less_than(self, field_value: Any, condition_value: Any) -> bool:
-        """Less than comparison."""
-        try:
-            return float(field_value) < float(condition_value)
-        except (ValueError, TypeError):
-            return str(field_value) < str(condition_value)
-    
-    def _less_equal(self, field_value: Any, condition_value: Any) -> bool:
-        """Less than or equal comparison."""
-        try:
-            return float(field_value) <= float(condition_value)
-        except (ValueError, TypeError):
-            return str(field_value) <= str(condition_value)
-    
-    def _in_operator(self, field_value: Any, condition_value: Any) -> bool:
+        return lambda field_value: field_value == condition_value
+    
+    @staticmethod
+    def _compile_ordering(compare: Callable[[Any, Any], bool]) -> Callable[[Any], Callable[[Any], bool]]:
+        """Numeric >, >=, <, <= with a string-comparison fallback."""
+        def compile_leaf(condition_value: Any) -> Callable[[Any], bool]:
+            number = _to_float(condition_value)
+            text = str(condition_value)
+            
+            if number is None:
+                return lambda field_value: compare(str(field_value), text)
+            
+            def test(field_value: Any) -> bool:
+                try:
+                    return compare(float(field_value), number)
+                except (ValueError, TypeError):
+                    return compare(str(field_value), text)
+            return test
+        return compile_leaf
+    
+    def _compile_in(self, condition_value: Any) -> Callable[[Any], bool]:
         """IN operator - check if value is in list."""
         if not isinstance(condition_value, (list, tuple, set)):
-            return False
-        return field_value in condition_value
+            return lambda field_value: False
+        try:
+            members = frozenset(condition_value)
+        except TypeError:
+            members = tuple(condition_value)
+        return lambda field_value: field_value in members
     
-    def _between(self, field_value: Any, condition_value: Any) -> bool:
+    def _compile_between(self, condition_value: Any) -> Callable[[Any], bool]:
         """BETWEEN operator - check if value is between two values."""
         if not isinstance(condition_value, (list, tuple)) or len(condition_value) != 2:
-            return False
+            return lambda field_value: False
         
-        try:
-            value = float(field_value)
-            min_val = float(condition_value[0])
-            max_val = float(condition_value[1])
-            return min_val <= value <= max_val
-        except (ValueError, TypeError):
-            value_str = str(field_value)
-            return str(condition_value[0]) <= value_str <= str(condition_value[1])
-    
-    def _contains(self, field_value: Any, condition_value: Any) -> bool:
-        """CONTAINS operator - check if field contains value."""
-        return str(condition_value).lower() in str(field_value).lower()
-    
-    def _starts_with(self, field_value: Any, condition_value: Any) -> bool:
-        """STARTS_WITH operator."""
-        return str(field_value).lower().startswith(str(condition_value).lower())
-    
-    def _ends_with(self, field_value: Any, condition_value: Any) -> bool:
-        """ENDS_WITH operator."""
-        return str(field_value).lower().endswith(str(condition_value).lower())
+        low_text, high_text = str(condition_value[0]), str(condition_value[1])
+        low, high = _to_float(condition_value[0]), _to_float(condition_value[1])
+        
+        if low is None or high is None:
+            return lambda field_value: low_text <= str(field_value) <= high_text
+        
+        def test(field_value: Any) -> bool:
+            try:
+                return low <= float(field_value) <= high
+            except (ValueError, TypeError):
+                return low_text <= str(field_value) <= high_text
+        return test
+    
+    @staticmethod
+    def _compile_string_test(check: Callable[[str, str], bool]) -> Callable[[Any], Callable[[Any], bool]]:
+        """Case-insensitive CONTAINS / STARTS_WITH / ENDS_WITH."""
+        def compile_leaf(condition_value: Any) -> Callable[[Any], bool]:
+            needle = str(condition_value).lower()
+            return lambda field_value: check(str(field_value).lower(), needle)
+        return compile_leaf
     
     # ============================================================================
     # UTILITY METHODS
     # ============================================================================
     
-    def _get_nested_field_value(self, data: Dict[str, Any], field_path: str) -> Any:
+    def _compile_field_accessor(self, field_path: str) -> Callable[[Dict[str, Any]], Any]:
         """
-        Get value from nested dictionary using dot notation.
+        Build an accessor for a dot-notation path; the path is split once.
         
         Examples:
             'age' -> data['age']
             'member.age' -> data['member']['age']
             'coverage.benefits.dental' -> data['coverage']['benefits']['dental']
         """
-        keys = field_path.split('.')
-        current = data
+        keys = tuple(field_path.split('.'))
         
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return None
+        if len(keys) == 1:
+            key = keys[0]
+            return lambda data: data.get(key) if isinstance(data, dict) else None
         
-        return current
+        def get_nested(data: Dict[str, Any]) -> Any:
+            current = data
+            for key in keys:
+                if isinstance(current, dict) and key in current:
+                    current = current[key]
+                else:
+                    return None
+            return current
+        return get_nested
+    
+    def _get_nested_field_value(self, data: Dict[str, Any], field_path: str) -> Any:
+        """Get value from nested dictionary using dot notation."""
+        return self._compile_field_accessor(field_path)(data)
     
     def parse_condition_json(self, condition_json: Union[str, Dict]) -> ConditionNode:
         """
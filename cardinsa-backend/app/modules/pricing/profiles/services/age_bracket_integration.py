@@ -5,7 +5,7 @@ Handles demographic pricing with age, gender, territory, and actuarial tables
 """
 
 from typing import List, Optional, Dict, Any, Tuple, Union
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime, date
 from decimal import Decimal
 from enum import Enum
@@ -16,6 +16,10 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.exceptions import ValidationError, BusinessLogicError
 from app.core.logging import get_logger
+from app.modules.pricing.product.services.actuarial_rate_index import (
+    ActuarialRateIndex,
+    get_rate_index
+)
 
 logger = get_logger(__name__)
 
@@ -607,7 +611,7 @@ class AdvancedAgeBracketIntegration:
             }
         
         table = ActuarialTable(
-            table_id=UUID.hex,
+            table_id=uuid4(),
             name=name,
             table_type=table_type,
             rates=decimal_rates,
@@ -642,14 +646,10 @@ class AdvancedAgeBracketIntegration:
         gender: Gender
     ) -> Optional[Decimal]:
         """Internal method to get actuarial rate."""
-        age_str = str(age)
+        index = self._get_rate_index(table)
         
-        if age_str in table.rates:
-            gender_rates = table.rates[age_str]
-            if gender.value in gender_rates:
-                return gender_rates[gender.value]
-            elif "UNISEX" in gender_rates:
-                return gender_rates["UNISEX"]
+        if index.has_age(age):
+            return index.get(age, gender.value)
         
         # Try to interpolate between nearby ages
         return self._interpolate_actuarial_rate(table, age, gender)
@@ -661,44 +661,7 @@ class AdvancedAgeBracketIntegration:
         gender: Gender
     ) -> Optional[Decimal]:
         """Interpolate actuarial rate between available ages."""
-        available_ages = [int(age_str) for age_str in table.rates.keys()]
-        if not available_ages:
-            return None
-        
-        available_ages.sort()
-        
-        # Find bounding ages
-        lower_age = None
-        upper_age = None
-        
-        for available_age in available_ages:
-            if available_age <= age:
-                lower_age = available_age
-            if available_age >= age and upper_age is None:
-                upper_age = available_age
-                break
-        
-        # If exact match or no interpolation possible
-        if lower_age == age:
-            return self._get_rate_for_age(table, lower_age, gender)
-        
-        if lower_age is None or upper_age is None:
-            # Use closest available age
-            closest_age = min(available_ages, key=lambda x: abs(x - age))
-            return self._get_rate_for_age(table, closest_age, gender)
-        
-        # Linear interpolation
-        lower_rate = self._get_rate_for_age(table, lower_age, gender)
-        upper_rate = self._get_rate_for_age(table, upper_age, gender)
-        
-        if lower_rate is None or upper_rate is None:
-            return None
-        
-        # Interpolation formula
-        weight = (age - lower_age) / (upper_age - lower_age)
-        interpolated_rate = lower_rate + (upper_rate - lower_rate) * Decimal(str(weight))
-        
-        return interpolated_rate
+        return self._get_rate_index(table).interpolate(age, gender.value)
     
     def _get_rate_for_age(
         self,
@@ -706,27 +669,15 @@ class AdvancedAgeBracketIntegration:
         age: int,
         gender: Gender
     ) -> Optional[Decimal]:
-        """Get rate for specific age, handling gender fallbacks."""
-        age_str = str(age)
-        if age_str not in table.rates:
-            return None
-        
-        gender_rates = table.rates[age_str]
-        
-        # Try exact gender match first
-        if gender.value in gender_rates:
-            return gender_rates[gender.value]
-        
-        # Fallback to unisex if available
-        if "UNISEX" in gender_rates:
-            return gender_rates["UNISEX"]
-        
-        # Fallback to average of available genders
-        if gender_rates:
-            rates = list(gender_rates.values())
-            return sum(rates) / len(rates)
-        
-        return None
+        """Get rate for specific age, handling gender fallbacks (gender, UNISEX, average)."""
+        return self._get_rate_index(table).get(age, gender.value)
+    
+    def _get_rate_index(self, table: ActuarialTable) -> ActuarialRateIndex:
+        """Age index over the table's rates, built once per table version."""
+        return get_rate_index(
+            ("rate_mapping", table.table_id, table.version, table.effective_date),
+            lambda: ActuarialRateIndex.from_rate_mapping(table.rates)
+        )
     
     # ============================================================================
     # HELPER METHODS
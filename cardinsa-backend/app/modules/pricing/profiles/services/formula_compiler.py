@@ -0,0 +1,348 @@
+# app/modules/pricing/profiles/services/formula_compiler.py
+
+"""
+Formula Compiler
+Shared safe compiler for pricing and benefit formulas.
+
+A formula is parsed and validated once, then compiled into nested
+closures (one per AST node) and cached by its text. The same tree is also
+compiled for NumPy column arrays, so ``evaluate_many`` prices a whole batch
+in one pass instead of walking the AST per row.
+
+Besides arithmetic, formulas may use comparisons, ``and``/``or``/``not``
+and conditional expressions (``x if condition else y``), e.g.
+``base_premium * (1.2 if age > 60 else 1)``. String constants are only
+allowed as comparison operands (``gender == 'male'``).
+"""
+
+import ast
+import math
+import operator
+from collections import OrderedDict
+from functools import reduce
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Sequence, Union
+
+import numpy as np
+
+from app.core.exceptions import ValidationError
+
+
+# Supported operators (scalar and array evaluation use the same functions)
+SAFE_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+# Supported comparisons (chains like ``18 <= age < 65`` are allowed)
+SAFE_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# Supported functions
+SAFE_FUNCTIONS = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'round': round,
+    'pow': pow,
+    'floor': math.floor,
+    'ceil': math.ceil,
+    'sum': sum,
+    'len': len,
+}
+
+# Element-wise equivalents; formulas using other functions are evaluated row by row
+VECTOR_FUNCTIONS = {
+    'abs': np.abs,
+    'min': lambda *args: reduce(np.minimum, args),
+    'max': lambda *args: reduce(np.maximum, args),
+    'round': lambda value, ndigits=0: np.round(value, int(ndigits)),
+    'pow': lambda base, exponent: np.power(base, exponent),
+    'floor': np.floor,
+    'ceil': np.ceil,
+}
+
+_FORMULA_CACHE_SIZE = 1024
+_formula_cache: "OrderedDict[str, CompiledFormula]" = OrderedDict()
+_formula_lock = Lock()
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+class CompiledFormula:
+    """
+    A validated formula compiled for scalar and batch evaluation.
+
+    Attributes:
+        formula: The formula text it was compiled from
+        variables: Variable names the formula reads
+        functions: Function names the formula calls
+        complexity: Operator/comparison/branch count (calls weigh 2)
+    """
+
+    def __init__(self, formula: str, tree: ast.Expression):
+        self.formula = formula
+        self.variables: FrozenSet[str] = frozenset(
+            node.id for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and node.id not in SAFE_FUNCTIONS
+        )
+        self.functions: FrozenSet[str] = frozenset(
+            node.func.id for node in ast.walk(tree) if isinstance(node, ast.Call)
+        )
+        self.complexity = sum(
+            2 if isinstance(node, ast.Call) else 1
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Call, ast.Compare, ast.BoolOp, ast.IfExp))
+        )
+        # Columns are float arrays, so string comparisons are evaluated row by row
+        self.vectorizable = self.functions <= VECTOR_FUNCTIONS.keys() and not any(
+            isinstance(node, ast.Constant) and isinstance(node.value, str) for node in ast.walk(tree)
+        )
+
+        self._scalar = _compile_node(tree.body, vector=False)
+        self._vector = _compile_node(tree.body, vector=True) if self.vectorizable else None
+
+    def __call__(self, variables: Mapping[str, Any]) -> Any:
+        """
+        Evaluate for one set of variables (values are used as given).
+
+        Raises:
+            ValidationError: If a variable is missing
+        """
+        return self._scalar(variables)
+
+    def evaluate_many(
+        self,
+        rows: Union[Mapping[str, Sequence[Any]], Sequence[Mapping[str, Any]]]
+    ) -> np.ndarray:
+        """
+        Evaluate over a batch.
+
+        Args:
+            rows: Either column arrays keyed by variable name, or a sequence
+                of row dicts (a missing value becomes NaN)
+
+        Returns:
+            float64 array with one result per row; rows whose result is
+            undefined (division by zero, domain errors) hold inf/NaN
+
+        Raises:
+            ValidationError: If a column for a variable is missing
+        """
+        columns = self._columns(rows)
+        if isinstance(rows, Mapping):
+            length = len(next(iter(rows.values()))) if rows else 0
+        else:
+            length = len(rows)
+
+        if self._vector is None:
+            results = np.empty(length, dtype=np.float64)
+            for i in range(length):
+                row = {name: column[i] for name, column in columns.items()}
+                try:
+                    results[i] = float(self._scalar(row))
+                except (ArithmeticError, ValueError, TypeError):
+                    results[i] = np.nan
+            return results
+
+        with np.errstate(all='ignore'):
+            result = self._vector(columns)
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), (length,)).copy()
+
+    def _columns(
+        self,
+        rows: Union[Mapping[str, Sequence[Any]], Sequence[Mapping[str, Any]]]
+    ) -> Dict[str, np.ndarray]:
+        if isinstance(rows, Mapping):
+            missing = self.variables - rows.keys()
+            if missing:
+                raise ValidationError(f"Unknown variable: {sorted(missing)[0]}")
+            return {name: np.asarray(rows[name], dtype=np.float64) for name in self.variables}
+
+        return {
+            name: np.array(
+                [np.nan if row.get(name) is None else float(row[name]) for row in rows],
+                dtype=np.float64
+            )
+            for name in self.variables
+        }
+
+
+# ============================================================================
+# COMPILATION
+# ============================================================================
+
+def _compile_name(name: str) -> Evaluator:
+    def lookup(variables: Mapping[str, Any]) -> Any:
+        try:
+            return variables[name]
+        except KeyError:
+            raise ValidationError(f"Unknown variable: {name}")
+    return lookup
+
+
+def _compile_node(node: ast.AST, vector: bool) -> Evaluator:
+    """Compile one validated AST node into a closure (over scalars or NumPy arrays)."""
+    if isinstance(node, ast.Constant):
+        # NumPy scalars give inf/NaN instead of raising, like the array rows
+        value = np.float64(node.value) if vector else node.value
+        return lambda variables: value
+    if isinstance(node, ast.Name):
+        return _compile_name(node.id)
+    if isinstance(node, ast.BinOp):
+        op = SAFE_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, vector)
+        right = _compile_node(node.right, vector)
+        return lambda variables: op(left(variables), right(variables))
+    if isinstance(node, ast.UnaryOp):
+        op = np.logical_not if vector and isinstance(node.op, ast.Not) else SAFE_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, vector)
+        return lambda variables: op(operand(variables))
+    if isinstance(node, ast.Compare):
+        return _compile_compare(node, vector)
+    if isinstance(node, ast.BoolOp):
+        return _compile_bool_op(node, vector)
+    if isinstance(node, ast.IfExp):
+        test = _compile_node(node.test, vector)
+        body = _compile_node(node.body, vector)
+        orelse = _compile_node(node.orelse, vector)
+        if vector:
+            return lambda variables: np.where(test(variables), body(variables), orelse(variables))
+        return lambda variables: body(variables) if test(variables) else orelse(variables)
+
+    # ast.Call (validated: plain name, positional arguments only)
+    func = (VECTOR_FUNCTIONS if vector else SAFE_FUNCTIONS)[node.func.id]
+    args = tuple(_compile_node(arg, vector) for arg in node.args)
+    return lambda variables: func(*(arg(variables) for arg in args))
+
+
+def _compile_compare(node: ast.Compare, vector: bool) -> Evaluator:
+    """Comparison chain; scalars short-circuit like Python, arrays AND element-wise."""
+    operands = [_compile_node(node.left, vector)] + [_compile_node(c, vector) for c in node.comparators]
+    ops = [SAFE_COMPARISONS[type(op)] for op in node.ops]
+
+    if vector:
+        def compare_arrays(variables: Mapping[str, Any]) -> Any:
+            values = [operand(variables) for operand in operands]
+            return reduce(np.logical_and, (op(a, b) for op, a, b in zip(ops, values, values[1:])))
+        return compare_arrays
+
+    def compare(variables: Mapping[str, Any]) -> bool:
+        left = operands[0](variables)
+        for op, operand in zip(ops, operands[1:]):
+            right = operand(variables)
+            if not op(left, right):
+                return False
+            left = right
+        return True
+    return compare
+
+
+def _compile_bool_op(node: ast.BoolOp, vector: bool) -> Evaluator:
+    """``and``/``or`` returning an operand value like Python (element-wise for arrays)."""
+    values = [_compile_node(value, vector) for value in node.values]
+    is_and = isinstance(node.op, ast.And)
+
+    if vector:
+        def combine(left: Any, right: Any) -> Any:
+            truthy = left != 0
+            return np.where(truthy, right, left) if is_and else np.where(truthy, left, right)
+        return lambda variables: reduce(combine, (value(variables) for value in values))
+
+    def evaluate(variables: Mapping[str, Any]) -> Any:
+        result = None
+        for value in values:
+            result = value(variables)
+            if bool(result) != is_and:
+                return result
+        return result
+    return evaluate
+
+
+def _validate_tree(tree: ast.Expression) -> None:
+    """Reject anything but arithmetic and logic on numbers, names and safe function calls."""
+    comparison_operands = {
+        id(operand)
+        for node in ast.walk(tree.body) if isinstance(node, ast.Compare)
+        for operand in (node.left, *node.comparators)
+    }
+    for node in ast.walk(tree.body):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, str):
+                if id(node) not in comparison_operands:
+                    raise ValidationError(f"String constants are only allowed in comparisons: {node.value!r}")
+            elif not isinstance(node.value, (int, float)):
+                raise ValidationError(f"Unsupported constant: {node.value!r}")
+        elif isinstance(node, ast.Name):
+            if node.id.startswith('_'):
+                raise ValidationError(f"Invalid variable name: {node.id}")
+        elif isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            if type(node.op) not in SAFE_OPERATORS:
+                raise ValidationError(f"Unsupported operator: {type(node.op).__name__}")
+        elif isinstance(node, ast.Compare):
+            for op in node.ops:
+                if type(op) not in SAFE_COMPARISONS:
+                    raise ValidationError(f"Unsupported comparison: {type(op).__name__}")
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                raise ValidationError("Complex function calls are not allowed")
+            if node.func.id not in SAFE_FUNCTIONS:
+                raise ValidationError(f"Function '{node.func.id}' is not allowed")
+            if node.keywords:
+                raise ValidationError("Keyword arguments are not allowed")
+        elif not isinstance(node, (ast.BoolOp, ast.IfExp, ast.operator, ast.unaryop, ast.boolop, ast.cmpop, ast.expr_context)):
+            raise ValidationError(f"Unsupported expression: {type(node).__name__}")
+
+
+def compile_formula(formula: str) -> CompiledFormula:
+    """
+    Get the compiled formula for ``formula``, compiling it on first use.
+
+    Raises:
+        ValidationError: If the formula has invalid syntax or unsafe constructs
+    """
+    with _formula_lock:
+        compiled = _formula_cache.get(formula)
+        if compiled is not None:
+            _formula_cache.move_to_end(formula)
+            return compiled
+
+    try:
+        tree = ast.parse(formula.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValidationError(f"Invalid formula syntax: {str(e)}")
+    _validate_tree(tree)
+    compiled = CompiledFormula(formula, tree)
+
+    with _formula_lock:
+        _formula_cache[formula] = compiled
+        while len(_formula_cache) > _FORMULA_CACHE_SIZE:
+            _formula_cache.popitem(last=False)
+    return compiled
+
+
+def evaluate_many(
+    formula: str,
+    rows: Union[Mapping[str, Sequence[Any]], Sequence[Mapping[str, Any]]]
+) -> np.ndarray:
+    """Evaluate ``formula`` over a batch of rows or column arrays (see CompiledFormula)."""
+    return compile_formula(formula).evaluate_many(rows)
+
+
+def clear_formula_cache() -> None:
+    """Drop every compiled formula."""
+    with _formula_lock:
+        _formula_cache.clear()
@@ -6,16 +6,18 @@ Handles parsing and evaluation of risk formulas and pricing expressions.
 """
 
 import re
-import ast
-import operator
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Mapping, Sequence, Union
 from decimal import Decimal
 from uuid import UUID
+
+import numpy as np
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.logging import get_logger
 from app.core.exceptions import ValidationError, BusinessLogicError
+from app.modules.pricing.profiles.services import formula_compiler
+from app.modules.pricing.profiles.services.formula_compiler import CompiledFormula
 
 
 logger = get_logger(__name__)
@@ -27,25 +29,9 @@ class FormulaEvaluationService:
     Supports safe mathematical expressions with variables.
     """
     
-    # Supported operators for formula evaluation
-    SAFE_OPERATORS = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
-        ast.USub: operator.neg,
-        ast.UAdd: operator.pos,
-    }
-    
-    # Supported functions
-    SAFE_FUNCTIONS = {
-        'abs': abs,
-        'min': min,
-        'max': max,
-        'round': round,
-        'pow': pow,
-    }
+    # Supported operators and functions (shared with the formula compiler)
+    SAFE_OPERATORS = formula_compiler.SAFE_OPERATORS
+    SAFE_FUNCTIONS = formula_compiler.SAFE_FUNCTIONS
     
     def __init__(self, db: Session = None):
         self.db = db or next(get_db())
@@ -75,16 +61,12 @@ class FormulaEvaluationService:
             if not formula or not formula.strip():
                 return Decimal('0')
             
-            # Clean and validate the formula
-            cleaned_formula = self._clean_formula(formula)
-            self._validate_formula_safety(cleaned_formula)
+            # Clean, validate and compile (cached per formula text)
+            compiled = _compile_profile_formula(formula)
             
-            # Prepare variables
+            # Prepare variables and evaluate
             eval_vars = self._prepare_variables(variables or {})
-            
-            # Parse and evaluate
-            parsed = ast.parse(cleaned_formula, mode='eval')
-            result = self._eval_ast_node(parsed.body, eval_vars)
+            result = compiled(eval_vars)
             
             # Convert to Decimal and validate result
             decimal_result = Decimal(str(result))
@@ -93,12 +75,36 @@ class FormulaEvaluationService:
             logger.debug(f"Formula '{formula}' evaluated to {decimal_result}")
             return decimal_result
             
-        except (ValueError, TypeError, ZeroDivisionError) as e:
+        except (ValueError, TypeError, ArithmeticError) as e:
             logger.error(f"Formula evaluation error: {str(e)}")
             raise BusinessLogicError(f"Formula evaluation failed: {str(e)}")
-        except SyntaxError as e:
-            logger.error(f"Formula syntax error: {str(e)}")
-            raise ValidationError(f"Invalid formula syntax: {str(e)}")
+    
+    def evaluate_many(
+        self,
+        formula: str,
+        rows: Union[Mapping[str, Sequence[Any]], Sequence[Mapping[str, Any]]]
+    ) -> np.ndarray:
+        """
+        Evaluate a formula over a batch in one vectorized pass.
+        
+        Used for batch pricing and simulations; no per-row result bounds
+        are applied (undefined results come back as inf/NaN).
+        
+        Args:
+            formula: The formula string to evaluate
+            rows: Column arrays keyed by variable name, or a list of
+                variable dictionaries
+            
+        Returns:
+            float64 array with one result per row
+            
+        Raises:
+            ValidationError: If formula is invalid, unsafe or a column is missing
+        """
+        if not formula or not formula.strip():
+            formula = '0'
+        
+        return _compile_profile_formula(formula).evaluate_many(rows)
     
     def validate_formula(self, formula: str) -> Dict[str, Any]:
         """
@@ -123,28 +129,15 @@ class FormulaEvaluationService:
                 result['errors'].append("Formula cannot be empty")
                 return result
             
-            # Clean the formula
-            cleaned_formula = self._clean_formula(formula)
-            
-            # Check syntax
+            # Syntax and safety checks happen once, when compiling
             try:
-                parsed = ast.parse(cleaned_formula, mode='eval')
-            except SyntaxError as e:
-                result['errors'].append(f"Syntax error: {str(e)}")
-                return result
-            
-            # Check for unsafe operations
-            safety_check = self._check_formula_safety(parsed)
-            if not safety_check['is_safe']:
-                result['errors'].extend(safety_check['errors'])
+                compiled = _compile_profile_formula(formula)
+            except ValidationError as e:
+                result['errors'].append(e.message)
                 return result
             
-            # Extract variables
-            variables = self._extract_variables(parsed)
-            result['variables_found'] = list(variables)
-            
-            # Calculate complexity
-            result['complexity_score'] = self._calculate_complexity(parsed)
+            result['variables_found'] = sorted(compiled.variables)
+            result['complexity_score'] = compiled.complexity
             
             # Add warnings for high complexity
             if result['complexity_score'] > 10:
@@ -168,10 +161,7 @@ class FormulaEvaluationService:
             List of variable names found in the formula
         """
         try:
-            cleaned_formula = self._clean_formula(formula)
-            parsed = ast.parse(cleaned_formula, mode='eval')
-            variables = self._extract_variables(parsed)
-            return list(variables)
+            return sorted(_compile_profile_formula(formula).variables)
         except Exception as e:
             logger.error(f"Error extracting variables from formula: {str(e)}")
             return []
@@ -217,7 +207,8 @@ class FormulaEvaluationService:
     # PRIVATE HELPER METHODS
     # ============================================================================
     
-    def _clean_formula(self, formula: str) -> str:
+    @staticmethod
+    def _clean_formula(formula: str) -> str:
         """Clean and normalize the formula string."""
         # Remove extra whitespace
         cleaned = re.sub(r'\s+', ' ', formula.strip())
@@ -234,7 +225,8 @@ class FormulaEvaluationService:
         
         return cleaned
     
-    def _validate_formula_safety(self, formula: str) -> None:
+    @staticmethod
+    def _validate_formula_safety(formula: str) -> None:
         """Validate that the formula is safe to evaluate."""
         # Check for dangerous patterns
         dangerous_patterns = [
@@ -251,29 +243,6 @@ class FormulaEvaluationService:
             if re.search(pattern, formula, re.IGNORECASE):
                 raise ValidationError(f"Formula contains unsafe pattern: {pattern}")
     
-    def _check_formula_safety(self, parsed_ast: ast.AST) -> Dict[str, Any]:
-        """Check if the parsed AST is safe for evaluation."""
-        result = {'is_safe': True, 'errors': []}
-        
-        for node in ast.walk(parsed_ast):
-            if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
-                result['is_safe'] = False
-                result['errors'].append("Import statements are not allowed")
-            elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    func_name = node.func.id
-                    if func_name not in self.SAFE_FUNCTIONS:
-                        result['is_safe'] = False
-                        result['errors'].append(f"Function '{func_name}' is not allowed")
-                else:
-                    result['is_safe'] = False
-                    result['errors'].append("Complex function calls are not allowed")
-            elif isinstance(node, ast.Attribute):
-                result['is_safe'] = False
-                result['errors'].append("Attribute access is not allowed")
-        
-        return result
-    
     def _prepare_variables(self, variables: Dict[str, Union[int, float, Decimal]]) -> Dict[str, float]:
         """Prepare variables for evaluation."""
         eval_vars = {}
@@ -289,72 +258,8 @@ class FormulaEvaluationService:
                 except (ValueError, TypeError):
                     raise ValidationError(f"Variable '{name}' must be numeric, got {type(value)}")
         
-        # Add safe functions
-        eval_vars.update(self.SAFE_FUNCTIONS)
-        
         return eval_vars
     
-    def _eval_ast_node(self, node: ast.AST, variables: Dict[str, float]) -> float:
-        """Safely evaluate an AST node."""
-        if isinstance(node, ast.Constant):  # Python 3.8+
-            return float(node.value)
-        elif isinstance(node, ast.Num):  # Python < 3.8
-            return float(node.n)
-        elif isinstance(node, ast.Name):
-            if node.id in variables:
-                return variables[node.id]
-            else:
-                raise ValidationError(f"Unknown variable: {node.id}")
-        elif isinstance(node, ast.BinOp):
-            left = self._eval_ast_node(node.left, variables)
-            right = self._eval_ast_node(node.right, variables)
-            op = self.SAFE_OPERATORS.get(type(node.op))
-            if op:
-                return op(left, right)
-            else:
-                raise ValidationError(f"Unsupported operator: {type(node.op)}")
-        elif isinstance(node, ast.UnaryOp):
-            operand = self._eval_ast_node(node.operand, variables)
-            op = self.SAFE_OPERATORS.get(type(node.op))
-            if op:
-                return op(operand)
-            else:
-                raise ValidationError(f"Unsupported unary operator: {type(node.op)}")
-        elif isinstance(node, ast.Call):
-            func_name = node.func.id if isinstance(node.func, ast.Name) else None
-            if func_name in self.SAFE_FUNCTIONS:
-                args = [self._eval_ast_node(arg, variables) for arg in node.args]
-                return self.SAFE_FUNCTIONS[func_name](*args)
-            else:
-                raise ValidationError(f"Unsupported function: {func_name}")
-        else:
-            raise ValidationError(f"Unsupported AST node type: {type(node)}")
-    
-    def _extract_variables(self, parsed_ast: ast.AST) -> set:
-        """Extract variable names from the AST."""
-        variables = set()
-        
-        for node in ast.walk(parsed_ast):
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
-                if node.id not in self.SAFE_FUNCTIONS:
-                    variables.add(node.id)
-        
-        return variables
-    
-    def _calculate_complexity(self, parsed_ast: ast.AST) -> int:
-        """Calculate formula complexity score."""
-        complexity = 0
-        
-        for node in ast.walk(parsed_ast):
-            if isinstance(node, ast.BinOp):
-                complexity += 1
-            elif isinstance(node, ast.Call):
-                complexity += 2
-            elif isinstance(node, ast.UnaryOp):
-                complexity += 1
-        
-        return complexity
-    
     def _validate_result(self, result: Decimal, context: Dict[str, Any]) -> None:
         """Validate the evaluation result."""
         if result.is_nan():
@@ -374,6 +279,13 @@ class FormulaEvaluationService:
             raise BusinessLogicError(f"Formula result {result} is below minimum allowed value {min_result}")
 
 
+def _compile_profile_formula(formula: str) -> CompiledFormula:
+    """Clean and safety-check a formula, then compile it (cached by cleaned text)."""
+    cleaned_formula = FormulaEvaluationService._clean_formula(formula)
+    FormulaEvaluationService._validate_formula_safety(cleaned_formula)
+    return formula_compiler.compile_formula(cleaned_formula)
+
+
 # Convenience functions
 def evaluate_risk_formula(formula: str, variables: Dict[str, Any]) -> Decimal:
     """Convenience function to evaluate a risk formula."""
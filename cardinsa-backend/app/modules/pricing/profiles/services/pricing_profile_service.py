@@ -19,7 +19,6 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from dataclasses import asdict
 import json
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 from app.core.database import get_db
 from app.modules.pricing.profiles.repositories.quotation_pricing_profile_repository import QuotationPricingProfileRepository
@@ -50,7 +49,8 @@ from app.core.exceptions import (
     DatabaseOperationError
 )
 from app.core.logging import get_logger
-from app.core.cache import get_cache_client
+from app.core.cache import cache_manager
+from app.core.executors import get_worker_pool
 from app.core.events import event_publisher
 
 logger = get_logger(__name__)
@@ -67,7 +67,7 @@ class PricingProfileService:
         self.profile_repo = QuotationPricingProfileRepository(self.db)
         self.profile_rule_repo = QuotationPricingProfileRuleRepository(self.db)
         self.cache = cache_manager.get_cache("pricing_profiles")
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.executor = get_worker_pool()
     
     # ============================================================================
     # ENHANCED PROFILE MANAGEMENT OPERATIONS
@@ -121,8 +121,8 @@ class PricingProfileService:
             # Save to database
             profile = self.profile_repo.create(profile_dict)
             
-            # Clear cache
-            self._invalidate_profile_cache()
+            # A new profile only affects caches keyed by its insurance type
+            self._invalidate_profile_cache(insurance_type=profile.insurance_type)
             
             # Publish creation event
             event_publisher.publish(
@@ -196,7 +196,10 @@ class PricingProfileService:
             
             # Cache the result
             if use_cache:
-                self.cache.set(cache_key, result, ttl=300)  # 5 minutes
+                self.cache.set(
+                    cache_key, result, ttl=300,  # 5 minutes
+                    tags=self._profile_cache_tags(profile_id, profile.insurance_type)
+                )
             
             return result
             
@@ -743,19 +746,26 @@ class PricingProfileService:
             if pattern in formula.lower():
                 raise ValidationError(f"Risk formula contains forbidden pattern: {pattern}")
     
-    def _invalidate_profile_cache(self, profile_id: UUID = None) -> None:
-        """Invalidate profile cache entries."""
+    @staticmethod
+    def _profile_cache_tags(profile_id: UUID = None, insurance_type: Any = None) -> List[str]:
+        """Invalidation tags for entries derived from a profile."""
+        tags = []
         if profile_id:
-            # Invalidate specific profile cache entries
-            cache_patterns = [
-                f"profile_{profile_id}_*",
-                f"analytics_{profile_id}_*",
-                f"validation_{profile_id}_*"
-            ]
-            for pattern in cache_patterns:
-                self.cache.delete_pattern(pattern)
+            tags.append(f"profile:{profile_id}")
+        if insurance_type:
+            tags.append(f"insurance_type:{getattr(insurance_type, 'value', insurance_type)}")
+        return tags
+    
+    def _invalidate_profile_cache(self, profile_id: UUID = None, insurance_type: Any = None) -> None:
+        """
+        Invalidate profile cache entries by tag, so editing one profile only
+        drops that profile's (and its insurance type's) entries.
+        """
+        tags = self._profile_cache_tags(profile_id, insurance_type)
+        if tags:
+            cache_manager.invalidate_tags_nowait(*tags)
         else:
-            # Invalidate all profile caches
+            # Nothing to scope by: drop this service's region only
             self.cache.clear()
     
     def _calculate_profile_analytics(self, profile_id: UUID) -> Dict[str, Any]:
@@ -1144,8 +1154,10 @@ class PricingProfileService:
                 create_version=True
             )
             
-            # Clear related caches
-            self._invalidate_profile_cache()
+            # Clear related caches (this profile and its insurance type)
+            self._invalidate_profile_cache(
+                profile_id, insurance_type=getattr(updated_profile, 'insurance_type', None)
+            )
             
             # Publish activation event
             event_publisher.publish(
@@ -1208,8 +1220,10 @@ class PricingProfileService:
                 create_version=True
             )
             
-            # Clear related caches
-            self._invalidate_profile_cache()
+            # Clear related caches (this profile and its insurance type)
+            self._invalidate_profile_cache(
+                profile_id, insurance_type=getattr(updated_profile, 'insurance_type', None)
+            )
             
             # Publish deactivation event
             event_publisher.publish(
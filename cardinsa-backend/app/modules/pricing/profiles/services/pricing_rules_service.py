@@ -17,6 +17,7 @@ from app.modules.pricing.profiles.schemas.quotation_pricing_rule_schema import (
     RuleEvaluationRequest,
     RuleEvaluationResult
 )
+from app.modules.pricing.profiles.services.formula_compiler import compile_formula
 from app.core.exceptions import (
     EntityNotFoundError,
     BusinessLogicError,
@@ -796,36 +797,35 @@ class PricingRulesService:
         rule: QuotationPricingRule, 
         input_data: Dict[str, Any]
     ) -> float:
-        """Calculate the impact value for a rule."""
-        try:
-            if rule.formula:
-                # Use formula if available
-                return self._evaluate_formula(rule.formula, input_data)
-            else:
-                # Use simple impact value
-                return float(rule.impact_value)
-                
-        except Exception as e:
-            logger.warning(f"Error calculating rule impact: {str(e)}")
-            return 0.0
+        """
+        Calculate the impact value for a rule.
+        
+        Raises:
+            ValidationError: If the rule's formula is invalid or cannot be
+                evaluated for this input (reported on the rule's result)
+        """
+        if rule.formula:
+            # Use formula if available
+            return self._evaluate_formula(rule.formula, input_data)
+        # Use simple impact value
+        return float(rule.impact_value)
     
     def _evaluate_formula(self, formula: str, input_data: Dict[str, Any]) -> float:
-        """Safely evaluate a formula with input data."""
+        """
+        Safely evaluate a formula with input data.
+        
+        Raises:
+            ValidationError: If the formula is rejected or its evaluation fails
+        """
         try:
-            # Create safe environment for evaluation
-            safe_dict = {
-                "__builtins__": {},
-                "abs": abs, "min": min, "max": max, "round": round,
-                "sum": sum, "len": len
-            }
-            safe_dict.update(input_data)
-            
-            result = eval(formula, safe_dict)
-            return float(result)
-            
-        except Exception as e:
-            logger.warning(f"Error evaluating formula '{formula}': {str(e)}")
-            return 0.0
+            # Validated and compiled once per formula text (no eval)
+            return float(compile_formula(formula)(input_data))
+        except ValidationError as e:
+            logger.error(f"Invalid formula '{formula}': {str(e)}")
+            raise
+        except (ArithmeticError, TypeError, ValueError) as e:
+            logger.error(f"Error evaluating formula '{formula}': {str(e)}")
+            raise ValidationError(f"Formula '{formula}' could not be evaluated: {str(e)}")
     
     def _requires_impact_analysis(
         self, 
@@ -0,0 +1,418 @@
+# app/modules/pricing/profiles/services/rule_definition_loader.py
+"""
+Rule Definition Loader
+Loads QuotationPricingRule rows (with profile overrides) as AdvancedRule objects
+"""
+
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+from uuid import UUID
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import json
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.modules.pricing.profiles.models.quotation_pricing_rule_model import (
+    QuotationPricingRule,
+    RuleStatus,
+    AdjustmentType,
+    ComparisonOperator as RuleOperator
+)
+from app.modules.pricing.profiles.models.quotation_pricing_profile_rule_model import (
+    QuotationPricingProfileRule,
+    AssociationStatus
+)
+from app.modules.pricing.profiles.services.advanced_rule_engine import (
+    AdvancedRule,
+    ConditionNode,
+    RuleImpact,
+    LogicalOperator,
+    ComparisonOperator
+)
+
+logger = get_logger(__name__)
+
+
+# Rule model operators -> advanced engine operators (negated ones wrap in NOT)
+_OPERATOR_MAP = {
+    RuleOperator.EQUALS.value: (ComparisonOperator.EQUALS, False),
+    RuleOperator.NOT_EQUALS.value: (ComparisonOperator.EQUALS, True),
+    RuleOperator.GREATER_THAN.value: (ComparisonOperator.GREATER_THAN, False),
+    RuleOperator.GREATER_THAN_OR_EQUAL.value: (ComparisonOperator.GREATER_EQUAL, False),
+    RuleOperator.LESS_THAN.value: (ComparisonOperator.LESS_THAN, False),
+    RuleOperator.LESS_THAN_OR_EQUAL.value: (ComparisonOperator.LESS_EQUAL, False),
+    RuleOperator.IN.value: (ComparisonOperator.IN, False),
+    RuleOperator.NOT_IN.value: (ComparisonOperator.IN, True),
+    RuleOperator.CONTAINS.value: (ComparisonOperator.CONTAINS, False),
+    RuleOperator.NOT_CONTAINS.value: (ComparisonOperator.CONTAINS, True),
+    RuleOperator.STARTS_WITH.value: (ComparisonOperator.STARTS_WITH, False),
+    RuleOperator.ENDS_WITH.value: (ComparisonOperator.ENDS_WITH, False),
+    RuleOperator.BETWEEN.value: (ComparisonOperator.BETWEEN, False),
+}
+
+
+@dataclass
+class _ProfileRuleSet:
+    """Parsed rules of one profile at one version."""
+    version: Tuple
+    rules: "OrderedDict[UUID, AdvancedRule]"
+    valid_until: Optional[datetime]  # next effective-date boundary
+
+
+class RuleDefinitionLoader:
+    """
+    Loads pricing rules from the database as AdvancedRule objects.
+
+    A profile's rule associations and rules are fetched in one joined
+    query, parsed once, and cached in-process keyed by profile and version
+    (association count plus the latest ``updated_at`` of associations and
+    rules). Later loads only run the cheap version query, and reparse when
+    a row changes or an effective-date boundary passes. Rules loaded by ID
+    are cached per ``(rule_id, updated_at)``.
+
+    Each parsed rule carries a ``version`` made of its timestamp, the
+    profile association and a digest of the applied overrides, so compile
+    and result caches never mix two profiles' variants of one rule.
+
+    Cached AdvancedRule objects are shared; treat them as read-only.
+    """
+
+    PROFILE_CACHE_SIZE = 256
+    RULE_CACHE_SIZE = 4096
+
+    def __init__(self):
+        self._profiles: "OrderedDict[UUID, _ProfileRuleSet]" = OrderedDict()
+        self._rules: "OrderedDict[Tuple[UUID, Any], AdvancedRule]" = OrderedDict()
+        self._lock = Lock()
+
+    # ============================================================================
+    # LOADING
+    # ============================================================================
+
+    def load_profile_rules(self, db: Session, profile_id: UUID) -> "OrderedDict[UUID, AdvancedRule]":
+        """
+        Get a profile's rules in execution order, keyed by rule ID.
+
+        Overrides on the profile association (adjustment value, priority,
+        condition value) are applied. Rules or associations that are not
+        currently effective are included with ``is_active=False``.
+
+        Args:
+            db: Database session
+            profile_id: Pricing profile ID
+
+        Returns:
+            Ordered mapping of rule ID to AdvancedRule
+        """
+        version = self._profile_version(db, profile_id)
+        now = datetime.now(timezone.utc)
+
+        with self._lock:
+            cached = self._profiles.get(profile_id)
+            if cached and cached.version == version and (
+                cached.valid_until is None or now < cached.valid_until
+            ):
+                self._profiles.move_to_end(profile_id)
+                return cached.rules
+
+        rows = (
+            db.query(QuotationPricingProfileRule, QuotationPricingRule)
+            .join(QuotationPricingRule, QuotationPricingRule.id == QuotationPricingProfileRule.rule_id)
+            .filter(
+                QuotationPricingProfileRule.profile_id == profile_id,
+                QuotationPricingProfileRule.is_deleted == False,
+                QuotationPricingRule.is_deleted == False
+            )
+            .order_by(
+                QuotationPricingProfileRule.priority_order,
+                QuotationPricingProfileRule.execution_order,
+                QuotationPricingRule.priority
+            )
+            .all()
+        )
+
+        rules: "OrderedDict[UUID, AdvancedRule]" = OrderedDict()
+        boundaries: List[datetime] = []
+        for association, rule in rows:
+            parsed = self._parse_rule(rule, association, now)
+            if parsed is not None and parsed.rule_id not in rules:
+                rules[parsed.rule_id] = parsed
+            boundaries.extend(self._future_boundaries(now, rule, association))
+
+        with self._lock:
+            self._profiles[profile_id] = _ProfileRuleSet(
+                version=version,
+                rules=rules,
+                valid_until=min(boundaries) if boundaries else None
+            )
+            self._profiles.move_to_end(profile_id)
+            while len(self._profiles) > self.PROFILE_CACHE_SIZE:
+                self._profiles.popitem(last=False)
+
+        logger.debug(f"Loaded {len(rules)} rules for profile {profile_id}")
+        return rules
+
+    def load_rules(self, db: Session, rule_ids: Iterable[UUID]) -> Dict[UUID, AdvancedRule]:
+        """
+        Get rules by ID (without profile overrides) in one query.
+
+        Args:
+            db: Database session
+            rule_ids: Rule IDs to load
+
+        Returns:
+            Mapping of rule ID to AdvancedRule for the rules found
+        """
+        rule_ids = list(dict.fromkeys(rule_ids))
+        if not rule_ids:
+            return {}
+
+        rows = (
+            db.query(QuotationPricingRule)
+            .filter(
+                QuotationPricingRule.id.in_(rule_ids),
+                QuotationPricingRule.is_deleted == False
+            )
+            .all()
+        )
+
+        now = datetime.now(timezone.utc)
+        loaded: Dict[UUID, AdvancedRule] = {}
+        for rule in rows:
+            # Effectiveness is time dependent, so it is part of the key
+            key = (rule.id, rule.updated_at, _is_rule_effective(rule, now))
+            with self._lock:
+                parsed = self._rules.get(key)
+                if parsed is not None:
+                    self._rules.move_to_end(key)
+            if parsed is None:
+                parsed = self._parse_rule(rule, None, now)
+                if parsed is None:
+                    continue
+                with self._lock:
+                    self._rules[key] = parsed
+                    while len(self._rules) > self.RULE_CACHE_SIZE:
+                        self._rules.popitem(last=False)
+            loaded[rule.id] = parsed
+
+        return loaded
+
+    def get_profile_rule_ids(self, db: Session, profile_id: UUID) -> List[UUID]:
+        """IDs of a profile's currently active rules, in execution order."""
+        return [
+            rule_id for rule_id, rule in self.load_profile_rules(db, profile_id).items()
+            if rule.is_active
+        ]
+
+    def invalidate(self, profile_id: Optional[UUID] = None):
+        """Drop cached rules for one profile, or everything."""
+        with self._lock:
+            if profile_id is None:
+                self._profiles.clear()
+                self._rules.clear()
+            else:
+                self._profiles.pop(profile_id, None)
+
+    def _profile_version(self, db: Session, profile_id: UUID) -> Tuple:
+        """Cheap aggregate identifying the current state of a profile's rules."""
+        return tuple(
+            db.query(
+                func.count(QuotationPricingProfileRule.id),
+                func.max(QuotationPricingProfileRule.updated_at),
+                func.max(QuotationPricingRule.updated_at)
+            )
+            .join(QuotationPricingRule, QuotationPricingRule.id == QuotationPricingProfileRule.rule_id)
+            .filter(QuotationPricingProfileRule.profile_id == profile_id)
+            .one()
+        )
+
+    # ============================================================================
+    # PARSING
+    # ============================================================================
+
+    def _parse_rule(
+        self,
+        rule: QuotationPricingRule,
+        association: Optional[QuotationPricingProfileRule],
+        now: datetime
+    ) -> Optional[AdvancedRule]:
+        """Convert a rule row (plus optional profile association) into an AdvancedRule."""
+        try:
+            condition_value = rule.value
+            adjustment_value = rule.adjustment_value
+            priority = rule.priority
+            is_active = _is_rule_effective(rule, now)
+            dependencies, conflicts = [], []
+
+            if association is not None:
+                if association.override_condition_value is not None:
+                    condition_value = association.override_condition_value
+                if association.override_adjustment_value is not None:
+                    adjustment_value = association.override_adjustment_value
+                if association.override_priority is not None:
+                    priority = association.override_priority
+                is_active = is_active and _is_association_effective(association, now)
+                dependencies = _uuid_list(association.depends_on_rules)
+                conflicts = _uuid_list(association.conflicts_with_rules)
+
+            updated_at = max(
+                (ts for ts in (rule.updated_at, association and association.updated_at) if ts),
+                default=None
+            )
+            return AdvancedRule(
+                rule_id=rule.id,
+                name=rule.rule_name,
+                description=rule.rule_description,
+                conditions=self._build_conditions(rule, condition_value),
+                impact=self._build_impact(rule, adjustment_value),
+                priority=priority or 0,
+                dependencies=dependencies,
+                conflicts_with=conflicts,
+                is_active=is_active,
+                created_at=rule.created_at,
+                updated_at=updated_at,
+                # Profiles overriding the same rule must not share compiled predicates or results
+                version=(
+                    updated_at or rule.created_at,
+                    association.id if association is not None else None,
+                    _overrides_digest(condition_value, adjustment_value, priority, dependencies, conflicts)
+                )
+            )
+        except Exception as e:
+            logger.error(f"Failed to parse pricing rule {getattr(rule, 'id', None)}: {str(e)}")
+            return None
+
+    def _build_conditions(self, rule: QuotationPricingRule, condition_value: Any) -> ConditionNode:
+        """Primary field condition AND-ed with condition_logic / secondary_conditions."""
+        nodes = [self._build_comparison(
+            rule.field_name,
+            rule.operator,
+            rule._parse_value(condition_value, rule.value_type or "string")
+        )]
+
+        if rule.condition_logic:
+            nodes.append(self._parse_condition_tree(rule.condition_logic))
+
+        for condition in rule.secondary_conditions or []:
+            if isinstance(condition, dict) and condition.get("field"):
+                nodes.append(self._build_comparison(
+                    condition["field"], condition.get("operator"), condition.get("value")
+                ))
+
+        if len(nodes) == 1:
+            return nodes[0]
+        return ConditionNode(operator=LogicalOperator.AND, conditions=nodes)
+
+    def _build_comparison(self, field: str, operator: Any, value: Any) -> ConditionNode:
+        """Leaf condition, translating rule-model operator names when needed."""
+        mapped, negate = _OPERATOR_MAP.get(str(operator).lower(), (operator, False))
+        node = ConditionNode(operator=mapped, field=field, value=value)
+        if negate:
+            return ConditionNode(operator=LogicalOperator.NOT, conditions=[node])
+        return node
+
+    def _parse_condition_tree(self, condition_logic: Any) -> ConditionNode:
+        """Parse a condition_logic JSON tree (advanced engine operator syntax)."""
+        data = json.loads(condition_logic) if isinstance(condition_logic, str) else condition_logic
+        sub_conditions = data.get("conditions") or []
+        return ConditionNode(
+            operator=data.get("operator"),
+            field=data.get("field"),
+            value=data.get("value"),
+            conditions=[self._parse_condition_tree(c) for c in sub_conditions] or None
+        )
+
+    @staticmethod
+    def _build_impact(rule: QuotationPricingRule, adjustment_value: Any) -> RuleImpact:
+        """Map the rule's adjustment onto the orchestration engine's impact types."""
+        adjustment_type = (rule.adjustment_type or "").lower()
+        value = float(adjustment_value) if adjustment_value is not None else 0.0
+
+        if adjustment_type == AdjustmentType.PERCENTAGE.value:
+            # Rule percentages are whole numbers (10 = 10%); impacts are fractions
+            return RuleImpact(type="PERCENTAGE", value=value / 100, description=rule.rule_description)
+
+        if adjustment_type == AdjustmentType.FORMULA.value and rule.adjustment_formula:
+            formula = rule.adjustment_formula.lower()\
+                .replace("base_amount", "base_premium")\
+                .replace("adjustment_value", str(value))
+            return RuleImpact(type="FORMULA", value=value, formula=formula, description=rule.rule_description)
+
+        return RuleImpact(type=adjustment_type.upper(), value=value, description=rule.rule_description)
+
+    @staticmethod
+    def _future_boundaries(
+        now: datetime,
+        rule: QuotationPricingRule,
+        association: QuotationPricingProfileRule
+    ) -> List[datetime]:
+        """Effective-date changes after ``now`` that would alter is_active."""
+        candidates = [
+            rule.effective_from, rule.effective_to,
+            association.effective_from, association.effective_to,
+            association.suspended_from, association.suspended_to
+        ]
+        return [ts for ts in map(_aware, candidates) if ts and ts > now]
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive timestamps as UTC so they compare with aware ones."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _is_rule_effective(rule: QuotationPricingRule, now: datetime) -> bool:
+    effective_from, effective_to = _aware(rule.effective_from), _aware(rule.effective_to)
+    return (
+        rule.status == RuleStatus.ACTIVE.value and
+        bool(rule.is_active) and
+        (effective_from is None or effective_from <= now) and
+        (effective_to is None or effective_to > now)
+    )
+
+
+def _is_association_effective(association: QuotationPricingProfileRule, now: datetime) -> bool:
+    if not association.is_active or association.status != AssociationStatus.ACTIVE.value:
+        return False
+
+    effective_from, effective_to = _aware(association.effective_from), _aware(association.effective_to)
+    if effective_from and effective_from > now:
+        return False
+    if effective_to and effective_to <= now:
+        return False
+
+    suspended_from, suspended_to = _aware(association.suspended_from), _aware(association.suspended_to)
+    if suspended_from and suspended_from <= now and (suspended_to is None or now <= suspended_to):
+        return False
+
+    return True
+
+
+def _overrides_digest(*values: Any) -> str:
+    """Stable digest of the values a profile association can override."""
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _uuid_list(values: Any) -> List[UUID]:
+    result = []
+    for value in values or []:
+        try:
+            result.append(value if isinstance(value, UUID) else UUID(str(value)))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rule reference: {value}")
+    return result
+
+
+# Global loader instance (shared by all orchestration engines)
+rule_definition_loader = RuleDefinitionLoader()
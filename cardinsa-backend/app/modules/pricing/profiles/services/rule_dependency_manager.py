@@ -10,7 +10,8 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
+from threading import Lock
 import json
 
 from sqlalchemy.orm import Session
@@ -38,6 +39,10 @@ class DependencyType(str, Enum):
     SEQUENCE = "sequence"             # Rules must execute in specific order
 
 
+# Dependency types that constrain execution order (and so can form cycles)
+ORDERING_DEPENDENCY_TYPES = (DependencyType.PREREQUISITE, DependencyType.SEQUENCE)
+
+
 @dataclass
 class RuleDependency:
     """Represents a dependency between two rules."""
@@ -63,23 +68,55 @@ class RuleConflict:
 
 @dataclass
 class RuleExecutionPlan:
-    """Execution plan for a set of rules."""
+    """
+    Execution plan for a set of rules.
+    
+    ``dependency_levels`` partitions ``execution_order`` into levels whose
+    rules only have prerequisites in earlier levels, so each level can run
+    concurrently. Plans are cached and shared; treat them as read-only.
+    """
     execution_order: List[UUID]
     conflicts: List[RuleConflict]
     resolution_strategy: ConflictResolutionStrategy
     metadata: Dict[str, Any] = field(default_factory=dict)
+    dependency_levels: List[List[UUID]] = field(default_factory=list)
 
 
 class RuleDependencyManager:
     """
     Manages rule dependencies, detects conflicts, and creates execution plans.
+    
+    Execution plans are compiled once per (rule set, resolution strategy)
+    and cached until the dependency graph or rule priorities change.
+    
+    Alongside ``dependencies`` (dependent -> its dependencies) the manager
+    keeps a reverse index and the ordering-edge successor lists, plus an
+    incrementally maintained topological order of all rules that appear in
+    ordering dependencies. Cycle checks only explore the order window
+    between the two rules, so add_dependency stays cheap on large graphs.
     """
     
+    PLAN_CACHE_SIZE = 512
+    
     def __init__(self, db: Session = None):
         self.db = db or next(get_db())
         self.dependencies: Dict[UUID, List[RuleDependency]] = defaultdict(list)
         self.rule_priorities: Dict[UUID, int] = {}
         self.conflict_cache: Dict[str, RuleConflict] = {}
+        
+        # Adjacency indexes: dependency -> {dependent: edge count}
+        self._dependents_index: Dict[UUID, Dict[UUID, int]] = defaultdict(dict)
+        self._ordering_successors: Dict[UUID, Dict[UUID, int]] = defaultdict(dict)
+        
+        # Incremental topological order over ordering edges (rule -> position)
+        self._topo_position: Dict[UUID, int] = {}
+        self._next_topo_position = 0
+        self._topo_order_valid = True
+        
+        # Compiled execution plans, invalidated whenever the graph changes
+        self.graph_version = 0
+        self._plan_cache: "OrderedDict[Tuple, RuleExecutionPlan]" = OrderedDict()
+        self._plan_lock = Lock()
     
     # ============================================================================
     # DEPENDENCY MANAGEMENT
@@ -125,6 +162,10 @@ class RuleDependencyManager:
             )
         
         self.dependencies[dependent_rule_id].append(dependency)
+        self._index_dependency(dependency, 1)
+        if dependency.dependency_type in ORDERING_DEPENDENCY_TYPES:
+            self._reorder_for_edge(dependency_rule_id, dependent_rule_id)
+        self.invalidate_execution_plans()
         
         logger.info(
             f"Added {dependency_type} dependency: "
@@ -157,17 +198,20 @@ class RuleDependencyManager:
         original_count = len(dependencies)
         
         # Filter out matching dependencies
-        self.dependencies[dependent_rule_id] = [
-            dep for dep in dependencies
-            if not (
-                dep.dependency_rule_id == dependency_rule_id and
-                (dependency_type is None or dep.dependency_type == dependency_type)
-            )
-        ]
-        
-        removed = len(dependencies) - len(self.dependencies[dependent_rule_id])
+        kept = []
+        for dep in dependencies:
+            if (dep.dependency_rule_id == dependency_rule_id and
+                    (dependency_type is None or dep.dependency_type == dependency_type)):
+                # Removing edges never invalidates the topological order
+                self._index_dependency(dep, -1)
+            else:
+                kept.append(dep)
+        self.dependencies[dependent_rule_id] = kept
+        
+        removed = len(dependencies) - len(kept)
         
         if removed > 0:
+            self.invalidate_execution_plans()
             logger.info(f"Removed {removed} dependencies between {dependent_rule_id} and {dependency_rule_id}")
         
         return removed > 0
@@ -179,12 +223,62 @@ class RuleDependencyManager:
     def get_dependents(self, rule_id: UUID) -> List[RuleDependency]:
         """Get all rules that depend on the given rule."""
         dependents = []
-        for dependent_id, deps in self.dependencies.items():
-            for dep in deps:
+        for dependent_id in self._dependents_index.get(rule_id, {}):
+            for dep in self.dependencies.get(dependent_id, []):
                 if dep.dependency_rule_id == rule_id:
                     dependents.append(dep)
         return dependents
     
+    def _index_dependency(self, dependency: RuleDependency, delta: int):
+        """Add (delta=1) or remove (delta=-1) one dependency from the adjacency indexes."""
+        indexes = [self._dependents_index]
+        if dependency.dependency_type in ORDERING_DEPENDENCY_TYPES:
+            indexes.append(self._ordering_successors)
+        
+        for index in indexes:
+            edges = index[dependency.dependency_rule_id]
+            count = edges.get(dependency.dependent_rule_id, 0) + delta
+            if count > 0:
+                edges[dependency.dependent_rule_id] = count
+            else:
+                edges.pop(dependency.dependent_rule_id, None)
+                if not edges:
+                    del index[dependency.dependency_rule_id]
+    
+    def _rebuild_graph_index(self):
+        """Rebuild adjacency indexes and topological order from ``dependencies``."""
+        self._dependents_index.clear()
+        self._ordering_successors.clear()
+        for deps in self.dependencies.values():
+            for dep in deps:
+                self._index_dependency(dep, 1)
+        
+        # Kahn's algorithm over ordering edges
+        in_degree: Dict[UUID, int] = defaultdict(int)
+        for source, targets in self._ordering_successors.items():
+            in_degree.setdefault(source, 0)
+            for target in targets:
+                in_degree[target] += 1
+        
+        queue = deque(rule_id for rule_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for target in self._ordering_successors.get(current, {}):
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    queue.append(target)
+        
+        self._topo_order_valid = len(order) == len(in_degree)
+        if not self._topo_order_valid:
+            logger.warning("Dependency graph contains cycles; cycle checks will not use order pruning")
+            placed = set(order)
+            order.extend(rule_id for rule_id in in_degree if rule_id not in placed)
+        
+        self._topo_position = {rule_id: i for i, rule_id in enumerate(order)}
+        self._next_topo_position = len(order)
+    
     # ============================================================================
     # CONFLICT DETECTION
     # ============================================================================
@@ -314,6 +408,52 @@ class RuleDependencyManager:
     # EXECUTION PLANNING
     # ============================================================================
     
+    def get_execution_plan(
+        self,
+        rule_ids: List[UUID],
+        resolution_strategy: ConflictResolutionStrategy = ConflictResolutionStrategy.PRIORITY_BASED
+    ) -> RuleExecutionPlan:
+        """
+        Get the cached execution plan for a rule set, compiling it on first use.
+        
+        Plans are keyed by the ordered rule IDs and resolution strategy and
+        are dropped whenever dependencies or priorities change (see
+        invalidate_execution_plans), so a cached plan always reflects the
+        current graph.
+        
+        Args:
+            rule_ids: Rules to include in the plan
+            resolution_strategy: How to resolve conflicts
+            
+        Returns:
+            Shared execution plan (read-only)
+        """
+        key = (tuple(rule_ids), resolution_strategy)
+        
+        with self._plan_lock:
+            plan = self._plan_cache.get(key)
+            if plan is not None:
+                self._plan_cache.move_to_end(key)
+                return plan
+            graph_version = self.graph_version
+        
+        plan = self.create_execution_plan(list(rule_ids), resolution_strategy)
+        
+        with self._plan_lock:
+            # Don't cache a plan compiled against a graph that changed meanwhile
+            if graph_version == self.graph_version:
+                self._plan_cache[key] = plan
+                while len(self._plan_cache) > self.PLAN_CACHE_SIZE:
+                    self._plan_cache.popitem(last=False)
+        
+        return plan
+    
+    def invalidate_execution_plans(self):
+        """Drop all cached execution plans (call after any graph change)."""
+        with self._plan_lock:
+            self.graph_version += 1
+            self._plan_cache.clear()
+    
     def create_execution_plan(
         self,
         rule_ids: List[UUID],
@@ -322,12 +462,14 @@ class RuleDependencyManager:
         """
         Create an execution plan for a set of rules.
         
+        Always recompiles; use get_execution_plan on hot paths.
+        
         Args:
             rule_ids: Rules to include in the plan
             resolution_strategy: How to resolve conflicts
             
         Returns:
-            Execution plan with order and conflict information
+            Execution plan with order, dependency levels and conflict information
         """
         # Detect conflicts
         conflicts = self.detect_conflicts(rule_ids)
@@ -337,6 +479,7 @@ class RuleDependencyManager:
         
         # Create topological ordering based on dependencies
         execution_order = self._topological_sort(filtered_rule_ids)
+        dependency_levels = self.compute_dependency_levels(execution_order)
         
         return RuleExecutionPlan(
             execution_order=execution_order,
@@ -346,8 +489,11 @@ class RuleDependencyManager:
                 "original_rule_count": len(rule_ids),
                 "final_rule_count": len(execution_order),
                 "conflicts_detected": len(conflicts),
+                "dependency_level_count": len(dependency_levels),
+                "graph_version": self.graph_version,
                 "planning_timestamp": datetime.utcnow().isoformat()
-            }
+            },
+            dependency_levels=dependency_levels
         )
     
     def _resolve_conflicts(
@@ -442,11 +588,12 @@ class RuleDependencyManager:
             in_degree[rule_id] = 0
         
         # Build graph based on prerequisite dependencies
+        rule_set = set(rule_ids)
         for rule_id in rule_ids:
             dependencies = self.get_dependencies(rule_id)
             prerequisites = [
                 dep for dep in dependencies 
-                if dep.dependency_type == DependencyType.PREREQUISITE and dep.dependency_rule_id in rule_ids
+                if dep.dependency_type == DependencyType.PREREQUISITE and dep.dependency_rule_id in rule_set
             ]
             
             for prereq in prerequisites:
@@ -468,13 +615,59 @@ class RuleDependencyManager:
         
         # Check for circular dependencies
         if len(result) != len(rule_ids):
-            remaining_rules = [rule_id for rule_id in rule_ids if rule_id not in result]
+            placed = set(result)
+            remaining_rules = [rule_id for rule_id in rule_ids if rule_id not in placed]
             logger.warning(f"Circular dependencies detected for rules: {remaining_rules}")
             # Add remaining rules at the end
             result.extend(remaining_rules)
         
         return result
     
+    def compute_dependency_levels(self, execution_order: List[UUID]) -> List[List[UUID]]:
+        """
+        Partition a topologically sorted rule list into dependency levels.
+        
+        A rule's level is one past the deepest of its prerequisites within
+        the list (prerequisites outside the list are ignored, as in
+        _topological_sort). Rules left over from a cycle go to a final level.
+        Order within a level follows ``execution_order``.
+        
+        Args:
+            execution_order: Output of _topological_sort
+            
+        Returns:
+            Rule IDs grouped by level, lowest level first
+        """
+        rule_set = set(execution_order)
+        level_of: Dict[UUID, int] = {}
+        cyclic: List[UUID] = []
+        
+        for rule_id in execution_order:
+            level = 0
+            for dep in self.get_dependencies(rule_id):
+                if (dep.dependency_type == DependencyType.PREREQUISITE and
+                        dep.dependency_rule_id in rule_set):
+                    prereq_level = level_of.get(dep.dependency_rule_id)
+                    if prereq_level is None:
+                        # Prerequisite not placed yet: rule is part of a cycle
+                        level = None
+                        break
+                    level = max(level, prereq_level + 1)
+            
+            if level is None:
+                cyclic.append(rule_id)
+            else:
+                level_of[rule_id] = level
+        
+        levels: List[List[UUID]] = [[] for _ in range(max(level_of.values(), default=-1) + 1)]
+        for rule_id in execution_order:
+            if rule_id in level_of:
+                levels[level_of[rule_id]].append(rule_id)
+        if cyclic:
+            levels.append(cyclic)
+        
+        return levels
+    
     # ============================================================================
     # CIRCULAR DEPENDENCY DETECTION
     # ============================================================================
@@ -490,24 +683,28 @@ class RuleDependencyManager:
             True if circular dependency would be created
         """
         # Only check for prerequisite and sequence dependencies
-        if new_dependency.dependency_type not in [DependencyType.PREREQUISITE, DependencyType.SEQUENCE]:
+        if new_dependency.dependency_type not in ORDERING_DEPENDENCY_TYPES:
             return False
         
-        # Use DFS to detect cycles
+        # The dependency must run first; a cycle exists if it already
+        # (transitively) runs after the dependent
         return self._has_path(
-            new_dependency.dependency_rule_id,
             new_dependency.dependent_rule_id,
-            set()
+            new_dependency.dependency_rule_id
         )
     
-    def _has_path(self, start: UUID, target: UUID, visited: Set[UUID]) -> bool:
+    def _has_path(self, start: UUID, target: UUID, visited: Optional[Set[UUID]] = None) -> bool:
         """
         Check if there's a path from start to target in the dependency graph.
         
+        Follows ordering edges from a rule to the rules that depend on it,
+        iteratively. While the topological order is valid, rules positioned
+        after ``target`` cannot reach it and are not explored.
+        
         Args:
             start: Starting rule ID
             target: Target rule ID
-            visited: Set of already visited rules
+            visited: Set of already visited rules (updated in place)
             
         Returns:
             True if path exists
@@ -515,21 +712,83 @@ class RuleDependencyManager:
         if start == target:
             return True
         
-        if start in visited:
+        visited = set() if visited is None else visited
+        bound = self._topo_position.get(target) if self._topo_order_valid else None
+        if bound is None and self._topo_order_valid:
+            # Target has no incoming ordering edges, so nothing reaches it
+            return False
+        if bound is not None and self._topo_position.get(start, bound + 1) > bound:
             return False
         
-        visited.add(start)
-        
-        # Check all rules that depend on the current rule
-        for dependent_id, deps in self.dependencies.items():
-            for dep in deps:
-                if (dep.dependency_rule_id == start and 
-                    dep.dependency_type in [DependencyType.PREREQUISITE, DependencyType.SEQUENCE]):
-                    if self._has_path(dependent_id, target, visited.copy()):
-                        return True
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+            
+            for dependent_id in self._ordering_successors.get(current, {}):
+                if dependent_id == target:
+                    return True
+                if dependent_id in visited:
+                    continue
+                if bound is not None and self._topo_position[dependent_id] > bound:
+                    continue
+                stack.append(dependent_id)
         
         return False
     
+    def _reorder_for_edge(self, before: UUID, after: UUID):
+        """
+        Keep the topological order valid after adding edge ``before -> after``.
+        
+        Pearce-Kelly: if ``before`` is already positioned earlier nothing
+        changes; otherwise only the rules whose positions lie between the two
+        are reshuffled, reusing their existing positions.
+        """
+        for rule_id in (before, after):
+            if rule_id not in self._topo_position:
+                self._topo_position[rule_id] = self._next_topo_position
+                self._next_topo_position += 1
+        
+        if not self._topo_order_valid:
+            return
+        
+        lower = self._topo_position[after]
+        upper = self._topo_position[before]
+        if upper < lower:
+            return
+        
+        # Rules reachable from `after` that sit at or before `before`
+        forward = self._collect_window(after, self._ordering_successors.get, lambda pos: pos <= upper)
+        # Rules that reach `before` and sit at or after `after`
+        backward = self._collect_window(before, self._ordering_predecessors, lambda pos: pos >= lower)
+        
+        by_position = lambda rule_id: self._topo_position[rule_id]
+        moved = sorted(backward, key=by_position) + sorted(forward, key=by_position)
+        positions = sorted(self._topo_position[rule_id] for rule_id in moved)
+        for rule_id, position in zip(moved, positions):
+            self._topo_position[rule_id] = position
+    
+    def _ordering_predecessors(self, rule_id: UUID) -> List[UUID]:
+        """Rules that ``rule_id`` has ordering dependencies on."""
+        return [
+            dep.dependency_rule_id for dep in self.dependencies.get(rule_id, [])
+            if dep.dependency_type in ORDERING_DEPENDENCY_TYPES
+        ]
+    
+    def _collect_window(self, start: UUID, neighbours, in_window) -> Set[UUID]:
+        """Rules reachable from ``start`` via ``neighbours`` whose positions are in the window."""
+        found = {start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for neighbour in neighbours(current) or ():
+                if neighbour not in found and in_window(self._topo_position[neighbour]):
+                    found.add(neighbour)
+                    stack.append(neighbour)
+        return found
+    
     # ============================================================================
     # UTILITY METHODS
     # ============================================================================
@@ -537,6 +796,7 @@ class RuleDependencyManager:
     def set_rule_priority(self, rule_id: UUID, priority: int):
         """Set priority for a rule."""
         self.rule_priorities[rule_id] = priority
+        self.invalidate_execution_plans()
         logger.debug(f"Set priority {priority} for rule {rule_id}")
     
     def get_rule_priority(self, rule_id: UUID) -> int:
@@ -546,7 +806,9 @@ class RuleDependencyManager:
     def clear_dependencies(self, rule_id: UUID):
         """Clear all dependencies for a rule."""
         if rule_id in self.dependencies:
-            del self.dependencies[rule_id]
+            for dep in self.dependencies.pop(rule_id):
+                self._index_dependency(dep, -1)
+            self.invalidate_execution_plans()
         logger.info(f"Cleared all dependencies for rule {rule_id}")
     
     def export_dependency_graph(self) -> Dict[str, Any]:
@@ -593,6 +855,8 @@ class RuleDependencyManager:
         for rule_id_str, priority in graph_data.get("priorities", {}).items():
             self.rule_priorities[UUID(rule_id_str)] = priority
         
+        self._rebuild_graph_index()
+        self.invalidate_execution_plans()
         logger.info("Imported dependency graph successfully")
 
 
@@ -5,7 +5,6 @@ from datetime import datetime
 from decimal import Decimal
 import json
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -26,6 +25,7 @@ from app.core.exceptions import (
 )
 from app.core.logging import get_logger
 from app.core.cache import get_cache_client
+from app.core.executors import get_worker_pool
 
 
 logger = get_logger(__name__)
@@ -43,7 +43,7 @@ class RuleEvaluationService:
         self.rule_repo = QuotationPricingRuleRepository(self.db)
         self.rules_service = PricingRulesService(self.db)
         self.cache = get_cache_client()
-        self.thread_pool = ThreadPoolExecutor(max_workers=4)
+        self.thread_pool = get_worker_pool()
     
     # ============================================================================
     # ADVANCED EVALUATION METHODS
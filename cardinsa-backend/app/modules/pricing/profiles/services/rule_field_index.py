@@ -0,0 +1,323 @@
+# app/modules/pricing/profiles/services/rule_field_index.py
+"""
+Rule Field Index
+Field -> rule index used to skip rules that cannot match an input
+
+For every rule the condition tree is reduced to necessary requirements:
+the top-level input fields that must be present (non-None), plus coarse
+numeric ranges and allowed value sets for plain fields such as age or
+territory. A rule whose requirements fail can never evaluate to true, so
+skipping it never changes the pricing result.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from threading import Lock
+
+from app.modules.pricing.profiles.services.advanced_rule_engine import (
+    AdvancedRule,
+    ConditionNode,
+    LogicalOperator,
+    ComparisonOperator,
+    rule_version
+)
+
+# (low, low_inclusive, high, high_inclusive)
+Interval = Tuple[float, bool, float, bool]
+
+_UNBOUNDED = float("-inf"), False, float("inf"), False
+
+# Requirements are derived once per rule version, like compiled predicates
+_REQUIREMENTS_CACHE_SIZE = 2048
+_requirements_cache: "OrderedDict[Tuple[UUID, Any], RuleRequirements]" = OrderedDict()
+_requirements_lock = Lock()
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass
+class RuleRequirements:
+    """Necessary conditions for a rule's condition tree to be true."""
+    fields: FrozenSet[str] = frozenset()
+    ranges: Dict[str, Interval] = field(default_factory=dict)
+    values: Dict[str, FrozenSet[Any]] = field(default_factory=dict)
+    # Every top-level field the tree reads, including OR/NOT branches
+    referenced: FrozenSet[str] = frozenset()
+
+    def is_satisfied_by(self, data: Dict[str, Any], ignore: FrozenSet[str] = frozenset()) -> bool:
+        """
+        Check the requirements against input data.
+
+        Returns False only when the rule cannot match; values that do not
+        convert to a number (or are unhashable) are not range/set checked.
+        """
+        for name in self.fields:
+            if name not in ignore and data.get(name) is None:
+                return False
+        for name, interval in self.ranges.items():
+            if name not in ignore and not _in_interval(data.get(name), interval):
+                return False
+        for name, allowed in self.values.items():
+            if name not in ignore and not _in_values(data.get(name), allowed):
+                return False
+        return True
+
+
+def _in_interval(value: Any, interval: Interval) -> bool:
+    number = _to_float(value)
+    if number is None:
+        # The engine falls back to string comparison for non-numeric values
+        return True
+    low, low_inclusive, high, high_inclusive = interval
+    if number < low or (number == low and not low_inclusive):
+        return False
+    if number > high or (number == high and not high_inclusive):
+        return False
+    return True
+
+
+def _in_values(value: Any, allowed: FrozenSet[Any]) -> bool:
+    try:
+        return value in allowed
+    except TypeError:
+        return True
+
+
+# ============================================================================
+# REQUIREMENT EXTRACTION
+# ============================================================================
+
+def extract_requirements(condition: Optional[ConditionNode]) -> RuleRequirements:
+    """
+    Reduce a condition tree to its necessary requirements.
+
+    A comparison needs its field present (the engine treats None as false)
+    and contributes a range or value set for plain numeric/equality tests.
+    AND combines its children's requirements, OR keeps only what every
+    branch requires, and NOT requires nothing.
+    """
+    if condition is None:
+        return RuleRequirements()
+    if condition.is_comparison():
+        return _leaf_requirements(condition)
+    if not condition.is_logical() or not condition.conditions:
+        return RuleRequirements()
+
+    if condition.operator == LogicalOperator.AND:
+        children = [extract_requirements(child) for child in condition.conditions]
+        return _all_of(children)
+    if condition.operator == LogicalOperator.OR:
+        children = [extract_requirements(child) for child in condition.conditions]
+        return _any_of(children)
+    return RuleRequirements()
+
+
+def referenced_fields(condition: Optional[ConditionNode]) -> FrozenSet[str]:
+    """Top-level input fields read anywhere in a condition tree."""
+    if condition is None:
+        return frozenset()
+    names = {condition.field.split('.')[0]} if condition.field else set()
+    for child in condition.conditions or []:
+        names |= referenced_fields(child)
+    return frozenset(names)
+
+
+def _leaf_requirements(condition: ConditionNode) -> RuleRequirements:
+    if not condition.field:
+        return RuleRequirements()
+
+    name = condition.field.split('.')[0]
+    requirements = RuleRequirements(fields=frozenset([name]))
+    if name != condition.field:
+        return requirements
+
+    op, value = condition.operator, condition.value
+    if op in (ComparisonOperator.GREATER_THAN, ComparisonOperator.GREATER_EQUAL):
+        number = _to_float(value)
+        if number is not None:
+            requirements.ranges[name] = (
+                number, op == ComparisonOperator.GREATER_EQUAL, float("inf"), False
+            )
+    elif op in (ComparisonOperator.LESS_THAN, ComparisonOperator.LESS_EQUAL):
+        number = _to_float(value)
+        if number is not None:
+            requirements.ranges[name] = (
+                float("-inf"), False, number, op == ComparisonOperator.LESS_EQUAL
+            )
+    elif op == ComparisonOperator.BETWEEN:
+        if isinstance(value, (list, tuple)) and len(value) == 2:
+            low, high = _to_float(value[0]), _to_float(value[1])
+            if low is not None and high is not None:
+                requirements.ranges[name] = (low, True, high, True)
+    elif op == ComparisonOperator.EQUALS:
+        try:
+            requirements.values[name] = frozenset([value])
+        except TypeError:
+            pass
+    elif op == ComparisonOperator.IN:
+        if isinstance(value, (list, tuple, set)):
+            try:
+                requirements.values[name] = frozenset(value)
+            except TypeError:
+                pass
+    return requirements
+
+
+def _all_of(children: List[RuleRequirements]) -> RuleRequirements:
+    combined = RuleRequirements(fields=frozenset().union(*(c.fields for c in children)))
+    for child in children:
+        for name, interval in child.ranges.items():
+            current = combined.ranges.get(name)
+            combined.ranges[name] = interval if current is None else _intersect(current, interval)
+        for name, allowed in child.values.items():
+            current = combined.values.get(name)
+            combined.values[name] = allowed if current is None else current & allowed
+    return combined
+
+
+def _any_of(children: List[RuleRequirements]) -> RuleRequirements:
+    combined = RuleRequirements(fields=frozenset.intersection(*(c.fields for c in children)))
+    first, rest = children[0], children[1:]
+    for name, interval in first.ranges.items():
+        if all(name in child.ranges for child in rest):
+            for child in rest:
+                interval = _hull(interval, child.ranges[name])
+            combined.ranges[name] = interval
+    for name, allowed in first.values.items():
+        if all(name in child.values for child in rest):
+            combined.values[name] = allowed.union(*(child.values[name] for child in rest))
+    return combined
+
+
+def _intersect(a: Interval, b: Interval) -> Interval:
+    if a[0] != b[0]:
+        low, low_inclusive = max((a[0], a[1]), (b[0], b[1]), key=lambda bound: bound[0])
+    else:
+        low, low_inclusive = a[0], a[1] and b[1]
+    if a[2] != b[2]:
+        high, high_inclusive = min((a[2], a[3]), (b[2], b[3]), key=lambda bound: bound[0])
+    else:
+        high, high_inclusive = a[2], a[3] and b[3]
+    return low, low_inclusive, high, high_inclusive
+
+
+def _hull(a: Interval, b: Interval) -> Interval:
+    if a[0] != b[0]:
+        low, low_inclusive = min((a[0], a[1]), (b[0], b[1]), key=lambda bound: bound[0])
+    else:
+        low, low_inclusive = a[0], a[1] or b[1]
+    if a[2] != b[2]:
+        high, high_inclusive = max((a[2], a[3]), (b[2], b[3]), key=lambda bound: bound[0])
+    else:
+        high, high_inclusive = a[2], a[3] or b[3]
+    return low, low_inclusive, high, high_inclusive
+
+
+def get_rule_requirements(rule: AdvancedRule) -> RuleRequirements:
+    """Requirements of a rule, cached by (rule_id, rule_version) so profile overrides get their own entry."""
+    key = (rule.rule_id, rule_version(rule))
+    with _requirements_lock:
+        requirements = _requirements_cache.get(key)
+        if requirements is not None:
+            _requirements_cache.move_to_end(key)
+            return requirements
+
+    requirements = extract_requirements(rule.conditions)
+    requirements.referenced = referenced_fields(rule.conditions)
+    with _requirements_lock:
+        _requirements_cache[key] = requirements
+        while len(_requirements_cache) > _REQUIREMENTS_CACHE_SIZE:
+            _requirements_cache.popitem(last=False)
+    return requirements
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class RuleFieldIndex:
+    """
+    Index from input field to the rules that require it.
+
+    ``candidates`` drops every rule that needs a field missing from the
+    input with one set union per missing field, then checks the coarse
+    ranges/value sets field by field. Rules not in the index (unknown IDs)
+    are always kept so they still report their own errors.
+    """
+
+    def __init__(self, rules: Dict[UUID, AdvancedRule]):
+        self.requirements: Dict[UUID, RuleRequirements] = {}
+        self.rules_by_field: Dict[str, Set[UUID]] = {}
+        self.constrained_by_field: Dict[str, Set[UUID]] = {}
+
+        for rule_id, rule in rules.items():
+            requirements = get_rule_requirements(rule)
+            self.requirements[rule_id] = requirements
+            for name in requirements.fields:
+                self.rules_by_field.setdefault(name, set()).add(rule_id)
+            for name in set(requirements.ranges) | set(requirements.values):
+                self.constrained_by_field.setdefault(name, set()).add(rule_id)
+
+    def candidates(
+        self,
+        rule_ids: Iterable[UUID],
+        data: Dict[str, Any],
+        ignore: FrozenSet[str] = frozenset()
+    ) -> Tuple[List[UUID], int, int]:
+        """
+        Rules (in the given order) whose requirements ``data`` can satisfy.
+
+        Args:
+            rule_ids: Rules to filter, in execution order
+            data: Input data
+            ignore: Fields whose value may still change, so they are not checked
+
+        Returns:
+            (kept rule IDs, skipped for missing fields, skipped by range/value)
+        """
+        missing: Set[UUID] = set()
+        for name, dependent_rules in self.rules_by_field.items():
+            if name not in ignore and data.get(name) is None:
+                missing.update(dependent_rules)
+
+        out_of_range: Set[UUID] = set()
+        for name, constrained_rules in self.constrained_by_field.items():
+            if name in ignore:
+                continue
+            value = data.get(name)
+            if value is None:
+                continue
+            for rule_id in constrained_rules:
+                if rule_id in missing or rule_id in out_of_range:
+                    continue
+                requirements = self.requirements[rule_id]
+                interval = requirements.ranges.get(name)
+                if interval is not None and not _in_interval(value, interval):
+                    out_of_range.add(rule_id)
+                    continue
+                allowed = requirements.values.get(name)
+                if allowed is not None and not _in_values(value, allowed):
+                    out_of_range.add(rule_id)
+
+        kept = []
+        skipped_missing = skipped_out_of_range = 0
+        for rule_id in rule_ids:
+            if rule_id in missing:
+                skipped_missing += 1
+            elif rule_id in out_of_range:
+                skipped_out_of_range += 1
+            else:
+                kept.append(rule_id)
+        return kept, skipped_missing, skipped_out_of_range
+
+    def might_match(self, rule_id: UUID, data: Dict[str, Any]) -> bool:
+        """Whether a single rule can match ``data`` (unknown rules: True)."""
+        requirements = self.requirements.get(rule_id)
+        return requirements is None or requirements.is_satisfied_by(data)
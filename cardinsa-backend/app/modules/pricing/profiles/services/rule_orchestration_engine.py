@@ -11,22 +11,23 @@ from decimal import Decimal
 from enum import Enum
 from dataclasses import dataclass, field
 import json
+import hashlib
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import copy
 import time
 
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, run_in_session
 from app.core.exceptions import ValidationError, BusinessLogicError
 from app.core.logging import get_logger
 from app.core.cache import get_cache_client
+from app.core.executors import get_worker_pool
 
 # Import our advanced components
 from app.modules.pricing.profiles.services.advanced_rule_engine import (
     MultiConditionLogicEngine, 
     AdvancedRule, 
-    ConditionNode, 
-    RuleImpact
+    rule_version
 )
 from app.modules.pricing.profiles.services.rule_dependency_manager import (
     RuleDependencyManager, 
@@ -38,9 +39,16 @@ from app.modules.pricing.profiles.services.age_bracket_integration import (
     DemographicProfile, 
     AgeBracket
 )
+from app.modules.pricing.profiles.services.formula_compiler import compile_formula
+from app.modules.pricing.profiles.services.rule_definition_loader import rule_definition_loader
+from app.modules.pricing.profiles.services.rule_field_index import RuleFieldIndex, get_rule_requirements
 
 logger = get_logger(__name__)
 
+# Input fields rewritten by applied rules (see _update_input_data_with_result);
+# the up-front pre-filter must not judge rules on their initial values
+RULE_OUTPUT_FIELDS = frozenset({"premium", "applied_rules"})
+
 
 class ExecutionStrategy(str, Enum):
     """Rule execution strategies."""
@@ -119,10 +127,16 @@ class RuleOrchestrationEngine:
         self.logic_engine = MultiConditionLogicEngine(self.db)
         self.dependency_manager = RuleDependencyManager(self.db)
         self.age_bracket_system = AdvancedAgeBracketIntegration(self.db)
+        self.rule_loader = rule_definition_loader
+        
+        # Rules prefetched for the orchestration in progress (set on per-call views)
+        self._rule_definitions: Optional[Dict[UUID, AdvancedRule]] = None
+        self._field_index: Optional[RuleFieldIndex] = None
+        self._skip_counts = self._new_skip_counts()
         
         # Performance and caching
         self.cache = get_cache_client() if self.config.cache_strategy != CacheStrategy.NONE else None
-        self.thread_pool = ThreadPoolExecutor(max_workers=self.config.max_parallel_rules)
+        self.thread_pool = get_worker_pool()
         
         # Internal state
         self.performance_stats = {
@@ -130,9 +144,23 @@ class RuleOrchestrationEngine:
             "cache_hits": 0,
             "cache_misses": 0,
             "average_execution_time": 0.0,
+            "rules_skipped_missing_fields": 0,
+            "rules_skipped_out_of_range": 0,
+            "rules_skipped_precheck": 0,
             "rule_performance": {}
         }
     
+    def with_session(self, db: Session) -> "RuleOrchestrationEngine":
+        """
+        Get a per-request view of this engine bound to another session.
+        
+        The view shares the component engines, cache client, worker pool and
+        performance statistics with this instance; only ``db`` differs.
+        """
+        view = copy.copy(self)
+        view.db = db
+        return view
+    
     # ============================================================================
     # MAIN ORCHESTRATION METHODS
     # ============================================================================
@@ -143,7 +171,8 @@ class RuleOrchestrationEngine:
         input_data: Dict[str, Any],
         demographic_profile: Optional[DemographicProfile] = None,
         base_premium: Optional[Decimal] = None,
-        benefit_type: Optional[str] = None
+        benefit_type: Optional[str] = None,
+        profile_id: Optional[UUID] = None
     ) -> OrchestrationResult:
         """
         Main orchestration method that coordinates all rule evaluation components.
@@ -154,6 +183,8 @@ class RuleOrchestrationEngine:
             demographic_profile: Optional demographic information
             base_premium: Base premium for calculations
             benefit_type: Type of benefit being priced
+            profile_id: Pricing profile the rules belong to (applies its
+                rule overrides and loads all its rules in one query)
             
         Returns:
             Complete orchestration result
@@ -161,8 +192,13 @@ class RuleOrchestrationEngine:
         start_time = time.time()
         
         try:
-            # Step 1: Create execution plan with dependency resolution
-            execution_plan = self.dependency_manager.create_execution_plan(
+            # Load every rule definition up front instead of one query per rule
+            executor = self._with_rule_definitions(
+                await run_in_session(self.db, self._prefetch_rule_definitions, rule_ids, profile_id)
+            )
+            
+            # Step 1: Get (cached) execution plan with dependency resolution
+            execution_plan = self.dependency_manager.get_execution_plan(
                 rule_ids, self.config.conflict_resolution
             )
             
@@ -176,7 +212,7 @@ class RuleOrchestrationEngine:
                 input_data = {**input_data, **demographic_calculation}
             
             # Step 3: Execute rules according to plan
-            rule_results = await self._execute_rules_with_plan(
+            rule_results = await executor._execute_rules_with_plan(
                 execution_plan, input_data
             )
             
@@ -200,7 +236,7 @@ class RuleOrchestrationEngine:
                 rule_results=rule_results,
                 demographic_calculation=demographic_calculation,
                 execution_plan=execution_plan,
-                performance_metrics=self._generate_performance_metrics(total_time, rule_results),
+                performance_metrics=executor._generate_performance_metrics(total_time, rule_results),
                 cache_statistics=self._generate_cache_statistics(rule_results)
             )
             
@@ -272,38 +308,47 @@ class RuleOrchestrationEngine:
         if not self.config.enable_parallel_evaluation:
             return await self._execute_sequential(rule_ids, input_data)
         
-        # Create tasks for parallel execution
-        tasks = [
-            self._execute_single_rule(rule_id, input_data)
-            for rule_id in rule_ids
-        ]
+        # One MGET for the whole batch instead of a GET per rule
+        use_rule_cache = self.config.cache_strategy in [CacheStrategy.RULE_LEVEL, CacheStrategy.PROFILE_LEVEL]
+        cached_results = await self._get_cached_rule_results(rule_ids, input_data) if use_rule_cache else {}
+        pending_rule_ids = [rule_id for rule_id in rule_ids if rule_id not in cached_results]
         
-        # Execute in batches to avoid overwhelming the system
-        batch_size = self.config.max_parallel_rules
-        results = []
+        # Bounded concurrency: at most max_parallel_rules in flight, and a
+        # slow rule only holds its own slot instead of stalling a whole batch
+        semaphore = asyncio.Semaphore(max(1, self.config.max_parallel_rules))
         
-        for i in range(0, len(tasks), batch_size):
-            batch = tasks[i:i + batch_size]
-            batch_results = await asyncio.gather(*batch, return_exceptions=True)
-            
-            # Handle exceptions and convert to error results
-            for j, result in enumerate(batch_results):
-                if isinstance(result, Exception):
-                    error_result = RuleExecutionResult(
-                        rule_id=rule_ids[i + j],
-                        rule_name="Unknown",
-                        execution_time=0.0,
-                        success=False,
-                        condition_met=False,
-                        impact_applied=False,
-                        result_value=None,
-                        error_message=str(result)
-                    )
-                    results.append(error_result)
-                else:
-                    results.append(result)
+        async def run(rule_id: UUID) -> RuleExecutionResult:
+            async with semaphore:
+                return await self._execute_single_rule(rule_id, input_data, use_cache=False)
         
-        return results
+        results = await asyncio.gather(
+            *(run(rule_id) for rule_id in pending_rule_ids), return_exceptions=True
+        )
+        
+        # Handle exceptions and convert to error results
+        executed: Dict[UUID, RuleExecutionResult] = {}
+        for rule_id, result in zip(pending_rule_ids, results):
+            if isinstance(result, Exception):
+                executed[rule_id] = RuleExecutionResult(
+                    rule_id=rule_id,
+                    rule_name="Unknown",
+                    execution_time=0.0,
+                    success=False,
+                    condition_met=False,
+                    impact_applied=False,
+                    result_value=None,
+                    error_message=str(result)
+                )
+            else:
+                executed[rule_id] = result
+        
+        # One pipelined write for all fresh results
+        if use_rule_cache:
+            await self._cache_rule_results(
+                [r for r in executed.values() if r.success], input_data
+            )
+        
+        return [cached_results.get(rule_id) or executed[rule_id] for rule_id in rule_ids]
     
     async def _execute_hybrid(
         self,
@@ -384,21 +429,26 @@ class RuleOrchestrationEngine:
     async def _execute_single_rule(
         self,
         rule_id: UUID,
-        input_data: Dict[str, Any]
+        input_data: Dict[str, Any],
+        use_cache: bool = True
     ) -> RuleExecutionResult:
-        """Execute a single rule with caching and monitoring."""
+        """
+        Execute a single rule with caching and monitoring.
+        Batch callers pass use_cache=False and handle cache I/O with MGET/MSET.
+        """
         start_time = time.time()
+        use_cache = use_cache and self.config.cache_strategy in [CacheStrategy.RULE_LEVEL, CacheStrategy.PROFILE_LEVEL]
         
         try:
             # Check cache first
-            if self.config.cache_strategy in [CacheStrategy.RULE_LEVEL, CacheStrategy.PROFILE_LEVEL]:
+            if use_cache:
                 cached_result = await self._get_cached_rule_result(rule_id, input_data)
                 if cached_result:
                     cached_result.execution_time = time.time() - start_time
                     cached_result.cache_hit = True
                     return cached_result
             
-            # Load rule definition (this would come from database in real implementation)
+            # Load rule definition (prefetched for the whole orchestration)
             rule = await self._load_rule_definition(rule_id)
             if not rule:
                 return RuleExecutionResult(
@@ -412,8 +462,20 @@ class RuleOrchestrationEngine:
                     error_message="Rule not found"
                 )
             
+            if not rule.is_active:
+                return RuleExecutionResult(
+                    rule_id=rule_id,
+                    rule_name=rule.name,
+                    execution_time=time.time() - start_time,
+                    success=True,
+                    condition_met=False,
+                    impact_applied=False,
+                    result_value=None,
+                    execution_details={"inactive": True}
+                )
+            
             # Evaluate rule conditions
-            condition_met = self.logic_engine.evaluate_conditions(rule.conditions, input_data)
+            condition_met = self.logic_engine.evaluate_rule(rule, input_data)
             
             # Apply impact if condition is met
             impact_applied = False
@@ -442,7 +504,7 @@ class RuleOrchestrationEngine:
             )
             
             # Cache result if configured
-            if self.config.cache_strategy in [CacheStrategy.RULE_LEVEL, CacheStrategy.PROFILE_LEVEL]:
+            if use_cache:
                 await self._cache_rule_result(rule_id, input_data, result)
             
             return result
@@ -528,51 +590,53 @@ class RuleOrchestrationEngine:
     
     def _group_rules_by_dependency_level(self, execution_plan: RuleExecutionPlan) -> List[List[UUID]]:
         """Group rules by dependency level for hybrid execution."""
-        levels = []
-        remaining_rules = set(execution_plan.execution_order)
-        processed_rules = set()
-        
-        while remaining_rules:
-            current_level = []
-            
-            for rule_id in list(remaining_rules):
-                # Check if all dependencies are satisfied
-                dependencies = self.dependency_manager.get_dependencies(rule_id)
-                prerequisite_deps = [
-                    dep.dependency_rule_id for dep in dependencies 
-                    if dep.dependency_type.value == "prerequisite"
-                ]
-                
-                if all(dep_id in processed_rules for dep_id in prerequisite_deps):
-                    current_level.append(rule_id)
-                    remaining_rules.remove(rule_id)
-            
-            if not current_level:
-                # No progress made - add remaining rules to avoid infinite loop
-                current_level = list(remaining_rules)
-                remaining_rules.clear()
-            
-            levels.append(current_level)
-            processed_rules.update(current_level)
-        
-        return levels
+        # Compiled plans carry their levels; only hand-built plans need them computed
+        if execution_plan.dependency_levels:
+            return execution_plan.dependency_levels
+        return self.dependency_manager.compute_dependency_levels(execution_plan.execution_order)
     
     def _pre_filter_rules(self, rule_ids: List[UUID], input_data: Dict[str, Any]) -> List[UUID]:
-        """Pre-filter rules that are unlikely to match."""
-        # Simple implementation - in practice this would check field availability
-        filtered = []
-        
-        for rule_id in rule_ids:
-            # Placeholder: check if rule's primary field exists in input data
-            # This would require access to rule definitions
-            filtered.append(rule_id)  # For now, include all rules
+        """
+        Drop rules that cannot match the input, keeping execution order.
         
+        Uses the field index over the prefetched rules: rules referencing a
+        field absent from the input, or whose coarse age/territory style
+        ranges exclude its value, are skipped. Fields that applied rules
+        rewrite are left to the per-rule precheck.
+        """
+        filtered, missing_fields, out_of_range = self._get_field_index().candidates(
+            rule_ids, input_data, ignore=RULE_OUTPUT_FIELDS
+        )
+        self._count_skipped_rules("rules_skipped_missing_fields", missing_fields)
+        self._count_skipped_rules("rules_skipped_out_of_range", out_of_range)
         return filtered
     
     async def _quick_rule_precheck(self, rule_id: UUID, input_data: Dict[str, Any]) -> bool:
         """Quick check if rule might match without full evaluation."""
-        # Placeholder implementation - would check simple field conditions
-        return True  # For now, assume all rules pass pre-check
+        if self._get_field_index().might_match(rule_id, input_data):
+            return True
+        self._count_skipped_rules("rules_skipped_precheck", 1)
+        return False
+    
+    def _get_field_index(self) -> RuleFieldIndex:
+        """Field index over the prefetched rules, built on first use."""
+        if self._field_index is None:
+            self._field_index = RuleFieldIndex(self._rule_definitions or {})
+        return self._field_index
+    
+    @staticmethod
+    def _new_skip_counts() -> Dict[str, int]:
+        return {
+            "rules_skipped_missing_fields": 0,
+            "rules_skipped_out_of_range": 0,
+            "rules_skipped_precheck": 0
+        }
+    
+    def _count_skipped_rules(self, counter: str, count: int):
+        """Record skipped rules for this orchestration and globally."""
+        if count:
+            self._skip_counts[counter] += count
+            self.performance_stats[counter] = self.performance_stats.get(counter, 0) + count
     
     def _calculate_rule_impact(self, rule: AdvancedRule, input_data: Dict[str, Any]) -> Decimal:
         """Calculate the impact value of a rule."""
@@ -590,22 +654,31 @@ class RuleOrchestrationEngine:
             return base_value * (Decimal(str(impact.value)) - Decimal('1.0'))
         
         elif impact.type == "FORMULA" and impact.formula:
-            # Simple formula evaluation (in practice, use a proper expression evaluator)
-            try:
-                # Replace variables in formula with actual values
-                formula = impact.formula
-                for key, value in input_data.items():
-                    formula = formula.replace(key, str(value))
-                
-                # Evaluate simple mathematical expressions
-                # WARNING: This is unsafe in production - use a proper expression evaluator
-                result = eval(formula.replace("base_premium", str(input_data.get("premium", 1000))))
-                return Decimal(str(result))
-            except:
-                return Decimal('0')
+            return Decimal(str(self._evaluate_impact_formula(impact.formula, input_data)))
         
         return Decimal('0')
     
+    @staticmethod
+    def _evaluate_impact_formula(formula: str, input_data: Dict[str, Any]) -> float:
+        """
+        Evaluate a FORMULA impact with the shared compiler.
+        
+        Variables are the input fields plus ``base_premium`` (the current
+        premium, 1000 when none has been set yet).
+        
+        Raises:
+            ValidationError: If the formula is rejected or its evaluation fails
+        """
+        variables = {
+            key: float(value) if isinstance(value, Decimal) else value
+            for key, value in input_data.items()
+        }
+        variables["base_premium"] = float(input_data.get("premium", 1000))
+        try:
+            return float(compile_formula(formula)(variables))
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise ValidationError(f"Formula '{formula}' could not be evaluated: {str(e)}")
+    
     def _update_input_data_with_result(
         self,
         input_data: Dict[str, Any],
@@ -701,12 +774,78 @@ class RuleOrchestrationEngine:
         except Exception as e:
             logger.warning(f"Cache storage error: {str(e)}")
     
+    async def _get_cached_rule_results(
+        self,
+        rule_ids: List[UUID],
+        input_data: Dict[str, Any]
+    ) -> Dict[UUID, RuleExecutionResult]:
+        """Get cached results for many rules with a single MGET."""
+        if not self.cache or not rule_ids:
+            return {}
+        
+        keys = [self._generate_rule_cache_key(rule_id, input_data) for rule_id in rule_ids]
+        found: Dict[UUID, RuleExecutionResult] = {}
+        
+        try:
+            for rule_id, cached_data in zip(rule_ids, await self.cache.mget(keys)):
+                if cached_data:
+                    found[rule_id] = self._deserialize_rule_result(cached_data)
+        except Exception as e:
+            logger.warning(f"Cache batch retrieval error: {str(e)}")
+        
+        self.performance_stats["cache_hits"] += len(found)
+        self.performance_stats["cache_misses"] += len(rule_ids) - len(found)
+        return found
+    
+    async def _cache_rule_results(
+        self,
+        results: List[RuleExecutionResult],
+        input_data: Dict[str, Any]
+    ):
+        """Cache many rule results in one pipelined MSET."""
+        if not self.cache or not results:
+            return
+        
+        try:
+            await self.cache.mset(
+                {self._generate_rule_cache_key(r.rule_id, input_data): self._serialize_rule_result(r) for r in results},
+                self.config.cache_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Cache batch storage error: {str(e)}")
+    
     def _generate_rule_cache_key(self, rule_id: UUID, input_data: Dict[str, Any]) -> str:
-        """Generate cache key for rule result."""
-        # Create hash of relevant input data for cache key
-        relevant_data = {k: v for k, v in input_data.items() if k in ["age", "gender", "territory", "premium"]}
-        data_hash = hash(json.dumps(relevant_data, sort_keys=True))
-        return f"rule_result:{rule_id}:{data_hash}"
+        """
+        Generate cache key for rule result, scoped to the rule's version
+        (which covers the profile overrides it was loaded with).
+        """
+        rule = self._rule_definitions.get(rule_id) if self._rule_definitions else None
+        version = self._rule_version_digest(rule) if rule else "0"
+        return f"rule_result:{rule_id}:{version}:{self._input_data_digest(input_data, rule)}"
+    
+    @staticmethod
+    def _rule_version_digest(rule: AdvancedRule) -> str:
+        payload = json.dumps(rule_version(rule), default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+    
+    @staticmethod
+    def _input_data_digest(input_data: Dict[str, Any], rule: Optional[AdvancedRule] = None) -> str:
+        """
+        Stable digest of the input fields that affect a rule's result.
+        
+        That is every field its conditions read plus ``premium`` (which
+        percentage and multiplier impacts scale). Formula impacts can read
+        any field, so they, and rules whose definition is unknown, digest
+        the whole input except the applied-rule history. Uses sha1 rather
+        than hash() so keys match across worker processes.
+        """
+        if rule is None or rule.impact.type == "FORMULA":
+            relevant_data = {k: v for k, v in input_data.items() if k != "applied_rules"}
+        else:
+            fields = get_rule_requirements(rule).referenced | {"premium"}
+            relevant_data = {k: v for k, v in input_data.items() if k in fields}
+        payload = json.dumps(relevant_data, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
     
     # ============================================================================
     # PERFORMANCE MONITORING
@@ -730,7 +869,9 @@ class RuleOrchestrationEngine:
             "successful_rules": len(successful_rules),
             "failed_rules": len(failed_rules),
             "cache_hit_rate": self.performance_stats["cache_hits"] / (self.performance_stats["cache_hits"] + self.performance_stats["cache_misses"]) if (self.performance_stats["cache_hits"] + self.performance_stats["cache_misses"]) > 0 else 0,
-            "rules_per_second": len(rule_results) / total_time if total_time > 0 else 0
+            "rules_per_second": len(rule_results) / total_time if total_time > 0 else 0,
+            **self._skip_counts,
+            "rules_skipped": sum(self._skip_counts.values())
         }
     
     def _generate_cache_statistics(self, rule_results: List[RuleExecutionResult]) -> Dict[str, Any]:
@@ -759,43 +900,47 @@ class RuleOrchestrationEngine:
     # UTILITY METHODS
     # ============================================================================
     
-    async def _load_rule_definition(self, rule_id: UUID) -> Optional[AdvancedRule]:
-        """Load rule definition from database or cache."""
-        # Placeholder implementation - would load from database
-        # For demonstration, create a sample rule
-        from app.modules.pricing.profiles.services.advanced_rule_engine import LogicalOperator, ComparisonOperator
-        
-        conditions = ConditionNode(
-            operator=LogicalOperator.AND,
-            conditions=[
-                ConditionNode(
-                    operator=ComparisonOperator.GREATER_THAN,
-                    field="age",
-                    value=25
-                ),
-                ConditionNode(
-                    operator=ComparisonOperator.LESS_THAN,
-                    field="age",
-                    value=65
-                )
-            ]
-        )
+    def _with_rule_definitions(self, definitions: Dict[UUID, AdvancedRule]) -> "RuleOrchestrationEngine":
+        """Per-call view of this engine that resolves rules from ``definitions``."""
+        view = copy.copy(self)
+        view._rule_definitions = definitions
+        view._field_index = None
+        view._skip_counts = self._new_skip_counts()
+        return view
+    
+    def _prefetch_rule_definitions(
+        self,
+        rule_ids: List[UUID],
+        profile_id: Optional[UUID] = None
+    ) -> Dict[UUID, AdvancedRule]:
+        """
+        Load the definitions of all rules in one go.
         
-        impact = RuleImpact(
-            type="PERCENTAGE",
-            value=-0.10,
-            formula="base_premium * (1 - 0.10)",
-            description="10% discount for middle-aged members"
-        )
+        With a profile, the profile's rules (including its overrides) come
+        from one joined query; any other requested rules are loaded by ID in
+        a single additional query. Parsed rules are cached by the loader.
+        """
+        definitions: Dict[UUID, AdvancedRule] = {}
         
-        return AdvancedRule(
-            rule_id=rule_id,
-            name=f"Sample Rule {rule_id}",
-            description="Example rule for demonstration",
-            conditions=conditions,
-            impact=impact,
-            priority=100
-        )
+        try:
+            if profile_id:
+                definitions.update(self.rule_loader.load_profile_rules(self.db, profile_id))
+            
+            missing = [rule_id for rule_id in rule_ids if rule_id not in definitions]
+            if missing:
+                definitions.update(self.rule_loader.load_rules(self.db, missing))
+        except Exception as e:
+            logger.error(f"Error prefetching rule definitions: {str(e)}")
+        
+        return definitions
+    
+    async def _load_rule_definition(self, rule_id: UUID) -> Optional[AdvancedRule]:
+        """Load rule definition from the prefetched set, or the database."""
+        if self._rule_definitions is not None:
+            return self._rule_definitions.get(rule_id)
+        
+        rules = await run_in_session(self.db, self.rule_loader.load_rules, self.db, [rule_id])
+        return rules.get(rule_id)
     
     def _serialize_rule_result(self, result: RuleExecutionResult) -> str:
         """Serialize rule result for caching."""
@@ -842,13 +987,18 @@ class RuleOrchestrationEngine:
     
     def clear_performance_statistics(self):
         """Clear performance statistics."""
-        self.performance_stats = {
+        # In place: per-request views share this dict
+        self.performance_stats.clear()
+        self.performance_stats.update({
             "total_executions": 0,
             "cache_hits": 0,
             "cache_misses": 0,
             "average_execution_time": 0.0,
+            "rules_skipped_missing_fields": 0,
+            "rules_skipped_out_of_range": 0,
+            "rules_skipped_precheck": 0,
             "rule_performance": {}
-        }
+        })
         logger.info("Cleared performance statistics")
     
     async def health_check(self) -> Dict[str, Any]:
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, and_, or_
 
 from app.core.base_repository import BaseRepository
+from app.modules.analytics.services.daily_rollup_service import DailyRollupService, QUOTATIONS
 from ..models import Quotation
 from ..schemas import QuotationCreate, QuotationUpdate, QuotationStatusEnum
 
@@ -251,24 +252,33 @@ class QuotationRepository(BaseRepository):  # ✅ Fixed: No generic parameters
         """
         Get quotation statistics.
         
+        Served from the daily rollups (closed days) plus today's quotations
+        once the rollups have been refreshed; before that, one grouped
+        query over the table.
+        
         Returns:
             Dictionary with various statistics
         """
-        total_count = self.count()
-        active_count = self.count(filters={"is_locked": False})
-        locked_count = self.count(filters={"is_locked": True})
-        
-        # Count by status
-        status_counts = {}
-        for status in QuotationStatusEnum:
-            count = self.count(filters={"status": status.value})
-            status_counts[status.value] = count
+        rollups = DailyRollupService(self.db).read(QUOTATIONS)
+        if rollups is not None:
+            statuses = rollups.counts("status", skip_blank=False)
+            locked = rollups.counts("locked")
+            return {
+                "total_quotations": sum(statuses.values()),
+                "active_quotations": locked.get("false", 0),
+                "locked_quotations": locked.get("true", 0),
+                "status_breakdown": {status.value: statuses.get(status.value, 0) for status in QuotationStatusEnum}
+            }
+        
+        stats = self.grouped_aggregates({"status": "status", "locked": "is_locked"})
+        locked = stats.counts("locked")
+        status_counts = stats.counts("status")
         
         return {
-            "total_quotations": total_count,
-            "active_quotations": active_count,
-            "locked_quotations": locked_count,
-            "status_breakdown": status_counts
+            "total_quotations": stats.total(),
+            "active_quotations": locked.get(False, 0),
+            "locked_quotations": locked.get(True, 0),
+            "status_breakdown": {status.value: status_counts.get(status.value, 0) for status in QuotationStatusEnum}
         }
     
     def get_recent_quotations(self, days: int = 30, limit: int = 10) -> List[Quotation]:
@@ -13,6 +13,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.core.exceptions import BusinessLogicError, ValidationError, NotFoundError
 from app.core.database import get_db
+from app.core.number_allocator import number_allocator
 from app.core.dependencies import get_current_user
 
 # ✅ CORRECTED MODEL IMPORTS - Import from individual model files
@@ -502,15 +503,8 @@ class EnhancedQuotationService:
             logger.error(f"Error logging quotation event: {str(e)}")
 
     async def _generate_quote_number(self) -> str:
-        """Generate unique quote number"""
-        try:
-            prefix = "QTE"
-            timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            return f"{prefix}-{timestamp}"
-            
-        except Exception as e:
-            logger.error(f"Error generating quote number: {str(e)}")
-            return f"QTE-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+        """Generate unique quote number (QTE-YYYYMMDD-SEQUENCE) from the number allocator"""
+        return number_allocator.next_number(self.db, "quotation")
 
     async def _get_pricing_factors_summary(self, quotation_id: UUID) -> Dict[str, List[Dict[str, Any]]]:
         """Get pricing factors summary for presentation"""
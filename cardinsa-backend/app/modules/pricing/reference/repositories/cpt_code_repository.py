@@ -1,4 +1,6 @@
+from typing import Any, Iterable, Mapping, Optional
 from sqlalchemy.orm import Session
+from app.core.bulk_import import BulkImportResult, ProgressCallback, bulk_upsert
 from app.modules.pricing.reference.models.cpt_code_model import CPTCode
 from app.modules.pricing.reference.schemas.cpt_code_schema import CPTCodeCreate, CPTCodeUpdate
 
@@ -33,3 +35,20 @@ class CPTCodeRepository:
             self.db.delete(obj)
             self.db.commit()
         return obj
+
+    def bulk_import(
+        self, records: Iterable[Mapping[str, Any]], progress: Optional[ProgressCallback] = None
+    ) -> BulkImportResult:
+        """COPY records into a staging table and upsert them by code in one transaction."""
+        try:
+            result = bulk_upsert(
+                self.db, CPTCode.__table__, records,
+                columns=["code", "description_en", "description_ar", "category"],
+                key_columns=["code"],
+                progress=progress,
+            )
+            self.db.commit()
+            return result
+        except Exception:
+            self.db.rollback()
+            raise
@@ -1,4 +1,6 @@
+from typing import Any, Iterable, Mapping, Optional
 from sqlalchemy.orm import Session
+from app.core.bulk_import import BulkImportResult, ProgressCallback, bulk_upsert
 from app.modules.pricing.reference.models.icd10_code_model import ICD10Code
 from app.modules.pricing.reference.schemas.icd10_code_schema import ICD10CodeCreate, ICD10CodeUpdate
 
@@ -33,3 +35,20 @@ class ICD10CodeRepository:
             self.db.delete(obj)
             self.db.commit()
         return obj
+
+    def bulk_import(
+        self, records: Iterable[Mapping[str, Any]], progress: Optional[ProgressCallback] = None
+    ) -> BulkImportResult:
+        """COPY records into a staging table and upsert them by code in one transaction."""
+        try:
+            result = bulk_upsert(
+                self.db, ICD10Code.__table__, records,
+                columns=["code", "description_en", "description_ar", "chapter"],
+                key_columns=["code"],
+                progress=progress,
+            )
+            self.db.commit()
+            return result
+        except Exception:
+            self.db.rollback()
+            raise
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, UploadFile
 from sqlalchemy.orm import Session
 from app.core.dependencies import get_db, require_permission_scoped
 from app.modules.pricing.reference.services.cpt_code_service import CPTCodeService
@@ -22,6 +22,11 @@ def create_cpt_code(obj_in: CPTCodeCreate, db: Session = Depends(get_db)):
     return CPTCodeService(db).create(obj_in)
 
 
+@router.post("/import", dependencies=[Depends(require_permission_scoped("pricing.reference", action="create"))])
+def import_cpt_codes(file: UploadFile = File(..., description="CSV with code, description_en, description_ar, category columns"), db: Session = Depends(get_db)):
+    return CPTCodeService(db).import_csv(file.file).to_dict()
+
+
 @router.put("/{id}", dependencies=[Depends(require_permission_scoped("pricing.reference", action="update"))])
 def update_cpt_code(id: str, obj_in: CPTCodeUpdate, db: Session = Depends(get_db)):
     return CPTCodeService(db).update(id, obj_in)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, UploadFile
 from sqlalchemy.orm import Session
 from app.core.dependencies import get_db, require_permission_scoped
 from app.modules.pricing.reference.services.icd10_code_service import ICD10CodeService
@@ -22,6 +22,11 @@ def create_icd10_code(obj_in: ICD10CodeCreate, db: Session = Depends(get_db)):
     return ICD10CodeService(db).create(obj_in)
 
 
+@router.post("/import", dependencies=[Depends(require_permission_scoped("pricing.reference", action="create"))])
+def import_icd10_codes(file: UploadFile = File(..., description="CSV with code, description_en, description_ar, chapter columns"), db: Session = Depends(get_db)):
+    return ICD10CodeService(db).import_csv(file.file).to_dict()
+
+
 @router.put("/{id}", dependencies=[Depends(require_permission_scoped("pricing.reference", action="update"))])
 def update_icd10_code(id: str, obj_in: ICD10CodeUpdate, db: Session = Depends(get_db)):
     return ICD10CodeService(db).update(id, obj_in)
@@ -1,4 +1,6 @@
+from typing import IO, Optional
 from sqlalchemy.orm import Session
+from app.core.bulk_import import BulkImportResult, ProgressCallback, iter_csv_records
 from app.modules.pricing.reference.repositories.cpt_code_repository import CPTCodeRepository
 from app.modules.pricing.reference.schemas.cpt_code_schema import CPTCodeCreate, CPTCodeUpdate
 
@@ -22,3 +24,7 @@ class CPTCodeService:
 
     def delete(self, id):
         return self.repo.delete(id)
+
+    def import_csv(self, stream: IO[bytes], progress: Optional[ProgressCallback] = None) -> BulkImportResult:
+        """Load a CPT code set from CSV (header: code, description_en, ...); existing codes are updated."""
+        return self.repo.bulk_import(iter_csv_records(stream), progress)
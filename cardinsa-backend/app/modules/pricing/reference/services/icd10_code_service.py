@@ -1,4 +1,6 @@
+from typing import IO, Optional
 from sqlalchemy.orm import Session
+from app.core.bulk_import import BulkImportResult, ProgressCallback, iter_csv_records
 from app.modules.pricing.reference.repositories.icd10_code_repository import ICD10CodeRepository
 from app.modules.pricing.reference.schemas.icd10_code_schema import ICD10CodeCreate, ICD10CodeUpdate
 
@@ -22,3 +24,7 @@ class ICD10CodeService:
 
     def delete(self, id):
         return self.repo.delete(id)
+
+    def import_csv(self, stream: IO[bytes], progress: Optional[ProgressCallback] = None) -> BulkImportResult:
+        """Load a ICD-10 code set from CSV (header: code, description_en, ...); existing codes are updated."""
+        return self.repo.bulk_import(iter_csv_records(stream), progress)
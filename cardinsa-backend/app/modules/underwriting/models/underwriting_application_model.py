@@ -339,14 +339,20 @@ class UnderwritingApplication(Base, TimestampMixin, ArchiveMixin):
     # =========================================================================
     
     def generate_application_number(self) -> str:
-        """Generate unique application number"""
+        """Generate unique application number (from the number allocator when attached to a session)"""
         from datetime import datetime
         import random
         import string
+        from sqlalchemy.orm import object_session
+        from app.core.number_allocator import number_allocator
         
-        # Format: YYYYMMDD-PRODUCT-RANDOM
-        date_part = datetime.now().strftime('%Y%m%d')
         product_part = self.product_type[:3].upper() if self.product_type else 'GEN'
+        session = object_session(self)
+        if session is not None:
+            return number_allocator.next_number(session, 'underwriting_application', product=product_part)
+        
+        # Detached instance - Format: YYYYMMDD-PRODUCT-RANDOM
+        date_part = datetime.now().strftime('%Y%m%d')
         random_part = ''.join(random.choices(string.digits, k=6))
         
         return f"{date_part}-{product_part}-{random_part}"
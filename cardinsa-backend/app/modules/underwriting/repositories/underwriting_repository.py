@@ -32,6 +32,7 @@ from app.core.exceptions import EntityNotFoundError, BusinessLogicError, Databas
 from app.core.base_repository import BaseRepository
 from app.core.cache import cache_manager
 from app.core.logging import get_logger
+from app.core.number_allocator import number_allocator
 
 # Model imports
 from app.modules.underwriting.models.underwriting_rule_model import (
@@ -47,6 +48,10 @@ from app.modules.underwriting.models.underwriting_workflow_model import (
     UnderwritingWorkflow, UnderwritingWorkflowStep, WorkflowExecution, WorkflowStepExecution
 )
 
+from app.modules.analytics.services.daily_rollup_service import (
+    DailyRollupService, UNDERWRITING_APPLICATIONS, UNDERWRITING_PROFILES
+)
+
 # Schema imports
 from app.modules.underwriting.schemas.underwriting_schema import (
     UnderwritingRuleSearchFilters, UnderwritingProfileSearchFilters,
@@ -91,7 +96,7 @@ class UnderwritingRepository(BaseRepository):
             self.db.refresh(rule)
             
             # Clear cache
-            self._clear_rules_cache()
+            self._clear_rules_cache(rule.product_type)
             
             self.logger.info(f"Created underwriting rule: {rule.rule_name} (ID: {rule.id})")
             return rule
@@ -137,32 +142,50 @@ class UnderwritingRepository(BaseRepository):
         except Exception as e:
             raise DatabaseError(f"Failed to get rule by name: {str(e)}")
     
-    @cache_manager.cached(ttl=300, key_prefix="active_rules")
     def get_active_rules_by_product(
         self, 
         product_type: str, 
         effective_date: Optional[date] = None
     ) -> List[UnderwritingRule]:
-        """Get active rules for product type"""
+        """
+        Get active rules for product type.
+        
+        Only the ordered rule IDs are cached; the rules themselves are loaded
+        into this repository's session by primary key, so no ORM instance is
+        shared between sessions or threads.
+        """
         try:
-            effective_date = effective_date or date.today()
-            
-            query = self.db.query(UnderwritingRule).filter(
-                UnderwritingRule.product_type == product_type,
-                UnderwritingRule.is_active == True,
-                UnderwritingRule.effective_from <= effective_date,
-                or_(
-                    UnderwritingRule.effective_to.is_(None),
-                    UnderwritingRule.effective_to >= effective_date
-                ),
-                UnderwritingRule.archived_at.is_(None)
-            ).order_by(desc(UnderwritingRule.priority), UnderwritingRule.order_index)
+            rule_ids = self._active_rule_ids(product_type, effective_date or date.today())
+            if not rule_ids:
+                return []
             
-            return query.all()
+            rules = self.db.query(UnderwritingRule).filter(UnderwritingRule.id.in_(rule_ids)).all()
+            by_id = {rule.id: rule for rule in rules}
+            return [by_id[rule_id] for rule_id in rule_ids if rule_id in by_id]
             
         except Exception as e:
             raise DatabaseError(f"Failed to get active rules: {str(e)}")
     
+    @cache_manager.cached(
+        ttl=300,
+        key_prefix="active_rules",
+        tags=lambda self, product_type, *args, **kwargs: [f"product_type:{product_type}"]
+    )
+    def _active_rule_ids(self, product_type: str, effective_date: date) -> Tuple[UUID, ...]:
+        """IDs of the active rules for a product type, in evaluation order"""
+        rows = self.db.query(UnderwritingRule.id).filter(
+            UnderwritingRule.product_type == product_type,
+            UnderwritingRule.is_active == True,
+            UnderwritingRule.effective_from <= effective_date,
+            or_(
+                UnderwritingRule.effective_to.is_(None),
+                UnderwritingRule.effective_to >= effective_date
+            ),
+            UnderwritingRule.archived_at.is_(None)
+        ).order_by(desc(UnderwritingRule.priority), UnderwritingRule.order_index)
+        
+        return tuple(rule_id for rule_id, in rows)
+    
     def search_rules(
         self, 
         filters: UnderwritingRuleSearchFilters,
@@ -244,6 +267,8 @@ class UnderwritingRepository(BaseRepository):
             if not rule:
                 raise EntityNotFoundError(f"Rule not found: {rule_id}")
             
+            previous_product_type = rule.product_type
+            
             # Update fields
             for key, value in rule_data.items():
                 if hasattr(rule, key) and key not in ['id', 'created_at', 'created_by']:
@@ -256,7 +281,7 @@ class UnderwritingRepository(BaseRepository):
             self.db.refresh(rule)
             
             # Clear cache
-            self._clear_rules_cache()
+            self._clear_rules_cache(previous_product_type, rule.product_type)
             
             self.logger.info(f"Updated underwriting rule: {rule.rule_name} (ID: {rule.id})")
             return rule
@@ -284,7 +309,7 @@ class UnderwritingRepository(BaseRepository):
             self.db.commit()
             
             # Clear cache
-            self._clear_rules_cache()
+            self._clear_rules_cache(rule.product_type)
             
             self.logger.info(f"Deleted underwriting rule: {rule.rule_name} (ID: {rule.id})")
             return True
@@ -329,7 +354,7 @@ class UnderwritingRepository(BaseRepository):
                         continue
             
             # Clear cache
-            self._clear_rules_cache()
+            self._clear_rules_cache(*{rule.product_type for rule in created_rules})
             
             self.logger.info(f"Bulk created {len(created_rules)} rules with {len(errors)} errors")
             return created_rules, errors
@@ -353,9 +378,15 @@ class UnderwritingRepository(BaseRepository):
         except Exception:
             return True  # Err on the side of caution
     
-    def _clear_rules_cache(self):
-        """Clear rules-related cache entries"""
-        cache_manager.clear_pattern("active_rules*")
+    def _clear_rules_cache(self, *product_types: str):
+        """
+        Clear rules-related cache entries. With product types, only the
+        active-rule sets of those products are dropped.
+        """
+        if product_types:
+            cache_manager.invalidate_tags_nowait(*(f"product_type:{pt}" for pt in set(product_types)))
+        else:
+            cache_manager.clear_pattern("active_rules*")
     
     # =========================================================================
     # UNDERWRITING PROFILES REPOSITORY
@@ -760,29 +791,9 @@ class UnderwritingRepository(BaseRepository):
             raise DatabaseError(f"Failed to get overdue applications: {str(e)}")
     
     def _generate_application_number(self, product_type: str) -> str:
-        """Generate unique application number"""
-        from datetime import datetime
-        import random
-        import string
-        
-        # Format: YYYYMMDD-PRODUCT-RANDOM
-        date_part = datetime.now().strftime('%Y%m%d')
+        """Generate unique application number (YYYYMMDD-PRODUCT-SEQUENCE) from the number allocator"""
         product_part = product_type[:3].upper() if product_type else 'GEN'
-        
-        # Generate random part and ensure uniqueness
-        max_attempts = 10
-        for attempt in range(max_attempts):
-            random_part = ''.join(random.choices(string.digits, k=6))
-            application_number = f"{date_part}-{product_part}-{random_part}"
-            
-            # Check if number already exists
-            existing = self.get_application_by_number(application_number)
-            if not existing:
-                return application_number
-        
-        # Fallback to timestamp-based number
-        timestamp = int(datetime.now().timestamp())
-        return f"{date_part}-{product_part}-{timestamp}"
+        return number_allocator.next_number(self.db, 'underwriting_application', product=product_part)
     
     # =========================================================================
     # UNDERWRITING DECISIONS REPOSITORY
@@ -1015,109 +1026,204 @@ class UnderwritingRepository(BaseRepository):
     # ANALYTICS AND REPORTING
     # =========================================================================
     
+    # Risk levels counted as high risk in risk analysis
+    HIGH_RISK_LEVELS = ('high', 'very_high', 'unacceptable')
+    
+    def _processing_stats_columns(self) -> List[Any]:
+        """
+        Aggregate columns for processing time and SLA compliance.
+        
+        Labels: completed, avg_hours, median_hours, p90_hours, sla_total,
+        sla_compliant. Only applications with both processing timestamps
+        count as completed.
+        """
+        app = UnderwritingApplication
+        # NULL unless both timestamps are set; aggregates skip NULLs
+        hours = func.extract('epoch', app.actual_completion_date - app.processing_started_at) / 3600
+        with_sla = and_(hours.isnot(None), app.sla_due_date.isnot(None))
+        
+        return [
+            func.count(hours).label('completed'),
+            func.avg(hours).label('avg_hours'),
+            func.percentile_cont(0.5).within_group(hours).label('median_hours'),
+            func.percentile_cont(0.9).within_group(hours).label('p90_hours'),
+            func.count().filter(with_sla).label('sla_total'),
+            func.count().filter(
+                and_(with_sla, app.actual_completion_date <= app.sla_due_date)
+            ).label('sla_compliant'),
+        ]
+    
+    def _status_count_columns(self) -> List[Any]:
+        """Aggregate columns: total, approved, rejected, referred."""
+        status = UnderwritingApplication.status
+        return [
+            func.count().label('total'),
+            func.count().filter(status == 'approved').label('approved'),
+            func.count().filter(status == 'rejected').label('rejected'),
+            func.count().filter(status == 'referred').label('referred'),
+        ]
+    
+    @staticmethod
+    def _percentage(part: int, whole: int) -> float:
+        return round(part / whole * 100, 2) if whole else 0
+    
+    @staticmethod
+    def _rounded(value: Any) -> float:
+        """Round an aggregate (NULL when nothing was aggregated) to 2 places."""
+        return round(float(value), 2) if value is not None else 0
+    
+    @staticmethod
+    def _submitted_in_period(start_date: date, end_date: date) -> List[Any]:
+        """
+        Applications submitted on any day from start_date to end_date.
+        
+        Half-open [start, end + 1 day) like the daily rollups, so the last
+        day counts whether or not the rollups have been refreshed.
+        """
+        submitted_at = UnderwritingApplication.submitted_at
+        return [submitted_at >= start_date, submitted_at < end_date + timedelta(days=1)]
+    
+    def _profile_period_query(self, start_date: date, end_date: date, product_type: Optional[str], *columns):
+        query = self.db.query(*columns).select_from(UnderwritingProfile).join(
+            UnderwritingApplication,
+            UnderwritingProfile.application_id == UnderwritingApplication.id
+        ).filter(
+            *self._submitted_in_period(start_date, end_date),
+            UnderwritingProfile.archived_at.is_(None)
+        )
+        if product_type:
+            query = query.filter(UnderwritingApplication.product_type == product_type)
+        return query
+    
+    def _risk_distribution(self, start_date: date, end_date: date, product_type: Optional[str]) -> Dict[str, int]:
+        risk_level = UnderwritingProfile.risk_level
+        rows = self._profile_period_query(
+            start_date, end_date, product_type, risk_level, func.count()
+        ).filter(
+            risk_level.isnot(None), risk_level != ''
+        ).group_by(risk_level).all()
+        return {level: count for level, count in rows}
+    
+    @staticmethod
+    def _average(total: float, count: int) -> float:
+        return round(total / count, 2) if count else 0
+    
+    def _read_rollups(self, source: str, start_date: date, end_date: date, product_type: Optional[str] = None):
+        """Daily rollups for the period, or None until the first refresh."""
+        return DailyRollupService(self.db).read(source, start_date, end_date, product_type)
+    
+    def _processing_percentiles(self, start_date: date, end_date: date, *filters) -> Any:
+        """
+        Median/p90 processing hours for whole days in the period.
+        
+        Percentiles cannot be recombined from daily rollups, so they are
+        computed in one aggregate query over the period.
+        """
+        app = UnderwritingApplication
+        return self.db.query(*self._processing_stats_columns()).filter(
+            *self._submitted_in_period(start_date, end_date),
+            app.archived_at.is_(None),
+            *filters
+        ).one()
+    
+    def _rollup_underwriting_analytics(
+        self, start_date: date, end_date: date, product_type: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        applications = self._read_rollups(UNDERWRITING_APPLICATIONS, start_date, end_date, product_type)
+        profiles = self._read_rollups(UNDERWRITING_PROFILES, start_date, end_date, product_type)
+        if applications is None or profiles is None:
+            return None
+        
+        overall = applications.totals()
+        statuses = applications.counts('status')
+        approved, rejected, referred = (statuses.get(s, 0) for s in ('approved', 'rejected', 'referred'))
+        risk = profiles.totals('risk_level')
+        percentiles = self._processing_percentiles(
+            start_date, end_date,
+            *([UnderwritingApplication.product_type == product_type] if product_type else [])
+        )
+        
+        return {
+            'period_start': start_date,
+            'period_end': end_date,
+            'total_applications': overall.row_count,
+            'approved_applications': approved,
+            'rejected_applications': rejected,
+            'referred_applications': referred,
+            'approval_rate': self._percentage(approved, overall.row_count),
+            'rejection_rate': self._percentage(rejected, overall.row_count),
+            'referral_rate': self._percentage(referred, overall.row_count),
+            'average_risk_score': self._average(risk.score_sum, risk.score_count),
+            'average_processing_time_hours': self._average(overall.processing_hours_sum, overall.processing_count),
+            'median_processing_time_hours': self._rounded(percentiles.median_hours),
+            'p90_processing_time_hours': self._rounded(percentiles.p90_hours),
+            'sla_compliance_rate': self._percentage(overall.sla_compliant, overall.sla_total),
+            'risk_distribution': profiles.counts('risk_level'),
+            'product_distribution': applications.counts_by_product(),
+            'channel_distribution': applications.counts('channel')
+        }
+    
     def get_underwriting_analytics(
         self, 
         start_date: date, 
         end_date: date,
         product_type: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get underwriting analytics for period"""
+        """
+        Get underwriting analytics for period.
+        
+        Served from daily rollups (whole days, today live) once they have
+        been refreshed, otherwise aggregated directly in the database.
+        """
         try:
-            query = self.db.query(UnderwritingApplication).filter(
-                UnderwritingApplication.submitted_at >= start_date,
-                UnderwritingApplication.submitted_at <= end_date,
-                UnderwritingApplication.archived_at.is_(None)
-            )
+            rollup = self._rollup_underwriting_analytics(start_date, end_date, product_type)
+            if rollup is not None:
+                return rollup
             
+            app = UnderwritingApplication
+            filters = [*self._submitted_in_period(start_date, end_date), app.archived_at.is_(None)]
             if product_type:
-                query = query.filter(UnderwritingApplication.product_type == product_type)
-            
-            applications = query.all()
+                filters.append(app.product_type == product_type)
             
-            # Calculate statistics
-            total_applications = len(applications)
-            approved_applications = len([app for app in applications if app.status == 'approved'])
-            rejected_applications = len([app for app in applications if app.status == 'rejected'])
-            referred_applications = len([app for app in applications if app.status == 'referred'])
-            
-            approval_rate = (approved_applications / total_applications * 100) if total_applications > 0 else 0
-            rejection_rate = (rejected_applications / total_applications * 100) if total_applications > 0 else 0
-            referral_rate = (referred_applications / total_applications * 100) if total_applications > 0 else 0
-            
-            # Get risk distribution
-            profiles = self.db.query(UnderwritingProfile).join(
-                UnderwritingApplication,
-                UnderwritingProfile.application_id == UnderwritingApplication.id
-            ).filter(
-                UnderwritingApplication.submitted_at >= start_date,
-                UnderwritingApplication.submitted_at <= end_date,
-                UnderwritingProfile.archived_at.is_(None)
-            )
+            # Status counts, processing times and SLA compliance in one pass
+            stats = self.db.query(
+                *self._status_count_columns(), *self._processing_stats_columns()
+            ).filter(*filters).one()
             
-            if product_type:
-                profiles = profiles.filter(UnderwritingApplication.product_type == product_type)
-            
-            profiles = profiles.all()
-            
-            risk_distribution = {}
-            total_risk_score = 0
-            valid_risk_scores = 0
-            
-            for profile in profiles:
-                if profile.risk_level:
-                    risk_distribution[profile.risk_level] = risk_distribution.get(profile.risk_level, 0) + 1
-                
-                if profile.risk_score:
-                    total_risk_score += float(profile.risk_score)
-                    valid_risk_scores += 1
-            
-            average_risk_score = total_risk_score / valid_risk_scores if valid_risk_scores > 0 else 0
-            
-            # Calculate processing times
-            completed_applications = [app for app in applications if app.actual_completion_date and app.processing_started_at]
-            processing_times = []
-            
-            for app in completed_applications:
-                processing_time = (app.actual_completion_date - app.processing_started_at).total_seconds() / 3600
-                processing_times.append(processing_time)
-            
-            average_processing_time = sum(processing_times) / len(processing_times) if processing_times else 0
-            
-            # Calculate SLA compliance
-            sla_compliant = 0
-            sla_total = 0
-            
-            for app in completed_applications:
-                if app.sla_due_date:
-                    sla_total += 1
-                    if app.actual_completion_date <= app.sla_due_date:
-                        sla_compliant += 1
-            
-            sla_compliance_rate = (sla_compliant / sla_total * 100) if sla_total > 0 else 0
-            
-            # Get distribution by product type and channel
-            product_distribution = {}
-            channel_distribution = {}
+            # Distribution by product type and channel
+            product_distribution = {
+                product: count for product, count in
+                self.db.query(app.product_type, func.count()).filter(*filters).group_by(app.product_type).all()
+            }
+            channel_distribution = {
+                channel: count for channel, count in
+                self.db.query(app.submission_channel, func.count()).filter(
+                    *filters, app.submission_channel.isnot(None), app.submission_channel != ''
+                ).group_by(app.submission_channel).all()
+            }
             
-            for app in applications:
-                product_distribution[app.product_type] = product_distribution.get(app.product_type, 0) + 1
-                if app.submission_channel:
-                    channel_distribution[app.submission_channel] = channel_distribution.get(app.submission_channel, 0) + 1
+            # Risk (zero scores are treated as unscored)
+            average_risk_score = self._profile_period_query(
+                start_date, end_date, product_type,
+                func.avg(func.nullif(UnderwritingProfile.risk_score, 0))
+            ).scalar()
             
             return {
                 'period_start': start_date,
                 'period_end': end_date,
-                'total_applications': total_applications,
-                'approved_applications': approved_applications,
-                'rejected_applications': rejected_applications,
-                'referred_applications': referred_applications,
-                'approval_rate': round(approval_rate, 2),
-                'rejection_rate': round(rejection_rate, 2),
-                'referral_rate': round(referral_rate, 2),
-                'average_risk_score': round(average_risk_score, 2),
-                'average_processing_time_hours': round(average_processing_time, 2),
-                'sla_compliance_rate': round(sla_compliance_rate, 2),
-                'risk_distribution': risk_distribution,
+                'total_applications': stats.total,
+                'approved_applications': stats.approved,
+                'rejected_applications': stats.rejected,
+                'referred_applications': stats.referred,
+                'approval_rate': self._percentage(stats.approved, stats.total),
+                'rejection_rate': self._percentage(stats.rejected, stats.total),
+                'referral_rate': self._percentage(stats.referred, stats.total),
+                'average_risk_score': self._rounded(average_risk_score),
+                'average_processing_time_hours': self._rounded(stats.avg_hours),
+                'median_processing_time_hours': self._rounded(stats.median_hours),
+                'p90_processing_time_hours': self._rounded(stats.p90_hours),
+                'sla_compliance_rate': self._percentage(stats.sla_compliant, stats.sla_total),
+                'risk_distribution': self._risk_distribution(start_date, end_date, product_type),
                 'product_distribution': product_distribution,
                 'channel_distribution': channel_distribution
             }
@@ -1125,93 +1231,149 @@ class UnderwritingRepository(BaseRepository):
         except Exception as e:
             raise DatabaseError(f"Failed to get underwriting analytics: {str(e)}")
     
+    def _rollup_performance_metrics(self, start_date: date, end_date: date) -> Optional[Dict[str, Any]]:
+        applications = self._read_rollups(UNDERWRITING_APPLICATIONS, start_date, end_date)
+        if applications is None:
+            return None
+        
+        overall = applications.totals()
+        statuses = applications.counts('status')
+        percentiles = self._processing_percentiles(start_date, end_date)
+        days_in_period = (end_date - start_date).days + 1
+        
+        return {
+            'total_applications_processed': overall.row_count,
+            'applications_approved': statuses.get('approved', 0),
+            'applications_rejected': statuses.get('rejected', 0),
+            'applications_referred': statuses.get('referred', 0),
+            'average_processing_time_hours': self._average(overall.processing_hours_sum, overall.processing_count),
+            'median_processing_time_hours': self._rounded(percentiles.median_hours),
+            'p90_processing_time_hours': self._rounded(percentiles.p90_hours),
+            'sla_compliance_rate': self._percentage(overall.sla_compliant, overall.sla_total),
+            'quality_score_average': self._average(overall.score_sum, overall.score_count),
+            'productivity_score': round(overall.row_count / days_in_period, 2) if days_in_period > 0 else 0
+        }
+    
     def get_performance_metrics(
         self, 
         start_date: date, 
         end_date: date,
         underwriter_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
-        """Get performance metrics for underwriter or system"""
+        """
+        Get performance metrics for underwriter or system.
+        
+        System-wide metrics come from daily rollups once refreshed;
+        per-underwriter metrics are aggregated directly in the database.
+        """
         try:
-            query = self.db.query(UnderwritingApplication).filter(
-                UnderwritingApplication.submitted_at >= start_date,
-                UnderwritingApplication.submitted_at <= end_date,
-                UnderwritingApplication.archived_at.is_(None)
+            if not underwriter_id:
+                rollup = self._rollup_performance_metrics(start_date, end_date)
+                if rollup is not None:
+                    return rollup
+            
+            app = UnderwritingApplication
+            query = self.db.query(
+                *self._status_count_columns(),
+                *self._processing_stats_columns(),
+                # Zero quality scores are treated as unscored
+                func.avg(func.nullif(app.quality_score, 0)).label('quality_average')
+            ).filter(
+                *self._submitted_in_period(start_date, end_date),
+                app.archived_at.is_(None)
             )
             
             if underwriter_id:
                 query = query.filter(
                     or_(
-                        UnderwritingApplication.assigned_underwriter == underwriter_id,
-                        UnderwritingApplication.decision_by == underwriter_id
+                        app.assigned_underwriter == underwriter_id,
+                        app.decision_by == underwriter_id
                     )
                 )
             
-            applications = query.all()
-            
-            # Calculate metrics
-            metrics = {
-                'total_applications_processed': len(applications),
-                'applications_approved': len([app for app in applications if app.status == 'approved']),
-                'applications_rejected': len([app for app in applications if app.status == 'rejected']),
-                'applications_referred': len([app for app in applications if app.status == 'referred']),
-                'average_processing_time_hours': 0,
-                'sla_compliance_rate': 0,
-                'quality_score_average': 0,
-                'productivity_score': 0
-            }
-            
-            # Calculate processing times and SLA compliance
-            completed_apps = [app for app in applications if app.actual_completion_date and app.processing_started_at]
-            if completed_apps:
-                processing_times = [
-                    (app.actual_completion_date - app.processing_started_at).total_seconds() / 3600
-                    for app in completed_apps
-                ]
-                metrics['average_processing_time_hours'] = round(sum(processing_times) / len(processing_times), 2)
-                
-                # SLA compliance
-                sla_compliant = sum(1 for app in completed_apps if app.sla_due_date and app.actual_completion_date <= app.sla_due_date)
-                sla_total = sum(1 for app in completed_apps if app.sla_due_date)
-                metrics['sla_compliance_rate'] = round((sla_compliant / sla_total * 100), 2) if sla_total > 0 else 0
+            stats = query.one()
             
-            # Calculate quality score
-            quality_scores = [float(app.quality_score) for app in applications if app.quality_score]
-            if quality_scores:
-                metrics['quality_score_average'] = round(sum(quality_scores) / len(quality_scores), 2)
-            
-            # Calculate productivity (applications per day)
+            # Productivity (applications per day)
             days_in_period = (end_date - start_date).days + 1
-            metrics['productivity_score'] = round(len(applications) / days_in_period, 2) if days_in_period > 0 else 0
             
-            return metrics
+            return {
+                'total_applications_processed': stats.total,
+                'applications_approved': stats.approved,
+                'applications_rejected': stats.rejected,
+                'applications_referred': stats.referred,
+                'average_processing_time_hours': self._rounded(stats.avg_hours),
+                'median_processing_time_hours': self._rounded(stats.median_hours),
+                'p90_processing_time_hours': self._rounded(stats.p90_hours),
+                'sla_compliance_rate': self._percentage(stats.sla_compliant, stats.sla_total),
+                'quality_score_average': self._rounded(stats.quality_average),
+                'productivity_score': round(stats.total / days_in_period, 2) if days_in_period > 0 else 0
+            }
             
         except Exception as e:
             raise DatabaseError(f"Failed to get performance metrics: {str(e)}")
     
+    def _rollup_risk_analysis(
+        self, start_date: date, end_date: date, product_type: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        profiles = self._read_rollups(UNDERWRITING_PROFILES, start_date, end_date, product_type)
+        if profiles is None:
+            return None
+        
+        totals = profiles.totals('risk_level')
+        if not totals.row_count:
+            return {
+                'total_profiles': 0,
+                'average_risk_score': 0,
+                'risk_distribution': {},
+                'high_risk_profiles': 0,
+                'premium_adjustments': {'average_loading': 0, 'average_discount': 0}
+            }
+        
+        high_risk = profiles.totals('risk_level', self.HIGH_RISK_LEVELS).row_count
+        return {
+            'total_profiles': totals.row_count,
+            'average_risk_score': self._average(totals.score_sum, totals.score_count),
+            'risk_distribution': profiles.counts('risk_level'),
+            'high_risk_profiles': high_risk,
+            'high_risk_percentage': self._percentage(high_risk, totals.row_count),
+            'premium_adjustments': {
+                'average_loading': self._average(totals.loading_sum, totals.loading_count),
+                'average_discount': self._average(totals.discount_sum, totals.discount_count),
+                'profiles_with_loading': totals.loading_count,
+                'profiles_with_discount': totals.discount_count
+            }
+        }
+    
     def get_risk_analysis(
         self, 
         start_date: date, 
         end_date: date,
         product_type: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get risk analysis for period"""
+        """Get risk analysis for period (from daily rollups once refreshed)"""
         try:
-            query = self.db.query(UnderwritingProfile).join(
-                UnderwritingApplication,
-                UnderwritingProfile.application_id == UnderwritingApplication.id
-            ).filter(
-                UnderwritingApplication.submitted_at >= start_date,
-                UnderwritingApplication.submitted_at <= end_date,
-                UnderwritingProfile.archived_at.is_(None)
-            )
-            
-            if product_type:
-                query = query.filter(UnderwritingApplication.product_type == product_type)
-            
-            profiles = query.all()
-            
-            if not profiles:
+            rollup = self._rollup_risk_analysis(start_date, end_date, product_type)
+            if rollup is not None:
+                return rollup
+            
+            profile = UnderwritingProfile
+            # Zero scores/loadings/discounts are treated as not set
+            risk_score = func.nullif(profile.risk_score, 0)
+            loading = func.nullif(profile.premium_loading, 0)
+            discount = func.nullif(profile.premium_discount, 0)
+            
+            stats = self._profile_period_query(
+                start_date, end_date, product_type,
+                func.count().label('total'),
+                func.avg(risk_score).label('average_risk_score'),
+                func.count().filter(profile.risk_level.in_(self.HIGH_RISK_LEVELS)).label('high_risk'),
+                func.avg(loading).label('average_loading'),
+                func.count(loading).label('with_loading'),
+                func.avg(discount).label('average_discount'),
+                func.count(discount).label('with_discount'),
+            ).one()
+            
+            if not stats.total:
                 return {
                     'total_profiles': 0,
                     'average_risk_score': 0,
@@ -1220,32 +1382,17 @@ class UnderwritingRepository(BaseRepository):
                     'premium_adjustments': {'average_loading': 0, 'average_discount': 0}
                 }
             
-            # Calculate risk statistics
-            risk_scores = [float(p.risk_score) for p in profiles if p.risk_score]
-            premium_loadings = [float(p.premium_loading) for p in profiles if p.premium_loading]
-            premium_discounts = [float(p.premium_discount) for p in profiles if p.premium_discount]
-            
-            risk_distribution = {}
-            high_risk_count = 0
-            
-            for profile in profiles:
-                if profile.risk_level:
-                    risk_distribution[profile.risk_level] = risk_distribution.get(profile.risk_level, 0) + 1
-                    
-                    if profile.risk_level in ['high', 'very_high', 'unacceptable']:
-                        high_risk_count += 1
-            
             return {
-                'total_profiles': len(profiles),
-                'average_risk_score': round(sum(risk_scores) / len(risk_scores), 2) if risk_scores else 0,
-                'risk_distribution': risk_distribution,
-                'high_risk_profiles': high_risk_count,
-                'high_risk_percentage': round((high_risk_count / len(profiles) * 100), 2) if profiles else 0,
+                'total_profiles': stats.total,
+                'average_risk_score': self._rounded(stats.average_risk_score),
+                'risk_distribution': self._risk_distribution(start_date, end_date, product_type),
+                'high_risk_profiles': stats.high_risk,
+                'high_risk_percentage': self._percentage(stats.high_risk, stats.total),
                 'premium_adjustments': {
-                    'average_loading': round(sum(premium_loadings) / len(premium_loadings), 2) if premium_loadings else 0,
-                    'average_discount': round(sum(premium_discounts) / len(premium_discounts), 2) if premium_discounts else 0,
-                    'profiles_with_loading': len(premium_loadings),
-                    'profiles_with_discount': len(premium_discounts)
+                    'average_loading': self._rounded(stats.average_loading),
+                    'average_discount': self._rounded(stats.average_discount),
+                    'profiles_with_loading': stats.with_loading,
+                    'profiles_with_discount': stats.with_discount
                 }
             }
             
@@ -738,6 +738,8 @@ class UnderwritingAnalytics(BaseModel):
     
     average_risk_score: Decimal = Field(..., ge=0, le=100, description="Average risk score")
     average_processing_time_hours: Decimal = Field(..., ge=0, description="Average processing time")
+    median_processing_time_hours: Optional[Decimal] = Field(None, ge=0, description="Median processing time")
+    p90_processing_time_hours: Optional[Decimal] = Field(None, ge=0, description="90th percentile processing time")
     sla_compliance_rate: Decimal = Field(..., ge=0, le=100, description="SLA compliance rate %")
     
     risk_distribution: Dict[str, int] = Field(..., description="Risk level distribution")
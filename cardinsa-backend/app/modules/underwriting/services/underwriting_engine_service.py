@@ -29,6 +29,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, not_
 
 # Core imports
+from app.core.database import run_in_session
 from app.core.exceptions import BusinessLogicError, ValidationError, EntityNotFoundError
 from app.core.logging import get_logger
 
@@ -213,7 +214,7 @@ class UnderwritingEngineService:
         self.logger.info(f"Re-evaluating application {application_id}: {reason}")
         
         # Get existing profile
-        profile = self.repository.get_profile_by_application(application_id)
+        profile = await run_in_session(self.db, self.repository.get_profile_by_application, application_id)
         if not profile:
             raise EntityNotFoundError(f"No profile found for application {application_id}")
         
@@ -647,7 +648,9 @@ class UnderwritingEngineService:
         """Get rules applicable to the context"""
         
         # Get active rules for product type
-        rules = self.repository.get_active_rules_by_product(
+        rules = await run_in_session(
+            self.db,
+            self.repository.get_active_rules_by_product,
             product_type=context.product_type,
             effective_date=datetime.now().date()
         )
@@ -1039,7 +1042,7 @@ class UnderwritingEngineService:
     ) -> UnderwritingProfile:
         """Get existing profile or create new one"""
         
-        profile = self.repository.get_profile_by_application(application_id)
+        profile = await run_in_session(self.db, self.repository.get_profile_by_application, application_id)
         
         if not profile:
             profile = UnderwritingProfile(
@@ -1054,7 +1057,7 @@ class UnderwritingEngineService:
                 created_by=context.applicant_data.get('created_by')
             )
             
-            self.repository.create_profile(profile)
+            await run_in_session(self.db, self.repository.create_profile, profile)
         
         return profile
     
@@ -1084,7 +1087,7 @@ class UnderwritingEngineService:
         
         profile.calculate_net_premium_adjustment()
         
-        self.repository.update_profile(profile)
+        await run_in_session(self.db, self.repository.update_profile, profile)
     
     async def _archive_current_decision(
         self, 
@@ -1106,7 +1109,7 @@ class UnderwritingEngineService:
             decision_date=datetime.now()
         )
         
-        self.repository.create_decision(archived_decision)
+        await run_in_session(self.db, self.repository.create_decision, archived_decision)
     
     async def _log_decision(
         self,
@@ -1128,7 +1131,7 @@ class UnderwritingEngineService:
             decision_date=datetime.now()
         )
         
-        self.repository.create_decision(decision_record)
+        await run_in_session(self.db, self.repository.create_decision, decision_record)
         
         self.logger.info(
             f"Underwriting decision logged - Application: {application_id}, "
@@ -1147,7 +1150,9 @@ class UnderwritingEngineService:
         """Start appropriate workflow for manual review"""
         
         # Get workflow for product type and decision
-        workflow = self.repository.get_workflow_for_context(
+        workflow = await run_in_session(
+            self.db,
+            self.repository.get_workflow_for_context,
             product_type=context.product_type,
             decision=decision_result.decision,
             risk_level=decision_result.risk_score
@@ -1155,7 +1160,7 @@ class UnderwritingEngineService:
         
         if not workflow:
             # Use default workflow
-            workflow = self.repository.get_default_workflow()
+            workflow = await run_in_session(self.db, self.repository.get_default_workflow)
         
         if not workflow:
             raise BusinessLogicError("No workflow available for manual review")
@@ -1174,7 +1179,7 @@ class UnderwritingEngineService:
             sla_due_date=datetime.now() + timedelta(hours=workflow.default_sla_hours or 72)
         )
         
-        self.repository.create_workflow_execution(execution)
+        await run_in_session(self.db, self.repository.create_workflow_execution, execution)
         
         # Start first workflow step
         await self._start_first_workflow_step(execution, workflow, context)
@@ -1209,7 +1214,7 @@ class UnderwritingEngineService:
         if assignment_target:
             step_execution.assigned_to = UUID(assignment_target) if assignment_target != 'auto' else None
         
-        self.repository.create_step_execution(step_execution)
+        await run_in_session(self.db, self.repository.create_step_execution, step_execution)
         
         # If step is automatic, execute it
         if first_step.step_type == StepType.AUTO:
@@ -1243,7 +1248,7 @@ class UnderwritingEngineService:
             step_execution.error_details = str(e)
             self.logger.error(f"Workflow step execution failed: {str(e)}")
         
-        self.repository.update_step_execution(step_execution)
+        await run_in_session(self.db, self.repository.update_step_execution, step_execution)
     
     async def _execute_automatic_step(
         self,
@@ -1307,13 +1312,15 @@ class UnderwritingEngineService:
     async def get_application_status(self, application_id: UUID) -> Dict[str, Any]:
         """Get current status of application"""
         
-        profile = self.repository.get_profile_by_application(application_id)
+        profile = await run_in_session(self.db, self.repository.get_profile_by_application, application_id)
         if not profile:
             return {'status': 'not_found'}
         
         workflow_execution = None
         if profile.status == ProfileStatus.REVIEW:
-            workflow_execution = self.repository.get_active_workflow_execution(application_id)
+            workflow_execution = await run_in_session(
+                self.db, self.repository.get_active_workflow_execution, application_id
+            )
         
         return {
             'status': profile.status,
@@ -1329,12 +1336,14 @@ class UnderwritingEngineService:
     async def get_decision_summary(self, application_id: UUID) -> Dict[str, Any]:
         """Get summary of underwriting decision"""
         
-        profile = self.repository.get_profile_by_application(application_id)
+        profile = await run_in_session(self.db, self.repository.get_profile_by_application, application_id)
         if not profile:
             raise EntityNotFoundError(f"No profile found for application {application_id}")
         
-        decisions = self.repository.get_decisions_by_application(application_id)
-        rule_evaluations = self.repository.get_rule_evaluations_by_application(application_id)
+        decisions = await run_in_session(self.db, self.repository.get_decisions_by_application, application_id)
+        rule_evaluations = await run_in_session(
+            self.db, self.repository.get_rule_evaluations_by_application, application_id
+        )
         
         return {
             'application_id': str(application_id),
@@ -7,11 +7,18 @@ Provides pagination functionality for FastAPI applications with SQLAlchemy,
 including response models, parameter validation, and utility functions.
 """
 
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
 from math import ceil
 from typing import Tuple, Generic, TypeVar, List, Optional, Any, Dict
-from sqlalchemy import func, select, asc, desc
+from uuid import UUID
+from sqlalchemy import func, select, asc, desc, tuple_
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from enum import Enum
 
@@ -36,6 +43,13 @@ class SortDirection(str, Enum):
     DESC = "desc"
 
 
+class CountMode(str, Enum):
+    """How the total is computed for a page"""
+    EXACT = "exact"        # COUNT(*) over the filtered query
+    ESTIMATE = "estimate"  # planner row estimate (EXPLAIN), no scan
+    NONE = "none"          # no total
+
+
 # =====================================================================
 # PARAMETER MODELS
 # =====================================================================
@@ -153,6 +167,28 @@ class PageMeta(BaseModel):
         }
 
 
+class CursorMeta(BaseModel):
+    """Keyset pagination metadata"""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    size: int = Field(..., ge=1, description="Items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (None on the last page)")
+    has_next: bool = Field(..., description="Whether another page follows")
+    total: Optional[int] = Field(None, ge=0, description="Total number of items (if requested)")
+    total_is_estimate: bool = Field(default=False, description="Whether total is a planner estimate")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            'size': self.size,
+            'next_cursor': self.next_cursor,
+            'has_next': self.has_next,
+            'total': self.total,
+            'total_is_estimate': self.total_is_estimate
+        }
+
+
 # =====================================================================
 # RESPONSE MODELS
 # =====================================================================
@@ -208,11 +244,211 @@ class PaginatedListResponse(PaginatedResponse[T]):
 # UTILITY FUNCTIONS
 # =====================================================================
 
+class _ExplainJSON(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, executed like the statement itself."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_ExplainJSON)
+def _compile_explain_json(element: _ExplainJSON, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(db: Session, stmt: Select) -> int:
+    """
+    Planner estimate of the number of rows ``stmt`` returns.
+    
+    Runs ``EXPLAIN (FORMAT JSON)`` (PostgreSQL), which reads table
+    statistics instead of scanning, so it costs the same on any table
+    size. Accuracy depends on how recently the table was analyzed.
+    
+    Args:
+        db: Database session
+        stmt: SQLAlchemy select statement (ordering/limits are ignored)
+        
+    Returns:
+        Estimated row count
+    """
+    # Executed (not pre-rendered) so IN lists expand and parameters go through their types
+    plan = db.execute(_ExplainJSON(stmt.order_by(None).limit(None).offset(None))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(db: Session, stmt: Select, mode: CountMode = CountMode.EXACT) -> Optional[int]:
+    """Total rows of ``stmt`` per ``mode`` (None for CountMode.NONE)."""
+    mode = CountMode(mode)
+    if mode == CountMode.NONE:
+        return None
+    if mode == CountMode.ESTIMATE:
+        return estimate_count(db, stmt)
+    count_stmt = select(func.count()).select_from(
+        stmt.order_by(None).limit(None).offset(None).subquery()
+    )
+    return db.execute(count_stmt).scalar_one()
+
+
+# ---------------------------------------------------------------------
+# Keyset (cursor) pagination
+# ---------------------------------------------------------------------
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        (kind, raw), = value.items()
+        if kind == "dt":
+            return datetime.fromisoformat(raw)
+        if kind == "d":
+            return date.fromisoformat(raw)
+        if kind == "uuid":
+            return UUID(raw)
+        if kind == "dec":
+            return Decimal(raw)
+        raise ValueError(f"Unknown cursor value type: {kind}")
+    return value
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque cursor for the sort key values of the last item of a page."""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Sort key values from a cursor made by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list):
+            raise ValueError("cursor is not a list")
+        return [_decode_value(value) for value in values]
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_statement(
+    stmt: Select,
+    sort_column: Any,
+    id_column: Any,
+    size: int,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> Select:
+    """
+    Apply keyset ordering, the cursor position and a limit of ``size + 1``.
+    
+    Rows are ordered by (sort_column, id_column) in one direction, and the
+    cursor becomes a row-value comparison that an index on
+    (sort_column, id_column) can seek to. ``sort_column`` must not be
+    nullable; ``id_column`` breaks ties.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        sort_value, id_value = decode_cursor(cursor)
+        key = tuple_(sort_column, id_column)
+        position = tuple_(sort_value, id_value)
+        stmt = stmt.where(key < position if descending else key > position)
+    
+    if descending:
+        stmt = stmt.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(None).order_by(sort_column.asc(), id_column.asc())
+    # One extra row tells whether a next page exists
+    return stmt.limit(size + 1)
+
+
+def keyset_page(
+    rows: List[Any],
+    sort_column: Any,
+    id_column: Any,
+    size: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by keyset_statement and build the next cursor."""
+    items = list(rows[:size])
+    if len(rows) <= size or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor([getattr(last, sort_column.key), getattr(last, id_column.key)])
+
+
+def keyset_paginate(
+    db: Session,
+    stmt: Select,
+    sort_column: Any,
+    id_column: Any,
+    size: int = 20,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    count_mode: CountMode = CountMode.NONE
+) -> Tuple[List[Any], CursorMeta]:
+    """
+    Paginate a SQLAlchemy query by keyset instead of OFFSET
+    
+    Each page costs an index seek plus ``size`` rows however deep it is.
+    
+    Args:
+        db: Database session
+        stmt: SQLAlchemy select statement of ORM entities
+        sort_column: Indexed, non-null sort column (e.g. Model.created_at)
+        id_column: Unique tie-breaker (e.g. Model.id)
+        size: Items per page
+        cursor: Cursor from the previous page's meta (None for the first page)
+        descending: Sort newest/highest first
+        count_mode: Whether to add an exact, estimated or no total
+        
+    Returns:
+        Tuple of (items, cursor_meta)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    total = count_rows(db, stmt, count_mode)
+    rows = db.execute(
+        keyset_statement(stmt, sort_column, id_column, size, cursor, descending)
+    ).scalars().all()
+    items, next_cursor = keyset_page(rows, sort_column, id_column, size)
+    
+    meta = CursorMeta(
+        size=size,
+        next_cursor=next_cursor,
+        has_next=next_cursor is not None,
+        total=total,
+        total_is_estimate=CountMode(count_mode) == CountMode.ESTIMATE
+    )
+    return items, meta
+
+
 def paginate(
     db: Session, 
     stmt: Select, 
     params: PageParams,
-    count_query: Optional[Select] = None
+    count_query: Optional[Select] = None,
+    estimate_total: bool = False
 ) -> Tuple[List[Any], PageMeta]:
     """
     Paginate a SQLAlchemy query
@@ -222,6 +458,7 @@ def paginate(
         stmt: SQLAlchemy select statement
         params: Pagination parameters
         count_query: Optional custom count query
+        estimate_total: Use the planner's row estimate instead of COUNT(*)
         
     Returns:
         Tuple of (items, pagination_meta)
@@ -229,6 +466,8 @@ def paginate(
     # Count total items
     if count_query is not None:
         total = db.execute(count_query).scalar_one()
+    elif estimate_total:
+        total = estimate_count(db, stmt)
     else:
         # Remove ordering and limiting from count query for performance
         count_stmt = select(func.count()).select_from(
@@ -259,27 +498,47 @@ def paginate_query(
     query_stmt: Select,
     page: int = 1,
     size: int = 20,
-    max_size: int = 100
-) -> Tuple[List[Any], PageMeta]:
+    max_size: int = 100,
+    cursor: Optional[str] = None,
+    sort_column: Any = None,
+    id_column: Any = None,
+    descending: bool = False,
+    count_mode: CountMode = CountMode.EXACT
+) -> Tuple[List[Any], Any]:
     """
     Simple pagination function with validation
     
+    Offset mode by default. Passing ``sort_column`` and ``id_column``
+    switches to keyset mode: ``page`` is ignored, ``cursor`` selects the
+    position and the meta is a CursorMeta.
+    
     Args:
         db: Database session
         query_stmt: SQLAlchemy select statement
-        page: Page number (1-based)
+        page: Page number (1-based, offset mode)
         size: Items per page
         max_size: Maximum allowed page size
+        cursor: Keyset cursor from the previous page
+        sort_column: Keyset sort column
+        id_column: Keyset tie-breaker column
+        descending: Keyset sort direction
+        count_mode: Exact, estimated or no total (estimated/exact only in offset mode)
         
     Returns:
-        Tuple of (items, pagination_meta)
+        Tuple of (items, pagination_meta) - PageMeta or CursorMeta
     """
     # Validate parameters
-    page = max(1, page)
     size = min(max(1, size), max_size)
     
+    if sort_column is not None and id_column is not None:
+        return keyset_paginate(
+            db, query_stmt, sort_column, id_column,
+            size=size, cursor=cursor, descending=descending, count_mode=count_mode
+        )
+    
+    page = max(1, page)
     params = PageParams(page=page, size=size)
-    return paginate(db, query_stmt, params)
+    return paginate(db, query_stmt, params, estimate_total=CountMode(count_mode) == CountMode.ESTIMATE)
 
 
 def apply_sort(
@@ -415,6 +674,7 @@ __all__ = [
     
     # Metadata models
     'PageMeta',
+    'CursorMeta',
     
     # Response models
     'PaginatedResponse',
@@ -422,10 +682,18 @@ __all__ = [
     
     # Enums
     'SortDirection',
+    'CountMode',
     
     # Utility functions
     'paginate',
     'paginate_query',
+    'keyset_paginate',
+    'keyset_statement',
+    'keyset_page',
+    'encode_cursor',
+    'decode_cursor',
+    'estimate_count',
+    'count_rows',
     'apply_sort',
     'apply_filters',
     'create_paginated_response',
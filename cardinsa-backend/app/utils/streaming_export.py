@@ -0,0 +1,236 @@
+# app/utils/streaming_export.py
+
+"""
+Streaming Export Utilities
+
+Streams large result sets as CSV or NDJSON without materializing them.
+Rows are read through a server-side cursor (``yield_per``) in a session
+owned by the response generator, encoded in batches and sent as they are
+produced, so memory stays flat however many rows are exported.
+
+Usage:
+    stmt = select(AuditLog).where(...).order_by(AuditLog.created_at)
+    return streaming_export_response(
+        stream_query(stmt, lambda log: log.to_dict()),
+        export_format="csv",
+        filename="audit_logs",
+    )
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.database import SessionLocal
+from app.utils.files import safe_filename
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    """Streaming export formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+# =====================================================================
+# ROW SOURCES
+# =====================================================================
+
+def stream_query(
+    stmt: Select,
+    row_mapper: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    scalars: bool = True,
+    session_factory: Callable[[], Session] = SessionLocal
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of ``stmt`` from a server-side cursor.
+
+    The generator opens its own session, because request-scoped sessions
+    may be closed before a streaming body is sent, and closes it when
+    exhausted or abandoned (client disconnect).
+
+    Args:
+        stmt: SQLAlchemy select statement
+        row_mapper: Converts each row/entity to a dict (default: row mapping)
+        batch_size: Rows fetched per round trip
+        scalars: Yield the first column (ORM entities) instead of rows
+        session_factory: Session factory
+
+    Yields:
+        One dict per row (the entity itself if scalars and no row_mapper)
+    """
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        rows = result.scalars() if scalars else result
+        # The identity map holds entities weakly, so encoded rows are freed
+        for row in rows:
+            if row_mapper is not None:
+                yield row_mapper(row)
+            elif scalars:
+                yield row
+            else:
+                yield dict(row._mapping)
+    finally:
+        db.close()
+
+
+# =====================================================================
+# ENCODERS
+# =====================================================================
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def iter_csv(
+    rows: Iterable[Dict[str, Any]],
+    columns: Optional[List[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode dict rows as CSV chunks.
+
+    Args:
+        rows: Dict rows
+        columns: Header/column order (default: keys of the first row);
+            keys missing from a row are left empty, extra keys are dropped
+        batch_size: Rows per yielded chunk
+
+    Yields:
+        UTF-8 encoded CSV chunks, header first
+    """
+    buffer = io.StringIO()
+    writer = None
+    pending = 0
+
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(
+                buffer, fieldnames=columns or list(row.keys()), extrasaction="ignore"
+            )
+            writer.writeheader()
+        writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if writer is None and columns:
+        csv.DictWriter(buffer, fieldnames=columns).writeheader()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode dict rows as newline-delimited JSON chunks.
+
+    Args:
+        rows: Dict rows
+        batch_size: Rows per yielded chunk
+
+    Yields:
+        UTF-8 encoded NDJSON chunks
+    """
+    lines: List[str] = []
+    for row in rows:
+        lines.append(json.dumps(row, default=_json_default, separators=(",", ":")))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# =====================================================================
+# RESPONSE
+# =====================================================================
+
+def streaming_export_response(
+    rows: Iterable[Dict[str, Any]],
+    export_format: ExportFormat = ExportFormat.CSV,
+    filename: str = "export",
+    columns: Optional[List[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> StreamingResponse:
+    """
+    Stream dict rows as a CSV or NDJSON attachment.
+
+    Args:
+        rows: Dict rows, typically from stream_query
+        export_format: csv or ndjson
+        filename: Download name without extension
+        columns: CSV column order (ignored for NDJSON)
+        batch_size: Rows per chunk
+
+    Returns:
+        StreamingResponse
+    """
+    export_format = ExportFormat(export_format)
+    if export_format == ExportFormat.CSV:
+        body = iter_csv(rows, columns, batch_size)
+    else:
+        body = iter_ndjson(rows, batch_size)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{safe_filename(filename)}.{export_format.value}"'
+            )
+        },
+    )
+
+
+__all__ = [
+    'ExportFormat',
+    'stream_query',
+    'iter_csv',
+    'iter_ndjson',
+    'streaming_export_response',
+]
@@ -0,0 +1,109 @@
+# scripts/benchmark_login.py
+"""
+Login storm benchmark
+Measures latency of an unrelated endpoint while logins hammer the server.
+
+bcrypt verification is deliberately slow; if it runs on the event loop,
+every concurrent request waits behind it. With hashing on the password
+pool, probe latency should stay close to the idle baseline.
+
+Run against a running server (needs httpx):
+    python scripts/benchmark_login.py --url http://localhost:8000 \\
+        --username admin@example.com --password secret --logins 16
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> List[float]:
+    """Hit ``path`` repeatedly and record each round-trip time."""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_worker(
+    client: httpx.AsyncClient, path: str, form: Dict[str, str], stop: asyncio.Event
+) -> List[float]:
+    """Log in back to back until stopped."""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.post(path, data=form)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(args: argparse.Namespace) -> None:
+    login_path = f"{args.api_prefix}/auth/login"
+    form = {"username": args.username, "password": args.password}
+    limits = httpx.Limits(max_connections=args.logins + 4)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        # Baseline: probe alone
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+        await asyncio.sleep(args.duration / 2)
+        stop.set()
+        baseline = await baseline_task
+
+        # Storm: probe while ``--logins`` clients log in continuously
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe_path, stop, args.probe_interval))
+        login_tasks = [
+            asyncio.create_task(login_worker(client, login_path, form, stop))
+            for _ in range(args.logins)
+        ]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        under_storm = await probe_task
+        logins = [latency for task in login_tasks for latency in await task]
+
+    print(f"Probe {args.probe_path} idle:        {summarize(baseline)}")
+    print(f"Probe {args.probe_path} under storm: {summarize(under_storm)}")
+    print(f"Logins ({args.logins} concurrent):   {summarize(logins)}")
+    print(f"Login throughput: {len(logins) / args.duration:.1f}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="storm length in seconds")
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
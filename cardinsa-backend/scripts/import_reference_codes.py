@@ -0,0 +1,58 @@
+# scripts/import_reference_codes.py
+"""
+Reference code set import
+Loads an ICD-10 or CPT code set from CSV through the COPY pipeline,
+printing progress. Existing codes are updated, unchanged rows are skipped.
+
+The CSV needs a header row: code, description_en, description_ar and
+chapter (ICD-10) or category (CPT).
+
+Run with:
+    python scripts/import_reference_codes.py icd10 icd10_2026.csv
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.bulk_import import ImportProgress
+from app.core.database import SessionLocal
+from app.modules.pricing.reference.services.cpt_code_service import CPTCodeService
+from app.modules.pricing.reference.services.icd10_code_service import ICD10CodeService
+
+SERVICES = {"icd10": ICD10CodeService, "cpt": CPTCodeService}
+
+
+def print_progress(progress: ImportProgress) -> None:
+    print(
+        f"[{progress.elapsed_seconds:7.1f}s] {progress.phase:<8} "
+        f"copied={progress.rows_copied} rejected={progress.rejected} "
+        f"inserted={progress.inserted} updated={progress.updated}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("code_set", choices=sorted(SERVICES))
+    parser.add_argument("csv_file")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.csv_file, "rb") as stream:
+            result = SERVICES[args.code_set](db).import_csv(stream, progress=print_progress)
+    finally:
+        db.close()
+
+    for error in result.errors:
+        print(f"row {error['row']}: {error['error']}")
+    print(
+        f"Done: {result.total_rows} rows, {result.inserted} inserted, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.rejected} rejected in {result.elapsed_seconds:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
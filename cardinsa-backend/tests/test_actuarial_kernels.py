@@ -0,0 +1,138 @@
+# tests/test_actuarial_kernels.py
+"""Vectorized actuarial kernels agree with the year-by-year scalar loops."""
+import random
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.modules.pricing.product.schemas.actuarial_table_schema import Gender, SmokingStatus
+from app.modules.pricing.product.services import actuarial_kernels as kernels
+from app.modules.pricing.product.services.actuarial_table_service import _calculate_life_expectancy
+
+
+# ---------------------------------------------------------------------
+# Scalar references
+# ---------------------------------------------------------------------
+
+def scalar_life_expectancy(table_data, current_age, gender, smoking_status):
+    survival_prob = 1.0
+    expected_years = 0.0
+    for age in range(current_age, min(current_age + 50, 120)):
+        rate = None
+        for row in table_data:
+            if row.get('age') == age:
+                if gender == Gender.MALE and row.get('rate_male'):
+                    rate = row['rate_male']
+                elif gender == Gender.FEMALE and row.get('rate_female'):
+                    rate = row['rate_female']
+                elif smoking_status == SmokingStatus.SMOKER and row.get('rate_smoker'):
+                    rate = row['rate_smoker']
+                elif smoking_status == SmokingStatus.NON_SMOKER and row.get('rate_non_smoker'):
+                    rate = row['rate_non_smoker']
+                else:
+                    rate = row.get('rate')
+                break
+        if rate is None:
+            break
+        survival_prob *= (1 - rate)
+        expected_years += survival_prob
+        if survival_prob < 0.01:
+            break
+    return expected_years
+
+
+def scalar_present_values(rate, term_years, interest_rate, sum_insured):
+    values = {}
+    annuity = Decimal('0')
+    for year in range(1, term_years + 1):
+        annuity += (1 + interest_rate) ** -year * (1 - rate) ** year
+    values["annuity_present_value"] = float(annuity)
+    if sum_insured:
+        insurance = Decimal('0')
+        for year in range(1, term_years + 1):
+            insurance += (1 + interest_rate) ** -year * rate * (1 - rate) ** (year - 1) * sum_insured
+        values["insurance_present_value"] = float(insurance)
+    return values
+
+
+def scalar_reserve(annual_premium, term_years, interest_rate):
+    reserve = annual_premium * term_years * Decimal('0.3')
+    return reserve * ((1 - (1 + interest_rate) ** -term_years) / interest_rate)
+
+
+# ---------------------------------------------------------------------
+# Life expectancy
+# ---------------------------------------------------------------------
+
+def mortality_table(rng):
+    rows = []
+    for age in range(0, 125):
+        if rng.random() < 0.04:
+            continue  # gap: projections stop here
+        row = {'age': age, 'rate': rng.choice([None] + [min(0.0005 * 1.09 ** age, 1.0)] * 8)}
+        for name in ('rate_male', 'rate_female', 'rate_smoker', 'rate_non_smoker'):
+            if rng.random() < 0.5:
+                row[name] = rng.choice([0, min(0.0007 * 1.1 ** age, 1.0)])
+        rows.append(row)
+        if rng.random() < 0.1:
+            rows.append({'age': age, 'rate': 0.9})  # later duplicates are ignored
+    return rows
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_life_expectancy_matches_scalar_projection(seed):
+    rng = random.Random(seed)
+    table_data = mortality_table(rng)
+    table = SimpleNamespace(id=uuid.uuid4(), version="1", updated_at=None, table_data=table_data)
+
+    for age in list(range(0, 125, 3)) + [119, 120, 130]:
+        for gender in [None, Gender.MALE, Gender.FEMALE]:
+            for smoking_status in [None, SmokingStatus.SMOKER, SmokingStatus.NON_SMOKER]:
+                assert _calculate_life_expectancy(table, age, gender, smoking_status) == pytest.approx(
+                    scalar_life_expectancy(table_data, age, gender, smoking_status), rel=1e-12, abs=1e-12
+                ), (age, gender, smoking_status)
+
+
+def test_life_expectancy_stops_after_low_survival():
+    mortality = np.full(120, 0.5)
+
+    # 0.5 + 0.25 + ... + 2^-7: the first year below 1% still counts
+    assert kernels.life_expectancies(mortality, np.array([30]))[0] == pytest.approx(1 - 2 ** -7)
+
+
+# ---------------------------------------------------------------------
+# Present values and reserves
+# ---------------------------------------------------------------------
+
+def test_present_values_and_reserves_match_decimal_loops():
+    rng = random.Random(11)
+    size = 200
+    rates = [Decimal(str(round(rng.uniform(0.0001, 0.3), 5))) for _ in range(size)]
+    terms = [rng.randint(0, 40) for _ in range(size)]
+    interest = [Decimal(str(round(rng.uniform(0.005, 0.12), 4))) for _ in range(size)]
+    sums = [rng.choice([None, Decimal("100000"), Decimal("250000.50")]) for _ in range(size)]
+    premiums = [Decimal(str(round(rng.uniform(100, 5000), 2))) for _ in range(size)]
+
+    values = kernels.present_values(
+        np.array(rates, dtype=float), np.array(terms), np.array(interest, dtype=float),
+        np.array([np.nan if s is None else float(s) for s in sums])
+    )
+    reserve_amounts = kernels.reserves(np.array(premiums, dtype=float), np.array(terms), np.array(interest, dtype=float))
+
+    for i in range(size):
+        expected = scalar_present_values(rates[i], terms[i], interest[i], sums[i])
+        assert values["annuity_present_value"][i] == pytest.approx(expected["annuity_present_value"], rel=1e-9, abs=1e-12)
+        if sums[i] is None:
+            assert np.isnan(values["insurance_present_value"][i])
+        else:
+            assert values["insurance_present_value"][i] == pytest.approx(expected["insurance_present_value"], rel=1e-9, abs=1e-9)
+        assert reserve_amounts[i] == pytest.approx(float(scalar_reserve(premiums[i], terms[i], interest[i])), rel=1e-9)
+
+
+def test_zero_interest_annuity_factor_is_the_term():
+    factors = kernels.annuity_certain_factors(np.array([10, 25]), np.array([0.0, 0.0]))
+
+    assert factors.tolist() == [10.0, 25.0]
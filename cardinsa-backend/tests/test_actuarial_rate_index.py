@@ -0,0 +1,153 @@
+# tests/test_actuarial_rate_index.py
+"""Age-indexed actuarial lookups agree with the linear scans they replaced."""
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.modules.pricing.product.repositories.actuarial_table_repository import (
+    _get_improvement_factor,
+    _get_rate_from_table,
+    _get_selection_factor,
+)
+from app.modules.pricing.product.schemas.actuarial_table_schema import Gender, SmokingStatus
+from app.modules.pricing.product.services.actuarial_rate_index import ActuarialRateIndex
+from app.modules.pricing.profiles.services import age_bracket_integration
+from app.modules.pricing.profiles.services.age_bracket_integration import AdvancedAgeBracketIntegration
+
+
+# ---------------------------------------------------------------------
+# Reference scans
+# ---------------------------------------------------------------------
+
+def scan_rate(table_data, age, gender, smoking_status):
+    for row in table_data:
+        if row.get('age') != age:
+            continue
+        if gender and row.get('gender') and row['gender'] != gender.value:
+            continue
+        if smoking_status and row.get('smoking_status') and row['smoking_status'] != smoking_status.value:
+            continue
+        if gender and smoking_status:
+            if gender == Gender.MALE and row.get('rate_male'):
+                return row['rate_male']
+            elif gender == Gender.FEMALE and row.get('rate_female'):
+                return row['rate_female']
+            if smoking_status == SmokingStatus.SMOKER and row.get('rate_smoker'):
+                return row['rate_smoker']
+            elif smoking_status == SmokingStatus.NON_SMOKER and row.get('rate_non_smoker'):
+                return row['rate_non_smoker']
+        return row.get('rate')
+    return None
+
+
+def scan_factor(table_data, age, name):
+    for row in table_data:
+        if row.get('age') == age and row.get(name):
+            return Decimal(str(row[name]))
+    return None
+
+
+def mapping_rate_for_age(rates, age, gender):
+    gender_rates = rates.get(str(age))
+    if gender_rates is None:
+        return None
+    if gender.value in gender_rates:
+        return gender_rates[gender.value]
+    if "UNISEX" in gender_rates:
+        return gender_rates["UNISEX"]
+    if gender_rates:
+        return sum(gender_rates.values()) / len(gender_rates)
+    return None
+
+
+def mapping_rate(rates, age, gender):
+    gender_rates = rates.get(str(age))
+    if gender_rates and (gender.value in gender_rates or "UNISEX" in gender_rates):
+        return mapping_rate_for_age(rates, age, gender)
+
+    available = sorted(int(a) for a in rates)
+    if not available:
+        return None
+    lower = upper = None
+    for candidate in available:
+        if candidate <= age:
+            lower = candidate
+        if candidate >= age and upper is None:
+            upper = candidate
+            break
+    if lower == age:
+        return mapping_rate_for_age(rates, lower, gender)
+    if lower is None or upper is None:
+        closest = min(available, key=lambda a: abs(a - age))
+        return mapping_rate_for_age(rates, closest, gender)
+    lower_rate = mapping_rate_for_age(rates, lower, gender)
+    upper_rate = mapping_rate_for_age(rates, upper, gender)
+    if lower_rate is None or upper_rate is None:
+        return None
+    weight = (age - lower) / (upper - lower)
+    return lower_rate + (upper_rate - lower_rate) * Decimal(str(weight))
+
+
+# ---------------------------------------------------------------------
+# table_data rows (repository lookups)
+# ---------------------------------------------------------------------
+
+def random_row(rng, age):
+    row = {'age': age, 'rate': rng.choice([None, 0, 0.01, 0.02, 0.5])}
+    for name in ('gender', 'smoking_status'):
+        values = [g.value for g in (Gender if name == 'gender' else SmokingStatus)]
+        if rng.random() < 0.6:
+            row[name] = rng.choice(values[:3])
+    for name in ('rate_male', 'rate_female', 'rate_smoker', 'rate_non_smoker',
+                 'improvement_factor', 'selection_factor'):
+        if rng.random() < 0.4:
+            row[name] = rng.choice([0, 0.011, 0.022, 0.9, 1.05])
+    return row
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_table_row_lookups_match_linear_scan(seed):
+    rng = random.Random(seed)
+    ages = rng.sample(range(0, 101), 15)
+    table_data = [random_row(rng, rng.choice(ages)) for _ in range(80)]
+    index = ActuarialRateIndex.from_table_rows(table_data)
+
+    for age in ages + [-1, 101, 200]:
+        for gender in [None, Gender.MALE, Gender.FEMALE, Gender.UNISEX]:
+            for smoking_status in [None, SmokingStatus.SMOKER, SmokingStatus.NON_SMOKER, SmokingStatus.PREFERRED]:
+                assert _get_rate_from_table(index, age, gender, smoking_status) == \
+                    scan_rate(table_data, age, gender, smoking_status), (age, gender, smoking_status)
+        assert _get_improvement_factor(index, age) == scan_factor(table_data, age, 'improvement_factor')
+        assert _get_selection_factor(index, age) == scan_factor(table_data, age, 'selection_factor')
+
+
+# ---------------------------------------------------------------------
+# {age: {gender: rate}} tables (age bracket integration)
+# ---------------------------------------------------------------------
+
+@pytest.fixture
+def system():
+    return AdvancedAgeBracketIntegration(db=object())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rate_mapping_lookup_and_interpolation_match_scan(system, seed):
+    rng = random.Random(seed)
+    keys = [g.value for g in age_bracket_integration.Gender] + ["UNISEX"]
+    rates = {
+        str(age): {key: round(rng.uniform(0.001, 0.2), 4) for key in rng.sample(keys, rng.randint(1, 3))}
+        for age in rng.sample(range(20, 90), 12)
+    }
+    table = system.load_actuarial_table("mortality", "MORTALITY", rates, version=str(seed))
+
+    for age in range(0, 110):
+        for gender in age_bracket_integration.Gender:
+            assert system.get_actuarial_rate(table.table_id, age, gender) == \
+                mapping_rate(table.rates, age, gender), (age, gender)
+
+
+def test_empty_rate_mapping(system):
+    table = system.load_actuarial_table("empty", "MORTALITY", {}, version="1")
+
+    assert system.get_actuarial_rate(table.table_id, 40, age_bracket_integration.Gender.MALE) is None
@@ -0,0 +1,30 @@
+# tests/test_actuarial_table_export.py
+"""Streaming actuarial table exports keep every column of mixed-schema tables."""
+import csv
+import io
+import uuid
+
+from app.modules.pricing.product.repositories import actuarial_table_repository as repo
+from app.modules.pricing.product.services import actuarial_table_service as service
+from app.utils.streaming_export import iter_csv
+
+
+def test_row_columns_union_prefixed_with_table_columns(monkeypatch):
+    monkeypatch.setattr(repo, "get_actuarial_table_row_keys", lambda db, table_ids: ["age", "rate", "loading"])
+
+    assert service.actuarial_table_row_columns(None, [uuid.uuid4()]) == [
+        "table_id", "table_code", "age", "rate", "loading"
+    ]
+    assert service.actuarial_table_row_columns(None, [uuid.uuid4()], include_table_columns=False) == [
+        "age", "rate", "loading"
+    ]
+
+
+def test_csv_with_union_columns_keeps_later_keys():
+    rows = [{"age": 30, "rate": 0.01}, {"age": 31, "rate": 0.02, "loading": 0.5}]
+
+    body = b"".join(iter_csv(iter(rows), columns=["age", "rate", "loading"])).decode()
+    parsed = list(csv.DictReader(io.StringIO(body)))
+
+    assert parsed[0] == {"age": "30", "rate": "0.01", "loading": ""}
+    assert parsed[1]["loading"] == "0.5"
@@ -0,0 +1,152 @@
+# tests/test_advanced_rule_engine.py
+"""Compiled rule predicates agree with a plain walk of the condition tree."""
+import random
+import uuid
+
+import pytest
+
+from app.modules.pricing.profiles.services.advanced_rule_engine import (
+    AdvancedRule,
+    ComparisonOperator,
+    ConditionNode,
+    LogicalOperator,
+    MultiConditionLogicEngine,
+    RuleImpact,
+)
+
+Op = ComparisonOperator
+ORDERINGS = {
+    Op.GREATER_THAN: lambda a, b: a > b,
+    Op.GREATER_EQUAL: lambda a, b: a >= b,
+    Op.LESS_THAN: lambda a, b: a < b,
+    Op.LESS_EQUAL: lambda a, b: a <= b,
+}
+
+
+def field_value(data, path):
+    current = data
+    for key in path.split('.'):
+        if isinstance(current, dict) and key in current:
+            current = current[key]
+        else:
+            return None
+    return current
+
+
+def compare(op, field, value):
+    if op == Op.EQUALS:
+        return field == value
+    if op in ORDERINGS:
+        try:
+            return ORDERINGS[op](float(field), float(value))
+        except (ValueError, TypeError):
+            return ORDERINGS[op](str(field), str(value))
+    if op == Op.IN:
+        return isinstance(value, (list, tuple, set)) and field in value
+    if op == Op.BETWEEN:
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            return False
+        try:
+            return float(value[0]) <= float(field) <= float(value[1])
+        except (ValueError, TypeError):
+            return str(value[0]) <= str(field) <= str(value[1])
+    field, value = str(field).lower(), str(value).lower()
+    if op == Op.CONTAINS:
+        return value in field
+    if op == Op.STARTS_WITH:
+        return field.startswith(value)
+    return field.endswith(value)
+
+
+def tree_evaluate(node, data):
+    """Reference interpreter: evaluate the tree node by node on every call."""
+    if node.is_comparison():
+        if not node.field:
+            return False
+        field = field_value(data, node.field)
+        return field is not None and compare(node.operator, field, node.value)
+    if not node.is_logical() or not node.conditions:
+        return False
+    if node.operator == LogicalOperator.AND:
+        return all(tree_evaluate(child, data) for child in node.conditions)
+    if node.operator == LogicalOperator.OR:
+        return any(tree_evaluate(child, data) for child in node.conditions)
+    return len(node.conditions) == 1 and not tree_evaluate(node.conditions[0], data)
+
+
+FIELDS = ["age", "territory", "member.age", "member.plan.tier", "missing"]
+NUMBERS = [0, 18, 45, 45.5, 65, "45", "18.0"]
+TEXTS = ["Riyadh", "riyadh-north", "JEDDAH", "gold", "", "n/a"]
+
+
+def random_value(rng, op):
+    if op == Op.IN:
+        return rng.choice([rng.sample(NUMBERS + TEXTS, 3), "not-a-list", tuple(rng.sample(NUMBERS, 2))])
+    if op == Op.BETWEEN:
+        return rng.choice([sorted(rng.sample([0, 18, 45, 65, 90], 2)), ["a", "m"], [1, 2, 3], 5])
+    if op in (Op.CONTAINS, Op.STARTS_WITH, Op.ENDS_WITH):
+        return rng.choice(["ri", "DH", "go", "", 4])
+    return rng.choice(NUMBERS + TEXTS)
+
+
+def random_tree(rng, depth=0):
+    if depth < 3 and rng.random() < 0.45:
+        operator = rng.choice(list(LogicalOperator))
+        count = rng.choice([1, 1, 2] if operator == LogicalOperator.NOT else [0, 1, 2, 3, 4])
+        return ConditionNode(operator=operator, conditions=[random_tree(rng, depth + 1) for _ in range(count)])
+    if rng.random() < 0.03:
+        return ConditionNode(operator=None, field="age", value=1)
+    op = rng.choice(list(ComparisonOperator))
+    return ConditionNode(operator=op, field=rng.choice(FIELDS + [""]), value=random_value(rng, op))
+
+
+def random_data(rng):
+    data = {}
+    if rng.random() < 0.9:
+        data["age"] = rng.choice(NUMBERS + ["old", None])
+    if rng.random() < 0.9:
+        data["territory"] = rng.choice(TEXTS + [42])
+    member = rng.choice([None, "flat", {}, {"age": rng.choice(NUMBERS)}, {"age": 70, "plan": {"tier": rng.choice(TEXTS)}}])
+    if member is not None:
+        data["member"] = member
+    return data
+
+
+@pytest.fixture
+def engine():
+    return MultiConditionLogicEngine(db=object())
+
+
+def test_compiled_predicates_match_tree_evaluation(engine):
+    rng = random.Random(2026)
+    for _ in range(300):
+        tree = random_tree(rng)
+        rule = AdvancedRule(
+            rule_id=uuid.uuid4(), name="r", description=None, conditions=tree,
+            impact=RuleImpact(type="PERCENTAGE", value=5), version=1
+        )
+        predicate = engine.compile_rule(rule)
+        for data in (random_data(rng) for _ in range(20)):
+            expected = tree_evaluate(tree, data)
+            assert predicate(data) is expected, (tree, data)
+            assert engine.evaluate_conditions(tree, data) is expected
+
+
+def test_cheapest_first_ordering_keeps_results(engine):
+    # The costly nested OR comes first in the tree but is evaluated last
+    tree = ConditionNode(operator=LogicalOperator.AND, conditions=[
+        ConditionNode(operator=LogicalOperator.OR, conditions=[
+            ConditionNode(operator=Op.CONTAINS, field="member.plan.tier", value="gold"),
+            ConditionNode(operator=Op.ENDS_WITH, field="territory", value="north"),
+        ]),
+        ConditionNode(operator=Op.GREATER_EQUAL, field="age", value="18"),
+    ])
+    predicate = engine.compile_conditions(tree)
+
+    for data in [
+        {"age": 30, "territory": "riyadh-north"},
+        {"age": 17, "territory": "riyadh-north"},
+        {"age": "40", "member": {"plan": {"tier": "Gold+"}}},
+        {"age": 40, "territory": "Jeddah"},
+    ]:
+        assert predicate(data) is tree_evaluate(tree, data)
@@ -0,0 +1,93 @@
+# tests/test_base_repository.py
+"""Grouped aggregates: one GROUPING SETS query, rows routed to totals or groups."""
+import enum
+
+from sqlalchemy import Boolean, Column, Integer, MetaData, String, Table, func
+from sqlalchemy.dialects import postgresql
+
+from app.core.base_repository import grouped_aggregates
+
+metadata = MetaData()
+policies = Table(
+    "policies",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("status", String),
+    Column("kind", String),
+    Column("is_active", Boolean),
+)
+
+
+class Kind(enum.Enum):
+    MOTOR = "motor"
+    MEDICAL = "medical"
+
+
+class FakeSession:
+    """Returns canned rows and keeps the executed statement."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statement = None
+
+    def execute(self, statement):
+        self.statement = statement
+        return iter(self.rows)
+
+
+DIMENSIONS = {"status": policies.c.status, "kind": policies.c.kind}
+AGGREGATES = {"count": func.count(), "active": func.count().filter(policies.c.is_active.is_(True))}
+
+
+def test_one_grouping_sets_statement():
+    db = FakeSession([])
+
+    grouped_aggregates(db, policies, DIMENSIONS, AGGREGATES, [policies.c.id > 10])
+
+    sql = " ".join(str(db.statement.compile(dialect=postgresql.dialect())).split())
+    assert sql.startswith(
+        "SELECT grouping(policies.status) AS grouping_1, grouping(policies.kind) AS grouping_2, "
+        "policies.status, policies.kind, count(*) AS count_1, "
+        "count(*) FILTER (WHERE policies.is_active IS true) AS anon_1 FROM policies"
+    )
+    assert sql.endswith("GROUP BY GROUPING SETS((), policies.status, policies.kind)")
+    assert "WHERE policies.id > " in sql
+
+
+def test_rows_route_to_totals_and_groups():
+    db = FakeSession([
+        # grouping(status), grouping(kind), status, kind, count, active
+        (0, 1, "draft", None, 2, 0),
+        (1, 1, None, None, 10, 7),
+        (0, 1, "active", None, 5, 5),
+        # A NULL status is its own group, not the totals row
+        (0, 1, None, None, 3, 2),
+        (1, 0, None, Kind.MOTOR, 6, 4),
+        (1, 0, None, None, 4, 3),
+    ])
+
+    result = grouped_aggregates(db, policies, DIMENSIONS, AGGREGATES)
+
+    assert result.totals == {"count": 10, "active": 7}
+    assert result.groups == {
+        "status": {
+            "draft": {"count": 2, "active": 0},
+            "active": {"count": 5, "active": 5},
+            None: {"count": 3, "active": 2},
+        },
+        # Enum keys are stored by value
+        "kind": {"motor": {"count": 6, "active": 4}, None: {"count": 4, "active": 3}},
+    }
+    assert result.total("active") == 7
+    assert result.counts("status", "active", skip_empty=True) == {"active": 5, None: 2}
+
+
+def test_empty_source_and_no_dimensions():
+    empty = grouped_aggregates(FakeSession([]), policies, DIMENSIONS)
+    assert empty.totals == {"count": None}
+    assert empty.total() == 0
+    assert empty.counts("status") == {}
+
+    db = FakeSession([(4,)])
+    assert grouped_aggregates(db, policies, {}).totals == {"count": 4}
+    assert "GROUP BY" not in str(db.statement)
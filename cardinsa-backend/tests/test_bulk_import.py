@@ -0,0 +1,82 @@
+# tests/test_bulk_import.py
+"""COPY staging validation: the generated set-based checks."""
+import io
+from types import SimpleNamespace
+
+from sqlalchemy import Integer, cast, create_mock_engine, func
+from sqlalchemy.dialects import postgresql
+
+from app.core.bulk_import import StagingImport, iter_csv_records
+
+
+class RecordingSession:
+    """Session stand-in that records statements instead of running them."""
+
+    def __init__(self):
+        self.statements = []
+        self.engine = create_mock_engine("postgresql+psycopg://", lambda sql, *args, **kwargs: None)
+
+    def connection(self):
+        return self.engine
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(rowcount=0)
+
+    def sql(self):
+        return [
+            str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            for statement in self.statements
+        ]
+
+
+def make_staging(columns):
+    db = RecordingSession()
+    return db, StagingImport(db, "test", columns)
+
+
+def test_duplicates_compare_normalized_values():
+    db, staging = make_staging(["age", "gender", "smoking_status"])
+    staging.reject_duplicates(
+        "age", "gender", "smoking_status",
+        normalize={"age": lambda column: cast(column, Integer), "gender": func.lower, "smoking_status": func.lower}
+    )
+
+    (sql,) = db.sql()
+    assert "PARTITION BY CAST(" in sql and ".age AS INTEGER)" in sql
+    assert "lower(" in sql and ".gender)" in sql and ".smoking_status)" in sql
+    assert "duplicate age, gender, smoking_status" in sql
+
+
+def test_duplicates_default_to_staged_text():
+    db, staging = make_staging(["code"])
+    staging.reject_duplicates("code")
+
+    (sql,) = db.sql()
+    assert "PARTITION BY " in sql and "CAST(" not in sql.split("PARTITION BY")[1].split("ORDER BY")[0]
+
+
+def test_number_checks_decimal_places():
+    db, staging = make_staging(["rate"])
+    staging.number("rate", minimum=0, maximum=1, decimal_places=6)
+
+    reasons = db.sql()
+    assert len(reasons) == 4
+    assert "rate must have at most 6 decimal places" in reasons[-1]
+    assert "scale(trim_scale(" in reasons[-1] and "> 6" in reasons[-1]
+
+
+def test_number_without_decimal_places_skips_scale_check():
+    db, staging = make_staging(["rate"])
+    staging.number("rate", minimum=0)
+
+    assert not any("scale(" in sql for sql in db.sql())
+
+
+def test_csv_records_normalize_header():
+    stream = io.BytesIO("\ufeffAge , Rate\n30,0.001\n\n31,0.002\n".encode("utf-8"))
+
+    assert list(iter_csv_records(stream)) == [
+        {"age": "30", "rate": "0.001"},
+        {"age": "31", "rate": "0.002"},
+    ]
@@ -0,0 +1,316 @@
+# tests/test_cache.py
+"""Cache manager: single-flight loading and invalidation; in-memory LRU/TTL backend."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import CacheManager, InMemoryCache
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    backend = InMemoryCache()
+    monkeypatch.setattr(cache_module, "_cache_instance", backend)
+    manager = CacheManager()
+    manager._cache_client = backend
+    return manager
+
+
+# ============================================================================
+# SINGLE-FLIGHT
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_async_concurrent_misses_load_once(manager):
+    calls = []
+
+    @manager.cached(ttl=60, key_prefix="quote")
+    async def load(quote_id):
+        calls.append(quote_id)
+        await asyncio.sleep(0.01)
+        return {"quote_id": quote_id}
+
+    results = await asyncio.gather(*(load(7) for _ in range(5)))
+
+    assert calls == [7]
+    assert results == [{"quote_id": 7}] * 5
+    assert await load(7) == {"quote_id": 7}
+    assert calls == [7]
+
+
+@pytest.mark.asyncio
+async def test_async_waiters_share_leader_exception(manager):
+    calls = []
+
+    @manager.cached(ttl=60)
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(load("k") for _ in range(3)), return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters(manager):
+    started = asyncio.Event()
+    calls = []
+
+    @manager.cached(ttl=60)
+    async def load(key):
+        calls.append(key)
+        started.set()
+        await asyncio.sleep(0.05)
+        return "value"
+
+    leader = asyncio.create_task(load("k"))
+    await started.wait()
+    waiters = [asyncio.create_task(load("k")) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*waiters) == ["value"] * 3
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    # The leader's attempt plus exactly one retry by a waiter
+    assert len(calls) == 2
+
+
+def test_sync_concurrent_misses_load_once(manager):
+    calls = []
+    barrier = threading.Barrier(4)
+
+    @manager.cached(ttl=60, key_prefix="rules")
+    def load(product_type):
+        calls.append(product_type)
+        time.sleep(0.05)
+        return ("rule-1", "rule-2")
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(load("medical"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["medical"]
+    assert results == [("rule-1", "rule-2")] * 4
+
+
+# ============================================================================
+# INVALIDATION
+# ============================================================================
+
+def test_sync_tag_invalidation_only_drops_tagged_entries(manager):
+    calls = []
+
+    @manager.cached(ttl=60, tags=lambda product_type: [f"product_type:{product_type}"])
+    def load(product_type):
+        calls.append(product_type)
+        return (product_type,)
+
+    load("medical")
+    load("motor")
+    assert manager.invalidate_tags_nowait("product_type:medical") == 1
+
+    load("medical")
+    load("motor")
+    assert calls == ["medical", "motor", "medical"]
+
+
+@pytest.mark.asyncio
+async def test_async_tag_invalidation(manager):
+    calls = []
+
+    @manager.cached(ttl=60, tags=lambda profile_id: [f"profile:{profile_id}"])
+    async def load(profile_id):
+        calls.append(profile_id)
+        return {"profile_id": profile_id}
+
+    await load(1)
+    await load(2)
+    await manager.invalidate_tags("profile:1")
+    await load(1)
+    await load(2)
+
+    assert calls == [1, 2, 1]
+
+
+class LoopRecordingCache(InMemoryCache):
+    """In-memory backend that records which event loop ran each invalidation."""
+
+    def __init__(self):
+        super().__init__()
+        self.loops = []
+
+    async def invalidate_tags(self, tags):
+        self.loops.append(asyncio.get_running_loop())
+        return await super().invalidate_tags(tags)
+
+
+def test_worker_thread_invalidation_runs_on_bound_loop(monkeypatch):
+    backend = LoopRecordingCache()
+    monkeypatch.setattr(cache_module, "_cache_instance", backend)
+    manager = CacheManager()
+    manager._cache_client = backend
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        manager.bind_loop(loop)
+        manager.invalidate_tags_nowait("product_type:medical")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    assert backend.loops == [loop]
+
+
+def test_redis_loop_local_copy_uses_own_connection():
+    from app.core.cache import RedisCache
+
+    url = "redis://localhost:6399/15"
+    shared = RedisCache(url, key_prefix="test:")
+    try:
+        local = shared.loop_local_copy()
+        assert local is not shared
+        assert local.redis.connection_pool is not RedisCache._pools[url]
+        assert local.key_prefix == shared.key_prefix
+    finally:
+        RedisCache._pools.pop(url, None)
+
+    fake = RedisCache("fakeredis://", key_prefix="test:")
+    assert fake.loop_local_copy() is fake
+
+
+def test_invalidation_without_loop_reaches_redis(monkeypatch):
+    from app.core.cache import RedisCache
+
+    backend = RedisCache("fakeredis://", key_prefix="test:")
+    monkeypatch.setattr(cache_module, "_cache_instance", backend)
+    manager = CacheManager()
+    manager._cache_client = backend
+
+    asyncio.run(backend.set("rules:medical", "1"))
+    asyncio.run(backend.tag_keys("rules:medical", ["product_type:medical"], 60))
+
+    manager.invalidate_tags_nowait("product_type:medical")
+
+    assert asyncio.run(backend.get("rules:medical")) is None
+
+
+# ============================================================================
+# IN-MEMORY BACKEND
+# ============================================================================
+
+class FakeClock:
+    """Monotonic clock the test moves by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_capacity_evicts_least_recently_used():
+    backend = InMemoryCache(max_entries=3)
+    for key in "abc":
+        await backend.set(key, key)
+
+    await backend.get("a")
+    await backend.set("d", "d")
+    await backend.set("a", "A")
+    await backend.set("e", "e")
+
+    assert [key for key in "abcde" if await backend.exists(key)] == ["a", "d", "e"]
+    assert backend.get_stats()["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_evicts_oldest_first():
+    backend = InMemoryCache(max_bytes=10)
+    await backend.set("old", "x" * 6)
+    await backend.set("new", "y" * 6)
+
+    assert await backend.get("old") is None
+    assert await backend.get("new") == "y" * 6
+    assert backend.get_stats()["bytes"] == 6
+
+
+@pytest.mark.asyncio
+async def test_ttl_follows_the_monotonic_clock(clock):
+    backend = InMemoryCache()
+    await backend.set("quote", "1", ttl=10)
+
+    clock.now += 9.9
+    assert await backend.get("quote") == "1"
+    clock.now += 0.1
+    assert not await backend.exists("quote")
+    assert await backend.get("quote") is None
+    assert backend.get_stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_sweep_expired_entries_in_batches(clock):
+    backend = InMemoryCache()
+    expiring = InMemoryCache._SWEEP_BATCH + 44
+    await backend.mset({f"k{i}": "v" for i in range(expiring)}, ttl=5)
+    await backend.set("kept", "v")
+
+    clock.now += 5
+    assert backend.get_stats()["expired_entries"] == expiring
+    await backend.set("trigger", "v")
+
+    # One write reclaims at most one batch; the rest go on a later sweep
+    assert backend.get_stats()["total_entries"] == 44 + 2
+    assert backend.cleanup_expired() == 44
+    stats = backend.get_stats()
+    assert (stats["total_entries"], stats["expirations"]) == (2, expiring)
+
+
+@pytest.mark.asyncio
+async def test_sweep_skips_overwritten_deadlines(clock):
+    backend = InMemoryCache()
+    await backend.set("rate", "old", ttl=5)
+    await backend.set("rate", "new", ttl=60)
+
+    clock.now += 10
+    assert backend.cleanup_expired() == 0
+    assert await backend.get("rate") == "new"
+
+
+@pytest.mark.asyncio
+async def test_stats_count_hits_misses_and_evictions():
+    backend = InMemoryCache(max_entries=1)
+    await backend.set("a", "1")
+    await backend.get("a")
+    await backend.get("a")
+    await backend.get("missing")
+    await backend.set("b", "2")
+    await backend.get("a")
+
+    stats = backend.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+    assert stats["hit_rate"] == 0.5
@@ -0,0 +1,169 @@
+# tests/test_daily_rollup_service.py
+"""Rollup reads: stored closed days merged with a live aggregate of the rest."""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, Date, MetaData, String, Table, create_engine, insert
+
+from app.modules.analytics.models.daily_rollup_model import DailyRollup
+from app.modules.analytics.services import daily_rollup_service
+from app.modules.analytics.services.daily_rollup_service import (
+    MEASURES,
+    DailyRollupService,
+    RollupSource,
+    RollupTotals,
+    _dimension_select,
+)
+
+SOURCE = "test_applications"
+TODAY = date(2026, 3, 10)
+ROLLED_THROUGH = date(2026, 3, 7)
+
+metadata = MetaData()
+applications = Table(
+    "applications",
+    metadata,
+    Column("day", Date),
+    Column("product_type", String),
+    Column("status", String),
+)
+
+
+def facts(day_filter):
+    day = applications.c.day
+    return _dimension_select(
+        day, applications.c.product_type, "status", applications.c.status, day_filter(day)
+    )
+
+
+def stored(day, product_type, status, row_count):
+    values = dict.fromkeys(MEASURES, 0)
+    values.update(
+        source=SOURCE, day=day, product_type=product_type,
+        dimension="status", dimension_value=status, row_count=row_count
+    )
+    return values
+
+
+# Rows in the rollup table; 6 March is also in the raw table and must not count twice
+STORED = [
+    stored(date(2026, 3, 2), "medical", "approved", 6),
+    stored(date(2026, 3, 6), "medical", "approved", 4),
+    stored(date(2026, 3, 6), "motor", "approved", 4),
+]
+
+
+class FakeSession:
+    """The service's session calls, answered from a SQLite connection."""
+
+    def __init__(self, connection, state):
+        self.connection = connection
+        self.state = state
+        self.statements = []
+
+    def get(self, model, source):
+        return self.state
+
+    def scalar(self, statement):
+        return TODAY
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return self.connection.execute(statement)
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    monkeypatch.setitem(
+        daily_rollup_service.ROLLUP_SOURCES, SOURCE, RollupSource(SOURCE, facts, lambda since: None)
+    )
+    # Query the rollup table through its Core columns (the ORM registry is not configured here)
+    rollup_table = DailyRollup.__table__
+    monkeypatch.setattr(daily_rollup_service, "DailyRollup", rollup_table.c)
+
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    rollup_table.create(engine)
+    with engine.connect() as conn:
+        conn.execute(insert(rollup_table), STORED)
+        conn.execute(insert(applications), [
+            {"day": date(2026, 3, 6), "product_type": "medical", "status": "approved"},
+            # Not rolled up yet (lagging refresh and today)
+            {"day": date(2026, 3, 8), "product_type": "medical", "status": "approved"},
+            {"day": date(2026, 3, 9), "product_type": "motor", "status": "rejected"},
+            {"day": TODAY, "product_type": "medical", "status": "approved"},
+            {"day": TODAY, "product_type": "medical", "status": None},
+        ])
+        yield conn
+
+
+def service(connection, rolled_through=ROLLED_THROUGH, state=True):
+    db = FakeSession(connection, SimpleNamespace(rolled_through=rolled_through) if state else None)
+    return DailyRollupService(db), db
+
+
+def test_never_refreshed_source_reads_none(connection):
+    rollups, _ = service(connection, state=False)
+
+    assert rollups.read(SOURCE, date(2026, 3, 1), TODAY) is None
+
+
+def test_stored_and_live_days_are_merged(connection):
+    rollups, _ = service(connection)
+
+    result = rollups.read(SOURCE, date(2026, 3, 1), TODAY)
+
+    # 14 stored + 2 live (8 March, today); the raw 6 March row is not counted twice
+    assert result.counts("status") == {"approved": 16, "rejected": 1}
+    assert result.counts("status", skip_blank=False)[""] == 1
+    assert result.counts_by_product("status") == {"medical": 13, "motor": 5}
+
+
+def test_stored_days_outside_the_period_are_skipped(connection):
+    rollups, _ = service(connection)
+
+    result = rollups.read(SOURCE, date(2026, 3, 5), date(2026, 3, 8))
+
+    assert result.counts("status") == {"approved": 9}
+
+
+def test_product_filter_applies_to_both_parts(connection):
+    rollups, _ = service(connection)
+
+    result = rollups.read(SOURCE, date(2026, 3, 1), TODAY, product_type="motor")
+
+    assert result.counts("status") == {"approved": 4, "rejected": 1}
+
+
+def test_period_inside_rolled_days_reads_no_live_rows(connection):
+    rollups, db = service(connection)
+
+    result = rollups.read(SOURCE, date(2026, 3, 1), date(2026, 3, 6))
+
+    assert len(db.statements) == 1
+    assert result.counts("status") == {"approved": 14}
+
+
+def test_period_after_rolled_days_skips_the_rollup_table(connection):
+    rollups, db = service(connection)
+
+    result = rollups.read(SOURCE, date(2026, 3, 9), TODAY)
+
+    assert len(db.statements) == 1
+    assert result.counts("status") == {"approved": 1, "rejected": 1}
+
+
+def test_lagging_refresh_reads_unrolled_days_live(connection):
+    rollups, _ = service(connection, rolled_through=date(2026, 3, 1))
+
+    # Nothing stored up to 1 March; everything after is aggregated live
+    result = rollups.read(SOURCE, None, date(2026, 12, 31))
+
+    assert result.totals("status").row_count == 5
+
+
+def test_totals_add_measures_by_field():
+    totals = RollupTotals().add([3, 1.5, 1]).merge(RollupTotals(row_count=2, processing_hours_sum=0.5))
+
+    assert (totals.row_count, totals.processing_hours_sum, totals.processing_count) == (5, 2.0, 1)
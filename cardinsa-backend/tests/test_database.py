@@ -0,0 +1,55 @@
+# tests/test_database.py
+"""Blocking session work from async code runs off the loop, one call at a time."""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.database import run_in_session
+
+
+def fake_session():
+    return SimpleNamespace(info={})
+
+
+@pytest.mark.asyncio
+async def test_runs_on_a_worker_thread():
+    loop_thread = threading.get_ident()
+
+    thread = await run_in_session(fake_session(), threading.get_ident)
+
+    assert thread != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_calls_on_one_session_never_overlap():
+    db = fake_session()
+    active, overlaps = [], []
+    lock = threading.Lock()
+
+    def query(n):
+        with lock:
+            active.append(n)
+            overlaps.append(len(active) > 1)
+        time.sleep(0.01)
+        with lock:
+            active.remove(n)
+        return n
+
+    results = await asyncio.gather(*(run_in_session(db, query, n) for n in range(5)))
+
+    assert results == list(range(5))
+    assert not any(overlaps)
+
+
+@pytest.mark.asyncio
+async def test_separate_sessions_run_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+
+    # Deadlocks (BrokenBarrierError) if the two sessions were serialized
+    await asyncio.gather(
+        run_in_session(fake_session(), barrier.wait),
+        run_in_session(fake_session(), barrier.wait),
+    )
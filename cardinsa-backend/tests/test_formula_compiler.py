@@ -0,0 +1,101 @@
+# tests/test_formula_compiler.py
+"""Formula compiler: whitelist, scalar evaluation and batch evaluation."""
+import numpy as np
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.modules.pricing.profiles.services.formula_compiler import compile_formula, evaluate_many
+
+
+@pytest.mark.parametrize("formula, variables, expected", [
+    ("base_premium * 1.5 + 5", {"base_premium": 100}, 155.0),
+    ("max(base_premium, 50) - abs(discount)", {"base_premium": 40, "discount": -10}, 40),
+    ("-age ** 2", {"age": 3}, -9),
+    ("base_premium * (1.2 if age > 60 else 1)", {"base_premium": 100, "age": 65}, 120.0),
+    ("base_premium * (1.2 if age > 60 else 1)", {"base_premium": 100, "age": 30}, 100),
+    ("18 <= age < 65", {"age": 64}, True),
+    ("18 <= age < 65", {"age": 65}, False),
+    ("age > 60 and smoker", {"age": 70, "smoker": True}, True),
+    ("discount or 0.05", {"discount": 0}, 0.05),
+    ("not smoker", {"smoker": False}, True),
+    ("100 if gender == 'male' else 90", {"gender": "male"}, 100),
+    ("100 if gender != 'male' else 90", {"gender": "male"}, 90),
+])
+def test_scalar_evaluation(formula, variables, expected):
+    assert compile_formula(formula)(variables) == expected
+
+
+def test_boolean_operators_short_circuit():
+    # The right-hand side would raise for a missing variable if evaluated
+    assert compile_formula("age < 18 and missing > 0")({"age": 30}) is False
+    assert compile_formula("age > 18 or missing > 0")({"age": 30}) is True
+
+
+@pytest.mark.parametrize("formula", [
+    "__import__('os')",
+    "base_premium.real",
+    "open('x')",
+    "[1, 2]",
+    "'a' * 1000",
+    "age is None",
+    "age in (1, 2)",
+    "lambda: 1",
+    "max(base_premium, key=abs)",
+    "_private + 1",
+])
+def test_unsafe_formulas_are_rejected(formula):
+    with pytest.raises(ValidationError):
+        compile_formula(formula)
+
+
+def test_missing_variable_raises():
+    with pytest.raises(ValidationError):
+        compile_formula("base_premium * factor")({"base_premium": 100})
+
+
+def test_evaluate_many_matches_scalar_evaluation():
+    formula = "base_premium * (1.5 if age >= 60 and smoker else 1) + (10 if age < 18 or age > 70 else 0)"
+    rows = [
+        {"base_premium": 100, "age": 10, "smoker": 0},
+        {"base_premium": 200, "age": 65, "smoker": 1},
+        {"base_premium": 300, "age": 65, "smoker": 0},
+        {"base_premium": 400, "age": 75, "smoker": 1},
+    ]
+    compiled = compile_formula(formula)
+    assert compiled.vectorizable
+
+    expected = [compiled(row) for row in rows]
+    np.testing.assert_allclose(evaluate_many(formula, rows), expected)
+
+
+def test_string_comparisons_fall_back_to_row_evaluation():
+    formula = "100 if gender == 'male' else 90"
+    compiled = compile_formula(formula)
+    assert not compiled.vectorizable
+    assert compiled.variables == {"gender"}
+
+
+def test_pricing_rules_service_surfaces_formula_errors():
+    from app.modules.pricing.profiles.services.pricing_rules_service import PricingRulesService
+
+    service = PricingRulesService.__new__(PricingRulesService)
+    assert service._evaluate_formula("premium * (1.1 if age > 60 else 1)", {"premium": 100, "age": 61}) == pytest.approx(110)
+    with pytest.raises(ValidationError):
+        service._evaluate_formula("premium / 0", {"premium": 100})
+    with pytest.raises(ValidationError):
+        service._evaluate_formula("premium * loading", {"premium": 100})
+
+
+def test_profile_formulas_share_the_compiler_cache():
+    from app.modules.pricing.profiles.services.formula_compiler import clear_formula_cache
+    from app.modules.pricing.profiles.services.formula_evaluation_service import _compile_profile_formula
+
+    clear_formula_cache()
+    compiled = _compile_profile_formula("age  ×  2")
+
+    assert _compile_profile_formula("age * 2") is compiled
+    assert compile_formula("age * 2") is compiled
+    with pytest.raises(ValidationError):
+        _compile_profile_formula("__class__")
+    clear_formula_cache()
+    assert _compile_profile_formula("age * 2") is not compiled
@@ -0,0 +1,104 @@
+# tests/test_number_allocator.py
+"""Number allocator: block reservation and formatting."""
+import re
+import threading
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.number_allocator import NumberAllocator, NumberFormat
+
+
+class FakeSequenceSession:
+    """Answers the allocator's two queries like PostgreSQL sequences would."""
+
+    def __init__(self, increment=100, start=1):
+        self.increment = increment
+        self.current = {}
+        self.start = start
+        self.nextval_calls = 0
+        self.increment_queries = 0
+
+    def scalar(self, statement):
+        sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        if "nextval" in sql:
+            self.nextval_calls += 1
+            name = re.search(r"nextval\('([^']+)'\)", sql).group(1)
+            value = self.current.get(name, self.start - self.increment) + self.increment
+            self.current[name] = value
+            return value
+        self.increment_queries += 1
+        return self.increment
+
+
+def test_one_nextval_per_block():
+    db = FakeSequenceSession(increment=100)
+    allocator = NumberAllocator(formats={})
+
+    values = [allocator.next_value(db, "quote_number_seq") for _ in range(250)]
+
+    assert values == list(range(1, 251))
+    assert db.nextval_calls == 3
+    assert db.increment_queries == 1
+
+
+def test_sequences_have_independent_blocks():
+    db = FakeSequenceSession(increment=10)
+    allocator = NumberAllocator(formats={})
+
+    assert allocator.next_value(db, "a_seq") == 1
+    assert allocator.next_value(db, "b_seq") == 1
+    assert allocator.next_value(db, "a_seq") == 2
+
+
+def test_blocks_from_other_processes_do_not_overlap():
+    db = FakeSequenceSession(increment=100)
+    first, second = NumberAllocator(formats={}), NumberAllocator(formats={})
+
+    values = []
+    for _ in range(150):
+        values.append(first.next_value(db, "quote_number_seq"))
+        values.append(second.next_value(db, "quote_number_seq"))
+
+    assert len(set(values)) == len(values)
+
+
+def test_concurrent_threads_get_unique_values():
+    db = FakeSequenceSession(increment=50)
+    allocator = NumberAllocator(formats={})
+    values = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(200):
+            value = allocator.next_value(db, "quote_number_seq")
+            with lock:
+                values.append(value)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(values) == list(range(1, 801))
+
+
+def test_next_number_formats_template():
+    db = FakeSequenceSession(increment=100, start=42)
+    allocator = NumberAllocator(formats={
+        "application": NumberFormat("application_seq", "{date:%Y%m%d}-{product}-{seq:06d}")
+    })
+
+    number = allocator.next_number(db, "application", product="MED")
+
+    assert re.fullmatch(r"\d{8}-MED-000042", number)
+
+
+def test_reset_skips_rest_of_block():
+    db = FakeSequenceSession(increment=100)
+    allocator = NumberAllocator(formats={})
+
+    allocator.next_value(db, "quote_number_seq")
+    allocator.reset()
+
+    assert allocator.next_value(db, "quote_number_seq") == 101
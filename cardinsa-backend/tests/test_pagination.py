@@ -0,0 +1,212 @@
+# tests/test_pagination.py
+"""Keyset pagination: cursors, seek predicate and page walking."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, event, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.utils.pagination import (
+    CountMode,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    keyset_paginate,
+    keyset_statement,
+)
+
+metadata = MetaData()
+quotes = Table(
+    "quotes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("name", String),
+)
+
+BASE = datetime(2026, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.connect() as conn:
+        # Pairs of rows share a timestamp so the id tie-breaker matters
+        conn.execute(insert(quotes), [
+            {"id": i, "created_at": BASE + timedelta(minutes=i // 2), "name": f"q{i}"}
+            for i in range(1, 12)
+        ])
+        yield conn
+
+
+def walk(conn, size, descending=False):
+    pages, cursor = [], None
+    while True:
+        stmt = keyset_statement(select(quotes), quotes.c.created_at, quotes.c.id, size, cursor, descending)
+        items, cursor = keyset_page(conn.execute(stmt).all(), quotes.c.created_at, quotes.c.id, size)
+        pages.append([row.id for row in items])
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_keeps_types():
+    values = [BASE, uuid4(), Decimal("12.500000"), 7, "text"]
+
+    decoded = decode_cursor(encode_cursor(values))
+
+    assert decoded == values
+    assert isinstance(decoded[1], UUID)
+    assert isinstance(decoded[2], Decimal)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!!",
+    encode_cursor([{"zz": 1}]),  # unknown tagged value type
+    "eyJhIjoxfQ",  # {"a":1}, not a list
+])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_statement_seeks_by_row_value_and_fetches_one_extra():
+    cursor = encode_cursor([BASE, 4])
+    stmt = keyset_statement(select(quotes), quotes.c.created_at, quotes.c.id, 10, cursor)
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "(quotes.created_at, quotes.id) > (" in sql
+    assert "ORDER BY quotes.created_at ASC, quotes.id ASC" in sql
+    assert stmt._limit == 11
+    assert "OFFSET" not in sql
+
+
+def test_descending_statement_flips_comparison_and_order():
+    cursor = encode_cursor([BASE, 4])
+    stmt = keyset_statement(
+        select(quotes).order_by(quotes.c.name), quotes.c.created_at, quotes.c.id, 5, cursor, descending=True
+    )
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "(quotes.created_at, quotes.id) < (" in sql
+    assert "ORDER BY quotes.created_at DESC, quotes.id DESC" in sql
+    assert "quotes.name" not in sql.split("ORDER BY")[1]
+
+
+def test_walking_pages_visits_every_row_once(connection):
+    assert walk(connection, 4) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11]]
+
+
+def test_walking_pages_descending(connection):
+    assert walk(connection, 5, descending=True) == [[11, 10, 9, 8, 7], [6, 5, 4, 3, 2], [1]]
+
+
+def test_exact_page_boundary_has_no_empty_last_page(connection):
+    pages = walk(connection, 11)
+
+    assert pages == [list(range(1, 12))]
+
+
+def test_keyset_page_without_extra_row_has_no_cursor():
+    rows = [SimpleNamespace(created_at=BASE, id=i) for i in range(3)]
+
+    items, cursor = keyset_page(rows, quotes.c.created_at, quotes.c.id, 3)
+
+    assert len(items) == 3
+    assert cursor is None
+
+
+class FakeSession:
+    """Returns canned rows for the page query and records what ran."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        rows = self.rows
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+
+def test_keyset_paginate_builds_meta_without_counting():
+    rows = [SimpleNamespace(created_at=BASE + timedelta(minutes=i), id=i) for i in range(4)]
+    db = FakeSession(rows)
+
+    items, meta = keyset_paginate(db, select(quotes), quotes.c.created_at, quotes.c.id, size=3)
+
+    assert [item.id for item in items] == [0, 1, 2]
+    assert meta.has_next is True
+    assert decode_cursor(meta.next_cursor) == [BASE + timedelta(minutes=2), 2]
+    assert meta.total is None
+    assert meta.total_is_estimate is False
+    # CountMode.NONE issues only the page query
+    assert len(db.statements) == 1
+
+
+def test_keyset_paginate_last_page():
+    rows = [SimpleNamespace(created_at=BASE, id=1)]
+
+    items, meta = keyset_paginate(
+        FakeSession(rows), select(quotes), quotes.c.created_at, quotes.c.id, size=3, count_mode=CountMode.NONE
+    )
+
+    assert len(items) == 1
+    assert meta.has_next is False
+    assert meta.next_cursor is None
+
+
+@pytest.fixture
+def explain_session():
+    """
+    SQLite session answering EXPLAIN (FORMAT JSON) like PostgreSQL.
+
+    The statement arrives after parameter expansion, so the fake plan's
+    row count is the real count of the explained query.
+    """
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    prefix = "EXPLAIN (FORMAT JSON) "
+    explained = []
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def fake_explain(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(prefix):
+            explained.append((statement, parameters))
+            statement = (
+                "SELECT json_array(json_object('Plan', json_object('Plan Rows', count(*)))) "
+                f"FROM ({statement[len(prefix):]})"
+            )
+        return statement, parameters
+
+    with Session(engine) as db:
+        db.execute(insert(quotes), [
+            {"id": i, "created_at": BASE, "name": f"q{i % 3}"} for i in range(1, 10)
+        ])
+        db.explained = explained
+        yield db
+
+
+def test_estimate_expands_in_lists(explain_session):
+    stmt = select(quotes).where(quotes.c.name.in_(["q0", "q1"])).order_by(quotes.c.id).limit(2)
+
+    total = count_rows(explain_session, stmt, CountMode.ESTIMATE)
+
+    assert total == 6
+    (statement, parameters), = explain_session.explained
+    assert "POSTCOMPILE" not in statement
+    assert "ORDER BY" not in statement and "LIMIT" not in statement
+    assert list(parameters) == ["q0", "q1"]
+
+
+def test_estimate_and_exact_agree_on_fake_plan(explain_session):
+    stmt = select(quotes).where(quotes.c.id > 3)
+
+    assert count_rows(explain_session, stmt, CountMode.ESTIMATE) == count_rows(explain_session, stmt)
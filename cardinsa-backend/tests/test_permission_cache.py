@@ -0,0 +1,175 @@
+# tests/test_permission_cache.py
+"""Resolved permissions: wildcard matching, scope chain and invalidation."""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import permission_cache
+from app.core.permission_cache import (
+    GLOBAL_SCOPE,
+    ResolvedPermissions,
+    get_user_permissions,
+    invalidate_all_permissions,
+    invalidate_role_permissions,
+    invalidate_user_permissions,
+    scope_chain,
+)
+from app.modules.auth.repositories import permission_repository, role_repository
+
+COMPANY, DEPARTMENT, UNIT = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+
+# ---------------------------------------------------------------------
+# Matching
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("grant, allowed, denied", [
+    (("quotes", "read"), ("quotes", "read"), ("quotes", "write")),
+    (("quotes", "*"), ("quotes", "delete"), ("policies", "read")),
+    (("*", "read"), ("policies", "read"), ("policies", "write")),
+])
+def test_wildcard_grants(grant, allowed, denied):
+    permissions = ResolvedPermissions({GLOBAL_SCOPE: frozenset([grant])})
+
+    assert permissions.allows(*allowed)
+    assert not permissions.allows(*denied)
+
+
+def test_full_wildcard_allows_everything():
+    permissions = ResolvedPermissions({GLOBAL_SCOPE: frozenset([("*", "*")])})
+
+    assert permissions.allows("anything", "at_all")
+
+
+def test_no_grants_allow_nothing():
+    assert not ResolvedPermissions({}).allows("quotes", "read")
+
+
+def test_scoped_grants_only_apply_in_their_scopes():
+    department_scope = (COMPANY, DEPARTMENT, None)
+    permissions = ResolvedPermissions({department_scope: frozenset([("quotes", "*")])})
+
+    assert permissions.allows_in_scopes("quotes", "read", scope_chain(COMPANY, DEPARTMENT, UNIT))
+    assert not permissions.allows_in_scopes("quotes", "read", scope_chain(COMPANY, uuid.uuid4(), None))
+    assert not permissions.allows_in_scopes("quotes", "read", scope_chain(None, None, None))
+
+
+# ---------------------------------------------------------------------
+# Scope chain
+# ---------------------------------------------------------------------
+
+def test_scope_chain_walks_unit_to_global():
+    assert scope_chain(COMPANY, DEPARTMENT, UNIT) == [
+        (COMPANY, DEPARTMENT, UNIT),
+        (COMPANY, DEPARTMENT, None),
+        (COMPANY, None, None),
+        GLOBAL_SCOPE,
+    ]
+
+
+def test_scope_chain_without_scope_is_global_only():
+    assert scope_chain(None, None, None) == [GLOBAL_SCOPE]
+
+
+def test_scope_chain_normalizes_string_ids():
+    assert scope_chain(str(COMPANY), None, None) == [(COMPANY, None, None), GLOBAL_SCOPE]
+
+
+def test_scope_chain_keeps_invalid_ids_unmatched():
+    permissions = ResolvedPermissions({(COMPANY, None, None): frozenset([("quotes", "read")])})
+
+    chain = scope_chain("not-a-uuid", None, None)
+
+    assert chain[0] == ("not-a-uuid", None, None)
+    assert not permissions.allows_in_scopes("quotes", "read", chain[:1])
+
+
+# ---------------------------------------------------------------------
+# Caching and invalidation
+# ---------------------------------------------------------------------
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Replace the database query with a counter returning one role's grants."""
+    calls = []
+    role_id = uuid.uuid4()
+
+    async def load(db, user_id):
+        calls.append(user_id)
+        return ResolvedPermissions({GLOBAL_SCOPE: frozenset([("quotes", "read")])}, [role_id])
+
+    monkeypatch.setattr(permission_cache, "_load_user_permissions", load)
+    permission_cache._cache().clear()
+    yield SimpleNamespace(calls=calls, role_id=role_id)
+    permission_cache._cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_permissions_are_cached_per_user(loads):
+    user_id = uuid.uuid4()
+
+    await get_user_permissions(None, user_id)
+    await get_user_permissions(None, user_id)
+
+    assert loads.calls == [user_id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("invalidate", [
+    lambda user_id, role_id: invalidate_user_permissions(user_id),
+    lambda user_id, role_id: invalidate_role_permissions(role_id),
+    lambda user_id, role_id: invalidate_all_permissions(),
+])
+async def test_invalidation_forces_a_reload(loads, invalidate):
+    user_id = uuid.uuid4()
+    await get_user_permissions(None, user_id)
+
+    invalidate(user_id, loads.role_id)
+    await get_user_permissions(None, user_id)
+
+    assert loads.calls == [user_id, user_id]
+
+
+@pytest.mark.asyncio
+async def test_other_roles_keep_their_entries(loads):
+    user_id = uuid.uuid4()
+    await get_user_permissions(None, user_id)
+
+    invalidate_role_permissions(uuid.uuid4())
+    await get_user_permissions(None, user_id)
+
+    assert loads.calls == [user_id]
+
+
+class FakeSession:
+    def add(self, instance):
+        pass
+
+    def commit(self):
+        pass
+
+    def refresh(self, instance):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_saving_a_role_invalidates_its_users(loads):
+    user_id = uuid.uuid4()
+    await get_user_permissions(None, user_id)
+
+    role_repository.save(FakeSession(), SimpleNamespace(id=loads.role_id, is_active=False))
+    await get_user_permissions(None, user_id)
+
+    assert loads.calls == [user_id, user_id]
+
+
+@pytest.mark.asyncio
+async def test_saving_a_permission_invalidates_everyone(loads):
+    user_id = uuid.uuid4()
+    await get_user_permissions(None, user_id)
+
+    permission_repository.save(FakeSession(), SimpleNamespace(id=uuid.uuid4(), is_active=False))
+    await get_user_permissions(None, user_id)
+
+    assert loads.calls == [user_id, user_id]
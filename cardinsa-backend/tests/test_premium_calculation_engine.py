@@ -0,0 +1,111 @@
+# tests/test_premium_calculation_engine.py
+"""Columnar batch mode prices every row exactly like the per-request pipeline."""
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.modules.pricing.calculations.services.premium_calculation_engine import (
+    CalculationRequest,
+    CalculationStatus,
+    PremiumCalculationEngine,
+)
+from app.modules.pricing.profiles.services.age_bracket_integration import DemographicProfile, Gender
+
+PROFILE, BROKEN_PROFILE = uuid.uuid4(), uuid.uuid4()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = PremiumCalculationEngine(db=object())
+    bracket = engine.age_bracket_system.create_age_bracket("40-59", 40, 59, Decimal("1.35"))
+    engine.age_bracket_system.update_gender_factors(bracket.bracket_id, {Gender.FEMALE: Decimal("0.97")})
+
+    async def load_profile(profile_id):
+        if profile_id == BROKEN_PROFILE:
+            raise LookupError("profile not found")
+        return {"name": "Gold", "base_factor": 1.1, "currency_factor": 0.5, "risk_factor": 1.3}
+
+    monkeypatch.setattr(engine, "_load_profile_configuration", load_profile)
+    return engine
+
+
+def requests():
+    components = {"deductibles": {"factor": 0.95}, "discounts": {"factor": 0.9}, "commission": {"factor": 1.07}}
+    return [
+        CalculationRequest(base_premium=Decimal("1000")),
+        CalculationRequest(base_premium=Decimal("1234.56"), profile_id=PROFILE, pricing_components=components),
+        CalculationRequest(
+            base_premium=Decimal("800"), profile_id=PROFILE, benefit_type="medical",
+            demographic_profile=DemographicProfile(age=47, gender=Gender.FEMALE, territory="SA"),
+            pricing_components={"copays": {"factor": "1.02"}}
+        ),
+        CalculationRequest(
+            base_premium=Decimal("500"),
+            demographic_profile=DemographicProfile(age=67, gender=Gender.MALE, territory="SA", occupation="pilot")
+        ),
+        # Failures stay on their own rows
+        CalculationRequest(base_premium=Decimal("700"), profile_id=BROKEN_PROFILE, pricing_components=components),
+        CalculationRequest(
+            base_premium=Decimal("900"),
+            pricing_components={"deductibles": {"factor": 0.8}, "copays": {"factor": "n/a"}, "commission": {"factor": 1.1}}
+        ),
+        CalculationRequest(base_premium=Decimal("0"), pricing_components={"discounts": {"factor": 0.5}}),
+    ]
+
+
+def summary(result):
+    return {
+        "status": result.status,
+        "final_premium": result.final_premium,
+        "total_factor": round(result.total_factor, 9),
+        "errors": result.errors,
+        "warnings": result.warnings,
+        "components": [
+            (c.component_type, c.component_name, round(c.input_value, 6), round(c.output_value, 6), round(c.factor, 9))
+            for c in result.components
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_columnar_matches_per_request_pipeline(engine):
+    scalar = await engine.batch_calculate(requests(), columnar=False)
+    columnar = await engine.batch_calculate(requests(), columnar=True)
+
+    assert all(r.metadata.get("batch_mode") == "columnar" for r in columnar)
+    # Profile, demographic and component stages are all exercised
+    assert len(scalar[2].components) == 3 and not scalar[2].errors
+    assert scalar[3].errors[0].startswith("Demographic pricing error:")
+    assert [summary(r) for r in columnar] == [summary(r) for r in scalar]
+
+
+@pytest.mark.asyncio
+async def test_row_failures_do_not_affect_the_batch(engine):
+    results = await engine.batch_calculate(requests(), columnar=True)
+
+    broken_profile, broken_component = results[4], results[5]
+    assert broken_profile.errors == ["Profile base error: profile not found"]
+    # Components after the bad one are skipped, earlier ones still apply
+    assert broken_component.final_premium == Decimal("720.00")
+    assert broken_component.errors[0].startswith("Pricing components error:")
+    assert [r.status for r in results] == [CalculationStatus.COMPLETED] * len(results)
+
+
+@pytest.mark.asyncio
+async def test_unexpected_row_error_fails_only_that_row(engine, monkeypatch):
+    add_components = engine._add_columnar_components
+
+    def add_or_fail(result, request, *args):
+        if request.base_premium == Decimal("1000"):
+            raise RuntimeError("boom")
+        return add_components(result, request, *args)
+
+    monkeypatch.setattr(engine, "_add_columnar_components", add_or_fail)
+
+    results = await engine.batch_calculate(requests(), columnar=True)
+
+    assert results[0].status == CalculationStatus.FAILED
+    assert results[0].errors == ["boom"]
+    assert results[0].final_premium == Decimal("1000")
+    assert sum(r.status == CalculationStatus.COMPLETED for r in results) == len(results) - 1
@@ -0,0 +1,45 @@
+# tests/test_pricing_engine_registry.py
+"""Pricing engine registry: shared engines, per-request sessions."""
+from app.modules.pricing.calculations.services import pricing_engine_registry as registry_module
+from app.modules.pricing.calculations.services.pricing_engine_registry import PricingEngineRegistry
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+
+def test_startup_session_is_closed_and_views_use_request_session(monkeypatch):
+    opened = []
+
+    def session_factory():
+        opened.append(FakeSession())
+        return opened[-1]
+
+    monkeypatch.setattr(registry_module, "SessionLocal", session_factory)
+    registry = PricingEngineRegistry()
+    registry.startup()
+    try:
+        assert len(opened) == 1 and opened[0].closed
+
+        request_db = object()
+        engine = registry.calculation_engine(request_db)
+        assert engine.db is request_db
+        assert engine.rule_orchestrator.db is request_db
+        assert registry.orchestration_engine(request_db).db is request_db
+
+        registry.startup()
+        assert len(opened) == 1
+    finally:
+        registry.shutdown()
+
+    assert not registry.is_started
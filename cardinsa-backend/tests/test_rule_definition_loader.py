@@ -0,0 +1,161 @@
+# tests/test_rule_definition_loader.py
+"""Rule loader versioning: profile overrides must not share cache entries."""
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.modules.pricing.profiles.models.quotation_pricing_rule_model import QuotationPricingRule
+from app.modules.pricing.profiles.services.advanced_rule_engine import MultiConditionLogicEngine, rule_version
+from app.modules.pricing.profiles.services.rule_definition_loader import RuleDefinitionLoader
+from app.modules.pricing.profiles.services.rule_orchestration_engine import RuleOrchestrationEngine
+
+NOW = datetime.now(timezone.utc)
+UPDATED_AT = NOW - timedelta(days=1)
+
+
+class FakeRule(SimpleNamespace):
+    """Unmapped stand-in for QuotationPricingRule (parsing never touches the session)."""
+    _parse_value = QuotationPricingRule._parse_value
+
+
+def make_rule(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        rule_name="Senior loading",
+        rule_description=None,
+        rule_type="age_bracket",
+        insurance_type="medical",
+        field_name="age",
+        operator="greater_than",
+        value="60",
+        value_type="integer",
+        adjustment_type="percentage",
+        adjustment_value=Decimal("10"),
+        adjustment_formula=None,
+        condition_logic=None,
+        secondary_conditions=None,
+        status="active",
+        is_active=True,
+        priority=100,
+        effective_from=NOW - timedelta(days=30),
+        effective_to=None,
+        created_at=NOW - timedelta(days=30),
+        updated_at=UPDATED_AT,
+    )
+    values.update(overrides)
+    return FakeRule(**values)
+
+
+def make_association(rule, **overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        profile_id=uuid.uuid4(),
+        rule_id=rule.id,
+        status="active",
+        is_active=True,
+        effective_from=NOW - timedelta(days=30),
+        effective_to=None,
+        suspended_from=None,
+        suspended_to=None,
+        depends_on_rules=None,
+        conflicts_with_rules=None,
+        override_condition_value=None,
+        override_adjustment_value=None,
+        override_priority=None,
+        updated_at=UPDATED_AT,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_overridden_variants_get_distinct_versions():
+    loader = RuleDefinitionLoader()
+    rule = make_rule()
+    plain = loader._parse_rule(rule, make_association(rule), NOW)
+    overridden = loader._parse_rule(rule, make_association(rule, override_condition_value="40"), NOW)
+
+    assert plain.updated_at == overridden.updated_at
+    assert rule_version(plain) != rule_version(overridden)
+
+
+def test_same_association_and_overrides_keep_version():
+    loader = RuleDefinitionLoader()
+    rule = make_rule()
+    association = make_association(rule, override_adjustment_value=Decimal("15"))
+
+    first = loader._parse_rule(rule, association, NOW)
+    second = loader._parse_rule(rule, association, NOW)
+
+    assert rule_version(first) == rule_version(second)
+
+
+def test_compiled_predicates_follow_overrides():
+    loader = RuleDefinitionLoader()
+    engine = MultiConditionLogicEngine(db=object())
+    rule = make_rule()
+    plain = loader._parse_rule(rule, make_association(rule), NOW)
+    overridden = loader._parse_rule(rule, make_association(rule, override_condition_value="40"), NOW)
+
+    applicant = {"age": 50}
+    assert engine.evaluate_rule(plain, applicant) is False
+    assert engine.evaluate_rule(overridden, applicant) is True
+    # Evaluation order must not matter once both are compiled
+    assert engine.evaluate_rule(plain, applicant) is False
+
+
+def formula_rule(formula):
+    return make_rule(
+        rule_name="Base loading",
+        adjustment_type="formula",
+        adjustment_value=Decimal("0"),
+        adjustment_formula=formula,
+    )
+
+
+async def run_rules(rules, data):
+    """Execute loaded rules in order, feeding each result into the next input."""
+    loader = RuleDefinitionLoader()
+    definitions = {rule.id: loader._parse_rule(rule, make_association(rule), NOW) for rule in rules}
+    engine = RuleOrchestrationEngine(db=object())._with_rule_definitions(definitions)
+    results = []
+    for rule in rules:
+        result = await engine._execute_single_rule(rule.id, data, use_cache=False)
+        data = engine._update_input_data_with_result(data, result)
+        results.append(result)
+    return results, data
+
+
+@pytest.mark.asyncio
+async def test_formula_rule_after_applied_rule_uses_current_premium():
+    results, data = await run_rules(
+        [make_rule(), formula_rule("BASE_AMOUNT * 0.1")], {"age": 70, "premium": Decimal("1000")}
+    )
+
+    loading, formula = results
+    assert loading.result_value == Decimal("100")
+    assert formula.success is True
+    assert formula.result_value == Decimal("110")
+    assert data["premium"] == Decimal("1210")
+
+
+@pytest.mark.asyncio
+async def test_formula_rule_reads_input_fields_without_eval():
+    results, _ = await run_rules(
+        [formula_rule("base_premium * (0.2 if age > 60 else 0)")], {"age": 70, "premium": 500}
+    )
+
+    assert results[0].result_value == Decimal("100")
+
+
+@pytest.mark.parametrize("formula", ["base_premium * unknown_factor", "__import__('os')", "base_premium / 0"])
+@pytest.mark.asyncio
+async def test_broken_formula_fails_the_rule(formula):
+    results, data = await run_rules([formula_rule(formula)], {"age": 70, "premium": 500})
+
+    assert results[0].success is False
+    assert results[0].error_message
+    assert data["premium"] == 500
@@ -0,0 +1,325 @@
+# tests/test_rule_dependency_manager.py
+"""Rule dependency graph: cycle checks, incremental ordering and indexes."""
+import copy
+import random
+import uuid
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.modules.pricing.profiles.services.rule_dependency_manager import (
+    ORDERING_DEPENDENCY_TYPES,
+    ConflictResolutionStrategy,
+    DependencyType,
+    RuleDependencyManager,
+)
+
+PREREQUISITE = DependencyType.PREREQUISITE
+
+
+def rules(count):
+    return [uuid.UUID(int=i + 1) for i in range(count)]
+
+
+@pytest.fixture
+def manager():
+    return RuleDependencyManager(db=object())
+
+
+def ordering_edges(manager):
+    """(runs first, runs after) for every ordering dependency."""
+    return [
+        (dep.dependency_rule_id, dep.dependent_rule_id)
+        for deps in manager.dependencies.values() for dep in deps
+        if dep.dependency_type in ORDERING_DEPENDENCY_TYPES
+    ]
+
+
+def assert_order_valid(manager):
+    positions = manager._topo_position
+    assert len(set(positions.values())) == len(positions)
+    for before, after in ordering_edges(manager):
+        assert positions[before] < positions[after], (before, after)
+
+
+def assert_indexes_consistent(manager):
+    rebuilt = RuleDependencyManager(db=object())
+    rebuilt.dependencies = copy.deepcopy(manager.dependencies)
+    rebuilt._rebuild_graph_index()
+    assert dict(manager._dependents_index) == dict(rebuilt._dependents_index)
+    assert dict(manager._ordering_successors) == dict(rebuilt._ordering_successors)
+
+
+def reaches(manager, start, target):
+    """Brute-force reachability over ordering edges (first -> after)."""
+    edges = ordering_edges(manager)
+    seen, stack = set(), [start]
+    while stack:
+        current = stack.pop()
+        if current == target:
+            return True
+        if current not in seen:
+            seen.add(current)
+            stack.extend(after for before, after in edges if before == current)
+    return False
+
+
+# ---------------------------------------------------------------------
+# Cycle checks
+# ---------------------------------------------------------------------
+
+def test_direct_cycle_is_rejected(manager):
+    a, b = rules(2)
+    manager.add_dependency(b, a, PREREQUISITE)
+
+    with pytest.raises(ValidationError):
+        manager.add_dependency(a, b, PREREQUISITE)
+
+
+def test_transitive_cycle_is_rejected(manager):
+    a, b, c = rules(3)
+    manager.add_dependency(b, a, PREREQUISITE)  # a before b
+    manager.add_dependency(c, b, DependencyType.SEQUENCE)  # b before c
+
+    with pytest.raises(ValidationError):
+        manager.add_dependency(a, c, PREREQUISITE)  # c before a
+    assert manager.get_dependencies(a) == []
+
+
+def test_self_dependency_is_rejected(manager):
+    a, = rules(1)
+
+    with pytest.raises(ValidationError):
+        manager.add_dependency(a, a, PREREQUISITE)
+
+
+def test_redundant_edge_is_accepted(manager):
+    a, b, c = rules(3)
+    manager.add_dependency(b, a, PREREQUISITE)
+    manager.add_dependency(c, b, PREREQUISITE)
+
+    # a before c already holds transitively
+    manager.add_dependency(c, a, PREREQUISITE)
+
+    assert_order_valid(manager)
+
+
+def test_non_ordering_dependencies_never_form_cycles(manager):
+    a, b = rules(2)
+    manager.add_dependency(b, a, PREREQUISITE)
+
+    manager.add_dependency(a, b, DependencyType.EXCLUSION)
+
+    assert [dep.dependency_type for dep in manager.get_dependencies(a)] == [DependencyType.EXCLUSION]
+
+
+# ---------------------------------------------------------------------
+# Incremental order
+# ---------------------------------------------------------------------
+
+def test_order_stays_valid_after_out_of_order_inserts(manager):
+    a, b, c, d = rules(4)
+    # Positions are handed out as c, d, b, a; each edge then forces a reshuffle
+    manager.add_dependency(d, c, PREREQUISITE)  # c before d
+    manager.add_dependency(c, b, PREREQUISITE)  # b before c
+    manager.add_dependency(b, a, PREREQUISITE)  # a before b
+
+    assert_order_valid(manager)
+    assert sorted([a, b, c, d], key=manager._topo_position.get) == [a, b, c, d]
+
+
+def test_random_inserts_match_brute_force_cycle_check(manager):
+    rng = random.Random(7)
+    ids = rules(30)
+    for _ in range(300):
+        dependent, dependency = rng.sample(ids, 2)
+        creates_cycle = reaches(manager, dependent, dependency)
+        if creates_cycle:
+            with pytest.raises(ValidationError):
+                manager.add_dependency(dependent, dependency, PREREQUISITE)
+        else:
+            manager.add_dependency(dependent, dependency, PREREQUISITE)
+        assert_order_valid(manager)
+
+    assert_indexes_consistent(manager)
+
+
+# ---------------------------------------------------------------------
+# Removal and import
+# ---------------------------------------------------------------------
+
+def test_removal_keeps_indexes_consistent(manager):
+    a, b, c = rules(3)
+    manager.add_dependency(b, a, PREREQUISITE)
+    manager.add_dependency(b, a, DependencyType.EXCLUSION)
+    manager.add_dependency(c, b, PREREQUISITE)
+
+    assert manager.remove_dependency(b, a, PREREQUISITE)
+
+    assert_indexes_consistent(manager)
+    assert [dep.dependent_rule_id for dep in manager.get_dependents(a)] == [b]
+    # With the edge gone the reverse direction is allowed
+    manager.add_dependency(a, b, PREREQUISITE)
+    assert_order_valid(manager)
+
+
+def test_removing_a_missing_dependency_is_a_no_op(manager):
+    a, b = rules(2)
+
+    assert manager.remove_dependency(a, b) is False
+
+
+def test_clear_dependencies_updates_indexes(manager):
+    a, b, c = rules(3)
+    manager.add_dependency(c, a, PREREQUISITE)
+    manager.add_dependency(c, b, PREREQUISITE)
+
+    manager.clear_dependencies(c)
+
+    assert_indexes_consistent(manager)
+    assert manager.get_dependents(a) == []
+
+
+def test_import_rebuilds_order_and_indexes(manager):
+    ids = rules(6)
+    for dependent, dependency in [(1, 0), (2, 1), (3, 1), (4, 3), (5, 2)]:
+        manager.add_dependency(ids[dependent], ids[dependency], PREREQUISITE)
+    manager.set_rule_priority(ids[0], 10)
+
+    imported = RuleDependencyManager(db=object())
+    imported.import_dependency_graph(manager.export_dependency_graph())
+
+    assert_order_valid(imported)
+    assert_indexes_consistent(imported)
+    assert imported.get_rule_priority(ids[0]) == 10
+    with pytest.raises(ValidationError):
+        imported.add_dependency(ids[0], ids[5], PREREQUISITE)
+    # Rules new to the imported graph are placed correctly too
+    extra = uuid.uuid4()
+    imported.add_dependency(ids[0], extra, PREREQUISITE)
+    assert_order_valid(imported)
+
+
+def test_import_of_cyclic_graph_falls_back_to_full_search(manager):
+    a, b = rules(2)
+    graph = manager.export_dependency_graph()
+    graph["dependencies"] = {
+        str(a): [{"dependency_rule_id": str(b), "dependency_type": "prerequisite", "created_at": "2026-01-01T00:00:00"}],
+        str(b): [{"dependency_rule_id": str(a), "dependency_type": "prerequisite", "created_at": "2026-01-01T00:00:00"}],
+    }
+
+    manager.import_dependency_graph(graph)
+
+    assert manager._topo_order_valid is False
+    assert manager._has_path(a, b)
+
+
+# ---------------------------------------------------------------------
+# Execution plans
+# ---------------------------------------------------------------------
+
+# Same-priority rules conflict under PRIORITY_BASED; aggregation keeps them all
+AGGREGATE = ConflictResolutionStrategy.AGGREGATE
+
+
+def test_cached_plan_is_reused(manager):
+    a, b = rules(2)
+    manager.add_dependency(b, a, PREREQUISITE)
+
+    first = manager.get_execution_plan([b, a], AGGREGATE)
+
+    assert manager.get_execution_plan([b, a], AGGREGATE) is first
+    assert first.execution_order == [a, b]
+
+
+def test_plans_are_keyed_by_rule_order_and_strategy(manager):
+    a, b = rules(2)
+    plan = manager.get_execution_plan([a, b], AGGREGATE)
+
+    assert manager.get_execution_plan([b, a], AGGREGATE) is not plan
+    assert manager.get_execution_plan([a, b]) is not plan
+
+
+@pytest.mark.parametrize("change", [
+    lambda manager, a, b, c: manager.add_dependency(c, b, PREREQUISITE),
+    lambda manager, a, b, c: manager.remove_dependency(b, a),
+    lambda manager, a, b, c: manager.set_rule_priority(a, 5),
+    lambda manager, a, b, c: manager.clear_dependencies(b),
+])
+def test_graph_changes_invalidate_plans(manager, change):
+    a, b, c = rules(3)
+    manager.add_dependency(b, a, PREREQUISITE)
+    plan = manager.get_execution_plan([a, b, c], AGGREGATE)
+
+    change(manager, a, b, c)
+
+    assert manager.get_execution_plan([a, b, c], AGGREGATE) is not plan
+
+
+def test_failed_add_keeps_cached_plan(manager):
+    a, b = rules(2)
+    manager.add_dependency(b, a, PREREQUISITE)
+    plan = manager.get_execution_plan([a, b], AGGREGATE)
+
+    with pytest.raises(ValidationError):
+        manager.add_dependency(a, b, PREREQUISITE)
+
+    assert manager.get_execution_plan([a, b], AGGREGATE) is plan
+
+
+def test_replanned_order_follows_new_dependency(manager):
+    a, b, c = rules(3)
+    assert manager.get_execution_plan([c, b, a], AGGREGATE).execution_order == [c, b, a]
+
+    manager.add_dependency(c, a, PREREQUISITE)
+
+    assert manager.get_execution_plan([c, b, a], AGGREGATE).execution_order == [b, a, c]
+
+
+def test_priority_change_replans_conflict_resolution(manager):
+    a, b = rules(2)
+    assert manager.get_execution_plan([a, b]).execution_order == [a]
+
+    manager.set_rule_priority(b, 10)
+
+    assert manager.get_execution_plan([a, b]).execution_order == [a, b]
+
+
+def test_levels_respect_prerequisites(manager):
+    a, b, c, d, e = rules(5)
+    manager.add_dependency(b, a, PREREQUISITE)
+    manager.add_dependency(c, a, PREREQUISITE)
+    manager.add_dependency(d, b, PREREQUISITE)
+    manager.add_dependency(d, c, PREREQUISITE)
+    # Sequence-only and outside-the-plan dependencies do not add levels
+    manager.add_dependency(e, d, DependencyType.SEQUENCE)
+    manager.add_dependency(a, uuid.uuid4(), PREREQUISITE)
+
+    plan = manager.get_execution_plan([d, c, b, a, e], AGGREGATE)
+
+    assert plan.dependency_levels == [[a, e], [c, b], [d]]
+    assert plan.metadata["dependency_level_count"] == 3
+    level_of = {rule_id: i for i, level in enumerate(plan.dependency_levels) for rule_id in level}
+    for rule_id in plan.execution_order:
+        for dep in manager.get_dependencies(rule_id):
+            if dep.dependency_type == PREREQUISITE and dep.dependency_rule_id in level_of:
+                assert level_of[dep.dependency_rule_id] < level_of[rule_id]
+
+
+def test_cyclic_rules_go_to_a_final_level(manager):
+    a, b, c, d = rules(4)
+
+    def requires(dependency):
+        return [{
+            "dependency_rule_id": str(dependency),
+            "dependency_type": "prerequisite",
+            "created_at": "2026-01-01T00:00:00"
+        }]
+
+    # b and c require each other; d requires a
+    manager.import_dependency_graph({"dependencies": {str(b): requires(c), str(c): requires(b), str(d): requires(a)}})
+
+    plan = manager.get_execution_plan([a, b, c, d], AGGREGATE)
+
+    assert plan.execution_order == [a, d, b, c]
+    assert plan.dependency_levels == [[a], [d], [b, c]]
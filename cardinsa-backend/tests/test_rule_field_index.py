@@ -0,0 +1,41 @@
+# tests/test_rule_field_index.py
+"""Rule field index: requirements are cached per rule version."""
+import uuid
+from datetime import datetime, timezone
+
+from app.modules.pricing.profiles.services.advanced_rule_engine import (
+    AdvancedRule,
+    ComparisonOperator,
+    ConditionNode,
+    RuleImpact
+)
+from app.modules.pricing.profiles.services.rule_field_index import get_rule_requirements
+
+UPDATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_rule(rule_id, territories, version):
+    return AdvancedRule(
+        rule_id=rule_id,
+        name="Territory loading",
+        description=None,
+        conditions=ConditionNode(operator=ComparisonOperator.IN, field="territory", value=territories),
+        impact=RuleImpact(type="PERCENTAGE", value=0.1),
+        updated_at=UPDATED_AT,
+        version=version
+    )
+
+
+def test_profile_variants_do_not_share_requirements():
+    rule_id = uuid.uuid4()
+    base = make_rule(rule_id, ["north"], (UPDATED_AT, uuid.uuid4(), "a"))
+    overridden = make_rule(rule_id, ["south"], (UPDATED_AT, uuid.uuid4(), "b"))
+
+    assert get_rule_requirements(base).is_satisfied_by({"territory": "north"})
+    assert not get_rule_requirements(overridden).is_satisfied_by({"territory": "north"})
+    assert get_rule_requirements(overridden).is_satisfied_by({"territory": "south"})
+
+
+def test_requirements_cached_per_version():
+    rule = make_rule(uuid.uuid4(), ["north"], (UPDATED_AT, None, "a"))
+    assert get_rule_requirements(rule) is get_rule_requirements(rule)
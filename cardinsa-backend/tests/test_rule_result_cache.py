@@ -0,0 +1,105 @@
+# tests/test_rule_result_cache.py
+"""Rule result caching in Redis (fakeredis) keyed by rule version and referenced input."""
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.core.cache import RedisCache
+from app.modules.pricing.profiles.services.advanced_rule_engine import (
+    AdvancedRule,
+    ComparisonOperator,
+    ConditionNode,
+    RuleImpact
+)
+from app.modules.pricing.profiles.services.rule_orchestration_engine import (
+    RuleExecutionResult,
+    RuleOrchestrationEngine
+)
+
+
+def make_rule(rule_id, field="smoker", impact_type="PERCENTAGE", version="v1"):
+    return AdvancedRule(
+        rule_id=rule_id,
+        name="Smoker loading",
+        description=None,
+        conditions=ConditionNode(operator=ComparisonOperator.EQUALS, field=field, value=True),
+        impact=RuleImpact(type=impact_type, value=0.2, formula="base_premium * 1.2"),
+        version=version
+    )
+
+
+def make_result(rule_id):
+    return RuleExecutionResult(
+        rule_id=rule_id,
+        rule_name="Smoker loading",
+        execution_time=0.001,
+        success=True,
+        condition_met=True,
+        impact_applied=True,
+        result_value=Decimal("200")
+    )
+
+
+@pytest.fixture
+def engine():
+    engine = RuleOrchestrationEngine(db=object())
+    engine.cache = RedisCache("fakeredis://", key_prefix="test:")
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_results_round_trip_through_redis(engine):
+    rule_id = uuid.uuid4()
+    view = engine._with_rule_definitions({rule_id: make_rule(rule_id)})
+    data = {"smoker": True, "premium": 1000}
+
+    await view._cache_rule_results([make_result(rule_id)], data)
+    found = await view._get_cached_rule_results([rule_id], data)
+
+    assert found[rule_id].result_value == Decimal("200")
+    assert found[rule_id].condition_met is True
+
+
+@pytest.mark.asyncio
+async def test_referenced_field_outside_demographics_changes_key(engine):
+    rule_id = uuid.uuid4()
+    view = engine._with_rule_definitions({rule_id: make_rule(rule_id)})
+
+    await view._cache_rule_results([make_result(rule_id)], {"smoker": True, "premium": 1000})
+
+    assert await view._get_cached_rule_results([rule_id], {"smoker": False, "premium": 1000}) == {}
+
+
+@pytest.mark.asyncio
+async def test_unreferenced_fields_share_cached_result(engine):
+    rule_id = uuid.uuid4()
+    view = engine._with_rule_definitions({rule_id: make_rule(rule_id)})
+
+    await view._cache_rule_results([make_result(rule_id)], {"smoker": True, "premium": 1000, "age": 30})
+
+    found = await view._get_cached_rule_results([rule_id], {"smoker": True, "premium": 1000, "age": 55})
+    assert rule_id in found
+
+
+@pytest.mark.asyncio
+async def test_rule_versions_do_not_share_results(engine):
+    rule_id = uuid.uuid4()
+    data = {"smoker": True, "premium": 1000}
+
+    await engine._with_rule_definitions({rule_id: make_rule(rule_id, version="v1")})._cache_rule_results(
+        [make_result(rule_id)], data
+    )
+    other = engine._with_rule_definitions({rule_id: make_rule(rule_id, version="v2")})
+
+    assert await other._get_cached_rule_results([rule_id], data) == {}
+
+
+def test_formula_rules_digest_whole_input(engine):
+    rule_id = uuid.uuid4()
+    view = engine._with_rule_definitions({rule_id: make_rule(rule_id, impact_type="FORMULA")})
+
+    first = view._generate_rule_cache_key(rule_id, {"smoker": True, "sum_insured": 100000})
+    second = view._generate_rule_cache_key(rule_id, {"smoker": True, "sum_insured": 200000})
+
+    assert first != second
@@ -0,0 +1,62 @@
+# tests/test_token_blacklist.py
+"""Token blacklist mirror: lookups and background pruning."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import database
+from app.core.token_blacklist import TokenBlacklistCache
+
+
+class FakeAsyncSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def test_add_and_contains():
+    cache = TokenBlacklistCache(sync_interval=60)
+    cache.add("revoked", datetime.now(timezone.utc) + timedelta(hours=1))
+
+    assert cache.contains("revoked")
+    assert not cache.contains("other")
+
+
+def test_prune_drops_expired_only():
+    cache = TokenBlacklistCache(sync_interval=60)
+    now = datetime.now(timezone.utc)
+    cache.add("expired", now - timedelta(minutes=1))
+    cache.add("live", now + timedelta(hours=1))
+
+    assert cache.prune() == 1
+    assert not cache.contains("expired")
+    assert cache.contains("live")
+
+
+@pytest.mark.asyncio
+async def test_background_sync_prunes_expired_tokens(monkeypatch):
+    monkeypatch.setattr(database, "AsyncSessionLocal", FakeAsyncSession)
+    cache = TokenBlacklistCache(sync_interval=0.01, prune_interval=0.02)
+    synced = []
+
+    async def sync_async(db):
+        synced.append(db)
+        return 0
+
+    monkeypatch.setattr(cache, "sync_async", sync_async)
+    cache.add("expired", datetime.now(timezone.utc) - timedelta(minutes=1))
+
+    cache.start_background_sync()
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(cache) == 0:
+                break
+    finally:
+        await cache.stop_background_sync()
+
+    assert synced
+    assert len(cache) == 0
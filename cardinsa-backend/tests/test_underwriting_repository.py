@@ -0,0 +1,257 @@
+# tests/test_underwriting_repository.py
+"""Underwriting analytics queries: period bounds and aggregate shape."""
+import operator
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+# app.core.validators (imported by the repository) needs phonenumbers
+pytest.importorskip("phonenumbers")
+
+from app.modules.underwriting.repositories import underwriting_repository
+from app.modules.underwriting.repositories.underwriting_repository import (
+    UnderwritingApplication,
+    UnderwritingProfile,
+    UnderwritingRepository,
+)
+
+
+def test_period_covers_whole_last_day():
+    since, until = UnderwritingRepository._submitted_in_period(date(2026, 3, 1), date(2026, 3, 31))
+
+    assert (since.operator, since.right.value) == (operator.ge, date(2026, 3, 1))
+    # Half-open like the daily rollups: everything submitted on 31 March counts
+    assert (until.operator, until.right.value) == (operator.lt, date(2026, 4, 1))
+
+
+# ---------------------------------------------------------------------
+# Direct aggregates (before the first rollup refresh)
+# ---------------------------------------------------------------------
+
+class CoreModel:
+    """Stand-in for a mapped class: column attributes and FROM over a Core table."""
+
+    def __init__(self, model, metadata, columns):
+        # Copy of the model's table with just the columns the analytics read
+        self.__table__ = Table(
+            model.__tablename__, metadata, *(Column(name, model.__table__.c[name].type) for name in columns)
+        )
+
+    def __getattr__(self, name):
+        try:
+            return self.__table__.c[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __clause_element__(self):
+        return self.__table__
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    """Point the repository at Core tables (the ORM registry is not configured here)."""
+    metadata = MetaData()
+    applications = CoreModel(UnderwritingApplication, metadata, [
+        "id", "product_type", "submission_channel", "submitted_at", "status", "assigned_underwriter",
+        "sla_due_date", "actual_completion_date", "processing_started_at", "decision_by",
+        "quality_score", "archived_at",
+    ])
+    profiles = CoreModel(UnderwritingProfile, metadata, [
+        "id", "application_id", "risk_score", "risk_level", "premium_loading", "premium_discount", "archived_at",
+    ])
+    monkeypatch.setattr(underwriting_repository, "UnderwritingApplication", applications)
+    monkeypatch.setattr(underwriting_repository, "UnderwritingProfile", profiles)
+    monkeypatch.setattr(UnderwritingRepository, "_read_rollups", lambda self, *args, **kwargs: None)
+    return SimpleNamespace(metadata=metadata, applications=applications, profiles=profiles)
+
+
+class RecordingQuery:
+    """Chainable stand-in for Session.query that answers from canned results."""
+
+    def __init__(self, session, columns):
+        self.session = session
+        self.statement = select(*columns)
+
+    def select_from(self, table):
+        self.statement = self.statement.select_from(table)
+        return self
+
+    def join(self, target, onclause):
+        self.statement = self.statement.join(target, onclause)
+        return self
+
+    def filter(self, *criteria):
+        self.statement = self.statement.where(*criteria)
+        return self
+
+    def group_by(self, *clauses):
+        self.statement = self.statement.group_by(*clauses)
+        return self
+
+    def _answer(self):
+        self.session.statements.append(self.statement)
+        return self.session.results.pop(0)
+
+    one = all = scalar = _answer
+
+
+class RecordingSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    def query(self, *columns):
+        return RecordingQuery(self, columns)
+
+
+def repository(db):
+    # UnderwritingRepository.__init__ passes no model to BaseRepository, so bind the session directly
+    repo = UnderwritingRepository.__new__(UnderwritingRepository)
+    repo.db = db
+    return repo
+
+
+def postgres_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def stats_row(**values):
+    row = dict(
+        total=0, approved=0, rejected=0, referred=0, completed=0, avg_hours=None,
+        median_hours=None, p90_hours=None, sla_total=0, sla_compliant=0, quality_average=None
+    )
+    row.update(values)
+    return SimpleNamespace(**row)
+
+
+MARCH = (date(2026, 3, 1), date(2026, 3, 31))
+
+
+def test_analytics_aggregate_in_one_filtered_pass(tables):
+    db = RecordingSession(
+        stats_row(total=8, approved=5, rejected=2, referred=1, avg_hours=10.456, median_hours=6, p90_hours=30.333,
+                  sla_total=4, sla_compliant=3),
+        [("medical", 6), ("motor", 2)],
+        [("broker", 8)],
+        Decimal("42.5"),
+        [("high", 3), ("low", 5)],
+    )
+
+    analytics = repository(db).get_underwriting_analytics(*MARCH, product_type="medical")
+
+    assert analytics == {
+        'period_start': MARCH[0],
+        'period_end': MARCH[1],
+        'total_applications': 8,
+        'approved_applications': 5,
+        'rejected_applications': 2,
+        'referred_applications': 1,
+        'approval_rate': 62.5,
+        'rejection_rate': 25.0,
+        'referral_rate': 12.5,
+        'average_risk_score': 42.5,
+        'average_processing_time_hours': 10.46,
+        'median_processing_time_hours': 6.0,
+        'p90_processing_time_hours': 30.33,
+        'sla_compliance_rate': 75.0,
+        'risk_distribution': {"high": 3, "low": 5},
+        'product_distribution': {"medical": 6, "motor": 2},
+        'channel_distribution': {"broker": 8},
+    }
+    stats_sql, _, _, risk_sql, _ = map(postgres_sql, db.statements)
+    assert "count(*) FILTER (WHERE underwriting_applications.status = " in stats_sql
+    assert "percentile_cont(%(percentile_cont_1)s) WITHIN GROUP (ORDER BY" in stats_sql
+    assert "underwriting_applications.product_type = " in stats_sql
+    assert "avg(nullif(underwriting_profiles.risk_score, " in risk_sql
+
+
+def test_empty_period_reports_zeros(tables):
+    db = RecordingSession(stats_row(), [], [], None, [])
+
+    analytics = repository(db).get_underwriting_analytics(*MARCH)
+
+    assert analytics['total_applications'] == 0
+    assert analytics['approval_rate'] == analytics['sla_compliance_rate'] == 0
+    assert analytics['average_risk_score'] == analytics['median_processing_time_hours'] == 0
+    assert analytics['product_distribution'] == analytics['risk_distribution'] == {}
+
+
+def test_underwriter_metrics_filter_by_assignment_or_decision(tables):
+    underwriter = uuid.uuid4()
+    db = RecordingSession(stats_row(total=31, approved=20, rejected=6, referred=5, avg_hours=2, quality_average=None))
+
+    metrics = repository(db).get_performance_metrics(*MARCH, underwriter_id=underwriter)
+
+    assert metrics == {
+        'total_applications_processed': 31,
+        'applications_approved': 20,
+        'applications_rejected': 6,
+        'applications_referred': 5,
+        'average_processing_time_hours': 2.0,
+        'median_processing_time_hours': 0,
+        'p90_processing_time_hours': 0,
+        'sla_compliance_rate': 0,
+        # No non-zero quality scores
+        'quality_score_average': 0,
+        'productivity_score': 1.0,
+    }
+    sql, = map(postgres_sql, db.statements)
+    assert "avg(nullif(underwriting_applications.quality_score, " in sql
+    assert "(underwriting_applications.assigned_underwriter = " in sql
+    assert " OR underwriting_applications.decision_by = " in sql
+
+
+@pytest.fixture
+def sqlite_db(tables):
+    engine = create_engine("sqlite://")
+    tables.metadata.create_all(engine)
+    with Session(engine) as db:
+        yield db
+
+
+def add_profile(db, tables, submitted_at, risk_level, risk_score, loading=0, discount=0, product_type="medical"):
+    application_id = uuid.uuid4()
+    db.execute(insert(tables.applications.__table__).values(
+        id=application_id, submitted_at=submitted_at, product_type=product_type, status="approved"
+    ))
+    db.execute(insert(tables.profiles.__table__).values(
+        id=uuid.uuid4(), application_id=application_id, risk_level=risk_level, risk_score=risk_score,
+        premium_loading=loading, premium_discount=discount
+    ))
+
+
+def test_risk_analysis_treats_zero_as_unscored(sqlite_db, tables):
+    add_profile(sqlite_db, tables, datetime(2026, 3, 1), "low", 20, discount=10)
+    add_profile(sqlite_db, tables, datetime(2026, 3, 15), "high", 80, loading=25)
+    add_profile(sqlite_db, tables, datetime(2026, 3, 31, 23, 59), "very_high", 0, loading=35)
+    add_profile(sqlite_db, tables, datetime(2026, 3, 20), "low", 0)
+    # Outside the period or the product
+    add_profile(sqlite_db, tables, datetime(2026, 4, 1), "high", 90, loading=50)
+    add_profile(sqlite_db, tables, datetime(2026, 3, 20), "high", 90, product_type="motor")
+
+    analysis = repository(sqlite_db).get_risk_analysis(*MARCH, product_type="medical")
+
+    assert analysis == {
+        'total_profiles': 4,
+        # Zero scores, loadings and discounts are left out of the averages
+        'average_risk_score': 50.0,
+        'risk_distribution': {"high": 1, "low": 2, "very_high": 1},
+        'high_risk_profiles': 2,
+        'high_risk_percentage': 50.0,
+        'premium_adjustments': {
+            'average_loading': 30.0,
+            'average_discount': 10.0,
+            'profiles_with_loading': 2,
+            'profiles_with_discount': 1,
+        },
+    }
+
+
+def test_risk_analysis_without_profiles(sqlite_db):
+    assert repository(sqlite_db).get_risk_analysis(*MARCH)['total_profiles'] == 0